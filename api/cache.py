@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Cache partagé à deux niveaux pour les données de marché, chaînes d'options et surfaces calculées
+
+- Niveau 1: LRU en mémoire du worker (accès sans sérialisation)
+- Niveau 2: fichier SQLite sur /dev/shm (ou Redis local) partagé par tous les workers gunicorn
+
+Ajouter des workers augmente ainsi la capacité CPU sans multiplier les appels Tradier / Yahoo.
+
+Les valeurs partagées sont sérialisées avec pickle: le fichier SQLite par défaut est dans un
+dossier propre à l'uid (utils/private_dir.py) et les valeurs Redis sont signées (HMAC), afin
+qu'un autre utilisateur local ne puisse pas y placer un contenu exécuté à la lecture.
+
+Chaque valeur calculée avec succès est aussi conservée comme dernier instantané valide
+(CACHE_STALE_TTL, 24 h par défaut, dans le niveau partagé). Si l'amont échoue, get_or_set et
+cached_json_view servent cet instantané, marqué de son âge (en-têtes X-Stale-Age / Warning et
+champs "stale" / "stale_age_s" des réponses JSON) au lieu d'une erreur.
+"""
+
+import os
+import hmac
+import time
+import pickle
+import hashlib
+import secrets
+import sqlite3
+import threading
+import contextvars
+from collections import OrderedDict
+from functools import wraps
+from contextlib import contextmanager
+from urllib.parse import urlencode
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .single_flight import SingleFlight
+from .market_hours import market_calendar
+from utils.private_dir import check_private_file, default_private_dir
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+# Sentinelle: distingue "absent du cache" d'une valeur None mise en cache
+MISSING = object()
+
+# Préfixe des derniers instantanés valides (servis quand l'amont échoue)
+STALE_PREFIX = "stale|"
+
+# Suivi des instantanés servis pendant la requête courante: dict partagé par les threads
+# de la requête (propagate copie la référence), None hors requête
+_stale_state = contextvars.ContextVar("stale_snapshots", default=None)
+
+
+def note_stale(age: Optional[float] = None) -> None:
+    """
+    Signale qu'une réponse s'appuie sur un instantané ancien ou qu'un amont a échoué
+
+    Args:
+        age (float, optional): Âge de l'instantané servi en secondes (None: échec sans instantané)
+    """
+    state = _stale_state.get()
+    if state is None:
+        return
+    state["failed"] = True
+    if age is not None:
+        state["age"] = max(state["age"] or 0.0, age)
+
+
+def stale_age() -> Optional[float]:
+    """Âge du plus ancien instantané servi pendant la requête courante (None si aucun)"""
+    state = _stale_state.get()
+    return state["age"] if state is not None else None
+
+
+# Préchauffage en cours (api/warmup.py): durée de vie minimale et clés déjà recalculées pendant
+# le passage (dict partagé par les threads de la requête), None hors préchauffage
+_warm_state = contextvars.ContextVar("cache_warming", default=None)
+
+
+@contextmanager
+def warming(min_ttl: float):
+    """
+    Recalcule les valeurs lues dans le bloc au lieu de les servir depuis le cache
+
+    Chaque clé n'est recalculée qu'une fois par bloc. Les réponses de cached_json_view sont
+    conservées au moins min_ttl (jusqu'au passage suivant du préchauffage), les données
+    intermédiaires (cotations, chaînes) gardent leur durée de vie habituelle.
+
+    Args:
+        min_ttl (float): Durée de vie minimale des réponses préchauffées (secondes)
+
+    Yields:
+        Dict: État du passage ("ttl" modifiable entre deux requêtes du même bloc)
+    """
+    state = {"ttl": min_ttl, "refreshed": set()}
+    token = _warm_state.set(state)
+    try:
+        yield state
+    finally:
+        _warm_state.reset(token)
+
+
+def _warm_refresh(key: str) -> Optional[float]:
+    """Durée de vie minimale si la clé doit être recalculée par le préchauffage en cours, sinon None"""
+    state = _warm_state.get()
+    if state is None or key in state["refreshed"]:
+        return None
+    state["refreshed"].add(key)
+    return state["ttl"]
+
+# Durées de vie par type de donnée (secondes)
+CACHE_TTLS = {
+    "market_data": 15,
+    "quote": 10,
+    "chart_intraday": 60,
+    "chart_daily": 900,
+    "tradier_quote": 10,
+    "tradier_clock": 30,
+    "tradier_chain_live": 60,
+    "tradier_chain_historical": 24 * 3600,
+    "tradier_expirations": 3600,
+    "tradier_strikes": 3600,
+    "tradier_history": 3600,
+    "tradier_search": 24 * 3600,
+    "surface": 120,
+    "smile": 120,
+    "term_structure": 300,
+    "risk_metrics": 900,
+}
+
+
+class MemoryLRUCache:
+    """
+    Cache LRU en mémoire avec expiration par entrée (thread-safe)
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialise le cache mémoire
+
+        Args:
+            max_entries (int): Nombre maximum d'entrées conservées
+        """
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return MISSING
+            expires_at, value = item
+            if expires_at < time.time():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def get_with_expiry(self, key: str) -> Tuple[Any, float]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.time():
+                return MISSING, 0.0
+            return item[1], item[0]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Cache partagé entre processus dans un fichier SQLite (idéalement sur /dev/shm)
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialise le cache SQLite
+
+        Args:
+            path (str): Chemin du fichier de base
+
+        Raises:
+            PermissionError: Base (ou journal WAL) créée par un autre utilisateur ou modifiable par d'autres
+        """
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Les valeurs relues passent par pickle: refuser une base qui n'est pas la nôtre
+        for name in (path, f"{path}-wal", f"{path}-shm"):
+            check_private_file(name)
+        # Créée en 0600: SQLite reprend ce mode pour le journal WAL et la mémoire partagée
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600))
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Une connexion par thread et par processus (les connexions ne survivent pas au fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_with_expiry(self, key: str) -> Tuple[Any, float]:
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return MISSING, 0.0
+        if row is None or row[0] < time.time():
+            return MISSING, 0.0
+        try:
+            return pickle.loads(row[1]), row[0]
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            return MISSING, 0.0
+
+    def get(self, key: str) -> Any:
+        return self.get_with_expiry(key)[0]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, sqlite3.Binary(blob))
+            )
+        except (sqlite3.Error, pickle.PicklingError, TypeError) as e:
+            print(f"⚠️  Écriture cache SQLite impossible pour {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def purge_expired(self) -> int:
+        """Supprime les entrées expirées et retourne leur nombre"""
+        try:
+            cursor = self._connection().execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            return cursor.rowcount
+        except sqlite3.Error:
+            return 0
+
+    def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM cache")
+        except sqlite3.Error:
+            pass
+
+
+class RedisCache:
+    """
+    Cache partagé via un Redis local
+
+    Chaque valeur est précédée de sa signature HMAC-SHA256: une valeur écrite sans le secret
+    (autre client du même Redis) est ignorée au lieu d'être désérialisée.
+    """
+
+    def __init__(self, url: str, secret: bytes, prefix: str = "mlg:"):
+        """
+        Initialise le cache Redis
+
+        Args:
+            url (str): URL Redis (ex: redis://localhost:6379/0)
+            secret (bytes): Clé de signature des valeurs, commune à tous les workers
+            prefix (str): Préfixe des clés
+        """
+        self.client = redis.Redis.from_url(url)
+        self.secret = secret
+        self.prefix = prefix
+
+    def _dumps(self, value: Any) -> bytes:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return hmac.new(self.secret, blob, hashlib.sha256).digest() + blob
+
+    def _loads(self, data: bytes) -> Any:
+        signature, blob = data[:32], data[32:]
+        if not hmac.compare_digest(signature, hmac.new(self.secret, blob, hashlib.sha256).digest()):
+            return MISSING
+        try:
+            return pickle.loads(blob)
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            return MISSING
+
+    def get_with_expiry(self, key: str) -> Tuple[Any, float]:
+        try:
+            pipe = self.client.pipeline()
+            pipe.get(self.prefix + key)
+            pipe.pttl(self.prefix + key)
+            blob, pttl = pipe.execute()
+        except redis.RedisError:
+            return MISSING, 0.0
+        if blob is None:
+            return MISSING, 0.0
+        value = self._loads(blob)
+        if value is MISSING:
+            return MISSING, 0.0
+        return value, time.time() + max(pttl, 0) / 1000.0
+
+    def get(self, key: str) -> Any:
+        return self.get_with_expiry(key)[0]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.client.set(self.prefix + key, self._dumps(value), px=max(int(ttl * 1000), 1))
+        except (redis.RedisError, pickle.PicklingError, TypeError) as e:
+            print(f"⚠️  Écriture cache Redis impossible pour {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError:
+            pass
+
+    def clear(self) -> None:
+        try:
+            for key in self.client.scan_iter(self.prefix + "*"):
+                self.client.delete(key)
+        except redis.RedisError:
+            pass
+
+
+class TieredCache:
+    """
+    Cache à deux niveaux: LRU mémoire devant un backend partagé optionnel
+    """
+
+    def __init__(self, memory: MemoryLRUCache, shared=None, stale_ttl: float = 24 * 3600):
+        """
+        Initialise le cache à deux niveaux
+
+        Args:
+            memory (MemoryLRUCache): Niveau 1 (processus courant)
+            shared (SQLiteCache | RedisCache, optional): Niveau 2 (partagé entre workers)
+            stale_ttl (float): Conservation des derniers instantanés valides (secondes, 0 = désactivé)
+        """
+        self.memory = memory
+        self.shared = shared
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "shared_hits": 0, "misses": 0, "sets": 0, "stale_served": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key: str) -> Any:
+        """
+        Lit une valeur (niveau 1 puis niveau 2)
+
+        Returns:
+            Any: La valeur ou MISSING
+        """
+        value = self.memory.get(key)
+        if value is not MISSING:
+            self._count("memory_hits")
+            return value
+
+        if self.shared is not None:
+            value, expires_at = self.shared.get_with_expiry(key)
+            if value is not MISSING:
+                self._count("shared_hits")
+                # Remonter au niveau 1 pour la durée de vie restante
+                self.memory.set(key, value, max(expires_at - time.time(), 0.0))
+                return value
+
+        self._count("misses")
+        return MISSING
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Écrit une valeur dans les deux niveaux"""
+        self._count("sets")
+        self.memory.set(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+            # Purge périodique des entrées expirées du niveau partagé
+            if self.stats["sets"] % 500 == 0 and hasattr(self.shared, "purge_expired"):
+                self.shared.purge_expired()
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def set_snapshot(self, key: str, value: Any) -> None:
+        """Conserve le dernier instantané valide d'une clé (niveau partagé, sinon mémoire)"""
+        if self.stale_ttl <= 0:
+            return
+        store = self.shared if self.shared is not None else self.memory
+        store.set(STALE_PREFIX + key, (value, time.time()), self.stale_ttl)
+
+    def get_snapshot(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Dernier instantané valide d'une clé
+
+        Returns:
+            Tuple[Any, float]: (valeur, âge en secondes) ou None
+        """
+        if self.stale_ttl <= 0:
+            return None
+        store = self.shared if self.shared is not None else self.memory
+        snapshot = store.get(STALE_PREFIX + key)
+        if snapshot is MISSING:
+            return None
+        value, stored_at = snapshot
+        return value, max(time.time() - stored_at, 0.0)
+
+    def serve_stale(self, key: str) -> Any:
+        """
+        Instantané à servir après un échec amont (signalé à la requête courante)
+
+        Returns:
+            Any: La valeur de l'instantané ou MISSING
+        """
+        snapshot = self.get_snapshot(key)
+        if snapshot is None:
+            note_stale()
+            return MISSING
+        value, age = snapshot
+        self._count("stale_served")
+        note_stale(age)
+        return value
+
+    def get_or_set(self, key: str, fn: Callable[[], Any], ttl: float, flight=None,
+                   cache_none: bool = False, valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Retourne la valeur en cache ou la calcule une seule fois
+
+        Si le calcul échoue (exception ou résultat non valide), le dernier instantané valide
+        est servi à la place, marqué de son âge pour la requête en cours.
+
+        Args:
+            key (str): Clé de cache
+            fn (Callable): Fonction sans argument qui produit la valeur
+            ttl (float): Durée de vie en secondes
+            flight (SingleFlight, optional): Groupe single-flight pour regrouper les calculs simultanés
+            cache_none (bool): Mettre aussi en cache un résultat None (échec amont)
+            valid (Callable, optional): Le résultat est-il exploitable ? (défaut: différent de None)
+
+        Returns:
+            Any: Valeur en cache, nouvellement calculée ou dernier instantané valide
+        """
+        # Préchauffage: recalculer la valeur même si elle est encore en cache
+        refresh = _warm_refresh(key) is not None
+        value = MISSING if refresh else self.get(key)
+        if value is not MISSING:
+            return value
+        is_valid = valid or (lambda result: result is not None)
+
+        def compute():
+            # Un autre appelant a pu remplir le cache pendant l'attente
+            cached = MISSING if refresh else self.get(key)
+            if cached is not MISSING:
+                return cached
+            result = fn()
+            if is_valid(result):
+                self.set(key, result, ttl)
+                self.set_snapshot(key, result)
+            elif cache_none:
+                self.set(key, result, ttl)
+            return result
+
+        try:
+            result = flight.do(key, compute) if flight is not None else compute()
+        except Exception:
+            stale = self.serve_stale(key)
+            if stale is MISSING:
+                raise
+            return stale
+        if not is_valid(result):
+            stale = self.serve_stale(key)
+            if stale is not MISSING:
+                return stale
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Statistiques du cache"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["memory_entries"] = len(self.memory)
+        stats["shared_backend"] = type(self.shared).__name__ if self.shared is not None else None
+        return stats
+
+
+# Durée de vie d'une réponse de route construite sur des instantanés (l'amont est réessayé ensuite)
+STALE_RETRY_TTL = 10
+
+# Regroupement des calculs de routes identiques (processus courant: les réponses ne sont pas picklables)
+view_flight = SingleFlight("views")
+
+
+# Paramètres anti-cache ajoutés par les pages (?_t=Date.now()): ignorés dans la clé
+CACHE_BUSTER_PARAMS = ("_t", "_")
+
+
+def _view_path(request) -> str:
+    """Chemin et paramètres triés de la requête, sans les paramètres anti-cache"""
+    params = sorted((k, v) for k, v in request.args.items(multi=True) if k not in CACHE_BUSTER_PARAMS)
+    return request.path + "?" + urlencode(params)
+
+
+def cached_json_view(cache: TieredCache, ttl_name: str, flight: Optional[SingleFlight] = None):
+    """
+    Décorateur de route Flask: met en cache la réponse JSON (status 200) par chemin et paramètres
+
+    Args:
+        cache (TieredCache): Cache à utiliser
+        ttl_name (str): Clé de CACHE_TTLS donnant la durée de vie
+        flight (SingleFlight, optional): Groupe pour regrouper les calculs simultanés (défaut: view_flight)
+    """
+    flight = flight or view_flight
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import Response, g, request, make_response
+            from utils.binary_transport import BINARY_MIMETYPE, wants_binary
+            from utils.http_cache import compute_etag
+
+            # Requête profilée: mesurer le calcul réel, pas une lecture de cache
+            if g.get("profiling"):
+                return view(*args, **kwargs)
+
+            # Réponse binaire et réponse JSON d'une même URL sont mises en cache séparément
+            key = ("view-bin:" if wants_binary() else "view:") + _view_path(request)
+
+            # Réponse rendue par cette requête (leader du single-flight), seule à pouvoir être renvoyée telle quelle
+            rendered = {}
+
+            def render():
+                # Instantanés servis pendant ce calcul: mémorisés avec la réponse mise en cache
+                state = {"age": None, "failed": False}
+                token = _stale_state.set(state)
+                try:
+                    response = make_response(view(*args, **kwargs))
+                finally:
+                    _stale_state.reset(token)
+                if response.status_code != 200 or response.mimetype not in ("application/json", BINARY_MIMETYPE):
+                    rendered["response"] = response
+                    # Les suiveurs reçoivent une copie (after_request modifie la réponse: ETag, compression,
+                    # Vary); une réponse en flux ne se copie pas, ils la recalculent
+                    if response.is_streamed or response.direct_passthrough:
+                        return ("uncacheable", None, state)
+                    return ("uncacheable", (response.get_data(), response.status_code, list(response.headers)), state)
+                body = response.get_data()
+                # ETag calculé une fois par version mise en cache (GET conditionnel → 304)
+                data_time = time.time() - state["age"] if state["age"] is not None else None
+                return (body, response.status_code, response.mimetype, compute_etag(body), data_time, state["failed"])
+
+            # Symbole de la route (surfaces, smiles, risque): réponse conservée jusqu'à la réouverture de sa place
+            symbol = kwargs.get("symbol")
+            ttl = market_calendar.cache_ttl(CACHE_TTLS.get(ttl_name, 60), symbol) if symbol else CACHE_TTLS.get(ttl_name, 60)
+            warm_ttl = _warm_refresh(key)
+            if warm_ttl is not None:
+                # Réponse préchauffée: conservée jusqu'au passage suivant du préchauffage
+                ttl = max(ttl, warm_ttl)
+            entry = cache.get(key) if warm_ttl is None else MISSING
+            if entry is MISSING:
+                entry = flight.do(key, render)
+                if entry[0] == "uncacheable":
+                    copy, state = entry[1], entry[2]
+                    response = rendered.get("response")
+                    if response is None:
+                        response = Response(copy[0], status=copy[1], headers=copy[2]) if copy is not None \
+                            else make_response(view(*args, **kwargs))
+                    # Échec amont (5xx, 429, ou erreur après un appel amont raté): dernière réponse valide
+                    if response.status_code >= 500 or response.status_code == 429 or state["failed"]:
+                        stale = cache.serve_stale(key)
+                        if stale is not MISSING:
+                            return _entry_response(stale)
+                    return response
+                if entry[4] is None and not entry[5]:
+                    cache.set(key, entry, ttl)
+                    cache.set_snapshot(key, entry)
+                else:
+                    # Réponse construite sur des instantanés ou dégradée par un appel amont raté:
+                    # réessayer l'amont bientôt, sans remplacer la dernière réponse complète
+                    cache.set(key, entry, min(ttl, STALE_RETRY_TTL))
+
+            if len(entry) > 4 and entry[4] is not None:
+                note_stale(max(time.time() - entry[4], 0.0))
+            return _entry_response(entry)
+        return wrapper
+    return decorator
+
+
+def _entry_response(entry):
+    """Réponse Flask d'une entrée de cached_json_view (body, status, mimetype[, etag, data_time, failed])"""
+    from flask import Response
+
+    body, status, mimetype = entry[:3]
+    response = Response(body, status=status, mimetype=mimetype)
+    if len(entry) > 3:
+        response.set_etag(entry[3])
+    return response
+
+
+def init_app(app) -> None:
+    """
+    Marque les réponses servies depuis un instantané ancien
+
+    En-têtes X-Stale-Age (secondes) et Warning: 110, Cache-Control: no-cache (à enregistrer
+    après le cache HTTP pour passer avant lui), et champs "stale" / "stale_age_s" ajoutés
+    aux réponses JSON objet.
+    """
+    from flask import current_app
+
+    def start():
+        _stale_state.set({"age": None, "failed": False})
+
+    def mark(response):
+        age = stale_age()
+        if age is None:
+            return response
+        response.headers["X-Stale-Age"] = str(int(age))
+        response.headers["Warning"] = '110 - "Response is Stale"'
+        response.headers["Cache-Control"] = "no-cache"
+        if response.mimetype == "application/json" and not response.is_streamed:
+            data = response.get_json(silent=True)
+            if isinstance(data, dict):
+                data["stale"] = True
+                data["stale_age_s"] = round(age, 1)
+                response.set_data(current_app.json.dumps_bytes(data))
+                # L'ETag d'origine ne correspond plus au corps annoté
+                response.headers.pop("ETag", None)
+        return response
+
+    app.before_request(start)
+    app.after_request(mark)
+
+
+def _redis_secret() -> bytes:
+    """Clé de signature Redis: CACHE_SECRET, sinon une clé aléatoire conservée dans le dossier privé de l'uid"""
+    configured = os.getenv("CACHE_SECRET")
+    if configured:
+        return configured.encode("utf-8")
+    path = os.path.join(default_private_dir("cache"), "redis.key")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        check_private_file(path)
+        with open(path, "rb") as f:
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        key = secrets.token_bytes(32)
+        f.write(key)
+    return key
+
+
+def create_cache_from_env() -> TieredCache:
+    """
+    Crée le cache selon les variables d'environnement
+
+    Variables:
+        CACHE_BACKEND: "sqlite" (défaut), "redis" ou "memory"
+        CACHE_SQLITE_PATH: Fichier SQLite partagé (défaut: /dev/shm/mlg-<uid>/cache/cache.sqlite3, dossier 0700)
+        CACHE_REDIS_URL: URL Redis (défaut: redis://localhost:6379/0)
+        CACHE_SECRET: Clé de signature des valeurs Redis (défaut: clé aléatoire dans /dev/shm/mlg-<uid>/cache,
+            à fixer si les workers ne sont pas sur la même machine)
+        CACHE_MEMORY_ENTRIES: Taille du LRU mémoire (défaut: 512)
+        CACHE_STALE_TTL: Conservation des derniers instantanés valides en secondes (défaut: 86400, 0 = aucun)
+
+    Returns:
+        TieredCache: Cache configuré (niveau mémoire seul si le backend partagé est indisponible)
+    """
+    memory = MemoryLRUCache(int(os.getenv("CACHE_MEMORY_ENTRIES", "512")))
+    backend = os.getenv("CACHE_BACKEND", "sqlite").lower()
+
+    shared = None
+    if backend == "redis":
+        if not REDIS_AVAILABLE:
+            print("⚠️  Module redis non trouvé, cache partagé désactivé")
+        else:
+            try:
+                shared = RedisCache(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"), _redis_secret())
+                shared.client.ping()
+            except Exception as e:
+                print(f"⚠️  Redis indisponible ({e}), cache partagé désactivé")
+                shared = None
+    elif backend == "sqlite":
+        try:
+            path = os.getenv("CACHE_SQLITE_PATH") or os.path.join(default_private_dir("cache"), "cache.sqlite3")
+            shared = SQLiteCache(path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Cache SQLite indisponible ({e}), cache partagé désactivé")
+
+    return TieredCache(memory, shared, stale_ttl=float(os.getenv("CACHE_STALE_TTL", str(24 * 3600))))
+
+
+# Instance globale partagée par les clients Tradier / Yahoo et les routes
+shared_cache = create_cache_from_env()
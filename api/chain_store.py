@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Stockage local des chaînes d'options (snapshots) au format colonnaire Arrow IPC
+
+Chaque chaîne récupérée via Tradier est écrite dans un fichier Arrow IPC
+rangé par symbole / expiration / date d'observation (as-of), et référencée
+dans un journal d'index en ajout seul (une ligne JSON par snapshot). Les
+lectures passent par un memory-map pour pouvoir rejouer surfaces, smiles et
+historiques d'IV depuis le disque local. Les fichiers sont compressés en zstd
+par défaut (chaque lecture décompresse, donc copie, le fichier); sans
+compression (CHAIN_STORE_COMPRESSION=none), les colonnes numériques pointent
+directement dans la page mappée, au prix de fichiers plus volumineux.
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pa_ipc = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou inter-processus sur l'index
+    fcntl = None
+
+
+class ChainSnapshotStore:
+    """
+    Store de snapshots de chaînes d'options sur disque (Arrow IPC + journal d'index)
+
+    Arborescence:
+        <root>/chains/<SYMBOL>/<EXPIRATION>/<AS_OF>.arrow
+        <root>/chains/index.jsonl
+    """
+
+    def __init__(self, root_dir: str, compression: Optional[str] = "zstd"):
+        """
+        Initialise le store de snapshots
+
+        Args:
+            root_dir (str): Dossier racine du store
+            compression (str, optional): Codec Arrow IPC ("zstd", "lz4" ou None pour des lectures sans copie)
+        """
+        self.root_dir = root_dir
+        self.chains_dir = os.path.join(root_dir, "chains")
+        self.index_path = os.path.join(self.chains_dir, "index.jsonl")
+        self.compression = compression or None
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # Position de lecture dans le journal et inode (remplacé par rebuild_index)
+        self._index_offset = 0
+        self._index_inode = None
+
+    @property
+    def enabled(self) -> bool:
+        """Le store n'est actif que si pyarrow est installé"""
+        return PYARROW_AVAILABLE
+
+    @staticmethod
+    def _key(symbol: str, expiration: str, as_of: str) -> str:
+        return f"{symbol.upper()}/{expiration}/{as_of}"
+
+    def _snapshot_path(self, symbol: str, expiration: str, as_of: str) -> str:
+        return os.path.join(self.chains_dir, symbol.upper(), expiration, f"{as_of}.arrow")
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Lit les entrées ajoutées au journal depuis la dernière lecture (autres workers compris)"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return self._index
+
+        if stat.st_ino != self._index_inode or stat.st_size < self._index_offset:
+            # Journal reconstruit: relecture complète
+            self._index = {}
+            self._index_offset = 0
+            self._index_inode = stat.st_ino
+
+        if stat.st_size > self._index_offset:
+            try:
+                with open(self.index_path, "rb") as f:
+                    f.seek(self._index_offset)
+                    chunk = f.read(stat.st_size - self._index_offset)
+            except OSError:
+                return self._index
+            # Une ligne incomplète (écriture en cours) sera relue au prochain appel
+            complete = chunk.rfind(b"\n") + 1
+            for line in chunk[:complete].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._index[self._key(entry["symbol"], entry["expiration"], entry["as_of"])] = entry
+            self._index_offset += complete
+        return self._index
+
+    @contextmanager
+    def _index_lock(self):
+        """Verrou inter-processus sur le journal d'index"""
+        os.makedirs(self.chains_dir, exist_ok=True)
+        lock_file = open(self.index_path + ".lock", "a")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _append_index_entry(self, entry: Dict[str, Any]) -> None:
+        """Ajoute une ligne au journal d'index (coût constant quel que soit le nombre de snapshots)"""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._index_lock():
+            with open(self.index_path, "ab") as f:
+                f.write(line)
+
+    def rebuild_index(self) -> int:
+        """
+        Reconstruit le journal d'index à partir des fichiers présents sur disque
+
+        Le journal est réécrit sous le même verrou que les ajouts: aucune entrée écrite
+        pendant la reconstruction n'est perdue.
+
+        Returns:
+            int: Nombre de snapshots indexés
+        """
+        with self._lock, self._index_lock():
+            # Les entrées déjà journalisées conservent leur nombre de lignes
+            known = dict(self._load_index())
+            index = {}
+            for symbol in os.listdir(self.chains_dir):
+                symbol_dir = os.path.join(self.chains_dir, symbol)
+                if not os.path.isdir(symbol_dir):
+                    continue
+                for expiration in os.listdir(symbol_dir):
+                    exp_dir = os.path.join(symbol_dir, expiration)
+                    if not os.path.isdir(exp_dir):
+                        continue
+                    for filename in os.listdir(exp_dir):
+                        if not filename.endswith(".arrow"):
+                            continue
+                        as_of = filename[:-len(".arrow")]
+                        path = os.path.join(exp_dir, filename)
+                        key = self._key(symbol, expiration, as_of)
+                        index[key] = {
+                            "symbol": symbol,
+                            "expiration": expiration,
+                            "as_of": as_of,
+                            "path": os.path.relpath(path, self.chains_dir),
+                            "rows": known.get(key, {}).get("rows"),
+                            "bytes": os.path.getsize(path),
+                            "written_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                        }
+
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in index.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.index_path)
+            self._index_inode = None  # Relecture complète au prochain accès
+            self._index_offset = 0
+        return len(index)
+
+    # ------------------------------------------------------------------
+    # Écriture / lecture
+    # ------------------------------------------------------------------
+    def write(self, symbol: str, expiration: str, as_of: str, df: pd.DataFrame) -> Optional[str]:
+        """
+        Écrit un snapshot de chaîne d'options
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            expiration (str): Date d'expiration au format YYYY-MM-DD
+            as_of (str): Date d'observation au format YYYY-MM-DD
+            df (pd.DataFrame): Chaîne d'options parsée
+
+        Returns:
+            str: Chemin du fichier écrit ou None si le store est inactif
+        """
+        if not self.enabled or df is None or df.empty:
+            return None
+
+        path = self._snapshot_path(symbol, expiration, as_of)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        options = pa_ipc.IpcWriteOptions(compression=self.compression)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        entry = {
+            "symbol": symbol.upper(),
+            "expiration": expiration,
+            "as_of": as_of,
+            "path": os.path.relpath(path, self.chains_dir),
+            "rows": table.num_rows,
+            "bytes": os.path.getsize(path),
+            "written_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._append_index_entry(entry)
+            self._index[self._key(symbol, expiration, as_of)] = entry
+
+        return path
+
+    def has(self, symbol: str, expiration: str, as_of: str) -> bool:
+        """Indique si un snapshot existe pour la clé donnée"""
+        if not self.enabled:
+            return False
+        return os.path.exists(self._snapshot_path(symbol, expiration, as_of))
+
+    def read(self, symbol: str, expiration: str, as_of: str) -> Optional[pd.DataFrame]:
+        """
+        Lit un snapshot via memory-map (sans copie si le fichier n'est pas compressé)
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            expiration (str): Date d'expiration au format YYYY-MM-DD
+            as_of (str): Date d'observation au format YYYY-MM-DD
+
+        Returns:
+            pd.DataFrame: Chaîne d'options ou None si absente
+        """
+        if not self.enabled:
+            return None
+
+        path = self._snapshot_path(symbol, expiration, as_of)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa_ipc.open_file(source).read_all()
+            return table.to_pandas()
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"⚠️  Snapshot illisible {path}: {e}")
+            return None
+
+    def list_snapshots(self, symbol: Optional[str] = None, expiration: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Liste les snapshots indexés, éventuellement filtrés
+
+        Args:
+            symbol (str, optional): Filtrer sur un symbole
+            expiration (str, optional): Filtrer sur une expiration
+
+        Returns:
+            List[Dict]: Entrées d'index triées par symbole, expiration et date
+        """
+        with self._lock:
+            entries = list(self._load_index().values())
+
+        if symbol:
+            entries = [e for e in entries if e["symbol"] == symbol.upper()]
+        if expiration:
+            entries = [e for e in entries if e["expiration"] == expiration]
+        return sorted(entries, key=lambda e: (e["symbol"], e["expiration"], e["as_of"]))
+
+    def read_history(self, symbol: str, expiration: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Concatène les snapshots d'un symbole pour le rejeu / backtest
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            expiration (str, optional): Limiter à une expiration
+            start (str, optional): Première date d'observation incluse (YYYY-MM-DD)
+            end (str, optional): Dernière date d'observation incluse (YYYY-MM-DD)
+
+        Returns:
+            pd.DataFrame: Snapshots concaténés ou None si aucun
+        """
+        frames = []
+        for entry in self.list_snapshots(symbol, expiration):
+            if start and entry["as_of"] < start:
+                continue
+            if end and entry["as_of"] > end:
+                continue
+            df = self.read(entry["symbol"], entry["expiration"], entry["as_of"])
+            if df is not None:
+                frames.append(df)
+
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+
+def create_chain_store_from_env() -> Optional[ChainSnapshotStore]:
+    """
+    Crée le store à partir des variables d'environnement
+
+    Variables:
+        CHAIN_STORE_ENABLED: "false" pour désactiver le store (défaut: true)
+        CHAIN_STORE_DIR: Dossier racine (défaut: data_store)
+        CHAIN_STORE_COMPRESSION: Codec Arrow IPC ("zstd" par défaut, "lz4", ou "none" pour des lectures sans copie)
+
+    Returns:
+        ChainSnapshotStore: Store configuré ou None si désactivé / pyarrow absent
+    """
+    if os.getenv("CHAIN_STORE_ENABLED", "true").lower() != "true":
+        return None
+
+    if not PYARROW_AVAILABLE:
+        print("⚠️  Module pyarrow non trouvé, stockage local des chaînes d'options désactivé")
+        return None
+
+    compression = os.getenv("CHAIN_STORE_COMPRESSION", "zstd").lower()
+    return ChainSnapshotStore(
+        root_dir=os.getenv("CHAIN_STORE_DIR", "data_store"),
+        compression=None if compression == "none" else compression
+    )
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Sonde de santé des API amont (Tradier, Yahoo Finance) en tâche de fond
+
+Un thread par worker interroge périodiquement chaque amont (horloge de marché Tradier, cotation
+Yahoo du S&P 500) et tient à jour latence, taux d'erreur et état (up / degraded / down).
+/api/tradier/status et /health lisent cet état sans appel réseau, et les clients s'en servent
+pour échouer immédiatement quand l'amont est tombé au lieu d'enchaîner timeouts et retries.
+
+Le dernier résultat est publié dans le cache partagé: un worker qui trouve un résultat récent
+d'un autre worker l'adopte au lieu de sonder à son tour (une sonde par intervalle, pas par worker).
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from .cache import shared_cache, MISSING
+from .rate_limiter import tradier_rate_limiter, PRIORITY_BACKGROUND
+from .replay import replay_transport
+
+STATUS_UNKNOWN = "unknown"
+STATUS_UP = "up"
+STATUS_DEGRADED = "degraded"
+STATUS_DOWN = "down"
+
+
+class UpstreamHealth:
+    """
+    État d'un amont: fenêtre glissante des dernières sondes
+    """
+
+    def __init__(self, name: str, check: Callable[[], bool], interval: float, window: int):
+        """
+        Initialise l'état
+
+        Args:
+            name (str): Nom de l'amont ("tradier", "yahoo")
+            check (Callable): Sonde: True si l'amont répond correctement (une exception vaut échec)
+            interval (float): Période entre deux sondes (secondes)
+            window (int): Nombre de sondes retenues pour le taux d'erreur et la latence
+        """
+        self.name = name
+        self.check = check
+        self.interval = interval
+        self.results: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.last_checked: Optional[float] = None
+        self.last_ok: Optional[float] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def record(self, ok: bool, latency_ms: float, error: Optional[str], checked_at: float) -> None:
+        self.results.append((ok, latency_ms))
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+        self.last_checked = checked_at
+        self.last_latency_ms = round(latency_ms, 1)
+        self.last_error = None if ok else error
+        if ok:
+            self.last_ok = checked_at
+
+
+class HealthProber:
+    """
+    Sondes périodiques des amonts, état servi instantanément aux routes et aux clients
+    """
+
+    def __init__(self, interval: float = 30.0, window: int = 20, failure_threshold: int = 3,
+                 degraded_error_rate: float = 0.2, cache=None):
+        """
+        Initialise la sonde
+
+        Args:
+            interval (float): Période par défaut entre deux sondes (secondes, 0 = sondes désactivées)
+            window (int): Nombre de sondes retenues par amont
+            failure_threshold (int): Échecs consécutifs à partir desquels l'amont est "down"
+            degraded_error_rate (float): Taux d'erreur sur la fenêtre à partir duquel l'amont est "degraded"
+            cache (TieredCache, optional): Cache partagé entre workers (défaut: cache global)
+        """
+        self.interval = interval
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.degraded_error_rate = degraded_error_rate
+        self.cache = cache if cache is not None else shared_cache
+        self.upstreams: Dict[str, UpstreamHealth] = {}
+        self.fail_fast_count: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        # Au rejeu, aucun amont réel à surveiller
+        return self.interval > 0 and not replay_transport.replaying
+
+    def register(self, name: str, check: Callable[[], bool], interval: Optional[float] = None) -> None:
+        """
+        Ajoute un amont à sonder
+
+        Args:
+            name (str): Nom de l'amont
+            check (Callable): Sonde sans argument (True = OK)
+            interval (float, optional): Période propre à cet amont (défaut: période globale)
+        """
+        with self._lock:
+            self.upstreams[name] = UpstreamHealth(name, check, interval or self.interval, self.window)
+            self.fail_fast_count.setdefault(name, 0)
+
+    def init_app(self, app) -> None:
+        """Démarre la sonde dans chaque worker à sa première requête (le thread ne survit pas au fork)"""
+        app.before_request(self.ensure_started)
+        app.extensions["health_prober"] = self
+
+    def ensure_started(self) -> None:
+        """Démarre le thread de sonde dans le processus courant s'il ne tourne pas déjà"""
+        if not self.enabled or (self._pid == os.getpid() and self._thread is not None):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mlg-health-probe", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.time()
+            for upstream in list(self.upstreams.values()):
+                if upstream.last_checked is None or now - upstream.last_checked >= upstream.interval:
+                    self.probe(upstream.name)
+            self._stop.wait(1.0)
+
+    def probe(self, name: str) -> Dict[str, Any]:
+        """
+        Sonde un amont maintenant (ou adopte le résultat récent d'un autre worker)
+
+        Returns:
+            Dict: État de l'amont après la sonde
+        """
+        upstream = self.upstreams[name]
+        key = f"health_probe|{name}"
+        shared = self.cache.get(key)
+        if shared is not MISSING and shared["checked_at"] != upstream.last_checked:
+            with self._lock:
+                upstream.record(shared["ok"], shared["latency_ms"], shared["error"], shared["checked_at"])
+            return self.status(name)
+
+        started = time.perf_counter()
+        try:
+            ok, error = bool(upstream.check()), None
+            if not ok:
+                error = "Réponse invalide"
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        latency_ms = (time.perf_counter() - started) * 1000
+        checked_at = time.time()
+
+        with self._lock:
+            was_down = self._is_down(upstream)
+            upstream.record(ok, latency_ms, error, checked_at)
+            now_down = self._is_down(upstream)
+        if now_down != was_down:
+            print(f"{'🔴' if now_down else '🟢'} Sonde {name}: {'amont indisponible' if now_down else 'amont rétabli'}"
+                  f"{f' ({error})' if error else ''}")
+        self.cache.set(key, {"ok": ok, "latency_ms": latency_ms, "error": error, "checked_at": checked_at},
+                       upstream.interval)
+        return self.status(name)
+
+    def _is_down(self, upstream: UpstreamHealth) -> bool:
+        if upstream.consecutive_failures < self.failure_threshold or upstream.last_checked is None:
+            return False
+        # Un état trop ancien (thread de sonde arrêté) ne doit pas bloquer les appels
+        return time.time() - upstream.last_checked <= 3 * upstream.interval
+
+    def _status_label(self, upstream: UpstreamHealth) -> str:
+        if not upstream.results:
+            return STATUS_UNKNOWN
+        if self._is_down(upstream):
+            return STATUS_DOWN
+        errors = sum(1 for ok, _ in upstream.results if not ok)
+        if not upstream.results[-1][0] or errors / len(upstream.results) >= self.degraded_error_rate:
+            return STATUS_DEGRADED
+        return STATUS_UP
+
+    def is_down(self, name: str) -> bool:
+        """
+        L'amont est-il tombé d'après les dernières sondes ? (appelé avant chaque appel amont)
+
+        Returns:
+            bool: True si les clients doivent échouer immédiatement
+        """
+        upstream = self.upstreams.get(name)
+        if upstream is None or not self.enabled:
+            return False
+        down = self._is_down(upstream)
+        if down:
+            with self._lock:
+                self.fail_fast_count[name] += 1
+        return down
+
+    def last_ok(self, name: str) -> Optional[float]:
+        """Horodatage (epoch) de la dernière sonde réussie de l'amont (None si aucune)"""
+        upstream = self.upstreams.get(name)
+        return upstream.last_ok if upstream is not None else None
+
+    def status(self, name: str) -> Dict[str, Any]:
+        """État public d'un amont (aucun appel réseau)"""
+        upstream = self.upstreams.get(name)
+        if upstream is None:
+            return {"status": STATUS_UNKNOWN}
+        with self._lock:
+            results = list(upstream.results)
+            latencies = sorted(latency for ok, latency in results if ok)
+            now = time.time()
+            return {
+                "status": self._status_label(upstream) if self.enabled else STATUS_UNKNOWN,
+                "probes": len(results),
+                "error_rate": round(sum(1 for ok, _ in results if not ok) / len(results), 3) if results else None,
+                "latency_ms": upstream.last_latency_ms,
+                "latency_p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                "consecutive_failures": upstream.consecutive_failures,
+                "last_error": upstream.last_error,
+                "checked_ago_s": round(now - upstream.last_checked, 1) if upstream.last_checked else None,
+                "last_ok_ago_s": round(now - upstream.last_ok, 1) if upstream.last_ok else None,
+                "fail_fast": self.fail_fast_count.get(name, 0),
+            }
+
+    def get_status(self) -> Dict[str, Any]:
+        """État de tous les amonts (pour /health)"""
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "upstreams": {name: self.status(name) for name in list(self.upstreams)},
+        }
+
+
+def _check_tradier(timeout: float) -> bool:
+    """Horloge de marché Tradier: appel léger, compté dans le budget en priorité basse"""
+    from .tradier_config import TRADIER_API_KEY
+
+    url = "https://api.tradier.com/v1/markets/clock"
+    if not replay_transport.replaying:
+        tradier_rate_limiter.acquire(PRIORITY_BACKGROUND)
+    response = replay_transport.get("tradier", url, None, lambda: requests.get(
+        url, headers={"Authorization": f"Bearer {TRADIER_API_KEY}", "Accept": "application/json"},
+        timeout=timeout))
+    tradier_rate_limiter.update_from_headers(response.headers)
+    return response.status_code == 200 and "clock" in response.json()
+
+
+def _check_yahoo(timeout: float) -> bool:
+    """Dernière cotation du S&P 500 sur Yahoo Finance"""
+    url = "https://query1.finance.yahoo.com/v8/finance/chart/^GSPC"
+    params = {"range": "1d", "interval": "1d"}
+    response = replay_transport.get("yahoo", url, params, lambda: requests.get(
+        url, params=params, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}))
+    return response.status_code == 200 and bool(response.json().get("chart", {}).get("result"))
+
+
+def create_health_prober_from_env() -> HealthProber:
+    """
+    Crée la sonde selon l'environnement (amonts Tradier et Yahoo enregistrés)
+
+    Variables:
+        HEALTH_PROBE_INTERVAL: Période entre deux sondes en secondes (défaut: 30, 0 = désactivé)
+        HEALTH_PROBE_TIMEOUT: Timeout d'une sonde en secondes (défaut: 5)
+        HEALTH_PROBE_FAILURES: Échecs consécutifs avant de considérer l'amont tombé (défaut: 3)
+    """
+    timeout = float(os.getenv("HEALTH_PROBE_TIMEOUT", "5"))
+    prober = HealthProber(
+        interval=float(os.getenv("HEALTH_PROBE_INTERVAL", "30")),
+        failure_threshold=int(os.getenv("HEALTH_PROBE_FAILURES", "3")),
+    )
+    prober.register("tradier", lambda: _check_tradier(timeout))
+    prober.register("yahoo", lambda: _check_yahoo(timeout))
+    return prober
+
+
+# Instance globale partagée par les clients Tradier / Yahoo et les routes
+health_prober = create_health_prober_from_env()
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Construction incrémentale de l'historique de volatilité implicite à maturité constante (IV30, IV60...)
+
+Pour chaque date de marché, la volatilité ATM est calculée sur les deux expirations
+qui encadrent la maturité cible puis interpolée en variance totale. Chaque point
+calculé est ajouté immédiatement à un CSV par symbole: une exécution ne récupère
+que les dates manquantes et peut reprendre après une interruption. Une date sans
+chaîne exploitable est persistée en échec et retentée après un délai croissant.
+"""
+
+import os
+import csv
+import math
+import time
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+import numpy as np
+import pandas as pd
+
+from .tradier_api import TradierAPI, calculate_implied_volatility
+
+
+HISTORY_COLUMNS = [
+    "Date", "Symbol", "Status", "Target_Days", "Spot_Price",
+    "Near_Expiration", "Near_Days", "Near_IV",
+    "Far_Expiration", "Far_Days", "Far_IV",
+    "Valid_IV_Count", "IV", "Attempts", "Checked_At"
+]
+
+STATUS_OK = "ok"
+STATUS_NO_DATA = "no_data"  # Jour sans cotation (férié): inutile de le redemander
+STATUS_FAILED = "failed"  # Aucune chaîne exploitable: retentée après RETRY_BACKOFF_HOURS * 2^(tentatives - 1)
+
+RETRY_BACKOFF_HOURS = 6
+RETRY_BACKOFF_MAX_HOURS = 7 * 24
+
+
+def retry_due(row: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """
+    Indique si une date en échec peut être retentée
+
+    Args:
+        row (Dict): Ligne d'historique au statut STATUS_FAILED
+        now (datetime, optional): Instant de référence (défaut: maintenant)
+
+    Returns:
+        bool: True si le délai d'attente depuis la dernière tentative est écoulé
+    """
+    try:
+        attempts = max(int(row.get("Attempts") or 1), 1)
+        checked_at = datetime.fromisoformat(str(row.get("Checked_At")))
+    except (TypeError, ValueError):
+        return True
+    backoff = min(RETRY_BACKOFF_HOURS * 2 ** (attempts - 1), RETRY_BACKOFF_MAX_HOURS)
+    return (now or datetime.now()) >= checked_at + timedelta(hours=backoff)
+
+
+def _third_friday(year: int, month: int) -> datetime:
+    """Troisième vendredi du mois (expiration mensuelle standard)"""
+    first = datetime(year, month, 1)
+    offset = (4 - first.weekday()) % 7
+    return first + timedelta(days=offset + 14)
+
+
+def candidate_expirations(target: datetime) -> Tuple[List[str], List[str]]:
+    """
+    Génère les expirations candidates encadrant une date cible
+
+    Les hebdomadaires (vendredis) sont essayées avant les mensuelles afin de
+    rester au plus près de la maturité cible pour les sous-jacents qui en ont.
+
+    Args:
+        target (datetime): Date cible (date d'observation + maturité)
+
+    Returns:
+        Tuple[List[str], List[str]]: Candidates avant / après la cible, de la plus proche à la plus lointaine
+    """
+    days_since_friday = (target.weekday() - 4) % 7
+    prev_friday = target - timedelta(days=days_since_friday)
+    next_friday = prev_friday + timedelta(days=7) if days_since_friday else prev_friday
+
+    monthly_this = _third_friday(target.year, target.month)
+    prev_month = (target.replace(day=1) - timedelta(days=1))
+    next_month = (target.replace(day=28) + timedelta(days=7))
+    monthly_prev = _third_friday(prev_month.year, prev_month.month)
+    monthly_next = _third_friday(next_month.year, next_month.month)
+
+    before = [prev_friday, prev_friday - timedelta(days=7)]
+    after = [next_friday, next_friday + timedelta(days=7)]
+    if monthly_this <= target:
+        before.append(monthly_this)
+        after.append(monthly_next)
+    else:
+        before.append(monthly_prev)
+        after.append(monthly_this)
+
+    def _unique(dates):
+        seen = []
+        for d in dates:
+            s = d.strftime("%Y-%m-%d")
+            if s not in seen:
+                seen.append(s)
+        return seen
+
+    return _unique(before), _unique(after)
+
+
+def bracket_expirations(obs_date: str, target: datetime, listed: List[str],
+                        listed_from: Optional[str]) -> Tuple[List[str], List[str]]:
+    """
+    Expirations encadrant une date cible: expirations connues d'abord, vendredis supposés en complément
+
+    Tradier ne liste que les expirations non échues (à partir de listed_from): les échéances
+    antérieures, inconnues, sont devinées par candidate_expirations.
+
+    Args:
+        obs_date (str): Date d'observation au format YYYY-MM-DD
+        target (datetime): Date cible (date d'observation + maturité)
+        listed (List[str]): Expirations connues (listées par Tradier ou présentes dans le store local)
+        listed_from (str, optional): Première date couverte par la liste Tradier (None = liste indisponible)
+
+    Returns:
+        Tuple[List[str], List[str]]: Candidates avant / après la cible, de la plus proche à la plus lointaine
+    """
+    target_str = target.strftime("%Y-%m-%d")
+    guessed_before, guessed_after = candidate_expirations(target)
+    known = set(listed)
+
+    def _unknown(dates):
+        # Une date postérieure au début de la liste et absente de celle-ci n'existe pas
+        return [d for d in dates if d not in known and (listed_from is None or d < listed_from)]
+
+    before = sorted((d for d in known if obs_date < d <= target_str), reverse=True)[:3]
+    after = sorted(d for d in known if d > target_str)[:3]
+    before = sorted(before + _unknown(guessed_before), reverse=True)
+    after = sorted(after + _unknown(guessed_after))
+    return before, after
+
+
+def interpolate_total_variance(t_near: float, iv_near: float, t_far: float, iv_far: float, t_target: float) -> float:
+    """
+    Interpolation linéaire en variance totale (sigma² * T) entre deux maturités
+
+    Args:
+        t_near (float): Maturité proche en années
+        iv_near (float): Volatilité ATM de la maturité proche
+        t_far (float): Maturité lointaine en années
+        iv_far (float): Volatilité ATM de la maturité lointaine
+        t_target (float): Maturité cible en années
+
+    Returns:
+        float: Volatilité implicite à maturité constante
+    """
+    if t_far == t_near:
+        return iv_near
+    w_near = iv_near * iv_near * t_near
+    w_far = iv_far * iv_far * t_far
+    weight = (t_target - t_near) / (t_far - t_near)
+    w_target = w_near + weight * (w_far - w_near)
+    return math.sqrt(max(w_target, 0.0) / t_target)
+
+
+def atm_implied_volatility(options_df: pd.DataFrame, spot_price: float, time_to_exp: float,
+                           risk_free_rate: float = 0.05, moneyness_band: float = 0.15) -> Tuple[Optional[float], int]:
+    """
+    Volatilité implicite ATM d'une chaîne: IV des options OTM proches du spot, interpolée au strike du spot
+
+    Args:
+        options_df (pd.DataFrame): Chaîne issue de get_historical_options_data
+        spot_price (float): Prix spot à la date d'observation
+        time_to_exp (float): Temps jusqu'à l'expiration en années
+        risk_free_rate (float): Taux sans risque
+        moneyness_band (float): Demi-largeur de la bande de strikes autour du spot
+
+    Returns:
+        Tuple[Optional[float], int]: IV ATM (ou None) et nombre d'IV valides utilisées
+    """
+    if options_df is None or options_df.empty or time_to_exp <= 0:
+        return None, 0
+
+    band = options_df[
+        (options_df["Strike"] >= spot_price * (1 - moneyness_band)) &
+        (options_df["Strike"] <= spot_price * (1 + moneyness_band))
+    ]
+
+    points: Dict[float, List[float]] = {}
+    for row in band.itertuples(index=False):
+        option_type = str(row.Type).lower()
+        strike = float(row.Strike)
+        # Options hors de la monnaie uniquement: plus liquides, sans biais de dividende
+        if (option_type == "call" and strike < spot_price) or (option_type == "put" and strike > spot_price):
+            continue
+
+        # Le mid est préféré au dernier prix, souvent ancien sur les strikes peu traités
+        if pd.notna(row.Bid) and pd.notna(row.Ask) and row.Bid > 0 and row.Ask > 0:
+            price = (row.Bid + row.Ask) / 2
+        elif pd.notna(row.Last) and row.Last > 0:
+            price = row.Last
+        else:
+            continue
+
+        iv = calculate_implied_volatility(spot_price, strike, time_to_exp, price, option_type, risk_free_rate)
+        if iv and 0.01 < iv < 2.0:
+            points.setdefault(strike, []).append(iv)
+
+    if len(points) < 2:
+        return None, sum(len(v) for v in points.values())
+
+    strikes = np.array(sorted(points))
+    ivs = np.array([np.mean(points[k]) for k in strikes])
+    return float(np.interp(spot_price, strikes, ivs)), sum(len(v) for v in points.values())
+
+
+class IVHistoryBuilder:
+    """
+    Construit et persiste l'historique de volatilité implicite à maturité constante pour n'importe quel symbole
+    """
+
+    def __init__(self, api: TradierAPI, root_dir: str = "data_store", target_days: int = 30,
+                 max_workers: int = 5, risk_free_rate: float = 0.05):
+        """
+        Initialise le constructeur d'historique
+
+        Args:
+            api (TradierAPI): Client Tradier (idéalement avec un chain_store)
+            root_dir (str): Dossier racine de persistance
+            target_days (int): Maturité cible en jours calendaires
+            max_workers (int): Nombre de dates traitées en parallèle
+            risk_free_rate (float): Taux sans risque utilisé pour l'inversion Black-Scholes
+        """
+        self.api = api
+        self.target_days = target_days
+        self.max_workers = max_workers
+        self.risk_free_rate = risk_free_rate
+        self.history_dir = os.path.join(root_dir, "iv_history")
+        self._file_lock = threading.Lock()
+        self._checked_headers = set()
+
+    def history_path(self, symbol: str) -> str:
+        """Chemin du CSV d'historique pour un symbole"""
+        return os.path.join(self.history_dir, f"{symbol.upper()}_iv{self.target_days}.csv")
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+    def load_history(self, symbol: str) -> pd.DataFrame:
+        """
+        Charge l'historique persisté d'un symbole (toutes lignes, y compris jours sans données)
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+
+        Returns:
+            pd.DataFrame: Historique (vide si aucun point calculé)
+        """
+        path = self.history_path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        df = pd.read_csv(path, dtype={"Date": str, "Status": str}).reindex(columns=HISTORY_COLUMNS)
+        # Une date recalculée remplace la précédente
+        return df.drop_duplicates(subset="Date", keep="last").sort_values("Date").reset_index(drop=True)
+
+    def _append_row(self, symbol: str, row: Dict[str, Any]) -> None:
+        """Ajoute un point au CSV dès qu'il est calculé (reprise possible après interruption)"""
+        path = self.history_path(symbol)
+        with self._file_lock:
+            os.makedirs(self.history_dir, exist_ok=True)
+            write_header = not os.path.exists(path)
+            if not write_header and path not in self._checked_headers:
+                self._migrate_header(path)
+            self._checked_headers.add(path)
+            with open(path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HISTORY_COLUMNS)
+                if write_header:
+                    writer.writeheader()
+                writer.writerow({col: row.get(col) for col in HISTORY_COLUMNS})
+                f.flush()
+
+    @staticmethod
+    def _migrate_header(path: str) -> None:
+        """Réécrit un CSV créé avec une version antérieure de HISTORY_COLUMNS"""
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header == HISTORY_COLUMNS:
+            return
+        df = pd.read_csv(path, dtype=str).reindex(columns=HISTORY_COLUMNS)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Données de marché
+    # ------------------------------------------------------------------
+    def _known_expirations(self, symbol: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Expirations connues d'un symbole: listées par Tradier (non échues) et présentes dans le store local
+
+        Returns:
+            Tuple[List[str], Optional[str]]: Expirations et première date couverte par la liste Tradier
+        """
+        listed, listed_from = set(), None
+        data = self.api.get_option_expirations(symbol)
+        dates = ((data or {}).get("expirations") or {}).get("date") if isinstance(data, dict) else None
+        if dates:
+            listed.update([dates] if isinstance(dates, str) else dates)
+            listed_from = datetime.now().strftime("%Y-%m-%d")
+        store = getattr(self.api, "chain_store", None)
+        if store is not None:
+            listed.update(entry["expiration"] for entry in store.list_snapshots(symbol))
+        return sorted(listed), listed_from
+
+    def _spot_history(self, symbol: str, start: str, end: str) -> Dict[str, float]:
+        """Clôtures journalières sur toute la période en un seul appel"""
+        data = self.api.get_price_history(symbol, start, end)
+        closes = {}
+        if not data or not data.get("history"):
+            return closes
+        days = data["history"].get("day") or []
+        if isinstance(days, dict):
+            days = [days]
+        for day in days:
+            try:
+                closes[day["date"]] = float(day["close"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return closes
+
+    def _fetch_side(self, symbol: str, date_str: str, candidates: List[str],
+                    spot_price: float) -> Optional[Dict[str, Any]]:
+        """Première expiration candidate dont la chaîne fournit une IV ATM exploitable"""
+        obs_date = datetime.strptime(date_str, "%Y-%m-%d")
+        for expiration in candidates:
+            exp_date = datetime.strptime(expiration, "%Y-%m-%d")
+            days = (exp_date - obs_date).days
+            if days <= 0:
+                continue
+            chain = self.api.get_historical_options_data(symbol, expiration, date_str)
+            time_to_exp = days / 365.25
+            iv, count = atm_implied_volatility(chain, spot_price, time_to_exp, self.risk_free_rate)
+            if iv is not None:
+                return {"expiration": expiration, "days": days, "t": time_to_exp, "iv": iv, "count": count}
+        return None
+
+    def compute_point(self, symbol: str, date_str: str, spot_price: float,
+                      known: Optional[Tuple[List[str], Optional[str]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Calcule l'IV à maturité constante pour une date
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            date_str (str): Date d'observation au format YYYY-MM-DD
+            spot_price (float): Clôture du sous-jacent à cette date
+            known (Tuple, optional): Résultat de _known_expirations (défaut: vendredis supposés uniquement)
+
+        Returns:
+            Dict: Ligne d'historique ou None si aucune chaîne exploitable
+        """
+        obs_date = datetime.strptime(date_str, "%Y-%m-%d")
+        target = obs_date + timedelta(days=self.target_days)
+        listed, listed_from = known or ([], None)
+        before, after = bracket_expirations(date_str, target, listed, listed_from)
+
+        near = self._fetch_side(symbol, date_str, before, spot_price)
+        far = self._fetch_side(symbol, date_str, after, spot_price)
+        if near is None and far is None:
+            return None
+
+        t_target = self.target_days / 365.25
+        if near is not None and far is not None:
+            iv = interpolate_total_variance(near["t"], near["iv"], far["t"], far["iv"], t_target)
+        else:
+            # Une seule maturité disponible: volatilité supposée plate en maturité
+            iv = (near or far)["iv"]
+
+        return {
+            "Date": date_str,
+            "Symbol": symbol.upper(),
+            "Status": STATUS_OK,
+            "Target_Days": self.target_days,
+            "Spot_Price": spot_price,
+            "Near_Expiration": near["expiration"] if near else None,
+            "Near_Days": near["days"] if near else None,
+            "Near_IV": near["iv"] if near else None,
+            "Far_Expiration": far["expiration"] if far else None,
+            "Far_Days": far["days"] if far else None,
+            "Far_IV": far["iv"] if far else None,
+            "Valid_IV_Count": (near["count"] if near else 0) + (far["count"] if far else 0),
+            "IV": iv,
+            "Checked_At": datetime.now().isoformat(timespec="seconds")
+        }
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+    def missing_dates(self, symbol: str, days_back: int, end_date: Optional[datetime] = None) -> List[str]:
+        """
+        Dates ouvrées de la fenêtre absentes de l'historique persisté, ou en échec et à retenter
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            days_back (int): Profondeur de la fenêtre en jours calendaires
+            end_date (datetime, optional): Dernière date incluse (défaut: J-1)
+
+        Returns:
+            List[str]: Dates YYYY-MM-DD à calculer, de la plus récente à la plus ancienne
+        """
+        end_date = end_date or (datetime.now() - timedelta(days=1))
+        history = self.load_history(symbol)
+        now = datetime.now()
+        done = {str(row["Date"]) for row in history.to_dict("records")
+                if row["Status"] != STATUS_FAILED or not retry_due(row, now)}
+        dates = []
+        for i in range(days_back):
+            date = end_date - timedelta(days=i)
+            if date.weekday() < 5:
+                date_str = date.strftime("%Y-%m-%d")
+                if date_str not in done:
+                    dates.append(date_str)
+        return dates
+
+    def build(self, symbol: str, days_back: int = 365, end_date: Optional[datetime] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> Optional[pd.DataFrame]:
+        """
+        Complète l'historique d'un symbole puis le retourne sur la fenêtre demandée
+
+        Args:
+            symbol (str): Symbole du sous-jacent
+            days_back (int): Profondeur de la fenêtre en jours calendaires
+            end_date (datetime, optional): Dernière date incluse (défaut: J-1)
+            progress (Callable, optional): Appelée avec (dates traitées, dates manquantes)
+
+        Returns:
+            pd.DataFrame: Points calculés (statut "ok") triés par date ou None si aucun
+        """
+        symbol = symbol.upper()
+        end_date = end_date or (datetime.now() - timedelta(days=1))
+        start_date = end_date - timedelta(days=days_back - 1)
+        dates = self.missing_dates(symbol, days_back, end_date)
+
+        print(f"📈 Historique IV{self.target_days} {symbol}: {len(dates)} date(s) manquante(s) sur {days_back} jours")
+
+        if dates:
+            spots = self._spot_history(symbol, min(dates), max(dates))
+            if not spots:
+                print(f"❌ Impossible de récupérer l'historique de prix de {symbol}")
+            else:
+                self._backfill(symbol, dates, spots, progress)
+
+        history = self.load_history(symbol)
+        history = history[
+            (history["Status"] == STATUS_OK) &
+            (history["Date"] >= start_date.strftime("%Y-%m-%d")) &
+            (history["Date"] <= end_date.strftime("%Y-%m-%d"))
+        ]
+        if history.empty:
+            return None
+        return history.reset_index(drop=True)
+
+    def _backfill(self, symbol: str, dates: List[str], spots: Dict[str, float],
+                  progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """Calcule les dates manquantes en parallèle et persiste chaque point dès qu'il est prêt"""
+        start_time = time.time()
+        computed = 0
+        finished = 0
+        last_quoted = max(spots)
+        known = self._known_expirations(symbol)
+        history = self.load_history(symbol)
+        failed = history[history["Status"] == STATUS_FAILED]
+        attempts = dict(zip(failed["Date"].astype(str), pd.to_numeric(failed["Attempts"], errors="coerce").fillna(1)))
+
+        def process(date_str):
+            spot_price = spots.get(date_str)
+            if not spot_price and date_str > last_quoted:
+                # Barre pas encore publiée: ne rien persister, la date sera retentée
+                return None
+            if not spot_price:
+                # Pas de barre journalière: jour férié, inutile de le redemander
+                return {"Date": date_str, "Symbol": symbol, "Status": STATUS_NO_DATA,
+                        "Target_Days": self.target_days}
+            return self.compute_point(symbol, date_str, spot_price, known)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(process, d): d for d in dates}
+            try:
+                for future in as_completed(futures):
+                    date_str = futures[future]
+                    finished += 1
+                    if progress:
+                        progress(finished, len(dates))
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        print(f"   ❌ {symbol} {date_str}: {e}")
+                        continue
+                    if row is None:
+                        # Échec persisté: la date ne sera retentée qu'après le délai d'attente
+                        count = int(attempts.get(date_str, 0)) + 1
+                        print(f"   ⚠️  {symbol} {date_str}: aucune chaîne exploitable (tentative {count})")
+                        self._append_row(symbol, {"Date": date_str, "Symbol": symbol, "Status": STATUS_FAILED,
+                                                  "Target_Days": self.target_days, "Attempts": count,
+                                                  "Checked_At": datetime.now().isoformat(timespec="seconds")})
+                        continue
+                    self._append_row(symbol, row)
+                    computed += 1
+            except BaseException:
+                # Interruption (annulation d'une tâche de fond): les dates pas encore lancées sont abandonnées
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        print(f"   ⏱️  {computed}/{len(dates)} point(s) {symbol} persistés en {time.time() - start_time:.1f}s")
+
+    def build_many(self, symbols: List[str], days_back: int = 365) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Complète l'historique de plusieurs symboles
+
+        Args:
+            symbols (List[str]): Symboles à traiter
+            days_back (int): Profondeur de la fenêtre en jours calendaires
+
+        Returns:
+            Dict[str, pd.DataFrame]: Historique par symbole
+        """
+        return {symbol.upper(): self.build(symbol, days_back) for symbol in symbols}
+
+
+def create_iv_history_builder(target_days: int = 30, max_workers: int = 5) -> IVHistoryBuilder:
+    """
+    Crée un constructeur d'historique branché sur la configuration Tradier et le store local
+
+    Args:
+        target_days (int): Maturité cible en jours calendaires
+        max_workers (int): Nombre de dates traitées en parallèle
+
+    Returns:
+        IVHistoryBuilder: Constructeur prêt à l'emploi
+    """
+    from .tradier_config import TRADIER_API_KEY
+    from .chain_store import create_chain_store_from_env
+    from .rate_limiter import PRIORITY_BACKGROUND
+
+    chain_store = create_chain_store_from_env()
+    # Backfill: priorité basse pour ne jamais retarder les requêtes interactives
+    api = TradierAPI(TRADIER_API_KEY, chain_store=chain_store, priority=PRIORITY_BACKGROUND)
+    return IVHistoryBuilder(
+        api,
+        root_dir=os.getenv("CHAIN_STORE_DIR", "data_store"),
+        target_days=target_days,
+        max_workers=max_workers
+    )
+
+
+def main():
+    """Backfill en ligne de commande: python -m api.iv_history AAPL MSFT --days 365"""
+    parser = argparse.ArgumentParser(description="Historique de volatilité implicite à maturité constante")
+    parser.add_argument("symbols", nargs="+", help="Symboles à traiter")
+    parser.add_argument("--days", type=int, default=365, help="Profondeur en jours calendaires")
+    parser.add_argument("--target", type=int, default=30, help="Maturité cible en jours")
+    parser.add_argument("--workers", type=int, default=5, help="Dates traitées en parallèle")
+    args = parser.parse_args()
+
+    builder = create_iv_history_builder(target_days=args.target, max_workers=args.workers)
+    results = builder.build_many(args.symbols, args.days)
+    for symbol, df in results.items():
+        if df is None:
+            print(f"❌ {symbol}: aucun point")
+        else:
+            print(f"✅ {symbol}: {len(df)} points, IV{args.target} moyenne {df['IV'].mean():.4f}")
+
+
+if __name__ == "__main__":
+    main()
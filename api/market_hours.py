@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Séances de cotation par classe d'instrument et durées de vie adaptées
+
+Une cotation ne change pas quand son marché est fermé: hors séance, les données en cache restent
+valides jusqu'à la réouverture (bornée par MARKET_CLOSED_TTL_MAX) et le préchauffage comme le
+rafraîchissement des pages s'espacent d'autant. La charge amont hors séance se limite ainsi
+aux marchés ouverts (crypto 24/7, forex 24/5).
+
+Séances (heure locale de la place, fuseaux IANA via zoneinfo, jours fériés non gérés):
+- us: actions et options américaines (NYSE / Nasdaq / Cboe), 9h30-16h00 New York
+- london, xetra, euronext, six: places européennes (^FTSE, ^GDAXI, ^STOXX50E, ^FCHI, .PA, .DE, ...)
+- tokyo, hong_kong, korea: places asiatiques (^N225, ^HSI, .T, .HK, .KS)
+- forex: 24/5, du dimanche 17h00 au vendredi 17h00 New York
+- futures: CME (=F), du dimanche 18h00 au vendredi 17h00 New York
+- crypto: 24/7
+"""
+
+import os
+from datetime import datetime, timedelta, time as dtime
+from typing import Dict, Iterable, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+
+class MarketSession(NamedTuple):
+    """
+    Séance d'une place: quotidienne (open / close, jours ouvrés) ou hebdomadaire (week_open / week_close)
+    """
+    name: str
+    timezone: str
+    open: Optional[dtime] = None
+    close: Optional[dtime] = None
+    # Fenêtre hebdomadaire continue: (jour, heure) d'ouverture et de fermeture (lundi = 0)
+    week_open: Optional[tuple] = None
+    week_close: Optional[tuple] = None
+    always_open: bool = False
+
+
+SESSIONS = {
+    "us": MarketSession("us", "America/New_York", dtime(9, 30), dtime(16, 0)),
+    "london": MarketSession("london", "Europe/London", dtime(8, 0), dtime(16, 30)),
+    "xetra": MarketSession("xetra", "Europe/Berlin", dtime(9, 0), dtime(17, 30)),
+    "euronext": MarketSession("euronext", "Europe/Paris", dtime(9, 0), dtime(17, 30)),
+    "six": MarketSession("six", "Europe/Zurich", dtime(9, 0), dtime(17, 30)),
+    "tokyo": MarketSession("tokyo", "Asia/Tokyo", dtime(9, 0), dtime(15, 30)),
+    "hong_kong": MarketSession("hong_kong", "Asia/Hong_Kong", dtime(9, 30), dtime(16, 0)),
+    "korea": MarketSession("korea", "Asia/Seoul", dtime(9, 0), dtime(15, 30)),
+    "forex": MarketSession("forex", "America/New_York", week_open=(6, dtime(17, 0)), week_close=(4, dtime(17, 0))),
+    "futures": MarketSession("futures", "America/New_York", week_open=(6, dtime(18, 0)), week_close=(4, dtime(17, 0))),
+    "crypto": MarketSession("crypto", "UTC", always_open=True),
+}
+
+# Indices Yahoo hors séance américaine (YahooFinanceAPI.indices)
+INDEX_SESSIONS = {
+    "^FCHI": "euronext",
+    "^GDAXI": "xetra",
+    "^STOXX50E": "xetra",
+    "^FTSE": "london",
+    "^N225": "tokyo",
+    "^HSI": "hong_kong",
+    "^KS11": "korea",
+}
+
+# Suffixes de place Yahoo
+SUFFIX_SESSIONS = {
+    ".PA": "euronext",
+    ".AS": "euronext",
+    ".BR": "euronext",
+    ".DE": "xetra",
+    ".F": "xetra",
+    ".SW": "six",
+    ".L": "london",
+    ".T": "tokyo",
+    ".HK": "hong_kong",
+    ".KS": "korea",
+}
+
+
+def session_name(symbol: str) -> str:
+    """
+    Séance d'un symbole Yahoo / Tradier
+
+    Exemples: "AAPL" → us, "^N225" → tokyo, "SAP.DE" → xetra, "EURUSD=X" → forex, "BTC-USD" → crypto
+    """
+    symbol = symbol.upper()
+    if symbol in INDEX_SESSIONS:
+        return INDEX_SESSIONS[symbol]
+    if symbol.endswith("=X"):
+        return "forex"
+    if symbol.endswith("=F"):
+        return "futures"
+    if symbol.endswith("-USD") or symbol.endswith("-EUR"):
+        return "crypto"
+    for suffix, name in SUFFIX_SESSIONS.items():
+        if symbol.endswith(suffix):
+            return name
+    # Actions, ETF et indices américains (^GSPC, ^VIX, ^TNX, ...), sous-jacents Tradier
+    return "us"
+
+
+class MarketCalendar:
+    """
+    Ouverture des séances et durées de vie / intervalles de rafraîchissement qui en découlent
+    """
+
+    def __init__(self, sessions: Dict[str, MarketSession] = SESSIONS, closed_ttl_max: float = 6 * 3600,
+                 settle: float = 15 * 60, enabled: bool = True):
+        """
+        Initialise le calendrier
+
+        Args:
+            sessions (Dict[str, MarketSession]): Séances par nom
+            closed_ttl_max (float): Durée de vie maximale hors séance (secondes)
+            settle (float): Délai après la clôture pendant lequel la séance est tenue pour ouverte
+                (fixing de clôture, dernières cotations publiées avec retard)
+            enabled (bool): False = séances ignorées (toujours ouvertes)
+        """
+        self.sessions = sessions
+        self.closed_ttl_max = closed_ttl_max
+        self.settle = settle
+        self.enabled = enabled
+        self._zones = {name: ZoneInfo(session.timezone) for name, session in sessions.items()}
+
+    def _session(self, symbol: Optional[str], session: Optional[str]) -> MarketSession:
+        return self.sessions[session or session_name(symbol or "")]
+
+    def seconds_until_open(self, symbol: Optional[str] = None, session: Optional[str] = None,
+                           now: Optional[datetime] = None) -> float:
+        """
+        Temps avant la prochaine ouverture de la séance du symbole (0 si elle est ouverte)
+
+        Args:
+            symbol (str, optional): Symbole (séance déduite par session_name)
+            session (str, optional): Nom de séance (prioritaire sur le symbole)
+            now (datetime, optional): Instant de référence avec fuseau (défaut: maintenant)
+        """
+        market = self._session(symbol, session)
+        if not self.enabled or market.always_open:
+            return 0.0
+        local = (now or datetime.now(tz=self._zones[market.name])).astimezone(self._zones[market.name])
+
+        if market.week_open is not None:
+            open_day, open_time = market.week_open
+            close_day, close_time = market.week_close
+            # Position dans la semaine en secondes depuis lundi 0h00
+            position = local.weekday() * 86400 + local.hour * 3600 + local.minute * 60 + local.second
+            opens = open_day * 86400 + open_time.hour * 3600 + open_time.minute * 60
+            closes = close_day * 86400 + close_time.hour * 3600 + close_time.minute * 60 + self.settle
+            week = 7 * 86400
+            if (position - opens) % week < (closes - opens) % week:
+                return 0.0
+            return float((opens - position) % week)
+
+        opens = datetime.combine(local.date(), market.open, tzinfo=local.tzinfo)
+        closes = datetime.combine(local.date(), market.close, tzinfo=local.tzinfo) + timedelta(seconds=self.settle)
+        if local.weekday() < 5 and opens <= local < closes:
+            return 0.0
+        for days in range(0, 8):
+            candidate = datetime.combine(local.date() + timedelta(days=days), market.open, tzinfo=local.tzinfo)
+            if candidate > local and candidate.weekday() < 5:
+                return (candidate - local).total_seconds()
+        return 0.0
+
+    def is_open(self, symbol: Optional[str] = None, session: Optional[str] = None,
+                now: Optional[datetime] = None) -> bool:
+        """La séance du symbole (ou la séance nommée) est-elle ouverte ?"""
+        return self.seconds_until_open(symbol, session, now) == 0.0
+
+    def cache_ttl(self, base: float, symbol: Optional[str] = None, session: Optional[str] = None) -> float:
+        """
+        Durée de vie en cache d'une donnée de marché
+
+        Args:
+            base (float): Durée de vie en séance (CACHE_TTLS)
+            symbol (str, optional): Symbole concerné
+            session (str, optional): Nom de séance (prioritaire sur le symbole)
+
+        Returns:
+            float: base en séance, sinon jusqu'à la réouverture (au plus closed_ttl_max)
+        """
+        wait = self.seconds_until_open(symbol, session)
+        return base if wait == 0.0 else max(base, min(wait, self.closed_ttl_max))
+
+    def refresh_interval(self, base: float, symbols: Iterable[str] = (), sessions: Iterable[str] = ()) -> float:
+        """
+        Intervalle de rafraîchissement d'un ensemble d'instruments (page, requête préchauffée)
+
+        Returns:
+            float: base si une des séances est ouverte, sinon jusqu'à la première réouverture
+        """
+        names = {session_name(symbol) for symbol in symbols} | set(sessions)
+        if not names:
+            return base
+        wait = min(self.seconds_until_open(session=name) for name in names)
+        return base if wait == 0.0 else max(base, min(wait, self.closed_ttl_max))
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Ouverture de chaque séance (pour /health)"""
+        status = {}
+        for name in self.sessions:
+            wait = self.seconds_until_open(session=name)
+            status[name] = {"open": wait == 0.0, "opens_in_s": round(wait) if wait else 0}
+        return status
+
+
+def create_market_calendar_from_env() -> MarketCalendar:
+    """
+    Crée le calendrier selon l'environnement
+
+    Variables:
+        MARKET_HOURS_ENABLED: Durées de vie adaptées aux séances (défaut: true)
+        MARKET_CLOSED_TTL_MAX: Durée de vie maximale hors séance en secondes (défaut: 21600)
+        MARKET_SETTLE_MINUTES: Minutes après la clôture encore traitées comme en séance (défaut: 15)
+    """
+    return MarketCalendar(
+        closed_ttl_max=float(os.getenv("MARKET_CLOSED_TTL_MAX", str(6 * 3600))),
+        settle=float(os.getenv("MARKET_SETTLE_MINUTES", "15")) * 60,
+        enabled=os.getenv("MARKET_HOURS_ENABLED", "true").lower() == "true",
+    )
+
+
+# Instance globale partagée par les caches, le préchauffage et les routes
+market_calendar = create_market_calendar_from_env()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Ordonnanceur des appels Tradier: token bucket partagé piloté par les headers de rate limit
+
+Tous les appelants (requêtes synchrones, coroutines aiohttp, pools de threads) puisent
+dans le même budget. Les requêtes interactives (pages, API Flask) ont une réserve de
+jetons que les traitements de fond (backfills, historiques) ne peuvent pas consommer.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional, Mapping
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Priorité du contexte courant (thread ou tâche asyncio)
+_current_priority = contextvars.ContextVar("tradier_request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Fixe la priorité des appels Tradier effectués dans le bloc
+
+    Args:
+        priority (int): PRIORITY_INTERACTIVE ou PRIORITY_BACKGROUND
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    """Priorité du contexte courant"""
+    return _current_priority.get()
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe recalé sur les headers X-Ratelimit-* de Tradier
+    """
+
+    def __init__(self, calls_per_minute: int = 120, burst: Optional[int] = None,
+                 interactive_reserve: float = 0.2, shares: int = 1):
+        """
+        Initialise le limiteur
+
+        Args:
+            calls_per_minute (int): Budget d'appels par minute de ce seau
+            burst (int, optional): Taille maximale du seau (défaut: 1/6 du budget minute)
+            interactive_reserve (float): Part du seau réservée aux requêtes interactives
+            shares (int): Nombre de seaux (workers) se partageant le budget du compte annoncé par Tradier
+        """
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(burst or max(2, calls_per_minute // 6))
+        self.interactive_reserve = interactive_reserve
+        self.shares = max(int(shares), 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._waiting_interactive = 0
+        self._condition = threading.Condition()
+
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "header_updates": 0}
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def _reserve_for(self, priority: int) -> float:
+        """Jetons que l'appelant doit laisser dans le seau"""
+        if priority == PRIORITY_INTERACTIVE:
+            return 0.0
+        reserve = self.capacity * self.interactive_reserve
+        # Un appel interactif en attente passe avant tout traitement de fond
+        if self._waiting_interactive:
+            reserve = self.capacity
+        return reserve
+
+    def _try_acquire(self, priority: int) -> float:
+        """
+        Tente de prendre un jeton (à appeler sous verrou)
+
+        Returns:
+            float: 0 si le jeton est obtenu, sinon le délai avant la prochaine tentative
+        """
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self._refill(now)
+        needed = 1.0 + self._reserve_for(priority)
+        if self.tokens >= needed:
+            self.tokens -= 1.0
+            self.stats["acquired"] += 1
+            return 0.0
+        return max((needed - self.tokens) / self.rate, 0.001)
+
+    def acquire(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Attend un jeton (appelants synchrones et threads)
+
+        Args:
+            priority (int, optional): Priorité de l'appel (défaut: priorité du contexte)
+            timeout (float, optional): Attente maximale en secondes
+
+        Returns:
+            bool: True si le jeton est obtenu, False si le délai est dépassé
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = None if timeout is None else time.monotonic() + timeout
+        started = time.monotonic()
+
+        with self._condition:
+            if priority == PRIORITY_INTERACTIVE:
+                self._waiting_interactive += 1
+            try:
+                while True:
+                    wait = self._try_acquire(priority)
+                    if wait == 0.0:
+                        self.stats["waited_seconds"] += time.monotonic() - started
+                        return True
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                if priority == PRIORITY_INTERACTIVE:
+                    self._waiting_interactive -= 1
+                    self._condition.notify_all()
+
+    async def acquire_async(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Attend un jeton sans bloquer la boucle asyncio
+
+        Args:
+            priority (int, optional): Priorité de l'appel (défaut: priorité du contexte)
+            timeout (float, optional): Attente maximale en secondes
+
+        Returns:
+            bool: True si le jeton est obtenu, False si le délai est dépassé
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = None if timeout is None else time.monotonic() + timeout
+        started = time.monotonic()
+        while True:
+            with self._condition:
+                wait = self._try_acquire(priority)
+                if wait == 0.0:
+                    self.stats["waited_seconds"] += time.monotonic() - started
+                    return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Recale le seau sur le budget annoncé par Tradier
+
+        Headers lus: X-Ratelimit-Allowed, X-Ratelimit-Available, X-Ratelimit-Expiry (epoch en ms)
+
+        Args:
+            headers (Mapping): Headers de la réponse HTTP
+        """
+        try:
+            available = headers.get("X-Ratelimit-Available")
+            allowed = headers.get("X-Ratelimit-Allowed")
+            expiry = headers.get("X-Ratelimit-Expiry")
+            if available is None or expiry is None:
+                return
+            available = int(available)
+            seconds_to_reset = max(int(expiry) / 1000.0 - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return
+
+        with self._condition:
+            self.stats["header_updates"] += 1
+            now = time.monotonic()
+            self._refill(now)
+            if allowed is not None:
+                try:
+                    allowed = int(allowed)
+                    if allowed > 0:
+                        # Tradier annonce le budget du compte par fenêtre d'une minute: part de ce worker
+                        allowed = max(allowed // self.shares, 1)
+                        self.rate = allowed / 60.0
+                        self.capacity = float(max(2, allowed // 6))
+                except ValueError:
+                    pass
+
+            if available <= 0:
+                self.tokens = 0.0
+                self.blocked_until = max(self.blocked_until, now + seconds_to_reset)
+            else:
+                # Ne jamais dépasser ce que le serveur accorde encore sur la fenêtre
+                self.tokens = min(self.tokens, float(available))
+            self._condition.notify_all()
+
+    def on_throttled(self, headers: Optional[Mapping[str, str]] = None, default_delay: float = 1.0) -> None:
+        """
+        Suspend les appels après une réponse 429
+
+        Args:
+            headers (Mapping, optional): Headers de la réponse 429
+            default_delay (float): Pause si aucun header n'indique la fin de fenêtre
+        """
+        delay = default_delay
+        if headers:
+            try:
+                if headers.get("Retry-After"):
+                    delay = float(headers["Retry-After"])
+                elif headers.get("X-Ratelimit-Expiry"):
+                    delay = max(int(headers["X-Ratelimit-Expiry"]) / 1000.0 - time.time(), default_delay)
+            except (TypeError, ValueError):
+                pass
+
+        with self._condition:
+            self.stats["throttled"] += 1
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self._condition.notify_all()
+
+    def get_status(self) -> dict:
+        """Etat courant du limiteur (pour /api/tradier/status)"""
+        with self._condition:
+            self._refill(time.monotonic())
+            return {
+                "calls_per_minute": round(self.rate * 60),
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "blocked_for": round(max(self.blocked_until - time.monotonic(), 0.0), 2),
+                **self.stats
+            }
+
+
+def _create_tradier_rate_limiter() -> RateLimiter:
+    from .tradier_config import API_RATE_LIMIT
+    # Chaque worker gunicorn a son seau: le budget du compte est réparti entre eux
+    workers = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+    return RateLimiter(calls_per_minute=max(API_RATE_LIMIT // workers, 1), shares=workers)
+
+
+# Instance globale partagée par tous les clients Tradier du processus
+tradier_rate_limiter = _create_tradier_rate_limiter()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Enregistrement / rejeu des réponses Tradier et Yahoo Finance
+
+Modes (REPLAY_MODE):
+- off (défaut): appels réels, aucun surcoût
+- record: appels réels, chaque réponse est écrite sur disque (une réponse par requête distincte)
+- replay: aucune requête réseau, les réponses enregistrées sont servies avec une latence simulée
+
+Un snapshot de marché enregistré permet ainsi de faire tourner toute l'application hors ligne
+(tests de charge, benchmarks) sans consommer le budget Tradier, avec des temps de réponse réalistes.
+
+Arborescence:
+    <REPLAY_DIR>/manifest.json                        date d'enregistrement du snapshot
+    <REPLAY_DIR>/<service>/<endpoint>/<params>.json   statut, type, latence mesurée, corps
+
+Les dates (AAAA-MM-JJ) peuvent être décalées au rejeu (REPLAY_SHIFT_DATES) pour que les
+expirations enregistrées restent dans le futur: un snapshot garde les mêmes maturités quel que soit
+le jour du rejeu.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import contextlib
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+REPLAY_MODES = ("off", "record", "replay")
+
+_DATE_PATTERN = re.compile(rb"\b(\d{4})-(\d{2})-(\d{2})\b")
+_DATE_PARAM = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_UNSAFE = re.compile(r"[^A-Za-z0-9=&._-]+")
+
+
+def _shift_date(value: str, days: int) -> str:
+    try:
+        return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+    except ValueError:
+        return value
+
+
+class RecordedResponse:
+    """
+    Réponse enregistrée, compatible avec l'usage fait des réponses requests
+    (status_code, headers, json(), text, raise_for_status())
+    """
+
+    def __init__(self, status: int, body: bytes, headers: Optional[Dict] = None, url: str = ""):
+        self.status_code = status
+        self.status = status
+        self.content = body
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} (réponse enregistrée) pour {self.url}", response=self)
+
+
+class AsyncRecordedResponse(RecordedResponse):
+    """Variante aiohttp (status, await json() / text() / read())"""
+
+    async def json(self) -> Any:
+        return json.loads(self.content)
+
+    async def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    async def read(self) -> bytes:
+        return self.content
+
+
+class ReplayTransport:
+    """
+    Transport d'enregistrement / rejeu des appels HTTP amont
+    """
+
+    def __init__(self, mode: str = "off", directory: str = "fixtures/replay", latency: str = "recorded",
+                 latency_scale: float = 1.0, jitter: float = 0.0, shift_dates: bool = True):
+        """
+        Initialise le transport
+
+        Args:
+            mode (str): "off", "record" ou "replay"
+            directory (str): Dossier des réponses enregistrées
+            latency (str): "recorded" (latence mesurée à l'enregistrement) ou durée fixe en millisecondes
+            latency_scale (float): Facteur appliqué à la latence simulée (0 = aucune attente)
+            jitter (float): Variation aléatoire relative de la latence (0.2 = ±20%)
+            shift_dates (bool): Décaler les dates au rejeu pour conserver les maturités enregistrées
+        """
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"REPLAY_MODE invalide: {mode} (attendu: {', '.join(REPLAY_MODES)})")
+        self.mode = mode
+        self.directory = directory
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.jitter = jitter
+        self.shift_dates = shift_dates
+        self._entries: Dict[str, Optional[Dict]] = {}
+        self._lock = threading.Lock()
+        self._missing_reported = set()
+        self._shift_days: Optional[int] = None
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # ------------------------------------------------------------------
+    # Clés et fichiers
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, service: str, url: str, params: Optional[Dict]) -> str:
+        endpoint = urlsplit(url).path.strip("/").replace("/", "_") or "root"
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params)) if params else "_"
+        name = _UNSAFE.sub("_", query)
+        if len(name) > 120:
+            name = name[:80] + "-" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, service, _UNSAFE.sub("_", endpoint), name + ".json")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def _date_shift(self) -> int:
+        """Jours écoulés depuis l'enregistrement du snapshot (0 si le décalage est désactivé)"""
+        if self._shift_days is None:
+            days = 0
+            if self.shift_dates:
+                try:
+                    with open(self._manifest_path(), encoding="utf-8") as f:
+                        recorded_on = date.fromisoformat(json.load(f)["recorded_on"])
+                    days = (date.today() - recorded_on).days
+                except (OSError, ValueError, KeyError):
+                    days = 0
+            self._shift_days = days
+        return self._shift_days
+
+    def _write(self, path: str, entry: Dict) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        if not os.path.exists(self._manifest_path()):
+            with contextlib.suppress(OSError):
+                with open(self._manifest_path(), "w", encoding="utf-8") as f:
+                    json.dump({"recorded_on": date.today().isoformat()}, f)
+
+    def _record(self, service: str, url: str, params: Optional[Dict], status: int,
+                content_type: str, body: bytes, elapsed: float) -> None:
+        entry = {
+            "service": service,
+            "url": urlsplit(url).path,
+            "params": params or {},
+            "status": status,
+            "content_type": content_type,
+            "elapsed_ms": round(elapsed * 1000.0, 1),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "body": body.decode("utf-8", errors="replace"),
+        }
+        try:
+            self._write(self._entry_path(service, url, params), entry)
+            self.stats["recorded"] += 1
+        except OSError as e:
+            print(f"⚠️  Enregistrement impossible ({service} {url}): {e}")
+
+    def _load(self, service: str, url: str, params: Optional[Dict]) -> Tuple[Optional[Dict], str]:
+        """Réponse enregistrée (corps déjà décalé en dates), mise en mémoire après la première lecture"""
+        shift = self._date_shift()
+        if shift and params:
+            params = {k: _shift_date(v, -shift) if isinstance(v, str) and _DATE_PARAM.match(v) else v
+                      for k, v in params.items()}
+        path = self._entry_path(service, url, params)
+        with self._lock:
+            if path in self._entries:
+                return self._entries[path], path
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            body = entry["body"].encode("utf-8")
+            if shift:
+                body = _DATE_PATTERN.sub(
+                    lambda m: _shift_date(m.group(0).decode(), shift).encode(), body)
+            entry["body"] = body
+        except (OSError, ValueError, KeyError):
+            entry = None
+        with self._lock:
+            self._entries[path] = entry
+        return entry, path
+
+    def _delay(self, entry: Optional[Dict]) -> float:
+        if self.latency == "recorded":
+            base = (entry or {}).get("elapsed_ms", 0.0) / 1000.0
+        else:
+            try:
+                base = float(self.latency) / 1000.0
+            except ValueError:
+                base = 0.0
+        if self.jitter:
+            base *= random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return max(base * self.latency_scale, 0.0)
+
+    def _replayed(self, service: str, url: str, params: Optional[Dict], factory) -> Tuple[RecordedResponse, float]:
+        entry, path = self._load(service, url, params)
+        if entry is None:
+            self.stats["missing"] += 1
+            if path not in self._missing_reported:
+                self._missing_reported.add(path)
+                print(f"⚠️  Rejeu: aucune réponse enregistrée pour {service} {urlsplit(url).path} {params or ''}")
+            body = json.dumps({"error": "Réponse non enregistrée"}).encode("utf-8")
+            return factory(404, body, {"Content-Type": "application/json"}, url), 0.0
+        self.stats["replayed"] += 1
+        response = factory(entry["status"], entry["body"], {"Content-Type": entry.get("content_type", "")}, url)
+        return response, self._delay(entry)
+
+    # ------------------------------------------------------------------
+    # API des clients
+    # ------------------------------------------------------------------
+
+    def get(self, service: str, url: str, params: Optional[Dict], send: Callable[[], requests.Response]):
+        """
+        GET synchrone (requests) enregistré ou rejoué selon le mode
+
+        Args:
+            service (str): "tradier" ou "yahoo"
+            url (str): URL appelée
+            params (Dict, optional): Paramètres de la requête
+            send (Callable): Exécute la requête réelle et renvoie la réponse requests
+
+        Returns:
+            requests.Response | RecordedResponse: Réponse réelle ou enregistrée
+        """
+        if self.mode == "off":
+            return send()
+        if self.replaying:
+            response, delay = self._replayed(service, url, params, RecordedResponse)
+            if delay:
+                time.sleep(delay)
+            return response
+
+        started = time.perf_counter()
+        response = send()
+        self._record(service, url, params, response.status_code,
+                     response.headers.get("Content-Type", ""), response.content, time.perf_counter() - started)
+        return response
+
+    @contextlib.asynccontextmanager
+    async def async_get(self, service: str, session, url: str, params: Optional[Dict] = None, **kwargs):
+        """
+        GET aiohttp enregistré ou rejoué selon le mode (s'utilise comme session.get)
+
+        Exemple:
+            async with replay_transport.async_get("tradier", session, url, params=params, timeout=timeout) as response:
+                data = await response.json()
+        """
+        if self.replaying:
+            response, delay = self._replayed(service, url, params, AsyncRecordedResponse)
+            if delay:
+                await asyncio.sleep(delay)
+            yield response
+            return
+
+        started = time.perf_counter()
+        async with session.get(url, params=params, **kwargs) as response:
+            if not self.recording:
+                yield response
+                return
+            body = await response.read()
+            self._record(service, url, params, response.status,
+                         response.headers.get("Content-Type", ""), body, time.perf_counter() - started)
+            # Les headers réels (budget Tradier) restent visibles de l'appelant
+            yield AsyncRecordedResponse(response.status, body, dict(response.headers), url)
+
+    def get_status(self) -> Dict:
+        """État du transport (pour /health)"""
+        status = {"mode": self.mode, **self.stats}
+        if self.mode != "off":
+            status.update({"directory": self.directory, "latency": self.latency,
+                           "latency_scale": self.latency_scale})
+        if self.replaying:
+            status["date_shift_days"] = self._date_shift()
+        return status
+
+
+def create_replay_from_env() -> ReplayTransport:
+    """
+    Crée le transport selon l'environnement
+
+    Variables:
+        REPLAY_MODE: off (défaut), record ou replay
+        REPLAY_DIR: Dossier des réponses enregistrées (défaut: fixtures/replay)
+        REPLAY_LATENCY: "recorded" (défaut) ou latence fixe en millisecondes
+        REPLAY_LATENCY_SCALE: Facteur de latence (défaut: 1.0, 0 = aucune attente)
+        REPLAY_JITTER: Variation relative de la latence (défaut: 0)
+        REPLAY_SHIFT_DATES: Décaler les dates au rejeu (défaut: true)
+    """
+    transport = ReplayTransport(
+        mode=os.getenv("REPLAY_MODE", "off").lower(),
+        directory=os.getenv("REPLAY_DIR", "fixtures/replay"),
+        latency=os.getenv("REPLAY_LATENCY", "recorded"),
+        latency_scale=float(os.getenv("REPLAY_LATENCY_SCALE", "1.0")),
+        jitter=float(os.getenv("REPLAY_JITTER", "0")),
+        shift_dates=os.getenv("REPLAY_SHIFT_DATES", "true").lower() == "true",
+    )
+    if transport.mode != "off":
+        print(f"🎞️  Transport amont en mode {transport.mode} ({transport.directory})")
+    return transport
+
+
+# Instance globale partagée par les clients Tradier (sync et async) et Yahoo
+replay_transport = create_replay_from_env()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Résilience des appels amont: disjoncteurs, timeouts adaptatifs et budget de temps par requête
+
+- Disjoncteur par amont (fermé / ouvert / semi-ouvert): après une série d'échecs, les appels
+  échouent immédiatement; passé le délai de récupération (ou dès qu'une sonde de santé réussit),
+  un seul appel d'essai est autorisé et son résultat referme ou rouvre le disjoncteur
+- Timeout adaptatif: dérivé des latences récentes (p95 × multiplicateur, borné) au lieu de (10, 30)
+- Budget de temps (deadline): fixé pour chaque requête Flask et propagé aux appels imbriqués
+  (threads, event loop asyncio): un timeout ne dépasse jamais le temps restant
+
+Un amont dégradé coûte ainsi quelques millisecondes par requête, pas des minutes de worker.
+"""
+
+import os
+import time
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from .health_probe import health_prober
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Échéance (time.monotonic) du contexte courant: thread, tâche asyncio ou requête Flask
+_deadline = contextvars.ContextVar("upstream_deadline", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé: le disjoncteur de l'amont est ouvert"""
+
+
+class DeadlineExceeded(Exception):
+    """Appel refusé: le budget de temps de la requête est épuisé"""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Limite la durée des appels amont effectués dans le bloc
+
+    Un budget imbriqué ne peut que raccourcir le budget englobant.
+
+    Args:
+        seconds (float, optional): Budget en secondes (None ou 0 = pas de nouvelle limite)
+    """
+    current = _deadline.get()
+    if seconds:
+        candidate = time.monotonic() + seconds
+        current = candidate if current is None else min(current, candidate)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def without_deadline():
+    """
+    Lève le budget courant dans le bloc
+
+    Pour les traitements longs par nature lancés depuis une requête (export en flux, lu après le
+    retour de la vue): chaque appel reste borné par le timeout adaptatif et le disjoncteur.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Temps restant du budget courant en secondes (None si aucun budget)"""
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Exécute fn dans une copie du contexte courant (budget, priorité Tradier)
+
+    Les threads (ThreadPoolExecutor, threading.Thread) démarrent avec un contexte vide:
+    envelopper la fonction soumise leur transmet le budget de la requête.
+
+    Exemple:
+        executor.submit(propagate(fetch), symbol)
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # Une copie par appel: un contexte ne peut être actif que dans un thread à la fois
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+class AdaptiveTimeout:
+    """
+    Timeout dérivé des latences récentes d'un amont
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float, multiplier: float = 3.0,
+                 window: int = 200, min_samples: int = 20):
+        """
+        Initialise le timeout
+
+        Args:
+            initial (float): Timeout tant que les mesures sont insuffisantes (secondes)
+            minimum (float): Borne basse (secondes)
+            maximum (float): Borne haute (secondes)
+            multiplier (float): Marge appliquée au p95 des latences réussies
+            window (int): Nombre de latences retenues
+            min_samples (int): Mesures nécessaires avant d'adapter le timeout
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Enregistre la latence d'un appel réussi"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def current(self) -> float:
+        """Timeout adapté aux latences récentes (hors budget de la requête)"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial
+            ordered = sorted(self._latencies)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return min(max(p95 * self.multiplier, self.minimum), self.maximum)
+
+    def timeout(self) -> float:
+        """
+        Timeout à appliquer maintenant: timeout adaptatif limité par le budget restant
+
+        Raises:
+            DeadlineExceeded: Le budget de la requête est épuisé
+        """
+        value = self.current()
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded("Budget de temps de la requête épuisé")
+            value = min(value, left)
+        return value
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un amont, alimenté par les appels et par la sonde de santé
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_time: float = 30.0, prober=None):
+        """
+        Initialise le disjoncteur
+
+        Args:
+            name (str): Nom de l'amont ("tradier", "yahoo"), aussi nom de la sonde de santé
+            failure_threshold (int): Échecs consécutifs qui ouvrent le disjoncteur
+            recovery_time (float): Délai avant l'appel d'essai (secondes)
+            prober (HealthProber, optional): Sonde de santé (défaut: sonde globale)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.prober = prober if prober is not None else health_prober
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._opened_wall = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {"rejected": 0, "opened": 0, "successes": 0, "failures": 0}
+
+    def _open(self, now: float) -> None:
+        if self.state != STATE_OPEN:
+            self.stats["opened"] += 1
+            print(f"🔌 Disjoncteur {self.name} ouvert ({self.failures} échecs consécutifs)")
+        self.state = STATE_OPEN
+        self.opened_at = now
+        self._opened_wall = time.time()
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        L'appel peut-il partir ? (à appeler avant chaque appel amont)
+
+        Returns:
+            bool: False si l'appel doit échouer immédiatement
+        """
+        # Même signal que /health: l'amont sondé comme tombé n'est pas appelé
+        if self.prober.is_down(self.name):
+            with self._lock:
+                self.stats["rejected"] += 1
+            return False
+
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == STATE_OPEN:
+                # Une sonde réussie depuis l'ouverture vaut délai de récupération écoulé
+                probed_ok = self.prober.last_ok(self.name)
+                if now - self.opened_at < self.recovery_time and (probed_ok is None or probed_ok < self._opened_wall):
+                    self.stats["rejected"] += 1
+                    return False
+                self.state = STATE_HALF_OPEN
+                self._trial_in_flight = False
+            # Semi-ouvert: un seul appel d'essai à la fois
+            if self._trial_in_flight:
+                self.stats["rejected"] += 1
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        """Libère l'appel d'essai réservé par allow() quand l'appel n'a finalement pas lieu"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats["successes"] += 1
+            self.failures = 0
+            if self.state != STATE_CLOSED:
+                print(f"🔌 Disjoncteur {self.name} refermé")
+            self.state = STATE_CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats["failures"] += 1
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(time.monotonic())
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for": round(max(self.recovery_time - (time.monotonic() - self.opened_at), 0.0), 1)
+                if self.state == STATE_OPEN else 0.0,
+                **self.stats,
+            }
+
+
+class UpstreamGuard:
+    """
+    Disjoncteur et timeout adaptatif d'un amont, appliqués autour de chaque appel
+    """
+
+    def __init__(self, breaker: CircuitBreaker, timeout: AdaptiveTimeout):
+        self.name = breaker.name
+        self.breaker = breaker
+        self.adaptive = timeout
+
+    @contextmanager
+    def call(self):
+        """
+        Encadre un appel amont
+
+        Exemple:
+            with tradier_guard.call() as call:
+                limiter.acquire()
+                call.begin()
+                response = requests.get(url, timeout=call.timeout)
+                call.ok = response.status_code < 500
+
+        Raises:
+            CircuitOpenError: Disjoncteur ouvert (aucun appel effectué)
+            DeadlineExceeded: Budget de la requête épuisé (pas compté comme un échec de l'amont)
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} indisponible (disjoncteur ouvert)")
+        call = _Call(self.adaptive)
+        try:
+            call.begin()
+            yield call
+        except DeadlineExceeded:
+            # L'appel n'a pas eu lieu: libérer l'éventuel appel d'essai sans compter d'échec
+            self.breaker.release_trial()
+            raise
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        if call.ok:
+            self.adaptive.observe(time.perf_counter() - call.started)
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {**self.breaker.get_status(), "timeout": round(self.adaptive.current(), 2)}
+
+
+class _Call:
+    """Appel en cours: timeout à appliquer et résultat (ok) pour le disjoncteur"""
+
+    def __init__(self, adaptive: AdaptiveTimeout):
+        self.adaptive = adaptive
+        self.timeout = adaptive.current()
+        self.ok = True
+        self.started = time.perf_counter()
+
+    def begin(self) -> None:
+        """(Re)part le chronomètre et recalcule le timeout (après l'attente d'un jeton par exemple)"""
+        self.timeout = self.adaptive.timeout()
+        self.started = time.perf_counter()
+
+
+def init_app(app, seconds: Optional[float] = None) -> None:
+    """
+    Fixe un budget de temps pour les appels amont de chaque requête Flask
+
+    Args:
+        app (Flask): Application
+        seconds (float, optional): Budget par requête (défaut: REQUEST_DEADLINE, 0 = aucun)
+    """
+    from flask import g
+
+    budget = float(os.getenv("REQUEST_DEADLINE", "60")) if seconds is None else seconds
+
+    def start():
+        if budget > 0:
+            g.upstream_deadline = _deadline.set(time.monotonic() + budget)
+
+    def finish(exc=None):
+        token = g.pop("upstream_deadline", None)
+        if token is not None:
+            try:
+                _deadline.reset(token)
+            except ValueError:
+                # Contexte déjà changé (fin de requête dans un autre contexte): rien à restaurer
+                pass
+
+    app.before_request(start)
+    app.teardown_request(finish)
+
+
+def _create_guard(name: str, initial: float, minimum: float, maximum: float) -> UpstreamGuard:
+    prefix = name.upper()
+    breaker = CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv("CIRCUIT_FAILURES", "5")),
+        recovery_time=float(os.getenv("CIRCUIT_RECOVERY", "30")),
+    )
+    timeout = AdaptiveTimeout(
+        initial=float(os.getenv(f"{prefix}_TIMEOUT", str(initial))),
+        minimum=float(os.getenv(f"{prefix}_TIMEOUT_MIN", str(minimum))),
+        maximum=float(os.getenv(f"{prefix}_TIMEOUT_MAX", str(maximum))),
+    )
+    return UpstreamGuard(breaker, timeout)
+
+
+# Instances globales partagées par les clients synchrones et asynchrones
+tradier_guard = _create_guard("tradier", initial=10.0, minimum=2.0, maximum=30.0)
+yahoo_guard = _create_guard("yahoo", initial=5.0, minimum=1.0, maximum=10.0)
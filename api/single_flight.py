@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Regroupement des appels identiques en cours (single-flight) vers Tradier et Yahoo Finance
+
+Quand plusieurs requêtes demandent la même ressource en même temps (ouverture simultanée
+de la surface SPY, ouverture du marché...), un seul appel amont est effectué: les autres
+attendent son résultat et le partagent. Le résultat partagé doit être traité en lecture seule.
+
+Mode inter-workers optionnel: un verrou fichier par clé (sur /dev/shm par défaut) fait
+attendre les autres workers gunicorn, qui relisent ensuite le résultat que le premier
+worker vient d'écrire au lieu de refaire l'appel. Les résultats périmés et les verrous
+inutilisés sont supprimés périodiquement. Les résultats sont relus avec pickle: le dossier
+partagé est réservé à l'uid du processus (mode 0700, propriétaire vérifié, utils/private_dir.py).
+
+L'attente d'un appel en cours est bornée par le budget de temps de la requête (api/resilience.py).
+"""
+
+import os
+import time
+import pickle
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Awaitable
+
+from utils.private_dir import default_private_dir, private_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: regroupement limité au processus courant
+    fcntl = None
+
+
+def _remaining() -> Optional[float]:
+    """Budget de temps restant de la requête (import local: resilience dépend du cache, qui dépend de ce module)"""
+    from .resilience import remaining
+    return remaining()
+
+
+def _deadline_exceeded(key: str) -> Exception:
+    from .resilience import DeadlineExceeded
+    return DeadlineExceeded(f"Budget de temps épuisé en attente de l'appel en cours ({key})")
+
+
+def _flock_exclusive(lock_file, poll_interval: float = 0.01, timeout: Optional[float] = None) -> bool:
+    """
+    Verrou exclusif non bloquant pour le processus
+
+    Un flock bloquant figerait tout le worker en profil gevent: on sonde le verrou
+    et on cède la main avec time.sleep (coopératif une fois gevent patché).
+
+    Returns:
+        bool: True si le verrou est obtenu, False si le délai est dépassé
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+
+def make_key(*parts: Any, **kwargs: Any) -> str:
+    """
+    Construit une clé stable à partir des arguments d'un appel
+
+    Returns:
+        str: Clé texte (les paramètres nommés sont triés)
+    """
+    items = [str(p) for p in parts]
+    for name in sorted(kwargs):
+        value = kwargs[name]
+        if isinstance(value, dict):
+            value = sorted(value.items())
+        items.append(f"{name}={value}")
+    return "|".join(items)
+
+
+class SingleFlight:
+    """
+    Groupe d'appels: une seule exécution par clé à un instant donné
+    """
+
+    def __init__(self, name: str, shared_dir: Optional[str] = None, shared_ttl: float = 2.0,
+                 sweep_interval: float = 30.0):
+        """
+        Initialise le groupe
+
+        Args:
+            name (str): Nom du groupe (préfixe des fichiers partagés)
+            shared_dir (str, optional): Dossier partagé entre workers, créé en 0700 (None = processus courant uniquement)
+            shared_ttl (float): Durée pendant laquelle un résultat écrit par un autre worker est réutilisé
+            sweep_interval (float): Intervalle minimal entre deux nettoyages du dossier partagé (secondes)
+        """
+        self.name = name
+        self.shared_dir = shared_dir if (shared_dir and fcntl is not None) else None
+        self.shared_ttl = shared_ttl
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._last_sweep = 0.0
+        self.stats = {"calls": 0, "coalesced": 0, "shared_hits": 0, "swept": 0}
+
+        if self.shared_dir:
+            # Un dossier d'un autre utilisateur lève PermissionError: ses résultats ne sont jamais relus
+            private_dir(self.shared_dir)
+
+    def _join_or_lead(self, key: str):
+        """Retourne (future, est_leader)"""
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Exécute fn une seule fois pour tous les appelants concurrents de la même clé
+
+        Args:
+            key (str): Identifiant de la ressource demandée
+            fn (Callable): Fonction sans argument qui effectue l'appel amont
+
+        Returns:
+            Any: Résultat de fn (partagé entre les appelants)
+        """
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            try:
+                return future.result(timeout=_remaining())
+            except FutureTimeoutError:
+                raise _deadline_exceeded(key) from None
+
+        try:
+            result = self._run_shared(key, fn) if self.shared_dir else fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+
+    async def do_async(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Variante asynchrone de do(), partagée aussi entre boucles asyncio de threads différents
+
+        Args:
+            key (str): Identifiant de la ressource demandée
+            coro_fn (Callable): Fonction sans argument qui retourne la coroutine d'appel amont
+
+        Returns:
+            Any: Résultat de la coroutine (partagé entre les appelants)
+        """
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            # shield: l'abandon d'un suiveur ne doit pas annuler le résultat attendu par les autres
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), _remaining())
+            except asyncio.TimeoutError:
+                raise _deadline_exceeded(key) from None
+
+        try:
+            result = await coro_fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+
+    # ------------------------------------------------------------------
+    # Mode inter-workers
+    # ------------------------------------------------------------------
+    def _shared_paths(self, key: str):
+        digest = hashlib.sha1(f"{self.name}|{key}".encode("utf-8")).hexdigest()
+        base = os.path.join(self.shared_dir, f"{self.name}-{digest}")
+        return base + ".lock", base + ".pkl"
+
+    def _open_locked(self, key: str, lock_path: str):
+        """
+        Ouvre et verrouille le fichier de verrou d'une clé
+
+        Un verrou supprimé par sweep() entre l'ouverture et l'obtention du flock n'exclut plus
+        personne: on recommence alors sur le nouveau fichier.
+        """
+        while True:
+            lock_file = open(lock_path, "a")
+            if not _flock_exclusive(lock_file, timeout=_remaining()):
+                lock_file.close()
+                raise _deadline_exceeded(key)
+            try:
+                if os.fstat(lock_file.fileno()).st_ino == os.stat(lock_path).st_ino:
+                    return lock_file
+            except OSError:
+                pass
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Supprime les résultats partagés périmés et les verrous libres du groupe
+
+        Returns:
+            int: Nombre de fichiers supprimés
+        """
+        if not self.shared_dir:
+            return 0
+        now = now or time.time()
+        removed = 0
+        prefix = f"{self.name}-"
+        try:
+            names = os.listdir(self.shared_dir)
+        except OSError:
+            return 0
+        for filename in names:
+            if not filename.startswith(prefix):
+                continue
+            path = os.path.join(self.shared_dir, filename)
+            try:
+                if filename.endswith(".lock"):
+                    with open(path, "a") as lock_file:
+                        # Verrou tenu par un appel en cours: on le laisse
+                        try:
+                            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except BlockingIOError:
+                            continue
+                        os.unlink(path)
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                elif now - os.path.getmtime(path) > max(self.shared_ttl, 60.0 if filename.endswith(".tmp") else 0.0):
+                    os.unlink(path)
+                else:
+                    continue
+                removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.stats["swept"] += removed
+        return removed
+
+    def _maybe_sweep(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = now
+        self.sweep(now)
+
+    def _run_shared(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Verrou fichier par clé: le premier worker appelle, les suivants relisent son résultat"""
+        self._maybe_sweep()
+        lock_path, result_path = self._shared_paths(key)
+        with self._open_locked(key, lock_path) as lock_file:
+            try:
+                try:
+                    if time.time() - os.path.getmtime(result_path) <= self.shared_ttl:
+                        with open(result_path, "rb") as f:
+                            result = pickle.load(f)
+                        with self._lock:
+                            self.stats["shared_hits"] += 1
+                        return result
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    pass
+
+                result = fn()
+                if result is not None:
+                    tmp_path = f"{result_path}.{os.getpid()}.tmp"
+                    try:
+                        with open(tmp_path, "wb") as f:
+                            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        os.replace(tmp_path, result_path)
+                    except (OSError, pickle.PicklingError, TypeError):
+                        pass
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_status(self) -> dict:
+        """Compteurs du groupe"""
+        with self._lock:
+            return {"name": self.name, "inflight": len(self._inflight),
+                    "shared": bool(self.shared_dir), **self.stats}
+
+
+def _create_group(name: str) -> SingleFlight:
+    """
+    Crée un groupe selon l'environnement
+
+    Variables:
+        SINGLE_FLIGHT_SHARED: "true" pour regrouper aussi entre workers gunicorn (défaut: false)
+        SINGLE_FLIGHT_DIR: Dossier des verrous partagés, réservé à l'uid (défaut: /dev/shm/mlg-<uid>/single_flight)
+        SINGLE_FLIGHT_SHARED_TTL: Réutilisation d'un résultat d'un autre worker, en secondes (défaut: 2)
+        SINGLE_FLIGHT_SWEEP_INTERVAL: Nettoyage des résultats périmés et verrous libres, en secondes (défaut: 30)
+    """
+    options = {"shared_ttl": float(os.getenv("SINGLE_FLIGHT_SHARED_TTL", "2")),
+               "sweep_interval": float(os.getenv("SINGLE_FLIGHT_SWEEP_INTERVAL", "30"))}
+    if os.getenv("SINGLE_FLIGHT_SHARED", "false").lower() == "true":
+        try:
+            shared_dir = os.getenv("SINGLE_FLIGHT_DIR") or default_private_dir("single_flight")
+            return SingleFlight(name, shared_dir=shared_dir, **options)
+        except OSError as e:
+            print(f"⚠️  Dossier single-flight partagé refusé ({e}), regroupement limité au worker")
+    return SingleFlight(name, **options)
+
+
+# Groupes globaux par fournisseur
+tradier_flight = _create_group("tradier")
+yahoo_flight = _create_group("yahoo")
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Univers de symboles en cache local et index de recherche en mémoire (autocomplétion)
+
+L'univers (symbole, description, type, place) est reconstruit une fois par jour à partir de
+recherches Tradier (/markets/lookup, une par préfixe de SYMBOL_INDEX_SEEDS, en priorité basse)
+et des symboles populaires, puis écrit dans un fichier JSON partagé par les workers.
+
+La recherche ne fait aucun appel réseau: tableaux triés et bisect sur les symboles et sur les
+mots des descriptions (préfixes), puis correspondance approchée sur les symboles (difflib)
+quand rien ne correspond exactement.
+"""
+
+import os
+import json
+import time
+import difflib
+import tempfile
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+try:
+    import fcntl
+except ImportError:  # Windows: reconstruction non coordonnée entre processus
+    fcntl = None
+
+# Au-delà de ce nombre de candidats, une recherche par mot de description s'arrête
+_MAX_WORD_CANDIDATES = 500
+
+
+def _normalize(entry: Dict) -> Optional[Dict[str, str]]:
+    """Entrée d'univers à partir d'un résultat Tradier ({symbol, description, type, exch})"""
+    symbol = str(entry.get("symbol") or "").strip().upper()
+    if not symbol:
+        return None
+    return {
+        "symbol": symbol,
+        "description": str(entry.get("description") or entry.get("name") or "").strip(),
+        "type": str(entry.get("type") or "").strip(),
+        "exchange": str(entry.get("exchange") or entry.get("exch") or "").strip(),
+    }
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in "".join(c if c.isalnum() else " " for c in text.upper()).split() if word]
+
+
+class SymbolIndex:
+    """
+    Index immuable d'un univers de symboles (reconstruit puis remplacé d'un bloc)
+    """
+
+    def __init__(self, entries: Iterable[Dict]):
+        """
+        Construit l'index
+
+        Args:
+            entries (Iterable[Dict]): Entrées {symbol, description, type, exchange} (doublons fusionnés)
+        """
+        merged: Dict[str, Dict[str, str]] = {}
+        for raw in entries:
+            entry = _normalize(raw)
+            if entry is None:
+                continue
+            known = merged.get(entry["symbol"])
+            if known is None:
+                merged[entry["symbol"]] = entry
+            else:
+                # Compléter les champs vides d'une entrée déjà vue
+                for field, value in entry.items():
+                    if value and not known[field]:
+                        known[field] = value
+
+        self.entries: List[Dict[str, str]] = [merged[symbol] for symbol in sorted(merged)]
+        self._symbols: List[str] = [entry["symbol"] for entry in self.entries]
+        self._entry_words: List[List[str]] = [_words(entry["description"]) for entry in self.entries]
+        words = sorted((word, i) for i, entry_words in enumerate(self._entry_words) for word in set(entry_words))
+        self._word_keys: List[str] = [word for word, _ in words]
+        self._word_refs: List[int] = [i for _, i in words]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> range:
+        start = bisect_left(keys, prefix)
+        return range(start, bisect_left(keys, prefix + "￿", lo=start))
+
+    def get(self, symbol: str) -> Optional[Dict[str, str]]:
+        """Entrée d'un symbole exact (None si inconnu)"""
+        symbol = symbol.strip().upper()
+        i = bisect_left(self._symbols, symbol)
+        return self.entries[i] if i < len(self._symbols) and self._symbols[i] == symbol else None
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Dict[str, str]]:
+        """
+        Recherche par préfixe de symbole, puis par préfixe des mots de la description
+
+        Args:
+            query (str): Texte saisi (ex: "AA", "apple", "ishares gold")
+            limit (int): Nombre maximum de résultats
+            fuzzy (bool): Correspondance approchée sur les symboles si rien ne correspond
+
+        Returns:
+            List[Dict]: Entrées, symbole exact en premier
+        """
+        terms = _words(query)
+        if not terms or limit <= 0:
+            return []
+        found: List[int] = []
+        seen = set()
+
+        def add(i: int) -> bool:
+            if i not in seen:
+                seen.add(i)
+                found.append(i)
+            return len(found) >= limit
+
+        # 1. Préfixe du symbole (ordre lexicographique: le symbole exact vient en premier)
+        compact = "".join(terms) if len(terms) == 1 else query.strip().upper()
+        for i in self._prefix_range(self._symbols, compact):
+            if add(i):
+                return [self.entries[j] for j in found]
+
+        # 2. Préfixe des mots de la description (tous les termes doivent correspondre)
+        first = self._prefix_range(self._word_keys, terms[0])
+        for k in first[:_MAX_WORD_CANDIDATES]:
+            i = self._word_refs[k]
+            if i in seen:
+                continue
+            if len(terms) > 1:
+                words = self._entry_words[i]
+                if not all(any(word.startswith(term) for word in words) for term in terms[1:]):
+                    continue
+            if add(i):
+                break
+
+        # 3. Symboles proches (faute de frappe), seulement si rien n'a été trouvé: candidats de même
+        #    initiale et de longueur voisine, pour rester loin d'un parcours complet de l'univers
+        if not found and fuzzy and len(compact) >= 2:
+            candidates = [symbol for symbol in (self._symbols[k] for k in self._prefix_range(self._symbols, compact[0]))
+                          if abs(len(symbol) - len(compact)) <= 1]
+            for symbol in difflib.get_close_matches(compact, candidates, n=limit, cutoff=0.75):
+                add(bisect_left(self._symbols, symbol))
+        return [self.entries[j] for j in found]
+
+
+class SymbolUniverse:
+    """
+    Univers de symboles persisté sur disque, reconstruit en tâche de fond quand il est périmé
+    """
+
+    def __init__(self, path: str, lookup: Optional[Callable[[str], Optional[Dict]]] = None,
+                 seeds: Iterable[str] = (), static_entries: Iterable[Dict] = (), ttl: float = 24 * 3600,
+                 reload_interval: float = 30.0):
+        """
+        Initialise l'univers
+
+        Args:
+            path (str): Fichier JSON de l'univers (partagé par les workers)
+            lookup (Callable, optional): Recherche amont (préfixe → réponse Tradier /markets/lookup)
+            seeds (Iterable[str]): Préfixes recherchés lors d'une reconstruction
+            static_entries (Iterable[Dict]): Entrées toujours présentes (symboles populaires)
+            ttl (float): Âge maximal de l'univers avant reconstruction (secondes)
+            reload_interval (float): Période de vérification du fichier (écrit par un autre worker)
+        """
+        self.path = path
+        self.lookup = lookup
+        self.seeds = list(seeds)
+        self.static_entries = list(static_entries)
+        self.ttl = ttl
+        self.reload_interval = reload_interval
+        self._index = SymbolIndex(self.static_entries)
+        self._learned: Dict[str, Dict] = {}
+        self._built_at: Optional[float] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self.stats = {"searches": 0, "refreshes": 0, "refresh_errors": 0, "learned": 0}
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        """Relit le fichier s'il a changé (écrit par ce worker ou un autre)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Univers de symboles illisible ({e})")
+            return
+        index = SymbolIndex([*self.static_entries, *data.get("symbols", []), *self._learned.values()])
+        with self._lock:
+            self._index = index
+            self._built_at = data.get("built_at")
+            self._mtime = mtime
+
+    @property
+    def index(self) -> SymbolIndex:
+        """Index courant (relu si le fichier a changé, reconstruction lancée s'il est périmé)"""
+        now = time.time()
+        if now - self._checked_at >= self.reload_interval:
+            self._checked_at = now
+            self._load()
+            if self.lookup is not None and (self._built_at is None or now - self._built_at >= self.ttl):
+                self.refresh_async()
+        return self._index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Recherche locale (aucun appel réseau), voir SymbolIndex.search"""
+        self.stats["searches"] += 1
+        return self.index.search(query, limit)
+
+    def get(self, symbol: str) -> Optional[Dict[str, str]]:
+        return self.index.get(symbol)
+
+    def learn(self, entries: Iterable[Dict]) -> int:
+        """
+        Ajoute à l'index les symboles obtenus par une recherche amont (jusqu'à la prochaine reconstruction)
+
+        Returns:
+            int: Nombre de symboles nouveaux
+        """
+        current = self._index
+        fresh = [entry for entry in map(_normalize, entries) if entry and current.get(entry["symbol"]) is None]
+        if not fresh:
+            return 0
+        with self._lock:
+            for entry in fresh:
+                self._learned[entry["symbol"]] = entry
+            self._index = SymbolIndex([*self._index.entries, *fresh])
+            self.stats["learned"] += len(fresh)
+        return len(fresh)
+
+    # ------------------------------------------------------------------
+    # Reconstruction
+    # ------------------------------------------------------------------
+    def refresh_async(self) -> None:
+        """Reconstruit l'univers dans un thread (une seule reconstruction à la fois par processus)"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_guarded, name="mlg-symbol-index", daemon=True).start()
+
+    def _refresh_guarded(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path + ".lock", "w") as lock_file:
+                if fcntl is not None:
+                    try:
+                        # Un autre worker reconstruit déjà: il écrira le fichier que l'on relira
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return
+                # Relire: la reconstruction a pu se terminer dans un autre worker entre-temps
+                self._mtime = None
+                self._load()
+                if self._built_at is None or time.time() - self._built_at >= self.ttl:
+                    self.refresh()
+        except Exception as e:
+            self.stats["refresh_errors"] += 1
+            print(f"⚠️  Reconstruction de l'univers de symboles impossible: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> int:
+        """
+        Reconstruit l'univers maintenant (recherches amont en priorité basse) et l'écrit sur disque
+
+        Returns:
+            int: Nombre de symboles de l'univers
+        """
+        if self.lookup is None:
+            return len(self._index)
+        collected: List[Dict] = []
+        failures = 0
+        with request_priority(PRIORITY_BACKGROUND):
+            for seed in self.seeds:
+                response = self.lookup(seed)
+                if not response:
+                    failures += 1
+                    continue
+                securities = (response.get("securities") or {}).get("security") or []
+                if isinstance(securities, dict):
+                    securities = [securities]
+                collected.extend(securities)
+        if self.seeds and failures == len(self.seeds):
+            # Amont injoignable: garder l'univers actuel, réessayer à la prochaine vérification
+            raise RuntimeError("aucune recherche amont n'a abouti")
+
+        index = SymbolIndex([*self.static_entries, *collected])
+        built_at = time.time()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".symbols-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"built_at": built_at, "symbols": index.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        with self._lock:
+            self._learned.clear()
+            self._index = index
+            self._built_at = built_at
+            self._mtime = os.path.getmtime(self.path)
+            self.stats["refreshes"] += 1
+        print(f"🔤 Univers de symboles reconstruit: {len(index)} symboles ({failures} recherches en échec)")
+        return len(index)
+
+    def get_status(self) -> Dict:
+        return {
+            "symbols": len(self._index),
+            "path": self.path,
+            "age_s": round(time.time() - self._built_at) if self._built_at else None,
+            "ttl": self.ttl,
+            "refreshing": self._refreshing,
+            **self.stats,
+        }
+
+
+def create_symbol_universe_from_env(lookup: Optional[Callable[[str], Optional[Dict]]] = None,
+                                    static_entries: Iterable[Dict] = ()) -> SymbolUniverse:
+    """
+    Crée l'univers selon l'environnement
+
+    Variables:
+        SYMBOL_INDEX_PATH: Fichier de l'univers (défaut: data_store/symbols.json)
+        SYMBOL_INDEX_TTL: Âge maximal avant reconstruction en secondes (défaut: 86400)
+        SYMBOL_INDEX_SEEDS: Préfixes recherchés à la reconstruction, séparés par des virgules (défaut: A à Z)
+
+    Args:
+        lookup (Callable, optional): Recherche amont (None = univers limité aux entrées statiques)
+        static_entries (Iterable[Dict]): Entrées toujours présentes
+    """
+    seeds = os.getenv("SYMBOL_INDEX_SEEDS", "")
+    return SymbolUniverse(
+        path=os.getenv("SYMBOL_INDEX_PATH", os.path.join("data_store", "symbols.json")),
+        lookup=lookup,
+        seeds=[s.strip() for s in seeds.split(",") if s.strip()] or [chr(c) for c in range(ord("A"), ord("Z") + 1)],
+        static_entries=static_entries,
+        ttl=float(os.getenv("SYMBOL_INDEX_TTL", str(24 * 3600))),
+    )
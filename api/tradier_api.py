@@ -10,19 +10,33 @@ import time
 from typing import Dict, List, Optional, Any
 import pandas as pd
 
+from .rate_limiter import tradier_rate_limiter
+from .single_flight import tradier_flight, make_key
+from .cache import shared_cache, CACHE_TTLS
+from .market_hours import market_calendar
+from .replay import replay_transport
+from .resilience import tradier_guard, remaining, CircuitOpenError, DeadlineExceeded
+from utils.metrics import observe_upstream
+
 class TradierAPI:
     """
     Classe pour interagir avec l'API Tradier
     """
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, chain_store=None, priority: Optional[int] = None, rate_limiter=None):
         """
         Initialise l'API Tradier avec le token d'authentification
         
         Args:
             token (str): Token d'authentification Tradier
+            chain_store (ChainSnapshotStore, optional): Store local des snapshots de chaînes d'options
+            priority (int, optional): Priorité fixe des appels (défaut: priorité du contexte courant)
+            rate_limiter (RateLimiter, optional): Limiteur partagé (défaut: limiteur global Tradier)
         """
         self.token = token
+        self.chain_store = chain_store
+        self.priority = priority
+        self.rate_limiter = rate_limiter or tradier_rate_limiter
         self.base_url = "https://api.tradier.com/v1"
         self.headers = {
             "Authorization": f"Bearer {token}",
@@ -30,6 +44,58 @@ class TradierAPI:
         }
         
     def _make_request(self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
+        """
+        Effectue une requête HTTP vers l'API Tradier
+        
+        Les appels identiques simultanés (même endpoint, mêmes paramètres) sont regroupés:
+        un seul part vers Tradier et sa réponse est partagée (à traiter en lecture seule).
+        
+        Args:
+            endpoint (str): Point de terminaison de l'API
+            params (Dict, optional): Paramètres de la requête
+            max_retries (int): Nombre maximum de tentatives
+            
+        Returns:
+            Dict: Réponse de l'API ou None en cas d'erreur
+        """
+        key = make_key(self.base_url, endpoint, params=params or {})
+        ttl = self._cache_ttl(endpoint, params)
+        if ttl:
+            return shared_cache.get_or_set(key, lambda: self._send_request(endpoint, params, max_retries),
+                                           ttl, flight=tradier_flight)
+        return tradier_flight.do(key, lambda: self._send_request(endpoint, params, max_retries))
+    
+    @staticmethod
+    def _cache_ttl(endpoint: str, params: Optional[Dict]) -> Optional[float]:
+        """
+        Durée de vie en cache d'une réponse Tradier selon l'endpoint
+        
+        Args:
+            endpoint (str): Point de terminaison de l'API
+            params (Dict, optional): Paramètres de la requête
+            
+        Returns:
+            float: Durée en secondes ou None si la réponse ne doit pas être mise en cache
+        """
+        if endpoint == "/markets/options/chains":
+            # Une chaîne d'une journée passée ne change plus
+            date = (params or {}).get("date")
+            if date and date < datetime.now().strftime("%Y-%m-%d"):
+                return CACHE_TTLS["tradier_chain_historical"]
+            return market_calendar.cache_ttl(CACHE_TTLS["tradier_chain_live"], session="us")
+        if endpoint in ("/markets/quotes", "/markets/history"):
+            # Cotations et historiques figés jusqu'à la réouverture des marchés américains
+            return market_calendar.cache_ttl(CACHE_TTLS["tradier_quote" if endpoint == "/markets/quotes"
+                                                        else "tradier_history"], session="us")
+        return {
+            "/markets/clock": CACHE_TTLS["tradier_clock"],
+            "/markets/options/expirations": CACHE_TTLS["tradier_expirations"],
+            "/markets/options/strikes": CACHE_TTLS["tradier_strikes"],
+            "/markets/search": CACHE_TTLS["tradier_search"],
+            "/markets/lookup": CACHE_TTLS["tradier_search"],
+        }.get(endpoint)
+    
+    def _send_request(self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
         """
         Effectue une requête HTTP vers l'API Tradier avec retry automatique
         
@@ -45,28 +111,46 @@ class TradierAPI:
         
         for attempt in range(max_retries + 1):
             try:
-                # Timeout plus long pour les connexions lentes
-                response = requests.get(
-                    url, 
-                    headers=self.headers, 
-                    params=params,
-                    timeout=(10, 30)  # (connect_timeout, read_timeout)
-                )
+                # Disjoncteur (échec immédiat si Tradier est tombé) et timeout adaptatif borné par le budget restant
+                with tradier_guard.call() as call:
+                    # Attendre un jeton du budget partagé plutôt que de subir un 429 (rejeu: aucun appel réel)
+                    if not replay_transport.replaying and not self.rate_limiter.acquire(self.priority, timeout=remaining()):
+                        raise DeadlineExceeded("Budget de temps épuisé en attente d'un jeton Tradier")
+                    call.begin()
+                    started = time.perf_counter()
+                    try:
+                        response = replay_transport.get("tradier", url, params, lambda: requests.get(
+                            url, 
+                            headers=self.headers, 
+                            params=params,
+                            timeout=(min(call.timeout, 10), call.timeout)  # (connect_timeout, read_timeout)
+                        ))
+                    except requests.exceptions.RequestException as e:
+                        observe_upstream("tradier", endpoint, type(e).__name__, time.perf_counter() - started)
+                        raise
+                    observe_upstream("tradier", endpoint, response.status_code, time.perf_counter() - started)
+                    call.ok = response.status_code < 500
+                self.rate_limiter.update_from_headers(response.headers)
                 
                 if response.status_code == 200:
                     return response.json()
                 elif response.status_code == 429:  # Rate limit
-                    print(f"⚠️  Rate limit atteint, attente avant retry...")
-                    time.sleep(2 ** attempt)  # Backoff exponentiel
+                    print(f"⚠️  Rate limit atteint, reprise à la réouverture de la fenêtre...")
+                    self.rate_limiter.on_throttled(response.headers)
                     continue
                 else:
                     print(f"❌ Erreur API: {response.status_code} - {response.text}")
                     return None
+            
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                # Amont tombé ou budget épuisé: échouer tout de suite plutôt qu'enchaîner timeouts et retries
+                observe_upstream("tradier", endpoint, type(e).__name__, 0.0)
+                print(f"⚡ Appel Tradier {endpoint} abandonné: {e}")
+                return None
                     
             except requests.exceptions.ConnectTimeout as e:
                 print(f"❌ Timeout de connexion (tentative {attempt + 1}/{max_retries + 1}): {e}")
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)  # Backoff exponentiel
+                if attempt < max_retries and self._backoff(attempt):
                     continue
                 else:
                     print(f"❌ Impossible de se connecter à Tradier après {max_retries + 1} tentatives")
@@ -74,8 +158,7 @@ class TradierAPI:
                     
             except requests.exceptions.ConnectionError as e:
                 print(f"❌ Erreur de connexion (tentative {attempt + 1}/{max_retries + 1}): {e}")
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)  # Backoff exponentiel
+                if attempt < max_retries and self._backoff(attempt):
                     continue
                 else:
                     print(f"❌ Impossible de se connecter à Tradier après {max_retries + 1} tentatives")
@@ -84,8 +167,7 @@ class TradierAPI:
                     
             except requests.exceptions.Timeout as e:
                 print(f"❌ Timeout de lecture (tentative {attempt + 1}/{max_retries + 1}): {e}")
-                if attempt < max_retries:
-                    time.sleep(2 ** attempt)
+                if attempt < max_retries and self._backoff(attempt):
                     continue
                 else:
                     return None
@@ -96,6 +178,21 @@ class TradierAPI:
         
         return None
     
+    @staticmethod
+    def _backoff(attempt: int) -> bool:
+        """
+        Pause exponentielle avant une nouvelle tentative, si le budget de temps le permet
+        
+        Returns:
+            bool: False si la pause dépasserait le budget restant (abandonner)
+        """
+        delay = 2 ** attempt
+        left = remaining()
+        if left is not None and left <= delay:
+            return False
+        time.sleep(delay)
+        return True
+    
     def get_account_info(self) -> Optional[Dict]:
         """
         Récupère les informations du compte
@@ -178,6 +275,23 @@ class TradierAPI:
         }
         return self._make_request("/markets/search", params)
     
+    def lookup_symbols(self, query: str, types: str = "stock,etf,index") -> Optional[Dict]:
+        """
+        Recherche des symboles par préfixe de ticker (alimente l'univers de symboles local)
+        
+        Args:
+            query (str): Préfixe du symbole (ex: "AA")
+            types (str): Types de titres séparés par des virgules
+            
+        Returns:
+            Dict: Résultats de recherche ou None en cas d'erreur
+        """
+        params = {
+            "q": query,
+            "types": types
+        }
+        return self._make_request("/markets/lookup", params)
+    
     def get_popular_symbols(self) -> List[Dict[str, str]]:
         """
         Retourne une liste des symboles populaires avec options
@@ -266,6 +380,27 @@ class TradierAPI:
         }
         return self._make_request("/markets/history", params)
     
+    def get_price_history(self, symbol: str, start: str, end: str, interval: str = "daily") -> Optional[Dict]:
+        """
+        Récupère l'historique de prix d'une action sur une période en un seul appel
+        
+        Args:
+            symbol (str): Symbole de l'action (ex: "AAPL")
+            start (str): Date de début au format YYYY-MM-DD
+            end (str): Date de fin au format YYYY-MM-DD
+            interval (str): Intervalle ("daily", "weekly", "monthly")
+            
+        Returns:
+            Dict: Données historiques de l'action ou None en cas d'erreur
+        """
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "start": start,
+            "end": end
+        }
+        return self._make_request("/markets/history", params)
+    
     def get_option_quotes_v2(self, symbol: str, expiration: str, strike: float, option_type: str = "call") -> Optional[Dict]:
         """
         Récupère les cotations d'options en utilisant l'endpoint correct de Tradier
@@ -307,6 +442,14 @@ class TradierAPI:
             yesterday = datetime.now() - timedelta(days=1)
             date = yesterday.strftime("%Y-%m-%d")
         
+        # Une journée passée est figée: la relire depuis le store local si elle y est
+        is_past_date = date < datetime.now().strftime("%Y-%m-%d")
+        if self.chain_store is not None and is_past_date:
+            cached_df = self.chain_store.read(symbol, expiration, date)
+            if cached_df is not None:
+                print(f"💾 Options {symbol} {expiration} au {date} lues depuis le store local ({len(cached_df)} lignes)")
+                return cached_df
+        
         print(f"📅 Récupération des options {symbol} pour l'expiration {expiration} au {date}...")
         
         # Utiliser l'endpoint options/chains avec la date historique
@@ -375,7 +518,13 @@ class TradierAPI:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
         
         # Trier le DataFrame
-        df = df.sort_values(["Strike", "Type"])
+        df = df.sort_values(["Strike", "Type"]).reset_index(drop=True)
+        
+        if self.chain_store is not None:
+            try:
+                self.chain_store.write(symbol, expiration, date, df)
+            except Exception as e:
+                print(f"⚠️  Écriture du snapshot {symbol} {expiration} au {date} impossible: {e}")
         
         print(f"✅ DataFrame historique créé avec {len(df)} lignes d'options")
         return df
@@ -415,9 +564,6 @@ class TradierAPI:
                 print(f"      ✅ {len(date_data)} options récupérées")
             else:
                 print(f"      ❌ Échec pour {date}")
-            
-            # Pause pour éviter de surcharger l'API
-            time.sleep(0.5)
         
         if not all_data:
             print("❌ Aucune donnée récupérée")
@@ -507,9 +653,6 @@ class TradierAPI:
                 except Exception as e:
                     print(f"   ⚠️  Erreur lors du traitement d'une option: {e}")
                     continue
-            
-            # Petite pause pour éviter de surcharger l'API
-            time.sleep(0.2)
         
         if not all_options_data:
             print("❌ Aucune donnée d'option récupérée")
@@ -618,6 +761,7 @@ def get_apple_options_simple():
     """
     Fonction simple pour récupérer les options Apple et retourner le DataFrame
     """
+    from .tradier_config import TRADIER_API_KEY
     TOKEN = TRADIER_API_KEY
     api = TradierAPI(TOKEN)
     
@@ -635,6 +779,7 @@ def get_apple_options_j1():
     """
     Fonction simple pour récupérer les options Apple de J-1
     """
+    from .tradier_config import TRADIER_API_KEY
     TOKEN = TRADIER_API_KEY
     api = TradierAPI(TOKEN)
     
@@ -667,8 +812,10 @@ def get_apple_options_j1():
 
 def get_aapl_historical_iv30_parallel(days_back: int = 365, max_workers: int = 5) -> Optional[pd.DataFrame]:
     """
-    Récupère les données d'historique IV30 (volatilité implicite 30 jours) pour AAPL en parallèle
-    Calcule la volatilité implicite à partir des prix des options car Tradier ne la fournit pas
+    Récupère les données d'historique IV30 (volatilité implicite 30 jours) pour AAPL
+    
+    Conservée pour compatibilité: délègue à IVHistoryBuilder (api/iv_history.py), qui
+    interpole entre deux expirations et ne récupère que les dates absentes de l'historique persisté.
     
     Args:
         days_back (int): Nombre de jours en arrière à récupérer (par défaut: 365)
@@ -677,238 +824,20 @@ def get_aapl_historical_iv30_parallel(days_back: int = 365, max_workers: int = 5
     Returns:
         pd.DataFrame: DataFrame contenant les données IV30 historiques ou None en cas d'erreur
     """
-    import concurrent.futures
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from .iv_history import create_iv_history_builder
     
-    TOKEN = TRADIER_API_KEY
-    
-    print(f"🍎 Récupération PARALLÈLE des données IV30 historiques AAPL sur {days_back} jours...")
-    print(f"   🚀 Utilisation de {max_workers} workers parallèles")
-    
-    # Récupérer les expirations disponibles (une seule fois)
-    api = TradierAPI(TOKEN)
-    expirations = api.get_option_expirations("AAPL")
-    if not expirations or "expirations" not in expirations:
-        print("❌ Impossible de récupérer les expirations")
-        return None
-    
-    exp_list = expirations["expirations"]["date"]
-    if not exp_list:
-        print("❌ Aucune expiration trouvée")
-        return None
-    
-    # Trouver l'expiration la plus proche de 30 jours
-    from datetime import datetime, timedelta
-    today = datetime.now()
-    target_date = today + timedelta(days=30)
-    
-    best_expiration = None
-    min_diff = float('inf')
-    
-    for exp_date_str in exp_list:
-        try:
-            exp_date = datetime.strptime(exp_date_str, "%Y-%m-%d")
-            diff = abs((exp_date - today).days - 30)
-            if diff < min_diff:
-                min_diff = diff
-                best_expiration = exp_date_str
-        except ValueError:
-            continue
-    
-    if not best_expiration:
-        print("❌ Aucune expiration proche de 30 jours trouvée")
-        return None
-    
-    print(f"   📅 Expiration sélectionnée: {best_expiration} (écart: {min_diff} jours)")
-    
-    # Générer les dates historiques
-    historical_dates = []
-    for i in range(1, days_back + 1):
-        date = today - timedelta(days=i)
-        # Vérifier que ce n'est pas un weekend
-        if date.weekday() < 5:  # 0-4 = Lundi-Vendredi
-            historical_dates.append(date.strftime("%Y-%m-%d"))
-    
-    print(f"   📊 {len(historical_dates)} dates de marché à traiter")
-    
-    # Fonction pour traiter une date individuelle
-    def process_single_date(date_str):
-        """Traite une seule date et retourne les données IV30"""
-        try:
-            # Créer une nouvelle instance d'API pour chaque thread
-            thread_api = TradierAPI(TOKEN)
-            
-            # Récupérer les données d'options pour cette date
-            options_data = thread_api.get_historical_options_data("AAPL", best_expiration, date_str)
-            
-            if options_data is not None and not options_data.empty:
-                # Récupérer le prix spot historique pour cette date spécifique
-                spot_price = None
-                try:
-                    # Essayer de récupérer le prix historique pour cette date
-                    historical_quote = thread_api.get_historical_quote("AAPL", date_str)
-                    if historical_quote and "history" in historical_quote and "day" in historical_quote["history"]:
-                        day_data = historical_quote["history"]["day"]
-                        if isinstance(day_data, list) and len(day_data) > 0:
-                            # Prendre le premier jour (le plus proche de la date demandée)
-                            spot_price = float(day_data[0].get("close", 0))
-                        elif isinstance(day_data, dict):
-                            spot_price = float(day_data.get("close", 0))
-                    
-                    # Validation du prix spot (AAPL devrait être entre 200-300$ récemment)
-                    if spot_price and (spot_price < 150 or spot_price > 350):
-                        print(f"      ⚠️  Prix spot suspect pour {date_str}: ${spot_price:.2f}")
-                        # Utiliser le prix actuel comme fallback
-                        stock_quote = thread_api.get_stock_quote("AAPL")
-                        if stock_quote and "quotes" in stock_quote and "quote" in stock_quote["quotes"]:
-                            quote_data = stock_quote["quotes"]["quote"]
-                            if isinstance(quote_data, list):
-                                quote_data = quote_data[0]
-                            spot_price = float(quote_data.get("last", 0))
-                            print(f"      🔄 Utilisation du prix actuel: ${spot_price:.2f}")
-                            
-                except Exception as e:
-                    print(f"      ❌ Erreur récupération prix historique {date_str}: {e}")
-                    # Si échec, utiliser le prix actuel comme fallback
-                    stock_quote = thread_api.get_stock_quote("AAPL")
-                    if stock_quote and "quotes" in stock_quote and "quote" in stock_quote["quotes"]:
-                        quote_data = stock_quote["quotes"]["quote"]
-                        if isinstance(quote_data, list):
-                            quote_data = quote_data[0]
-                        spot_price = float(quote_data.get("last", 0))
-                
-                if spot_price and spot_price > 0:
-                    # Filtrer les options ATM (At The Money) - proches du prix spot
-                    # Utiliser une plage plus large pour avoir plus d'options
-                    atm_options = options_data[
-                        (options_data['Strike'] >= spot_price * 0.90) & 
-                        (options_data['Strike'] <= spot_price * 1.10)
-                    ]
-                    
-                    if not atm_options.empty:
-                        # Calculer la volatilité implicite à partir des prix des options
-                        calculated_ivs = []
-                        
-                        for _, option in atm_options.iterrows():
-                            try:
-                                # Utiliser le prix moyen bid-ask ou le dernier prix
-                                option_price = None
-                                if pd.notna(option['Last']) and option['Last'] > 0:
-                                    option_price = option['Last']
-                                elif pd.notna(option['Bid']) and pd.notna(option['Ask']) and option['Bid'] > 0 and option['Ask'] > 0:
-                                    option_price = (option['Bid'] + option['Ask']) / 2
-                                
-                                if option_price and option_price > 0:
-                                    # Calculer le temps jusqu'à l'expiration
-                                    exp_date = datetime.strptime(best_expiration, "%Y-%m-%d")
-                                    hist_date = datetime.strptime(date_str, "%Y-%m-%d")
-                                    time_to_exp = (exp_date - hist_date).days / 365.25
-                                    
-                                    if time_to_exp > 0:
-                                        # Calculer la volatilité implicite avec Black-Scholes
-                                        iv = calculate_implied_volatility(
-                                            spot_price=spot_price,
-                                            strike=option['Strike'],
-                                            time_to_exp=time_to_exp,
-                                            option_price=option_price,
-                                            option_type=option['Type'].lower(),
-                                            risk_free_rate=0.05  # Taux sans risque approximatif
-                                        )
-                                        
-                                        # Filtrer les valeurs aberrantes plus strictement
-                                        if iv and 0.05 < iv < 1.0:  # IV entre 5% et 100%
-                                            calculated_ivs.append(iv)
-                                            
-                            except Exception:
-                                continue
-                        
-                        if calculated_ivs and len(calculated_ivs) >= 3:  # Au moins 3 IV valides
-                            avg_iv = sum(calculated_ivs) / len(calculated_ivs)
-                            
-                            # Validation supplémentaire de la cohérence
-                            iv_std = (sum((iv - avg_iv)**2 for iv in calculated_ivs) / len(calculated_ivs))**0.5
-                            
-                            # Si l'écart-type est trop élevé, filtrer les valeurs extrêmes
-                            if iv_std > 0.2:  # Écart-type > 20%
-                                filtered_ivs = [iv for iv in calculated_ivs if abs(iv - avg_iv) <= 2 * iv_std]
-                                if len(filtered_ivs) >= 3:
-                                    avg_iv = sum(filtered_ivs) / len(filtered_ivs)
-                                    calculated_ivs = filtered_ivs
-                            
-                            return {
-                                'Date': date_str,
-                                'Expiration': best_expiration,
-                                'Days_to_Exp': (datetime.strptime(best_expiration, "%Y-%m-%d") - datetime.strptime(date_str, "%Y-%m-%d")).days,
-                                'Spot_Price': spot_price,
-                                'ATM_Options_Count': len(atm_options),
-                                'Valid_IV_Count': len(calculated_ivs),
-                                'IV30': avg_iv
-                            }
-            
-            return None
-            
-        except Exception as e:
-            print(f"      ❌ Erreur pour {date_str}: {e}")
-            return None
-    
-    # Traitement parallèle des dates
-    all_iv_data = []
-    completed_count = 0
-    
-    print(f"   🚀 Démarrage du traitement parallèle...")
-    start_time = time.time()
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Soumettre toutes les tâches
-        future_to_date = {executor.submit(process_single_date, date): date for date in historical_dates}
-        
-        # Traiter les résultats au fur et à mesure
-        for future in as_completed(future_to_date):
-            date = future_to_date[future]
-            completed_count += 1
-            
-            try:
-                result = future.result()
-                if result:
-                    all_iv_data.append(result)
-                    print(f"      ✅ [{completed_count}/{len(historical_dates)}] {date}: IV30 = {result['IV30']:.4f}")
-                else:
-                    print(f"      ⚠️  [{completed_count}/{len(historical_dates)}] {date}: Aucune donnée")
-                    
-            except Exception as e:
-                print(f"      ❌ [{completed_count}/{len(historical_dates)}] {date}: Erreur - {e}")
-            
-            # Afficher le progrès
-            if completed_count % 10 == 0 or completed_count == len(historical_dates):
-                elapsed = time.time() - start_time
-                rate = completed_count / elapsed if elapsed > 0 else 0
-                eta = (len(historical_dates) - completed_count) / rate if rate > 0 else 0
-                print(f"   📊 Progrès: {completed_count}/{len(historical_dates)} ({completed_count/len(historical_dates)*100:.1f}%) - ETA: {eta:.1f}s")
-    
-    total_time = time.time() - start_time
-    print(f"   ⏱️  Traitement terminé en {total_time:.1f} secondes")
-    
-    if not all_iv_data:
+    builder = create_iv_history_builder(target_days=30, max_workers=max_workers)
+    df = builder.build("AAPL", days_back)
+    if df is None:
         print("❌ Aucune donnée IV30 récupérée")
         return None
     
-    # Créer le DataFrame
-    df = pd.DataFrame(all_iv_data)
-    
-    # Trier par date
-    df = df.sort_values('Date')
-    
-    # Convertir les colonnes numériques
-    df['IV30'] = pd.to_numeric(df['IV30'], errors='coerce')
-    df['Days_to_Exp'] = pd.to_numeric(df['Days_to_Exp'], errors='coerce')
-    df['Spot_Price'] = pd.to_numeric(df['Spot_Price'], errors='coerce')
-    
+    # Colonnes historiques de cette fonction: expiration réellement utilisée (proche, à défaut lointaine)
+    df["Expiration"] = df["Near_Expiration"].fillna(df["Far_Expiration"])
+    df["Days_to_Exp"] = pd.to_numeric(df["Near_Days"].fillna(df["Far_Days"]), errors="coerce")
+    df["ATM_Options_Count"] = pd.to_numeric(df["Valid_IV_Count"], errors="coerce")
+    df = df.rename(columns={"IV": "IV30"})
     print(f"✅ DataFrame IV30 créé avec {len(df)} points de données")
-    print(f"   📊 Période: {df['Date'].min()} à {df['Date'].max()}")
-    print(f"   📈 IV30 moyenne: {df['IV30'].mean():.4f}")
-    print(f"   📊 IV30 min/max: {df['IV30'].min():.4f} / {df['IV30'].max():.4f}")
-    print(f"   ⚡ Vitesse: {len(df)/total_time:.1f} points/seconde")
-    
     return df
 
 def get_aapl_historical_iv30(days_back: int = 30) -> Optional[pd.DataFrame]:
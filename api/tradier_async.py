@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Appels Tradier asynchrones (aiohttp) des routes d'options
+
+Expirations, chaînes et cotations récupérées en parallèle dans un event loop dédié
+(run_async), avec le même limiteur de débit, le même single-flight et la même
+capture / relecture que le client synchrone. Importé par le blueprint options uniquement.
+"""
+
+import sys
+import atexit
+import asyncio
+import warnings
+from typing import TYPE_CHECKING
+
+from .tradier_config import TRADIER_API_KEY
+from .rate_limiter import tradier_rate_limiter
+from .single_flight import tradier_flight, make_key
+from .replay import replay_transport
+from .resilience import tradier_guard, propagate, remaining, DeadlineExceeded
+from utils.metrics import UpstreamTimer
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Supprimer tous les warnings d'asyncio dès le début
+warnings.filterwarnings("ignore", category=RuntimeWarning, module="asyncio")
+warnings.filterwarnings("ignore", category=DeprecationWarning, module="asyncio")
+warnings.filterwarnings("ignore", message=".*Event loop is closed.*")
+warnings.filterwarnings("ignore", message=".*_ProactorBasePipeTransport.*")
+warnings.filterwarnings("ignore", message=".*coroutine.*was never awaited.*")
+warnings.filterwarnings("ignore", message=".*Task was destroyed but it is pending.*")
+warnings.filterwarnings("ignore", message=".*unclosed.*transport.*")
+warnings.filterwarnings("ignore", message=".*unclosed.*client.*session.*")
+
+
+# Classe pour les appels asynchrones Tradier
+# aiohttp (~100 ms d'import) n'est chargé qu'au premier appel asynchrone, pas au démarrage du worker
+class AsyncTradierAPI:
+    """Classe pour gérer les appels asynchrones à l'API Tradier"""
+    
+    def __init__(self, token: str):
+        self.token = token
+        self.base_url = "https://api.tradier.com/v1"
+        self.headers = {
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/json'
+        }
+    
+    async def get_expirations(self, session: 'aiohttp.ClientSession', symbol: str) -> dict:
+        """Récupère les expirations pour un symbole de manière asynchrone (appels simultanés regroupés)"""
+        return await tradier_flight.do_async(make_key("async_expirations", symbol),
+                                             lambda: self._fetch_expirations(session, symbol))
+    
+    async def _fetch_expirations(self, session: 'aiohttp.ClientSession', symbol: str) -> dict:
+        """Récupère les expirations pour un symbole de manière asynchrone"""
+        try:
+            url = f"{self.base_url}/markets/options/expirations"
+            params = {'symbol': symbol}
+            
+            import aiohttp
+            # Disjoncteur (échec immédiat si Tradier est tombé, traité par le except ci-dessous)
+            # et timeout adaptatif borné par le budget de temps de la requête
+            with tradier_guard.call() as guard:
+                if not replay_transport.replaying:
+                    if not await tradier_rate_limiter.acquire_async(timeout=remaining()):
+                        raise DeadlineExceeded("Budget de temps épuisé en attente d'un jeton Tradier")
+                guard.begin()
+                timeout = aiohttp.ClientTimeout(total=guard.timeout)
+                with UpstreamTimer("tradier", "/markets/options/expirations") as call:
+                    async with replay_transport.async_get("tradier", session, url, params=params, timeout=timeout) as response:
+                        call.status = response.status
+                        guard.ok = response.status < 500
+                        tradier_rate_limiter.update_from_headers(response.headers)
+                        if response.status == 429:
+                            tradier_rate_limiter.on_throttled(response.headers)
+                        if response.status == 200:
+                            data = await response.json()
+                            return {
+                                'success': True,
+                                'data': data,
+                                'expirations': data.get('expirations', {}).get('date', [])
+                            }
+                        else:
+                            return {
+                                'success': False,
+                                'error': f'HTTP {response.status}',
+                                'expirations': []
+                            }
+        except asyncio.TimeoutError:
+            return {
+                'success': False,
+                'error': 'Timeout lors de la requête',
+                'expirations': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'expirations': []
+            }
+    
+    async def get_options(self, session: 'aiohttp.ClientSession', symbol: str, expiration: str) -> dict:
+        """Récupère les options pour un symbole et une expiration de manière asynchrone (appels simultanés regroupés)"""
+        return await tradier_flight.do_async(make_key("async_options", symbol, expiration),
+                                             lambda: self._fetch_options(session, symbol, expiration))
+    
+    async def _fetch_options(self, session: 'aiohttp.ClientSession', symbol: str, expiration: str) -> dict:
+        """Récupère les options pour un symbole et une expiration de manière asynchrone"""
+        try:
+            url = f"{self.base_url}/markets/options/chains"
+            params = {
+                'symbol': symbol,
+                'expiration': expiration,
+                'greeks': 'true'
+            }
+            
+            import aiohttp
+            # Disjoncteur (échec immédiat si Tradier est tombé, traité par le except ci-dessous)
+            # et timeout adaptatif borné par le budget de temps de la requête
+            with tradier_guard.call() as guard:
+                if not replay_transport.replaying:
+                    if not await tradier_rate_limiter.acquire_async(timeout=remaining()):
+                        raise DeadlineExceeded("Budget de temps épuisé en attente d'un jeton Tradier")
+                guard.begin()
+                timeout = aiohttp.ClientTimeout(total=guard.timeout)
+                with UpstreamTimer("tradier", "/markets/options/chains") as call:
+                    async with replay_transport.async_get("tradier", session, url, params=params, timeout=timeout) as response:
+                        call.status = response.status
+                        guard.ok = response.status < 500
+                        tradier_rate_limiter.update_from_headers(response.headers)
+                        if response.status == 429:
+                            tradier_rate_limiter.on_throttled(response.headers)
+                        if response.status == 200:
+                            data = await response.json()
+                            return {
+                                'success': True,
+                                'data': data,
+                                'options': data.get('options', {}).get('option', [])
+                            }
+                        else:
+                            return {
+                                'success': False,
+                                'error': f'HTTP {response.status}',
+                                'options': []
+                            }
+        except asyncio.TimeoutError:
+            return {
+                'success': False,
+                'error': 'Timeout lors de la requête',
+                'options': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'options': []
+            }
+    
+    async def get_quote(self, session: 'aiohttp.ClientSession', symbol: str) -> dict:
+        """Récupère le prix spot d'une action de manière asynchrone (appels simultanés regroupés)"""
+        return await tradier_flight.do_async(make_key("async_quote", symbol),
+                                             lambda: self._fetch_quote(session, symbol))
+    
+    async def _fetch_quote(self, session: 'aiohttp.ClientSession', symbol: str) -> dict:
+        """Récupère le prix spot d'une action de manière asynchrone"""
+        try:
+            url = f"{self.base_url}/markets/quotes"
+            params = {'symbols': symbol}
+            
+            import aiohttp
+            # Disjoncteur (échec immédiat si Tradier est tombé, traité par le except ci-dessous)
+            # et timeout adaptatif borné par le budget de temps de la requête
+            with tradier_guard.call() as guard:
+                if not replay_transport.replaying:
+                    if not await tradier_rate_limiter.acquire_async(timeout=remaining()):
+                        raise DeadlineExceeded("Budget de temps épuisé en attente d'un jeton Tradier")
+                guard.begin()
+                timeout = aiohttp.ClientTimeout(total=guard.timeout)
+                with UpstreamTimer("tradier", "/markets/quotes") as call:
+                    async with replay_transport.async_get("tradier", session, url, params=params, timeout=timeout) as response:
+                        call.status = response.status
+                        guard.ok = response.status < 500
+                        tradier_rate_limiter.update_from_headers(response.headers)
+                        if response.status == 429:
+                            tradier_rate_limiter.on_throttled(response.headers)
+                        if response.status == 200:
+                            data = await response.json()
+                            quotes = data.get('quotes', {}).get('quote', [])
+                            if quotes:
+                                quote = quotes[0] if isinstance(quotes, list) else quotes
+                                return {
+                                    'success': True,
+                                    'data': data,
+                                    'spot_price': float(quote.get('last', 0))
+                                }
+                            else:
+                                return {
+                                    'success': False,
+                                    'error': 'No quote data',
+                                    'spot_price': 0
+                                }
+                        else:
+                            return {
+                                'success': False,
+                                'error': f'HTTP {response.status}',
+                                'spot_price': 0
+                            }
+        except asyncio.TimeoutError:
+            return {
+                'success': False,
+                'error': 'Timeout lors de la requête',
+                'spot_price': 0
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'spot_price': 0
+            }
+
+
+# Initialiser l'API Tradier asynchrone
+async_tradier_api = AsyncTradierAPI(TRADIER_API_KEY)
+
+
+# Fonction helper pour exécuter des fonctions async dans Flask
+def run_async(coro):
+    """Exécute une coroutine asynchrone dans le contexte Flask"""
+    import threading
+    import warnings
+    import gc
+    
+    # Supprimer tous les warnings d'asyncio
+    warnings.filterwarnings("ignore", category=RuntimeWarning, module="asyncio")
+    warnings.filterwarnings("ignore", category=DeprecationWarning, module="asyncio")
+    warnings.filterwarnings("ignore", message=".*Event loop is closed.*")
+    warnings.filterwarnings("ignore", message=".*_ProactorBasePipeTransport.*")
+    
+    # Créer un nouvel event loop pour chaque requête (évite les conflits)
+    def run_in_thread():
+        # Créer un nouvel event loop dans un thread séparé
+        new_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(new_loop)
+        
+        try:
+            return new_loop.run_until_complete(coro)
+        except Exception as e:
+            print(f"⚠️ Erreur dans run_async: {e}")
+            raise
+        finally:
+            # Nettoyage ultra-robuste pour Windows
+            try:
+                # Attendre que toutes les tâches en attente se terminent
+                pending = asyncio.all_tasks(new_loop)
+                if pending:
+                    # Annuler toutes les tâches en cours
+                    for task in pending:
+                        task.cancel()
+                    
+                    # Attendre que toutes les tâches se terminent avec timeout court
+                    try:
+                        new_loop.run_until_complete(asyncio.wait_for(
+                            asyncio.gather(*pending, return_exceptions=True),
+                            timeout=2.0
+                        ))
+                    except asyncio.TimeoutError:
+                        # Forcer l'arrêt si timeout
+                        pass
+                
+                # Fermer l'event loop proprement
+                if not new_loop.is_closed():
+                    new_loop.close()
+                
+                # Forcer le garbage collection pour nettoyer les transports
+                gc.collect()
+                
+            except Exception as cleanup_error:
+                # Ignorer complètement les erreurs de nettoyage sur Windows
+                pass
+    
+    # Exécuter dans un thread séparé pour éviter les conflits d'event loop
+    result = [None]
+    exception = [None]
+    
+    def target():
+        try:
+            result[0] = run_in_thread()
+        except Exception as e:
+            exception[0] = e
+    
+    # Le thread hérite du contexte de la requête (budget de temps, priorité Tradier)
+    thread = threading.Thread(target=propagate(target))
+    thread.start()
+    thread.join()
+    
+    # Forcer le garbage collection après le thread
+    gc.collect()
+    
+    if exception[0]:
+        raise exception[0]
+    
+    return result[0]
+
+
+# Fonction alternative synchrone pour éviter les problèmes asyncio
+def run_sync_fallback(func, *args, **kwargs):
+    """Fonction de fallback synchrone pour éviter les prcurrencies il faut s moi ce qui?oblèmes asyncio"""
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        print(f"⚠️ Erreur dans run_sync_fallback: {e}")
+        raise e
+
+
+# Fonction asynchrone pour récupérer les expirations
+async def get_expirations_async(symbol: str):
+    """Récupère les expirations de manière asynchrone"""
+    import aiohttp
+    async with aiohttp.ClientSession(headers=async_tradier_api.headers) as session:
+        result = await async_tradier_api.get_expirations(session, symbol)
+        
+        if result['success']:
+            exp_dates = result['expirations']
+            if not isinstance(exp_dates, list):
+                exp_dates = [exp_dates]
+            
+            # Formater les dates d'expiration
+            formatted_expirations = []
+            for exp_date in exp_dates:
+                try:
+                    # Calculer les jours jusqu'à l'expiration
+                    from datetime import datetime
+                    exp_datetime = datetime.strptime(exp_date, "%Y-%m-%d")
+                    today = datetime.now()
+                    days_to_exp = (exp_datetime - today).days
+                    
+                    # Vérifier que days_to_exp n'est pas None
+                    if days_to_exp is None:
+                        continue
+                    
+                    # Déterminer le type d'expiration
+                    if days_to_exp <= 7:
+                        exp_type = "Weekly"
+                    elif days_to_exp <= 30:
+                        exp_type = "Monthly"
+                    elif days_to_exp <= 90:
+                        exp_type = "Quarterly"
+                    else:
+                        exp_type = "Long-term"
+                    
+                    formatted_expirations.append({
+                        'date': exp_date,
+                        'days_to_exp': days_to_exp,
+                        'type': exp_type,
+                        'label': f"{exp_date} ({days_to_exp} jours)"
+                    })
+                except ValueError:
+                    continue
+            
+            return {
+                'success': True,
+                'expirations': formatted_expirations,
+                'count': len(formatted_expirations)
+            }
+        else:
+            return {
+                'success': False,
+                'error': result['error'],
+                'expirations': [],
+                'count': 0
+            }
+
+
+# Fonction asynchrone pour récupérer le prix spot
+async def get_quote_async(symbol: str):
+    """Récupère le prix spot de manière asynchrone"""
+    import aiohttp
+    async with aiohttp.ClientSession(headers=async_tradier_api.headers) as session:
+        result = await async_tradier_api.get_quote(session, symbol)
+        
+        if result['success']:
+            return {
+                'success': True,
+                'spot_price': result['spot_price'],
+                'symbol': symbol
+            }
+        else:
+            return {
+                'success': False,
+                'error': result['error'],
+                'spot_price': 0,
+                'symbol': symbol
+            }
+
+
+# Fonction asynchrone pour récupérer l'union des strikes
+async def get_strikes_union_async(symbol: str):
+    """Récupère l'union des strikes de plusieurs maturités de manière asynchrone"""
+    import aiohttp
+    async with aiohttp.ClientSession(headers=async_tradier_api.headers) as session:
+        # 1. Récupérer les expirations
+        expirations_result = await async_tradier_api.get_expirations(session, symbol)
+        
+        if not expirations_result['success']:
+            return {
+                'success': False,
+                'error': f"Erreur récupération expirations: {expirations_result['error']}",
+                'strikes': []
+            }
+        
+        expirations = expirations_result['expirations']
+        if not expirations:
+            return {
+                'success': False,
+                'error': 'Aucune expiration trouvée',
+                'strikes': []
+            }
+        
+        # 2. Sélectionner les maturités spécifiques (2ème, 5ème, 6ème, 8ème, 15ème)
+        selected_indices = [1, 4, 5, 7, 14]  # Indices 0-based
+        selected_expirations = []
+        
+        for idx in selected_indices:
+            if idx < len(expirations):
+                # expirations est une liste de strings (dates)
+                selected_expirations.append(expirations[idx])
+        
+        if not selected_expirations:
+            return {
+                'success': False,
+                'error': 'Pas assez d\'expirations disponibles',
+                'strikes': []
+            }
+        
+        print(f"📅 Maturités sélectionnées: {selected_expirations}")
+        
+        # 3. Récupérer les options pour chaque expiration en parallèle
+        tasks = []
+        for expiration in selected_expirations:
+            task = async_tradier_api.get_options(session, symbol, expiration)
+            tasks.append(task)
+        
+        # Exécuter toutes les tâches en parallèle
+        results = await asyncio.gather(*tasks)
+        
+        # 4. Traiter les résultats et extraire les strikes
+        all_strikes = set()
+        successful_expirations = 0
+        
+        for i, result in enumerate(results):
+            if result['success']:
+                options = result['options']
+                successful_expirations += 1
+                
+                for option in options:
+                    try:
+                        strike = float(option.get('strike', 0))
+                        all_strikes.add(strike)
+                    except (ValueError, TypeError):
+                        continue
+        
+        if not all_strikes:
+            return {
+                'success': False,
+                'error': 'Aucun strike trouvé',
+                'strikes': []
+            }
+        
+        # 5. Récupérer le prix spot pour le filtrage
+        spot_result = await async_tradier_api.get_quote(session, symbol)
+        spot_price = spot_result.get('spot_price', 0) if spot_result['success'] else 0
+        
+        # 6. Filtrer les strikes (multiples de 5 uniquement)
+        filtered_strikes = []
+        for strike in sorted(all_strikes):
+            # Filtrage: Garder seulement les multiples de 5 (divisibles par 5)
+            if strike % 5 == 0:
+                percentage = (strike / spot_price * 100) if spot_price > 0 else 0
+                filtered_strikes.append({
+                    'strike': strike,
+                    'percentage': percentage,
+                    'percentage_display': f"{percentage:.1f}% (${strike:.2f})"
+                })
+        
+        print(f"✅ Union terminée: {len(filtered_strikes)} strikes uniques (filtrés) pour {symbol} (Spot: ${spot_price:.2f})")
+        print(f"📊 Filtrage appliqué: divisibles par 5 uniquement")
+        
+        return {
+            'success': True,
+            'strikes': filtered_strikes,
+            'spot_price': spot_price,
+            'total_strikes': len(all_strikes),
+            'filtered_strikes': len(filtered_strikes),
+            'expirations_processed': successful_expirations,
+            'selected_expirations': selected_expirations
+        }
+
+
+def cleanup_async_resources():
+    """Nettoie les ressources asynchrones lors de la fermeture"""
+    import gc
+    import warnings
+    
+    # Supprimer tous les warnings pendant le nettoyage
+    warnings.filterwarnings("ignore")
+    
+    try:
+        # Obtenir l'event loop actuel
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            # Aucun event loop actuel
+            print("ℹ️ Aucun event loop actuel à nettoyer")
+            return
+        
+        if loop.is_closed():
+            print("ℹ️ Event loop déjà fermé")
+            return
+        
+        # Annuler toutes les tâches en cours
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            print(f"🔄 Annulation de {len(pending)} tâches en cours...")
+            for task in pending:
+                task.cancel()
+            
+            # Attendre que toutes les tâches se terminent avec un timeout court
+            try:
+                loop.run_until_complete(asyncio.wait_for(
+                    asyncio.gather(*pending, return_exceptions=True),
+                    timeout=2.0
+                ))
+            except (asyncio.TimeoutError, Exception):
+                # Ignorer les erreurs de timeout
+                pass
+        
+        # Fermer l'event loop proprement
+        if not loop.is_closed():
+            loop.close()
+            print("✅ Event loop fermé proprement")
+        
+    except Exception as e:
+        # Ignorer complètement les erreurs de nettoyage
+        pass
+    
+    # Nettoyage agressif des ressources
+    try:
+        # Forcer le garbage collection multiple fois
+        for _ in range(3):
+            gc.collect()
+        
+        # Nettoyer les connexions aiohttp restantes (si aiohttp a servi: ne pas l'importer à la fermeture)
+        try:
+            aiohttp = sys.modules.get('aiohttp')
+            # Fermer toutes les sessions aiohttp restantes
+            if aiohttp is not None and hasattr(aiohttp, '_connector_cleanup'):
+                aiohttp._connector_cleanup()
+        except:
+            pass
+        
+        print("✅ Nettoyage agressif effectué")
+    except Exception as e:
+        # Ignorer les erreurs de nettoyage
+        pass
+
+
+# Enregistrer le nettoyage à la fermeture du processus
+atexit.register(cleanup_async_resources)
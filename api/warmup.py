@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Préchauffage du cache pour les symboles les plus consultés
+
+Un thread par worker rejoue périodiquement, à travers l'application, les requêtes des pages
+pour une liste de symboles (WARMUP_SYMBOLS: SPY, QQQ, AAPL par défaut) et les données de marché
+Yahoo (indices et actions de YahooFinanceAPI): cotation, expirations, chaînes, volatilités
+implicites et surfaces sont recalculées et remises en cache avant que les utilisateurs ne les
+demandent. Le premier chargement d'une page pour un symbole populaire est ainsi une lecture de cache.
+
+- En séance, chaque cible est rafraîchie avant l'expiration de son cache
+- Hors séance (données figées, api/market_hours.py), la cible suivante est programmée à la
+  réouverture (au plus WARMUP_INTERVAL_CLOSED) et les réponses préchauffées restent en cache
+  jusque-là
+- Un seul worker préchauffe une cible donnée par intervalle (marqueur dans le cache partagé),
+  en priorité basse auprès du limiteur Tradier
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .cache import shared_cache, warming, MISSING, CACHE_TTLS
+from .market_hours import market_calendar
+from .rate_limiter import request_priority, PRIORITY_BACKGROUND
+from .replay import replay_transport
+from .tradier_config import is_tradier_configured
+from utils.metrics import INTERNAL_REQUEST_ENVIRON
+
+# En-tête Accept des pages (MLGBinary.ACCEPT): la variante binaire est mise en cache à part
+BINARY_ACCEPT = "application/x-mlg-binary, application/json;q=0.9"
+
+
+class WarmTarget(NamedTuple):
+    """Requête à préchauffer: chemin, en-tête Accept, type de donnée (clé de CACHE_TTLS) et séance (None = continue)"""
+    path: str
+    accept: Optional[str]
+    ttl_name: str
+    session: Optional[str] = None
+
+
+class CacheWarmer:
+    """
+    Préchauffage périodique des réponses des symboles populaires
+    """
+
+    def __init__(self, targets: List[WarmTarget], min_interval: float = 10.0, closed_interval: float = 6 * 3600,
+                 grace: float = 60.0, enabled: bool = True, cache=None):
+        """
+        Initialise le préchauffage
+
+        Args:
+            targets (List[WarmTarget]): Requêtes à préchauffer
+            min_interval (float): Intervalle minimal entre deux rafraîchissements d'une cible (secondes)
+            closed_interval (float): Intervalle maximal hors séance (secondes)
+            grace (float): Marge de durée de vie des réponses préchauffées au-delà de l'intervalle
+            enabled (bool): Préchauffage actif
+            cache (TieredCache, optional): Cache partagé entre workers (défaut: cache global)
+        """
+        self.targets = targets
+        self.min_interval = min_interval
+        self.closed_interval = closed_interval
+        self.grace = grace
+        self._enabled = enabled
+        self.cache = cache if cache is not None else shared_cache
+        self.app = None
+        self.last_run: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"runs": 0, "warmed": 0, "skipped": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        # Au rejeu, les réponses enregistrées ne doivent pas être consommées par le préchauffage
+        return self._enabled and bool(self.targets) and not replay_transport.replaying
+
+    def init_app(self, app) -> None:
+        """
+        Associe l'application (les cibles dont la route n'est pas montée sont ignorées)
+
+        Le thread n'est démarré que par start() (hook post_worker_init de gunicorn, lancement
+        direct de app.py): un client de test ou un script qui importe l'application ne préchauffe pas.
+        """
+        self.app = app
+        app.extensions["cache_warmer"] = self
+
+    def interval(self, target: WarmTarget) -> float:
+        """Intervalle de rafraîchissement d'une cible: avant l'expiration de son cache en séance, à la réouverture sinon"""
+        base = max(CACHE_TTLS.get(target.ttl_name, 60) * 0.8, self.min_interval)
+        if target.session is None:
+            return base
+        wait = market_calendar.seconds_until_open(session=target.session)
+        return base if wait == 0.0 else max(base, min(wait, self.closed_interval))
+
+    def start(self) -> None:
+        """Démarre le thread de préchauffage dans le processus courant s'il ne tourne pas déjà"""
+        if not self.enabled or self.app is None or (self._pid == os.getpid() and self._thread is not None):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mlg-cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        targets = self._mounted_targets()
+        print(f"🔥 Préchauffage du cache: {len(targets)} requêtes")
+        while not self._stop.is_set():
+            self.run_once(targets)
+            self._stop.wait(1.0)
+
+    def _mounted_targets(self) -> List[WarmTarget]:
+        from werkzeug.exceptions import HTTPException
+
+        adapter = self.app.url_map.bind("localhost")
+        mounted = []
+        for target in self.targets:
+            try:
+                adapter.match(target.path.split("?", 1)[0], method="GET")
+            except HTTPException:
+                continue
+            mounted.append(target)
+        return mounted
+
+    def run_once(self, targets: Optional[List[WarmTarget]] = None) -> int:
+        """
+        Rafraîchit les cibles arrivées à échéance (non rafraîchies par un autre worker)
+
+        Returns:
+            int: Nombre de cibles rafraîchies
+        """
+        warmed = 0
+        client = self.app.test_client()
+        # Un seul bloc pour le passage: une chaîne commune à plusieurs cibles n'est rechargée qu'une fois
+        with warming(self.grace) as state, request_priority(PRIORITY_BACKGROUND):
+            for target in targets if targets is not None else self._mounted_targets():
+                interval = self.interval(target)
+                marker = f"warmup|{target.path}|{target.accept or ''}"
+                if self.cache.get(marker) is not MISSING:
+                    with self._lock:
+                        self.stats["skipped"] += 1
+                    continue
+                # Réserver la cible avant la requête: les autres workers passent leur tour
+                self.cache.set(marker, os.getpid(), interval)
+                state["ttl"] = interval + self.grace
+                started = time.perf_counter()
+                try:
+                    # Requête marquée interne: hors histogrammes de /metrics et du profilage par échantillonnage
+                    response = client.get(target.path, headers={"Accept": target.accept} if target.accept else None,
+                                          environ_base={INTERNAL_REQUEST_ENVIRON: True})
+                    status = response.status_code
+                    response.close()
+                except Exception as e:
+                    status = None
+                    print(f"⚠️  Préchauffage {target.path}: {e}")
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self.last_run[target.path] = {
+                        "status": status, "duration_ms": round(elapsed_ms, 1), "at": time.time(), "interval": interval,
+                    }
+                    if status == 200:
+                        self.stats["warmed"] += 1
+                        warmed += 1
+                    else:
+                        self.stats["errors"] += 1
+        with self._lock:
+            self.stats["runs"] += 1
+        return warmed
+
+    def get_status(self) -> Dict[str, Any]:
+        """État du préchauffage (pour /health)"""
+        now = time.time()
+        with self._lock:
+            targets = {name: {"status": run["status"], "duration_ms": run["duration_ms"], "interval": run["interval"],
+                              "ago_s": round(now - run["at"], 1)}
+                       for name, run in self.last_run.items()}
+            return {
+                "enabled": self.enabled,
+                "running": self._thread is not None and self._pid == os.getpid(),
+                "us_market_open": market_calendar.is_open(session="us"),
+                "targets": targets,
+                **self.stats,
+            }
+
+
+def default_targets(symbols: List[str], span: str = "0.3") -> List[WarmTarget]:
+    """
+    Requêtes des pages pour les symboles populaires
+
+    Args:
+        symbols (List[str]): Symboles Tradier à préchauffer
+        span (str): Paramètre span de la surface (valeur chargée par volatility_surface.html)
+    """
+    # Données de marché: indices et actions de toutes les places, forex et crypto (cotation continue)
+    targets = [WarmTarget("/api/market-data", None, "market_data")]
+    for symbol in symbols:
+        targets += [
+            WarmTarget(f"/api/tradier/expirations/{symbol}", None, "tradier_expirations", "us"),
+            # Variante binaire: celle que volatility_surface.html demande
+            WarmTarget(f"/api/vol-surface-3d-tradier-simple/{symbol}?span={span}", BINARY_ACCEPT, "surface", "us"),
+        ]
+    return targets
+
+
+def create_cache_warmer_from_env() -> CacheWarmer:
+    """
+    Crée le préchauffage selon l'environnement
+
+    Variables:
+        WARMUP_ENABLED: Préchauffage actif (défaut: true)
+        WARMUP_SYMBOLS: Symboles préchauffés, séparés par des virgules (défaut: SPY,QQQ,AAPL)
+        WARMUP_SPAN: Paramètre span des surfaces préchauffées (défaut: 0.3)
+        WARMUP_MIN_INTERVAL: Intervalle minimal entre deux rafraîchissements d'une cible (défaut: 10)
+        WARMUP_INTERVAL_CLOSED: Intervalle maximal hors séance en secondes (défaut: 21600)
+    """
+    symbols = [s.strip().upper() for s in os.getenv("WARMUP_SYMBOLS", "SPY,QQQ,AAPL").split(",") if s.strip()]
+    if not is_tradier_configured():
+        # Sans clé Tradier, seules les données Yahoo sont préchauffées
+        symbols = []
+    return CacheWarmer(
+        targets=default_targets(symbols, os.getenv("WARMUP_SPAN", "0.3")),
+        min_interval=float(os.getenv("WARMUP_MIN_INTERVAL", "10")),
+        closed_interval=float(os.getenv("WARMUP_INTERVAL_CLOSED", str(6 * 3600))),
+        enabled=os.getenv("WARMUP_ENABLED", "true").lower() == "true",
+    )
+
+
+# Instance globale (démarrée dans chaque worker)
+cache_warmer = create_cache_warmer_from_env()
@@ -4,6 +4,13 @@ import time
 from datetime import datetime, timedelta
 import random
 
+from .single_flight import yahoo_flight, make_key
+from .cache import shared_cache, CACHE_TTLS
+from .market_hours import market_calendar
+from .replay import replay_transport
+from .resilience import yahoo_guard, propagate
+from utils.metrics import observe_upstream
+
 class YahooFinanceAPI:
     def __init__(self):
         self.session = requests.Session()
@@ -150,6 +157,28 @@ class YahooFinanceAPI:
         
 
     def get_quote(self, symbol):
+        """Récupère les données de cotation pour un symbole (cache partagé, appels simultanés regroupés)"""
+        # Marché fermé: la cotation reste en cache jusqu'à la réouverture
+        return shared_cache.get_or_set(make_key("yahoo_quote", symbol), lambda: self._fetch_quote(symbol),
+                                       market_calendar.cache_ttl(CACHE_TTLS["quote"], symbol), flight=yahoo_flight)
+
+    def _get(self, url, params):
+        """GET Yahoo instrumenté (latence et statut par endpoint dans /metrics, enregistrement / rejeu)"""
+        # Disjoncteur (échec immédiat si Yahoo est tombé) et timeout adaptatif borné par le budget de la requête;
+        # CircuitOpenError / DeadlineExceeded sont traitées par les appelants comme une erreur réseau
+        with yahoo_guard.call() as call:
+            started = time.perf_counter()
+            try:
+                response = replay_transport.get("yahoo", url, params,
+                                                lambda: self.session.get(url, params=params, timeout=call.timeout))
+            except requests.exceptions.RequestException as e:
+                observe_upstream("yahoo", "/v8/finance/chart", type(e).__name__, time.perf_counter() - started)
+                raise
+            observe_upstream("yahoo", "/v8/finance/chart", response.status_code, time.perf_counter() - started)
+            call.ok = response.status_code < 500
+        return response
+
+    def _fetch_quote(self, symbol):
         """Récupère les données de cotation pour un symbole"""
         try:
             # URL de l'API Yahoo Finance
@@ -162,7 +191,7 @@ class YahooFinanceAPI:
                 'events': 'div,split'
             }
             
-            response = self.session.get(url, params=params, timeout=5)
+            response = self._get(url, params)
             response.raise_for_status()
             
             data = response.json()
@@ -208,6 +237,26 @@ class YahooFinanceAPI:
             return None
 
     def get_market_data(self):
+        """Récupère les données de marché (cache partagé, appels simultanés regroupés en une seule collecte)"""
+        # Collecte vide (Yahoo injoignable): dernier instantané valide à la place
+        # Collecte espacée seulement quand toutes les places sont fermées (la crypto cote en continu)
+        symbols = [symbol for category in self.all_symbols().values() for symbol in category]
+        ttl = market_calendar.refresh_interval(CACHE_TTLS["market_data"], symbols)
+        return shared_cache.get_or_set(make_key("yahoo_market_data"), self._fetch_market_data,
+                                       ttl, flight=yahoo_flight,
+                                       valid=lambda data: bool(data and (data.get('indices') or data.get('stocks'))))
+
+    def all_symbols(self):
+        """Symboles Yahoo de la collecte de données de marché, par catégorie"""
+        return {
+            'indices': list(self.indices.values()),
+            'stocks': list(self.stocks),
+            'forex': list(self.forex),
+            'rates': list(self.rates),
+            'crypto': list(self.crypto),
+        }
+
+    def _fetch_market_data(self):
         """Récupère les données de marché pour tous les indices, actions, forex, taux d'intérêt et cryptomonnaies"""
         market_data = {
             'indices': {},
@@ -235,6 +284,9 @@ class YahooFinanceAPI:
                 })
             return None
         
+        # Les threads du pool héritent du budget de temps de la requête
+        fetch_quote = propagate(fetch_quote)
+        
         # Récupération parallèle avec ThreadPoolExecutor (réduire le nombre de workers)
         with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
             # Soumettre toutes les tâches
@@ -299,6 +351,14 @@ class YahooFinanceAPI:
         }
 
     def get_chart_data(self, symbol, timeframe="1mo", start=None, end=None):
+        """Récupère les données de graphique pour un symbole (cache partagé, appels simultanés regroupés)"""
+        key = make_key("yahoo_chart", symbol, timeframe=timeframe, start=start, end=end)
+        intraday = not (start and end) and timeframe in ("1d", "5d")
+        ttl = market_calendar.cache_ttl(CACHE_TTLS["chart_intraday"] if intraday else CACHE_TTLS["chart_daily"], symbol)
+        return shared_cache.get_or_set(key, lambda: self._fetch_chart_data(symbol, timeframe, start, end),
+                                       ttl, flight=yahoo_flight)
+
+    def _fetch_chart_data(self, symbol, timeframe="1mo", start=None, end=None):
         """Récupère les données de graphique pour un symbole"""
         try:
             # Si start et end sont fournis, utiliser period1 et period2
@@ -358,7 +418,7 @@ class YahooFinanceAPI:
                     'events': 'div,split'
                 }
             
-            response = self.session.get(url, params=params, timeout=5)
+            response = self._get(url, params)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1 @@
+# Package de benchmarks reproductibles (pricing, volatilité implicite, surfaces, sérialisation)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Chaînes d'options de référence pour les benchmarks (aucun appel réseau)
+
+Une fixture est un fichier JSON compressé (gzip) au format des réponses Tradier
+(/v1/markets/options/chains), une chaîne par expiration:
+
+    {"symbol": "SPY", "spot": 450.0, "as_of": "2025-01-15",
+     "chains": {"2025-02-21": [{"strike": ..., "option_type": "call", "bid": ..., "greeks": {...}}, ...]}}
+
+Au chargement, les dates d'expiration sont décalées pour conserver les mêmes maturités
+qu'à l'enregistrement: les résultats restent comparables d'un jour (et d'un commit) à l'autre.
+
+Régénérer la fixture synthétique par défaut:
+    python -m benchmarks.fixtures --write benchmarks/fixtures/spy_chain.json.gz
+"""
+
+import gzip
+import json
+import math
+import hashlib
+import argparse
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FIXTURE = "benchmarks/fixtures/spy_chain.json.gz"
+
+# Maturités (jours calendaires) de la fixture synthétique: hebdomadaires, mensuelles, trimestrielles
+DEFAULT_DAYS = (7, 14, 30, 45, 60, 91, 122, 182, 273, 365)
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def _smile_iv(moneyness: float, maturity: float) -> float:
+    """Smile paramétrique (skew equity) utilisé pour générer des prix cohérents"""
+    k = math.log(moneyness)
+    atm = 0.16 + 0.04 * math.exp(-maturity * 4.0)
+    skew = -0.35 / math.sqrt(max(maturity, 0.02))
+    return max(0.05, atm + 0.1 * skew * k + 0.9 * k * k / math.sqrt(max(maturity, 0.02)))
+
+
+def _black_scholes(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    if option_type == "call":
+        return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
+    return K * math.exp(-r * T) * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+
+
+def generate_fixture(symbol: str = "SPY", spot: float = 450.0, days: tuple = DEFAULT_DAYS,
+                     strike_step: float = 5.0, span: float = 0.3, rate: float = 0.05,
+                     seed: int = 42) -> Dict:
+    """
+    Génère une chaîne synthétique déterministe au format Tradier
+
+    Args:
+        symbol (str): Symbole du sous-jacent
+        spot (float): Prix spot
+        days (tuple): Maturités en jours calendaires
+        strike_step (float): Pas entre strikes
+        span (float): Plage de strikes autour du spot (0.3 = ±30%)
+        rate (float): Taux sans risque
+        seed (int): Graine du bruit sur les cotations
+
+    Returns:
+        Dict: Fixture (symbole, spot, date d'enregistrement, chaînes par expiration)
+    """
+    rng = np.random.default_rng(seed)
+    as_of = date.today()
+    strikes = np.arange(math.floor(spot * (1 - span) / strike_step) * strike_step,
+                        spot * (1 + span) + strike_step, strike_step)
+    chains = {}
+    for day_count in days:
+        expiration = (as_of + timedelta(days=day_count)).isoformat()
+        maturity = day_count / 365.0
+        options = []
+        for strike in strikes:
+            sigma = _smile_iv(strike / spot, maturity)
+            for option_type in ("call", "put"):
+                fair = _black_scholes(spot, strike, maturity, rate, sigma, option_type)
+                half_spread = max(0.01, fair * 0.02) * (1.0 + rng.random())
+                bid = max(0.0, round(fair - half_spread, 2))
+                ask = round(fair + half_spread, 2)
+                options.append({
+                    "symbol": f"{symbol}{expiration.replace('-', '')[2:]}{option_type[0].upper()}{int(strike * 1000):08d}",
+                    "underlying": symbol,
+                    "strike": float(strike),
+                    "option_type": option_type,
+                    "expiration_date": expiration,
+                    "bid": bid,
+                    "ask": ask,
+                    "last": round((bid + ask) / 2.0, 2),
+                    "volume": int(rng.integers(0, 5000)),
+                    "open_interest": int(rng.integers(0, 20000)),
+                    "greeks": {"mid_iv": round(sigma, 4), "smv_vol": round(sigma, 4)},
+                })
+        chains[expiration] = options
+    return {"symbol": symbol, "spot": spot, "rate": rate, "as_of": as_of.isoformat(), "chains": chains}
+
+
+def write_fixture(fixture: Dict, path: str) -> None:
+    """Écrit une fixture (JSON gzip, mtime fixe pour un fichier identique à contenu égal)"""
+    data = json.dumps(fixture, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(gzip.compress(data, mtime=0))
+
+
+def load_fixture(path: str = DEFAULT_FIXTURE, rebase: bool = True) -> Dict:
+    """
+    Charge une fixture
+
+    Args:
+        path (str): Fichier JSON (éventuellement gzip)
+        rebase (bool): Décaler les expirations pour conserver les maturités d'origine
+
+    Returns:
+        Dict: Fixture, avec "digest" (empreinte du fichier) pour comparer les résultats
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    fixture = json.loads(gzip.decompress(raw) if raw[:2] == b"\x1f\x8b" else raw)
+    fixture["digest"] = hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+    if rebase and fixture.get("as_of"):
+        shift = date.today() - date.fromisoformat(fixture["as_of"])
+        chains = {}
+        for expiration, options in fixture["chains"].items():
+            new_expiration = (date.fromisoformat(expiration) + shift).isoformat()
+            for option in options:
+                option["expiration_date"] = new_expiration
+            chains[new_expiration] = options
+        fixture["chains"] = chains
+        fixture["as_of"] = date.today().isoformat()
+    return fixture
+
+
+def fixture_frames(fixture: Dict) -> List[pd.DataFrame]:
+    """Une DataFrame par expiration (colonnes utilisées par process_volatility_surface_data)"""
+    frames = []
+    for expiration, options in fixture["chains"].items():
+        frames.append(pd.DataFrame({
+            "strike": [o["strike"] for o in options],
+            "type": [o["option_type"] for o in options],
+            "expiration_date": expiration,
+            "implied_volatility": [(o.get("greeks") or {}).get("mid_iv") for o in options],
+            "bid": [o["bid"] for o in options],
+            "ask": [o["ask"] for o in options],
+        }))
+    return frames
+
+
+def fixture_quotes(fixture: Dict, max_options: Optional[int] = None) -> List[Dict]:
+    """Options cotées (prix milieu > 0) avec leur maturité, pour les solveurs d'IV"""
+    today = date.fromisoformat(fixture["as_of"])
+    quotes = []
+    for expiration, options in fixture["chains"].items():
+        maturity = (date.fromisoformat(expiration) - today).days / 365.0
+        for option in options:
+            mid = (option["bid"] + option["ask"]) / 2.0
+            if mid > 0 and maturity > 0:
+                quotes.append({"strike": option["strike"], "option_type": option["option_type"],
+                               "maturity": maturity, "price": mid})
+    return quotes[:max_options] if max_options else quotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère la fixture synthétique des benchmarks")
+    parser.add_argument("--write", default=DEFAULT_FIXTURE, help="Fichier de sortie")
+    parser.add_argument("--symbol", default="SPY")
+    parser.add_argument("--spot", type=float, default=450.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fixture = generate_fixture(args.symbol, args.spot, seed=args.seed)
+    write_fixture(fixture, args.write)
+    count = sum(len(options) for options in fixture["chains"].values())
+    print(f"✅ Fixture écrite: {args.write} ({len(fixture['chains'])} expirations, {count} options)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Audit du temps de démarrage: coût de l'import de l'application (python -X importtime)
+
+Chaque mesure tourne dans un interpréteur neuf (aucun module en cache). On retient le meilleur
+de --repeat lancements pour le total, puis on détaille les modules les plus coûteux:
+- par coût cumulé (le module et tout ce qu'il importe), au premier niveau sous l'application
+- par coût propre (exécution du module lui-même)
+
+Les modules de DEFERRED sont volontairement importés à la première utilisation (aiohttp, plotly,
+openpyxl, ...): --check échoue si l'un d'eux est de nouveau chargé au démarrage.
+
+Exemples:
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --check --budget 900 --json importtime.json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules chargés à la première utilisation, jamais au démarrage d'un worker
+DEFERRED = ("aiohttp", "plotly", "openpyxl", "pyarrow.parquet", "gevent", "psutil")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Analyse la sortie de -X importtime
+
+    Returns:
+        List[Dict]: Un élément par module (name, self_ms, cumulative_ms, depth)
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules.append({
+                "name": match.group(4),
+                "self_ms": int(match.group(1)) / 1000.0,
+                "cumulative_ms": int(match.group(2)) / 1000.0,
+                "depth": (len(match.group(3)) - 1) // 2,
+            })
+    return modules
+
+
+def measure_import(module: str) -> Dict:
+    """
+    Importe un module dans un interpréteur neuf
+
+    Returns:
+        Dict: Modules importés, total (ms) et mémoire résidente maximale (Mo)
+    """
+    code = (f"import {module}, sys, resource; "
+            "sys.stderr.write('MLG_RSS_KB=%d\\n' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "échec de l'import")
+    modules = parse_importtime(proc.stderr)
+    rss = re.search(r"MLG_RSS_KB=(\d+)", proc.stderr)
+    target = next((m for m in reversed(modules) if m["name"] == module), None)
+    return {
+        "modules": modules,
+        "total_ms": target["cumulative_ms"] if target else sum(m["self_ms"] for m in modules),
+        "rss_mb": int(rss.group(1)) / 1024.0 if rss else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Coût de l'import de l'application (python -X importtime)")
+    parser.add_argument("--module", default="app", help="Module importé (défaut: app)")
+    parser.add_argument("--repeat", type=int, default=3, help="Lancements (on garde le plus rapide)")
+    parser.add_argument("--top", type=int, default=15, help="Nombre de modules détaillés")
+    parser.add_argument("--budget", type=float, help="Échec si le total dépasse ce nombre de ms")
+    parser.add_argument("--check", action="store_true", help="Échec si un module de DEFERRED est importé")
+    parser.add_argument("--json", dest="json_path", help="Écrire le détail dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    runs = [measure_import(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda run: run["total_ms"])
+    modules = best["modules"]
+
+    print(f"🚀 import {args.module}: {best['total_ms']:.0f} ms (meilleur de {len(runs)}), "
+          f"{len(modules)} modules, RSS {best['rss_mb']:.0f} Mo")
+
+    print("\n📦 Premier niveau, par coût cumulé")
+    first_level = sorted((m for m in modules if m["depth"] == 1), key=lambda m: m["cumulative_ms"], reverse=True)
+    for m in first_level[:args.top]:
+        print(f"   {m['cumulative_ms']:>8.1f} ms  {m['name']}")
+
+    print("\n⏱️  Par coût propre")
+    for m in sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:args.top]:
+        print(f"   {m['self_ms']:>8.1f} ms  {m['name']}")
+
+    loaded = {m["name"] for m in modules}
+    eager = [name for name in DEFERRED if name in loaded]
+    if eager:
+        print(f"\n⚠️  Modules différés chargés au démarrage: {', '.join(eager)}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "total_ms": best["total_ms"], "rss_mb": best["rss_mb"],
+                       "eager_deferred": eager, "modules": modules}, f, indent=2)
+        print(f"💾 Détail écrit dans {args.json_path}")
+
+    failed = False
+    if args.budget is not None and best["total_ms"] > args.budget:
+        print(f"❌ Budget dépassé: {best['total_ms']:.0f} ms > {args.budget:.0f} ms")
+        failed = True
+    if args.check and eager:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
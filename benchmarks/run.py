@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmarks reproductibles: pricing, volatilité implicite, grecques, surface, risque, sérialisation
+
+Tout tourne sur une fixture de chaîne d'options enregistrée (aucun appel réseau), avec des
+graines fixées. Chaque benchmark est calibré pour que chaque échantillon dure au moins
+--min-time secondes, puis répété --repeat fois: on retient le temps par appel (min, médiane).
+
+Exemples:
+    # Suite complète, résultats sauvegardés pour comparaison
+    python -m benchmarks.run --json bench-main.json
+
+    # Comparaison avec un commit précédent (échec si une médiane régresse de plus de 10%)
+    python -m benchmarks.run --compare bench-main.json --threshold 0.10 --fail-on-regression
+
+    # Un seul groupe
+    python -m benchmarks.run iv surface
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# Exécution depuis la racine du dépôt: python -m benchmarks.run (ou python benchmarks/run.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from benchmarks.fixtures import DEFAULT_FIXTURE, load_fixture
+from benchmarks.suite import select
+
+SEED = 1234
+
+
+def _environment(fixture: Dict) -> Dict:
+    """Contexte de la mesure (pour ne comparer que des résultats comparables)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    import pandas as pd
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "fixture": fixture.get("digest"),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    """
+    Mesure une fonction
+
+    Args:
+        func (Callable): Fonction mesurée
+        repeat (int): Nombre d'échantillons
+        min_time (float): Durée minimale d'un échantillon en secondes (calibre le nombre d'appels)
+
+    Returns:
+        Dict: Temps par appel en millisecondes (min, médiane, moyenne, écart-type) et appels par échantillon
+    """
+    # Échauffement (caches, imports paresseux) puis calibrage
+    np.random.seed(SEED)
+    func()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeat):
+        np.random.seed(SEED)
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1000.0)
+
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """
+    Compare les médianes à une référence
+
+    Args:
+        results (Dict): Résultats courants par benchmark
+        baseline (Dict): Résultats de référence par benchmark
+        threshold (float): Variation relative au-delà de laquelle un écart est signalé
+
+    Returns:
+        List[Dict]: Un élément par benchmark commun (ratio, statut)
+    """
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / reference["median_ms"]
+        status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "same"
+        rows.append({"name": name, "baseline_ms": reference["median_ms"], "current_ms": result["median_ms"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_ms(value: float) -> str:
+    if value >= 100:
+        return f"{value:.0f}"
+    if value >= 1:
+        return f"{value:.2f}"
+    return f"{value * 1000:.1f}µ"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks reproductibles du dashboard (sans réseau)")
+    parser.add_argument("patterns", nargs="*", help="Filtre par nom ou groupe (pricing, iv, greeks, surface, risk, json)")
+    parser.add_argument("--fixture", default=os.path.join(ROOT, DEFAULT_FIXTURE), help="Chaîne d'options enregistrée")
+    parser.add_argument("--repeat", type=int, default=7, help="Nombre d'échantillons par benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Durée minimale d'un échantillon (s)")
+    parser.add_argument("--json", dest="json_path", help="Écrire les résultats dans ce fichier JSON")
+    parser.add_argument("--compare", help="Résultats de référence (fichier JSON produit par --json)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variation relative signalée (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Code retour 1 si une régression est détectée")
+    parser.add_argument("--list", action="store_true", help="Lister les benchmarks et quitter")
+    args = parser.parse_args(argv)
+
+    benchmarks = select(args.patterns)
+    if args.list:
+        for bench in benchmarks:
+            print(f"{bench['name']:<34} {bench['description']}")
+        return 0
+    if not benchmarks:
+        print(f"❌ Aucun benchmark ne correspond à {args.patterns}")
+        return 1
+
+    # Les modules de l'application ne doivent rien écrire pendant les mesures
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    fixture = load_fixture(args.fixture)
+    environment = _environment(fixture)
+    print(f"🚀 {len(benchmarks)} benchmarks | commit {environment['commit']} | Python {environment['python']} "
+          f"| NumPy {environment['numpy']} | fixture {os.path.basename(args.fixture)} ({environment['fixture']})")
+    print(f"{'benchmark':<34} {'min ms':>9} {'médiane':>9} {'écart':>7} {'appels':>7}")
+
+    results: Dict[str, Dict] = {}
+    for bench in benchmarks:
+        try:
+            # Les print() des modules mesurés restent dans la mesure mais pas dans le terminal
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                func = bench["setup"](fixture)
+                result = measure(func, args.repeat, args.min_time)
+        except Exception as e:
+            print(f"{bench['name']:<34} ❌ {type(e).__name__}: {e}")
+            continue
+        results[bench["name"]] = {"group": bench["group"], **result}
+        spread = result["stdev_ms"] / result["median_ms"] * 100 if result["median_ms"] else 0.0
+        print(f"{bench['name']:<34} {_format_ms(result['min_ms']):>9} {_format_ms(result['median_ms']):>9} "
+              f"{spread:>6.1f}% {result['number']:>7}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_env = baseline.get("environment", {})
+        if base_env.get("fixture") != environment["fixture"] or base_env.get("machine") != environment["machine"]:
+            print("⚠️  Référence mesurée sur une autre fixture ou une autre machine: comparaison indicative")
+        print(f"\n📊 Comparaison avec {base_env.get('commit')} (seuil ±{args.threshold * 100:.0f}%)")
+        for row in compare(results, baseline.get("results", {}), args.threshold):
+            marker = {"regression": "🔴", "improvement": "🟢", "same": "⚪"}[row["status"]]
+            print(f"{marker} {row['name']:<34} {_format_ms(row['baseline_ms']):>9} → "
+                  f"{_format_ms(row['current_ms']):>9}  ×{row['ratio']:.2f}")
+            if row["status"] == "regression":
+                regressions.append(row["name"])
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment, "results": results}, f, indent=2)
+        print(f"💾 Résultats écrits dans {args.json_path}")
+
+    if len(results) < len(benchmarks):
+        return 1
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Définition des benchmarks
+
+Chaque benchmark est une fonction de préparation, enregistrée par @benchmark, qui reçoit
+la fixture et renvoie la fonction mesurée (sans argument). La préparation (imports,
+construction des entrées) n'est jamais chronométrée.
+"""
+
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.fixtures import fixture_frames, fixture_quotes
+
+# Paramètres d'une option de référence (ATM, 3 mois)
+S, K, T, R, SIGMA = 450.0, 450.0, 0.25, 0.05, 0.2
+
+BENCHMARKS: Dict[str, Dict] = {}
+
+
+def benchmark(name: str, group: str, description: str = ""):
+    """
+    Enregistre un benchmark
+
+    Args:
+        name (str): Identifiant stable (clé de comparaison entre commits)
+        group (str): Groupe (pricing, iv, greeks, surface, risk, json)
+        description (str): Description courte
+    """
+    def decorator(setup: Callable[[Dict], Callable[[], object]]):
+        BENCHMARKS[name] = {"name": name, "group": group, "description": description, "setup": setup}
+        return setup
+    return decorator
+
+
+def _app_module():
+    """Import différé de l'application (fournisseur JSON configuré)"""
+    import app
+    return app
+
+
+def _options_module():
+    """Import différé du blueprint options (solveur d'IV et traitement de surface y sont définis)"""
+    from routes import options
+    return options
+
+
+# ---------------------------------------------------------------------------
+# Pricing
+# ---------------------------------------------------------------------------
+
+@benchmark("pricing.bs_price_greeks", "pricing", "Black-Scholes prix + grecques, toute la chaîne")
+def _bs_chain(fixture):
+    from models.options_pricing import OptionPricer
+    pricer = OptionPricer()
+    quotes = fixture_quotes(fixture)
+    spot, rate = fixture["spot"], fixture.get("rate", R)
+
+    def run():
+        for q in quotes:
+            pricer.black_scholes_price_and_greeks(spot, q["strike"], q["maturity"], rate, SIGMA, q["option_type"])
+    return run
+
+
+@benchmark("pricing.mc_price_100k", "pricing", "Monte Carlo prix seul, 100 000 simulations")
+def _mc_price(fixture):
+    from models.options_pricing import OptionPricer
+    pricer = OptionPricer()
+    return lambda: pricer.monte_carlo_price(S, K, T, R, SIGMA, "call", 100_000, 252, return_std=True)
+
+
+@benchmark("pricing.mc_price_and_greeks_10k", "pricing", "Monte Carlo prix + grecques + 50 chemins, 10 000 × 252 pas")
+def _mc_greeks(fixture):
+    from models.options_pricing import OptionPricer
+    pricer = OptionPricer()
+    return lambda: pricer.monte_carlo_price_and_greeks(S, K, T, R, SIGMA, "call", 10_000, 252,
+                                                       return_std=True, return_paths=50)
+
+
+# ---------------------------------------------------------------------------
+# Volatilité implicite
+# ---------------------------------------------------------------------------
+
+@benchmark("iv.newton_app", "iv", "Solveur d'IV de l'application (app.py), toute la chaîne")
+def _iv_app(fixture):
+    solver = _options_module().calculate_implied_volatility_black_scholes
+    quotes = fixture_quotes(fixture)
+    spot = fixture["spot"]
+
+    def run():
+        for q in quotes:
+            solver(spot, q["strike"], q["maturity"], q["price"], q["option_type"])
+    return run
+
+
+@benchmark("iv.newton_tradier", "iv", "Solveur d'IV du module Tradier, toute la chaîne")
+def _iv_tradier(fixture):
+    from api.tradier_api import calculate_implied_volatility
+    quotes = fixture_quotes(fixture)
+    spot = fixture["spot"]
+
+    def run():
+        for q in quotes:
+            calculate_implied_volatility(spot, q["strike"], q["maturity"], q["price"], q["option_type"])
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Grecques
+# ---------------------------------------------------------------------------
+
+@benchmark("greeks.curves", "greeks", "Courbes des grecques sur la plage de spot")
+def _greek_curves(fixture):
+    from models.greeks_calculator import GreeksCalculator
+    calculator = GreeksCalculator()
+    return lambda: calculator.generate_greek_curves(S, K, T, R, SIGMA, "call")
+
+
+@benchmark("greeks.volatility_matrix", "greeks", "Matrice de sensibilité à la volatilité")
+def _vol_matrix(fixture):
+    from models.greeks_calculator import GreeksCalculator
+    calculator = GreeksCalculator()
+    return lambda: calculator.generate_volatility_sensitivity_matrix(S, K, T, R, SIGMA, "call")
+
+
+@benchmark("greeks.maturity_matrix", "greeks", "Matrice de sensibilité à la maturité")
+def _maturity_matrix(fixture):
+    from models.greeks_calculator import GreeksCalculator
+    calculator = GreeksCalculator()
+    return lambda: calculator.generate_maturity_sensitivity_matrix(S, K, T, R, SIGMA, "call")
+
+
+# ---------------------------------------------------------------------------
+# Surface
+# ---------------------------------------------------------------------------
+
+@benchmark("surface.process_data", "surface", "process_volatility_surface_data (pivot maturité × strike)")
+def _surface(fixture):
+    process = _options_module().process_volatility_surface_data
+    frames = fixture_frames(fixture)
+    symbol, spot = fixture["symbol"], fixture["spot"]
+
+    def run():
+        result = process([frame.copy() for frame in frames], symbol, spot, 0.3)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Métriques de risque
+# ---------------------------------------------------------------------------
+
+@benchmark("risk.all_metrics", "risk", "Métriques de risque sur 10 ans de clôtures journalières")
+def _risk(fixture):
+    from models.risk_metrics import RiskMetricsCalculator
+    calculator = RiskMetricsCalculator()
+    rng = np.random.default_rng(7)
+    log_returns = rng.normal(0.0003, 0.012, size=2520)
+    prices: List[float] = (100.0 * np.exp(np.cumsum(log_returns))).tolist()
+    return lambda: calculator.calculate_all_metrics(prices)
+
+
+# ---------------------------------------------------------------------------
+# Sérialisation des réponses
+# ---------------------------------------------------------------------------
+
+def _surface_payload(fixture) -> Dict:
+    return _options_module().process_volatility_surface_data(fixture_frames(fixture), fixture["symbol"], fixture["spot"], 0.3)
+
+
+@benchmark("json.surface_payload", "json", "Encodage JSON d'une réponse de surface (avec raw_options)")
+def _json_surface(fixture):
+    app_module = _app_module()
+    payload = _surface_payload(fixture)
+    provider = app_module.app.json
+    return lambda: provider.dumps_bytes(payload)
+
+
+@benchmark("json.greeks_payload", "json", "Encodage JSON des courbes de grecques")
+def _json_greeks(fixture):
+    from models.greeks_calculator import GreeksCalculator
+    payload = {"success": True, "curves": GreeksCalculator().generate_greek_curves(S, K, T, R, SIGMA, "call")}
+    provider = _app_module().app.json
+    return lambda: provider.dumps_bytes(payload)
+
+
+@benchmark("json.surface_binary", "json", "Encodage binaire (MLGB) de la même surface")
+def _binary_surface(fixture):
+    from utils.binary_transport import encode_binary
+    payload = _surface_payload(fixture)
+    return lambda: encode_binary(payload, json_default=str)
+
+
+def select(patterns: List[str]) -> List[Dict]:
+    """Benchmarks dont le nom ou le groupe contient l'un des motifs (tous si aucun motif)"""
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [b for b in BENCHMARKS.values()
+            if any(p in b["name"] or p == b["group"] for p in patterns)]
+
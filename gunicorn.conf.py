@@ -1,12 +1,26 @@
 # Configuration Gunicorn optimisée pour Render
+import importlib
 import multiprocessing
 import os
 
+# Profil de service: "sync" (défaut, plan gratuit) ou "gevent" (haute concurrence)
+# En profil gevent, chaque requête est une greenlet: les attentes Tradier / Yahoo
+# ne bloquent plus le worker et quelques centaines de connexions tiennent sur une instance
+profile = os.environ.get("GUNICORN_PROFILE", "sync").lower()
+
+if profile == "gevent":
+    # Patch avant l'import de l'application (preload_app) pour rendre requests,
+    # ssl, threading et time.sleep coopératifs
+    from gevent import monkey
+    monkey.patch_all()
+
 # Nombre de workers (1 pour le plan gratuit de Render)
-workers = 1
+# Le cache partagé (api/cache.py, SQLite sur /dev/shm) évite qu'un worker supplémentaire
+# multiplie les appels Tradier / Yahoo: augmenter WEB_CONCURRENCY selon les CPU disponibles
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
 
-# Nombre de threads par worker
-threads = 2
+# Nombre de threads par worker (profil sync; à régler d'après loadtest/scenarios.py)
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
 
 # Timeout en secondes (5 minutes)
 timeout = 300
@@ -18,6 +32,12 @@ max_requests_jitter = 100
 # Précharger l'application
 preload_app = True
 
+# Les modules lourds (aiohttp, openpyxl, plotly, pyarrow.parquet) sont importés à la première
+# utilisation, dans chaque worker. Avec plusieurs workers, PRELOAD_MODULES=aiohttp,openpyxl les
+# charge dans le master: leur mémoire est partagée par copy-on-write au lieu d'être dupliquée
+for _module in filter(None, (name.strip() for name in os.environ.get("PRELOAD_MODULES", "").split(","))):
+    importlib.import_module(_module)
+
 # Bind sur le port spécifié par Render
 bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 
@@ -44,13 +64,33 @@ max_requests_jitter = 100
 # Worker tmp directory
 worker_tmp_dir = "/dev/shm"
 
+# Profil haute concurrence
+if profile == "gevent":
+    worker_class = "gevent"
+    # Connexions simultanées par worker (les threads ne sont pas utilisés par gevent)
+    worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "500"))
+    threads = 1
+    # Les routes lentes n'occupent plus le worker: un timeout plus court protège des blocages CPU
+    timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+    keepalive = 5
+    # Un redémarrage toutes les 1000 requêtes coupe des centaines de connexions en cours:
+    # recyclage désactivé par défaut (la mémoire reste surveillée par /health)
+    max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+    max_requests_jitter = max_requests // 10
+
 # Hook pour nettoyer la mémoire
 def worker_exit(server, worker):
     import gc
     gc.collect()
 
 def on_starting(server):
-    print("🚀 Démarrage du serveur Gunicorn...")
+    print(f"🚀 Démarrage du serveur Gunicorn (profil {profile}, worker {worker_class})...")
+    # Instantanés de métriques d'un lancement précédent: repartir de zéro
+    from utils.metrics import metrics
+    if metrics.shared_dir:
+        for name in os.listdir(metrics.shared_dir):
+            if name.startswith("metrics-"):
+                os.remove(os.path.join(metrics.shared_dir, name))
 
 def on_reload(server):
     print("🔄 Rechargement du serveur...")
@@ -66,6 +106,16 @@ def post_fork(server, worker):
 
 def post_worker_init(worker):
     print(f"🔧 Initialisation du worker {worker.pid}")
+    # Préchauffage du cache des symboles populaires avant la première requête
+    # (enregistré par create_app seulement si un blueprint Tradier / Yahoo est monté)
+    cache_warmer = getattr(worker.wsgi, "extensions", {}).get("cache_warmer")
+    if cache_warmer is not None:
+        cache_warmer.start()
+
+def child_exit(server, worker):
+    # Compteurs du worker reportés dans l'instantané cumulé, ses jauges disparaissent de /metrics
+    from utils.metrics import metrics
+    metrics.retire(worker.pid)
 
 def worker_abort(worker):
     print(f"❌ Worker {worker.pid} interrompu")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test de charge: capacité en connexions simultanées du dashboard
+
+Ouvre N clients concurrents (paliers croissants) qui enchaînent les requêtes sur les
+routes du dashboard pendant une durée fixe, puis affiche latences, débit et taux d'erreur.
+Le palier retenu est le plus haut qui respecte les seuils d'erreur et de latence p95.
+
+Exemples:
+    # Serveur en profil gevent
+    GUNICORN_PROFILE=gevent gunicorn -c gunicorn.conf.py app:app
+
+    # Paliers 50 → 400 clients, 20 s chacun
+    python loadtest/concurrency.py --base-url http://localhost:5000 --levels 50,100,200,400 --duration 20
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, List
+
+import aiohttp
+
+# Routes consultées par un utilisateur du dashboard (pages + polling)
+DEFAULT_PATHS = [
+    "/health",
+    "/api/market-data",
+    "/api/crypto-data",
+    "/api/tradier/quote/SPY",
+    "/api/tradier/expirations/SPY",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile par rang le plus proche (valeurs en secondes)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def _client(session: aiohttp.ClientSession, base_url: str, paths: List[str], offset: int,
+                  stop_at: float, latencies: List[float], errors: Dict[str, int]) -> None:
+    """Un utilisateur simulé: enchaîne les routes en boucle jusqu'à la fin du palier"""
+    i = offset
+    while time.monotonic() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.monotonic()
+        try:
+            async with session.get(base_url + path) as response:
+                await response.read()
+                if response.status >= 500:
+                    errors[f"HTTP {response.status}"] = errors.get(f"HTTP {response.status}", 0) + 1
+                    continue
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            continue
+        latencies.append(time.monotonic() - started)
+
+
+async def run_level(base_url: str, paths: List[str], concurrency: int, duration: float,
+                    request_timeout: float) -> Dict:
+    """
+    Exécute un palier de charge
+
+    Args:
+        base_url (str): URL du serveur
+        paths (List[str]): Routes à interroger
+        concurrency (int): Nombre de clients simultanés
+        duration (float): Durée du palier en secondes
+        request_timeout (float): Timeout par requête en secondes
+
+    Returns:
+        Dict: Résultats du palier
+    """
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=False)
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.monotonic()
+        stop_at = started + duration
+        await asyncio.gather(*[
+            _client(session, base_url, paths, i, stop_at, latencies, errors)
+            for i in range(concurrency)
+        ])
+        elapsed = time.monotonic() - started
+
+    total = len(latencies) + sum(errors.values())
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": len(latencies),
+        "errors": errors,
+        "error_rate": (sum(errors.values()) / total) if total else 0.0,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capacité en connexions simultanées du dashboard")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--paths", default=",".join(DEFAULT_PATHS), help="Routes séparées par des virgules")
+    parser.add_argument("--levels", default="25,50,100,200,400", help="Paliers de clients simultanés")
+    parser.add_argument("--duration", type=float, default=15.0, help="Durée de chaque palier (s)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout par requête (s)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Taux d'erreur maximal accepté")
+    parser.add_argument("--max-p95-ms", type=float, default=2000.0, help="Latence p95 maximale acceptée")
+    parser.add_argument("--json", dest="json_path", help="Écrire les résultats dans ce fichier JSON")
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(f"🚀 Test de charge sur {args.base_url} ({len(paths)} routes, paliers {levels})")
+    print(f"{'clients':>8} {'requêtes':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erreurs':>8}")
+
+    results = []
+    capacity = 0
+    for level in levels:
+        result = asyncio.run(run_level(args.base_url, paths, level, args.duration, args.timeout))
+        results.append(result)
+        print(f"{level:>8} {result['requests']:>9} {result['throughput_rps']:>8.1f} "
+              f"{result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f} {result['p99_ms']:>8.0f} "
+              f"{result['error_rate'] * 100:>7.1f}%")
+        if result["error_rate"] <= args.max_error_rate and result["p95_ms"] <= args.max_p95_ms:
+            capacity = level
+        else:
+            print(f"⚠️  Seuils dépassés à {level} clients, arrêt de la montée en charge")
+            break
+
+    print(f"✅ Capacité soutenue: {capacity} clients simultanés "
+          f"(erreurs ≤ {args.max_error_rate * 100:.0f}%, p95 ≤ {args.max_p95_ms:.0f} ms)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"base_url": args.base_url, "paths": paths, "capacity": capacity, "levels": results}, f, indent=2)
+
+    return 0 if capacity else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Test de charge par scénarios: mélanges d'usage réalistes et rapport de latence par SLO
+
+Chaque utilisateur simulé choisit un scénario (selon les poids du mélange), enchaîne ses étapes
+avec des temps de réflexion, puis recommence jusqu'à la fin du palier:
+- dashboard: polling des marchés (indices, crypto, cotation)
+- surface: chargement de la page et de la surface de volatilité 3D
+- drilldown: expirations, smile et term structure d'un symbole
+- calculator: rafale de calculs (pricing Black-Scholes + Monte Carlo, grecques, matrices)
+
+Pour chaque palier et chaque scénario: débit, latences p50 / p95 / p99, taux d'erreur et respect
+du SLO (p95 maximal). La mémoire des workers est relevée pendant le palier via /metrics.
+
+À lancer contre l'application en mode rejeu (aucun appel Tradier / Yahoo réel, latences enregistrées):
+    REPLAY_MODE=replay TRADIER_API_KEY=replay WEB_CONCURRENCY=2 gunicorn -c gunicorn.conf.py app:app
+    python loadtest/scenarios.py --levels 10,25,50 --duration 30 --json results.json
+
+    # Un seul scénario, sans temps de réflexion
+    python loadtest/scenarios.py --mix calculator=1 --think-scale 0 --levels 4,8,16
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from concurrency import percentile  # noqa: E402
+
+BINARY_ACCEPT = "application/x-mlg-binary, application/json;q=0.9"
+
+CALCULATOR_BODY = {
+    "spotPrice": 100, "strikePrice": 100, "timeMaturity": 0.5, "riskFreeRate": 0.05,
+    "volatility": 0.2, "optionType": "call", "modelChoice": "both",
+    "numSimulations": 10000, "numSteps": 252, "numPaths": 50,
+}
+
+# Étapes: (nom, méthode, chemin, corps JSON, en-têtes). Le chemin peut utiliser {symbol}, {maturity}, {strike}
+SCENARIOS: Dict[str, Dict] = {
+    "dashboard": {
+        "description": "Polling des marchés",
+        "think_time": (3.0, 6.0),
+        "steps": [
+            ("market-data", "GET", "/api/market-data", None, None),
+            ("crypto-data", "GET", "/api/crypto-data", None, None),
+            ("quote", "GET", "/api/tradier/quote/{symbol}", None, None),
+        ],
+    },
+    "surface": {
+        "description": "Page et surface de volatilité 3D",
+        "think_time": (5.0, 10.0),
+        "steps": [
+            ("page", "GET", "/volatility-surface", None, None),
+            ("available-symbols", "GET", "/api/available-symbols", None, None),
+            ("surface", "GET", "/api/vol-surface-3d-tradier-simple/{symbol}?span=0.3", None, {"Accept": BINARY_ACCEPT}),
+        ],
+    },
+    "drilldown": {
+        "description": "Expirations, smile et term structure",
+        "think_time": (2.0, 5.0),
+        "steps": [
+            ("quote", "GET", "/api/tradier/quote/{symbol}", None, None),
+            ("expirations", "GET", "/api/tradier/expirations/{symbol}", None, None),
+            ("smile", "GET", "/api/volatility-smile-tradier/{symbol}?maturity={maturity}", None, None),
+            ("strikes-union", "GET", "/api/tradier/strikes-union/{symbol}", None, None),
+            ("term-structure", "GET", "/api/term-structure/{symbol}/{strike}", None, None),
+        ],
+    },
+    "calculator": {
+        "description": "Rafale de calculs d'options",
+        "think_time": (0.2, 1.0),
+        "steps": [
+            ("calculate-option", "POST", "/api/calculate-option", CALCULATOR_BODY, {"Accept": BINARY_ACCEPT}),
+            ("greeks-curves", "POST", "/api/greeks-curves", CALCULATOR_BODY, {"Accept": BINARY_ACCEPT}),
+            ("volatility-matrix", "POST", "/api/volatility-sensitivity-matrix", CALCULATOR_BODY, None),
+            ("maturity-matrix", "POST", "/api/maturity-sensitivity-matrix", CALCULATOR_BODY, None),
+        ],
+    },
+}
+
+DEFAULT_MIX = "dashboard=50,surface=15,drilldown=20,calculator=15"
+DEFAULT_SLO_MS = "dashboard=500,surface=3000,drilldown=2000,calculator=1500"
+
+_RSS_LINE = re.compile(r'^mlg_process_resident_memory_bytes(?:\{[^}]*pid="(\d+)"[^}]*\})?\s+([0-9.eE+]+)', re.M)
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    """'dashboard=50,surface=15' → {'dashboard': 50.0, 'surface': 15.0}"""
+    weights = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            weights[name.strip()] = float(value)
+    return weights
+
+
+class Recorder:
+    """Latences et erreurs par scénario et par étape"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.steps: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+
+    def ok(self, scenario: str, step: str, seconds: float) -> None:
+        self.latencies.setdefault(scenario, []).append(seconds)
+        self.steps.setdefault(f"{scenario}/{step}", []).append(seconds)
+
+    def error(self, scenario: str, kind: str) -> None:
+        errors = self.errors.setdefault(scenario, {})
+        errors[kind] = errors.get(kind, 0) + 1
+
+
+async def _spot_strike(session: aiohttp.ClientSession, base_url: str, symbol: str, cache: Dict[str, float]) -> float:
+    """Strike ATM (arrondi à 5) utilisé par la term structure, mis en cache par symbole"""
+    if symbol not in cache:
+        try:
+            async with session.get(f"{base_url}/api/tradier/quote/{symbol}") as response:
+                data = await response.json(content_type=None)
+                cache[symbol] = max(5.0, round(float(data.get("spot_price") or 100.0) / 5.0) * 5.0)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, TypeError):
+            cache[symbol] = 100.0
+    return cache[symbol]
+
+
+async def _user(session: aiohttp.ClientSession, base_url: str, mix: Dict[str, float], symbols: List[str],
+                think_scale: float, stop_at: float, recorder: Recorder, rng: random.Random,
+                strikes: Dict[str, float]) -> None:
+    """Un utilisateur simulé: scénario tiré selon le mélange, étapes enchaînées jusqu'à la fin du palier"""
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < stop_at:
+        name = rng.choices(names, weights)[0]
+        scenario = SCENARIOS[name]
+        symbol = rng.choice(symbols)
+        context = {"symbol": symbol, "maturity": rng.choice((30, 60, 90)), "strike": ""}
+        if any("{strike}" in step[2] for step in scenario["steps"]):
+            context["strike"] = f"{await _spot_strike(session, base_url, symbol, strikes):g}"
+
+        for step_name, method, path, body, headers in scenario["steps"]:
+            if time.monotonic() >= stop_at:
+                return
+            started = time.monotonic()
+            try:
+                async with session.request(method, base_url + path.format(**context), json=body,
+                                           headers=headers) as response:
+                    await response.read()
+                    if response.status >= 400:
+                        recorder.error(name, f"{step_name}: HTTP {response.status}")
+                    else:
+                        recorder.ok(name, step_name, time.monotonic() - started)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                recorder.error(name, f"{step_name}: {type(e).__name__}")
+            low, high = scenario["think_time"]
+            if think_scale > 0:
+                await asyncio.sleep(rng.uniform(low, high) * think_scale)
+
+
+async def _sample_memory(session: aiohttp.ClientSession, base_url: str, stop_at: float,
+                         samples: List[Dict[str, float]], interval: float = 2.0) -> None:
+    """Relève la mémoire résidente des workers (jauge par pid de /metrics)"""
+    while time.monotonic() < stop_at:
+        try:
+            async with session.get(f"{base_url}/metrics") as response:
+                text = await response.text()
+            per_pid = {pid or "worker": float(value) for pid, value in _RSS_LINE.findall(text)}
+            if per_pid:
+                samples.append(per_pid)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(interval)
+
+
+def _summarize(recorder: Recorder, elapsed: float, slo_ms: Dict[str, float], max_error_rate: float) -> Dict:
+    scenarios = {}
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        latencies = recorder.latencies.get(name, [])
+        error_count = sum(recorder.errors.get(name, {}).values())
+        total = len(latencies) + error_count
+        p95_ms = percentile(latencies, 95) * 1000
+        error_rate = error_count / total if total else 0.0
+        slo = slo_ms.get(name)
+        scenarios[name] = {
+            "requests": total,
+            "errors": recorder.errors.get(name, {}),
+            "error_rate": error_rate,
+            "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": p95_ms,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "slo_p95_ms": slo,
+            "slo_met": (slo is None or p95_ms <= slo) and error_rate <= max_error_rate,
+        }
+    steps = {name: {"requests": len(values), "p50_ms": percentile(values, 50) * 1000,
+                    "p95_ms": percentile(values, 95) * 1000}
+             for name, values in sorted(recorder.steps.items())}
+    return {"scenarios": scenarios, "steps": steps}
+
+
+async def run_level(base_url: str, users: int, duration: float, mix: Dict[str, float], symbols: List[str],
+                    think_scale: float, request_timeout: float, slo_ms: Dict[str, float],
+                    max_error_rate: float, seed: int) -> Dict:
+    """
+    Exécute un palier: N utilisateurs simultanés pendant une durée fixe
+
+    Args:
+        base_url (str): URL du serveur
+        users (int): Nombre d'utilisateurs simultanés
+        duration (float): Durée du palier en secondes
+        mix (Dict): Poids des scénarios
+        symbols (List[str]): Symboles consultés
+        think_scale (float): Facteur des temps de réflexion (0 = enchaînement immédiat)
+        request_timeout (float): Timeout par requête en secondes
+        slo_ms (Dict): p95 maximal par scénario (ms)
+        max_error_rate (float): Taux d'erreur maximal accepté
+        seed (int): Graine des tirages (scénarios, symboles, temps de réflexion)
+
+    Returns:
+        Dict: Résultats par scénario et par étape, mémoire des workers
+    """
+    recorder = Recorder()
+    memory: List[Dict[str, float]] = []
+    strikes: Dict[str, float] = {}
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    connector = aiohttp.TCPConnector(limit=users + 2)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        started = time.monotonic()
+        stop_at = started + duration
+        tasks = [_user(session, base_url, mix, symbols, think_scale, stop_at, recorder,
+                       random.Random(seed + i), strikes) for i in range(users)]
+        tasks.append(_sample_memory(session, base_url, stop_at, memory))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    result = {"users": users, "duration_s": elapsed, **_summarize(recorder, elapsed, slo_ms, max_error_rate)}
+    if memory:
+        totals = [sum(sample.values()) for sample in memory]
+        result["memory_mb"] = {
+            "workers": max(len(sample) for sample in memory),
+            "start_total": totals[0] / 1e6,
+            "peak_total": max(totals) / 1e6,
+            "end_total": totals[-1] / 1e6,
+            "peak_worker": max(max(sample.values()) for sample in memory) / 1e6,
+        }
+    result["slo_met"] = all(s["slo_met"] for s in result["scenarios"].values()) and bool(result["scenarios"])
+    return result
+
+
+def _print_level(result: Dict) -> None:
+    print(f"\n👥 {result['users']} utilisateurs ({result['duration_s']:.0f} s)")
+    print(f"{'scénario':<12} {'requêtes':>9} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'erreurs':>8} {'SLO p95':>8}")
+    for name, s in result["scenarios"].items():
+        slo = f"{s['slo_p95_ms']:.0f}" if s["slo_p95_ms"] is not None else "-"
+        print(f"{name:<12} {s['requests']:>9} {s['throughput_rps']:>7.1f} {s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f} "
+              f"{s['p99_ms']:>8.0f} {s['error_rate'] * 100:>7.1f}% {slo:>7} {'✅' if s['slo_met'] else '❌'}")
+    memory = result.get("memory_mb")
+    if memory:
+        print(f"💾 Mémoire ({memory['workers']} worker(s)): {memory['start_total']:.0f} → pic "
+              f"{memory['peak_total']:.0f} MB (max par worker {memory['peak_worker']:.0f} MB)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Test de charge par scénarios avec rapport SLO")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Poids des scénarios: " + ", ".join(SCENARIOS))
+    parser.add_argument("--levels", default="5,10,25,50", help="Paliers d'utilisateurs simultanés")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée de chaque palier (s)")
+    parser.add_argument("--symbols", default="SPY,QQQ,AAPL", help="Symboles consultés (présents dans le snapshot rejoué)")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="Facteur des temps de réflexion (0 = aucun)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout par requête (s)")
+    parser.add_argument("--slo", default=DEFAULT_SLO_MS, help="p95 maximal par scénario (ms)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Taux d'erreur maximal accepté")
+    parser.add_argument("--seed", type=int, default=1, help="Graine des tirages")
+    parser.add_argument("--keep-going", action="store_true", help="Continuer après un palier hors SLO")
+    parser.add_argument("--json", dest="json_path", help="Écrire les résultats dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    mix = _parse_weights(args.mix)
+    unknown = [name for name in mix if name not in SCENARIOS]
+    if unknown or not mix:
+        print(f"❌ Scénarios inconnus: {unknown} (disponibles: {', '.join(SCENARIOS)})")
+        return 2
+    slo_ms = _parse_weights(args.slo)
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(f"🚀 Scénarios {mix} sur {args.base_url}, paliers {levels}, {args.duration:.0f} s chacun")
+    results = []
+    capacity = 0
+    for level in levels:
+        result = asyncio.run(run_level(args.base_url, level, args.duration, mix, symbols, args.think_scale,
+                                       args.timeout, slo_ms, args.max_error_rate, args.seed))
+        results.append(result)
+        _print_level(result)
+        if result["slo_met"]:
+            capacity = level
+        elif not args.keep_going:
+            print(f"⚠️  SLO non respecté à {level} utilisateurs, arrêt de la montée en charge")
+            break
+
+    print(f"\n✅ Capacité dans les SLO: {capacity} utilisateurs simultanés")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"base_url": args.base_url, "mix": mix, "slo_ms": slo_ms, "capacity": capacity,
+                       "levels": results}, f, indent=2)
+    return 0 if capacity else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
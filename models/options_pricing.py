@@ -198,8 +198,9 @@ class OptionPricer:
             incp = (r - 0.5 * sigma * sigma) * dtp + sigma * math.sqrt(dtp) * Zp
             csum = np.cumsum(incp, axis=1)
             exp_csum = np.exp(csum)
-            paths = (S * np.hstack([np.ones((n_paths, 1)), exp_csum])).tolist()
-            time_grid = (np.arange(steps_used + 1) * dtp).tolist()
+            # Tableaux NumPy conservés tels quels: le fournisseur JSON les sérialise directement
+            paths = S * np.hstack([np.ones((n_paths, 1)), exp_csum])
+            time_grid = np.arange(steps_used + 1) * dtp
 
         out = {
             'price': float(price),
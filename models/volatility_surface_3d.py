@@ -1,10 +1,15 @@
-import plotly.graph_objects as go
-import plotly.express as px
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any
 import json
 
+# Plotly (plusieurs centaines de ms d'import) n'est chargé que pour construire une figure:
+# get_statistics() et to_json() n'en ont pas besoin
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 
 class VolatilitySurface3D:
     """
@@ -56,6 +61,8 @@ class VolatilitySurface3D:
         Returns:
             go.Figure: Figure Plotly avec la surface 3D
         """
+        import plotly.graph_objects as go
+        
         if not self.data or not self._validate_data():
             raise ValueError("Données invalides ou manquantes pour créer la surface 3D")
         
@@ -122,6 +129,8 @@ class VolatilitySurface3D:
         Returns:
             go.Figure: Figure Plotly avec le heatmap
         """
+        import plotly.graph_objects as go
+        
         if not self.data or not self._validate_data():
             raise ValueError("Données invalides ou manquantes pour créer le heatmap")
         
@@ -178,6 +187,8 @@ class VolatilitySurface3D:
         Returns:
             go.Figure: Figure Plotly avec les surfaces comparées
         """
+        import plotly.graph_objects as go
+        
         traces = []
         colors = ['Viridis', 'Plasma', 'Inferno', 'Magma']
         
@@ -334,6 +345,8 @@ class VolatilitySurface3D:
     
     def _create_spot_line(self) -> Optional[go.Scatter3d]:
         """Crée une ligne au niveau du prix spot."""
+        import plotly.graph_objects as go
+        
         if not self.data.get('spot_price'):
             return None
         
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Blueprints de l'application (montés par create_app() dans app.py)
+
+- ops: santé, métriques, profils, tâches de fond (toujours monté)
+- pages: pages HTML du dashboard
+- market_data: indices, actions, crypto, historiques et risque (Yahoo Finance)
+- options: surfaces, smiles, structure par terme, exports et routes Tradier
+- pricing: calculateur d'options et matrices de sensibilité (aucun appel réseau)
+
+Chaque blueprint crée ses clients à la première requête qui en a besoin (lazy):
+un worker qui ne monte que le pricing n'instancie ni client Tradier ni store de chaînes.
+"""
+
+import threading
+from functools import wraps
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def lazy(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Décorateur: l'instance est créée au premier appel puis réutilisée (une seule création par processus)
+
+    Exemple:
+        @lazy
+        def get_pricer():
+            return OptionPricer()
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+    return get
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Données de marché (Yahoo Finance): indices, actions, crypto, historiques et métriques de risque
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+
+from api.cache import shared_cache, cached_json_view
+from api.market_hours import market_calendar, session_name
+from models.risk_metrics import risk_calculator
+from routes import lazy
+
+bp = Blueprint("market_data", __name__)
+
+
+@lazy
+def get_yahoo_api():
+    """Client Yahoo Finance (importé et créé à la première requête)"""
+    from api.yahoo_finance_api import yahoo_api
+    return yahoo_api
+
+
+# Rafraîchissement automatique des pages de marché en séance (secondes)
+PAGE_REFRESH_INTERVAL = 300
+
+
+def _market_hours(categories):
+    """Ouverture et intervalle de rafraîchissement des pages par catégorie (jusqu'à la réouverture hors séance)"""
+    result = {}
+    for category, symbols in categories.items():
+        sessions = sorted({session_name(symbol) for symbol in symbols})
+        result[category] = {
+            'open': any(market_calendar.is_open(session=name) for name in sessions),
+            'sessions': sessions,
+            'refresh_interval': int(market_calendar.refresh_interval(PAGE_REFRESH_INTERVAL, sessions=sessions)),
+        }
+    return result
+
+
+# APIs pour les données financières
+@bp.route('/api/market-data')
+def api_market_data():
+    """API pour récupérer les données de marché"""
+    try:
+        # Utiliser le nouveau module Yahoo Finance API
+        data = get_yahoo_api().get_market_data()
+        
+        if data and (data.get('indices') or data.get('stocks')):
+            # Séances calculées à chaque requête (la collecte, elle, est en cache)
+            return jsonify({**data, 'market_hours': _market_hours(get_yahoo_api().all_symbols())})
+        else:
+            return jsonify({
+                'error': 'Impossible de récupérer les données via Yahoo Finance.',
+                'indices': {},
+                'stocks': {},
+                'forex': {},
+                'rates': {},
+                'crypto': {},
+                'timestamp': datetime.now().isoformat()
+            })
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/chart-data/<path:symbol>')
+def api_chart_data_legacy(symbol):
+    """API pour récupérer les données de graphique (route legacy)"""
+    return api_chart_data_v2(symbol)
+
+
+@bp.route('/api/chart-data-v2/<path:symbol>')
+def api_chart_data_v2(symbol):
+    """API pour récupérer les données de graphique avec timeframe"""
+    try:
+        # Récupérer le timeframe depuis les paramètres de requête
+        timeframe = request.args.get('timeframe', '1mo')
+        start = request.args.get('start')  # YYYY-MM-DD
+        end = request.args.get('end')      # YYYY-MM-DD
+        
+        # Utiliser le nouveau module Yahoo Finance API
+        test_data = get_yahoo_api().get_chart_data(symbol, timeframe, start, end)
+        
+        if test_data:
+            return jsonify(test_data)
+        else:
+            return jsonify({
+                'error': f'Impossible de récupérer les données pour {symbol}.',
+                'labels': [],
+                'datasets': []
+            })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/indices')
+def api_indices():
+    """API pour récupérer uniquement les indices"""
+    try:
+        data = get_yahoo_api().get_market_data()
+        return jsonify(data.get('indices', {}))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/stocks')
+def api_stocks():
+    """API pour récupérer uniquement les actions"""
+    try:
+        data = get_yahoo_api().get_market_data()
+        return jsonify(data.get('stocks', {}))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/risk-metrics/<symbol>')
+@cached_json_view(shared_cache, 'risk_metrics')
+def api_risk_metrics(symbol):
+    """Calculer les métriques de risque pour un symbole donné"""
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        
+        # Utiliser le nouveau module Yahoo Finance API avec les dates spécifiées
+        data = get_yahoo_api().get_chart_data(symbol, '1d', start, end)
+        
+        if not data or 'labels' not in data or 'datasets' not in data:
+            return jsonify({'error': 'Données indisponibles'}), 404
+        
+        # Extraire les prix de clôture
+        prices = [float(p) for p in data['datasets'][0]['data'] if p is not None and float(p) > 0]
+        
+        # Valider les données
+        is_valid, message = risk_calculator.validate_data(prices)
+        if not is_valid:
+            return jsonify({'error': message}), 400
+        
+        # Calculer toutes les métriques
+        metrics = risk_calculator.calculate_all_metrics(prices)
+        
+        # Ajouter les informations de période
+        result = {
+            'symbol': symbol,
+            **metrics,
+            'period': {
+                'start': data['labels'][0] if data['labels'] else None,
+                'end': data['labels'][-1] if data['labels'] else None,
+                'days': len(prices)
+            }
+        }
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# API: Données des cryptomonnaies
+@bp.route('/api/crypto-data')
+def api_crypto_data():
+    """API endpoint pour récupérer les données des cryptomonnaies"""
+    try:
+        data = get_yahoo_api().get_crypto_data()
+        return jsonify(data)
+    except Exception as e:
+        return jsonify({'error': f'Erreur lors de la récupération des données crypto: {str(e)}'}), 500
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Exploitation: santé, métriques Prometheus, profils enregistrés et tâches de fond
+
+Monté dans tous les profils de déploiement (chaque pool de workers est supervisé). Le cache
+partagé, le limiteur Tradier, les sondes et les disjoncteurs ne sont lus que si create_app les a
+chargés (blueprint market_data ou options monté): un pool pricing n'importe pas la pile amont.
+"""
+
+import os
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, has_app_context, jsonify, request, send_file, url_for
+
+from api.market_hours import market_calendar
+from utils.jobs import job_manager
+from utils.metrics import metrics
+
+bp = Blueprint("ops", __name__)
+
+
+def _upstream_loaded() -> bool:
+    """Pile amont chargée par create_app (sondes enregistrées dans app.extensions)"""
+    return has_app_context() and "health_prober" in current_app.extensions
+
+
+def _upstream_health() -> dict:
+    """Cache partagé, sondes, disjoncteurs et rejeu (None sans blueprint amont monté)"""
+    if not _upstream_loaded():
+        return {'cache': None, 'upstreams': None, 'circuits': None, 'replay': None}
+    from api.cache import shared_cache
+    from api.replay import replay_transport
+    from api.resilience import tradier_guard, yahoo_guard
+
+    return {
+        'cache': shared_cache.get_status(),
+        'upstreams': current_app.extensions['health_prober'].get_status(),
+        'circuits': {guard.name: guard.get_status() for guard in (tradier_guard, yahoo_guard)},
+        'replay': replay_transport.get_status(),
+    }
+
+
+# Route de santé pour surveiller l'application
+@bp.route('/health')
+def health_check():
+    """Route de santé pour surveiller l'état de l'application"""
+    try:
+        # Vérifier l'utilisation mémoire
+        import psutil
+        http_cache_ext = current_app.extensions.get('http_cache')
+        symbol_universe = current_app.extensions.get('symbol_universe')
+        cache_warmer = current_app.extensions.get('cache_warmer')
+        memory_usage = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+        
+        upstream = _upstream_health()
+
+        return jsonify({
+            'status': 'healthy',
+            'memory_usage_mb': round(memory_usage, 2),
+            'cache': upstream['cache'],
+            'blueprints': current_app.config.get('BLUEPRINTS'),
+            'http_cache': http_cache_ext.get_status() if http_cache_ext else None,
+            'upstreams': upstream['upstreams'],
+            'circuits': upstream['circuits'],
+            'replay': upstream['replay'],
+            'jobs': job_manager.get_status(),
+            'symbol_index': symbol_universe.get_status() if symbol_universe else None,
+            'warmup': cache_warmer.get_status() if cache_warmer else None,
+            'market_hours': market_calendar.get_status(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'unhealthy',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+
+def _collect_upstream_metrics():
+    """Compteurs du cache partagé, du single-flight, du limiteur Tradier, des sondes et des disjoncteurs"""
+    from api.cache import shared_cache, view_flight
+    from api.rate_limiter import tradier_rate_limiter
+    from api.resilience import tradier_guard, yahoo_guard
+    from api.single_flight import tradier_flight, yahoo_flight
+
+    health_prober = current_app.extensions['health_prober']
+    cache_stats = shared_cache.get_status()
+    yield ("cache_lookups_total", "counter", "Lectures du cache partagé par résultat",
+           [({"result": name}, cache_stats[name]) for name in ("memory_hits", "shared_hits", "misses")])
+    yield ("cache_sets_total", "counter", "Écritures dans le cache partagé", [({}, cache_stats["sets"])])
+    yield ("cache_stale_served_total", "counter", "Derniers instantanés valides servis après un échec amont",
+           [({}, cache_stats["stale_served"])])
+    yield ("cache_memory_entries", "gauge", "Entrées du LRU mémoire du worker", [({}, cache_stats["memory_entries"])])
+
+    flights = [flight.get_status() for flight in (tradier_flight, yahoo_flight, view_flight)]
+    for stat, help_text in (("calls", "Appels passés par le single-flight"),
+                            ("coalesced", "Appels regroupés sur un appel déjà en cours"),
+                            ("shared_hits", "Résultats relus depuis un autre worker")):
+        yield (f"single_flight_{stat}_total", "counter", help_text,
+               [({"group": f["name"]}, f[stat]) for f in flights])
+    yield ("single_flight_inflight", "gauge", "Appels amont en cours",
+           [({"group": f["name"]}, f["inflight"]) for f in flights])
+
+    limiter = tradier_rate_limiter.get_status()
+    yield ("tradier_rate_limit_tokens", "gauge", "Jetons disponibles du limiteur Tradier", [({}, limiter["tokens"])])
+    yield ("tradier_rate_limit_acquired_total", "counter", "Jetons consommés", [({}, limiter["acquired"])])
+    yield ("tradier_rate_limit_wait_seconds_total", "counter", "Attente cumulée pour un jeton",
+           [({}, limiter["waited_seconds"])])
+    yield ("tradier_rate_limit_throttled_total", "counter", "Réponses 429 de Tradier", [({}, limiter["throttled"])])
+
+    upstreams = {name: health_prober.status(name) for name in health_prober.upstreams}
+    yield ("upstream_probe_status", "gauge", "État sondé des amonts (1 = up, 0.5 = degraded, 0 = down)",
+           [({"provider": name}, {"up": 1, "degraded": 0.5, "down": 0}[state["status"]])
+            for name, state in upstreams.items() if state["status"] != "unknown"])
+    yield ("upstream_probe_latency_ms", "gauge", "Latence de la dernière sonde",
+           [({"provider": name}, state["latency_ms"]) for name, state in upstreams.items()
+            if state["latency_ms"] is not None])
+    yield ("upstream_fail_fast_total", "counter", "Appels abandonnés car l'amont est tombé",
+           [({"provider": name}, state["fail_fast"]) for name, state in upstreams.items()])
+
+    guards = (tradier_guard, yahoo_guard)
+    yield ("circuit_open", "gauge", "Disjoncteur ouvert ou semi-ouvert (1) ou fermé (0)",
+           [({"provider": guard.name}, 0 if guard.breaker.state == "closed" else 1) for guard in guards])
+    yield ("circuit_rejected_total", "counter", "Appels refusés par le disjoncteur",
+           [({"provider": guard.name}, guard.breaker.stats["rejected"]) for guard in guards])
+    yield ("upstream_timeout_seconds", "gauge", "Timeout adaptatif courant",
+           [({"provider": guard.name}, guard.adaptive.current()) for guard in guards])
+
+
+def _collect_runtime_metrics():
+    """Compteurs déjà tenus par le cache HTTP et, si la pile amont est chargée, par ses composants"""
+    if _upstream_loaded():
+        yield from _collect_upstream_metrics()
+
+    http_cache_ext = current_app.extensions.get('http_cache') if has_app_context() else None
+    if http_cache_ext is not None:
+        http_stats = http_cache_ext.get_status()
+        yield ("http_not_modified_total", "counter", "Réponses 304 (If-None-Match)", [({}, http_stats["not_modified"])])
+        yield ("http_compressed_total", "counter", "Réponses compressées", [({}, http_stats["compressed"])])
+        yield ("http_compression_saved_bytes_total", "counter", "Octets économisés par la compression",
+               [({}, http_stats["bytes_saved"])])
+
+    import psutil
+    yield ("process_resident_memory_bytes", "gauge", "Mémoire résidente du worker",
+           [({}, psutil.Process().memory_info().rss)])
+
+
+metrics.register_collector(_collect_runtime_metrics)
+
+
+# Métriques au format Prometheus, à côté de /health
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Route d'exposition des métriques (latences par route, appels amont, caches, solveur IV)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+# Profils enregistrés (même secret que le profilage à la demande)
+@bp.route('/api/profiles')
+def api_profiles():
+    """Liste des profils enregistrés, du plus récent au plus ancien"""
+    profiler = current_app.extensions.get('profiler')
+    if profiler is None or not profiler.authorized(request):
+        return jsonify({'error': 'Profilage non activé ou jeton invalide'}), 403
+    return jsonify({'profiles': profiler.list_profiles()[:100]})
+
+
+@bp.route('/api/profiles/<profile_id>')
+def api_profile_download(profile_id):
+    """Télécharge un profil (?format=text pour le résumé pstats d'un profil cProfile)"""
+    profiler = current_app.extensions.get('profiler')
+    if profiler is None or not profiler.authorized(request):
+        return jsonify({'error': 'Profilage non activé ou jeton invalide'}), 403
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        return jsonify({'error': f'Profil {profile_id} introuvable'}), 404
+    if request.args.get('format') == 'text' and path.endswith('.prof'):
+        return Response(profiler.summarize(path), mimetype='text/plain')
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=profile_id)
+
+
+def job_response(job):
+    """État public d'une tâche, avec les liens de suivi et de téléchargement"""
+    response = {key: value for key, value in job.items() if key not in ('key', 'pid', 'pid_token')}
+    response['status_url'] = url_for('ops.api_job_status', job_id=job['id'])
+    if job['status'] == 'done':
+        response['download_url'] = url_for('ops.api_job_download', job_id=job['id'])
+    return response
+
+
+@bp.route('/api/jobs', methods=['GET', 'POST'])
+def api_jobs():
+    """Liste des tâches (GET) ou soumission d'une tâche (POST {"kind": ..., "params": {...}})"""
+    # Protégé comme les profils (JOBS_SECRET): la liste donne les identifiants, donc les fichiers
+    # produits, et une soumission mobilise le quota Tradier et le disque
+    if not job_manager.authorized(request):
+        return jsonify({'error': 'Tâches de fond non activées ou jeton invalide'}), 403
+    
+    if request.method == 'GET':
+        return jsonify({'jobs': [job_response(job) for job in job_manager.list()], 'kinds': job_manager.kinds})
+    
+    # Types de tâches enregistrés par les blueprints montés (ex: surface_export par options)
+    body = request.get_json(silent=True) or {}
+    kind = body.get('kind')
+    params = job_manager.validate(kind, body.get('params') or {})
+    if isinstance(params, str):
+        return jsonify({'error': params}), 400
+    
+    job = job_manager.submit(kind, params)
+    return jsonify(job_response(job)), 202
+
+
+@bp.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def api_job_status(job_id):
+    """Progression d'une tâche (GET) ou demande d'annulation (DELETE)"""
+    if not job_manager.authorized(request):
+        return jsonify({'error': 'Tâches de fond non activées ou jeton invalide'}), 403
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Tâche {job_id} introuvable'}), 404
+    if request.method == 'DELETE':
+        if not job_manager.cancel(job_id):
+            return jsonify({'error': f'Tâche {job_id} déjà terminée ({job["status"]})'}), 409
+        job = job_manager.get(job_id)
+    return jsonify(job_response(job))
+
+
+@bp.route('/api/jobs/<job_id>/download')
+def api_job_download(job_id):
+    """Télécharge le fichier produit par une tâche terminée"""
+    if not job_manager.authorized(request):
+        return jsonify({'error': 'Tâches de fond non activées ou jeton invalide'}), 403
+    path = job_manager.artifact_path(job_id)
+    if path is None:
+        return jsonify({'error': f'Aucun fichier disponible pour la tâche {job_id}'}), 404
+    artifact = job_manager.get(job_id)['artifact']
+    return send_file(path, mimetype=artifact['mimetype'], as_attachment=True, download_name=artifact['filename'])
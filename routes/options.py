@@ -0,0 +1,2540 @@
+#!/usr/bin/env python3
+"""
+Analyse des options via Tradier: surfaces de volatilité, smiles, structure par terme,
+exports (en flux ou en tâche de fond) et routes de consultation Tradier
+
+La volatilité implicite est calculée avec Black-Scholes à partir des prix Tradier.
+Le client Tradier et le store de chaînes sont créés à la première requête.
+"""
+
+import gc
+import os
+import math
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from flask import Blueprint, current_app, jsonify, redirect, request
+
+from api.tradier_config import TRADIER_API_KEY, is_tradier_configured
+from api.tradier_api import TradierAPI
+from api.tradier_async import run_async, get_expirations_async, get_quote_async, get_strikes_union_async
+from api.chain_store import create_chain_store_from_env
+from api.iv_history import create_iv_history_builder
+from api.rate_limiter import tradier_rate_limiter, PRIORITY_BACKGROUND
+from api.cache import shared_cache, cached_json_view
+from api.health_probe import health_prober
+from api.resilience import propagate, without_deadline
+from api.symbol_index import create_symbol_universe_from_env
+from utils.logging_setup import get_logger, debug_enabled
+from utils.metrics import observe_iv_solver
+from utils.binary_transport import binary_capable
+from utils.http_cache import http_cache
+from utils.export import (EXPORT_FORMATS, chain_frames, iter_chain_csv, iter_surface_csv,
+                          iter_surface_xlsx, iter_parquet, iter_arrow, streaming_response)
+from utils.jobs import job_manager
+from routes import lazy
+from routes.ops import job_response
+
+bp = Blueprint("options", __name__)
+
+# Loggers par module (niveaux réglables via LOG_LEVELS, ex: "smile=DEBUG")
+memory_log = get_logger("memory")
+smile_log = get_logger("smile")
+surface_log = get_logger("surface")
+term_log = get_logger("term_structure")
+
+# Vérifier que les clés API sont disponibles
+if not is_tradier_configured():
+    print("❌ ERREUR: TRADIER_API_KEY non trouvée dans les variables d'environnement")
+    print("   L'application ne fonctionnera pas correctement")
+    print("   Créez un fichier .env avec: TRADIER_API_KEY=votre_clé")
+    print("   Obtenez votre clé gratuite sur: https://developer.tradier.com/")
+else:
+    print(f"✅ TRADIER_API_KEY chargée depuis le fichier .env: {TRADIER_API_KEY[:10]}...{TRADIER_API_KEY[-4:]}")
+    print("🔧 Configuration Tradier: OK")
+    print("📊 IMPORTANT: La volatilité implicite est CALCULÉE avec Black-Scholes (pas récupérée de l'API)")
+    print("🎯 L'API Tradier fournit les prix des options, nous calculons l'IV")
+
+
+@lazy
+def get_chain_store():
+    """Store local des chaînes historiques (CHAIN_STORE_*), créé à la première requête"""
+    return create_chain_store_from_env()
+
+
+@lazy
+def get_tradier_api():
+    """Client Tradier partagé par les routes (créé à la première requête)"""
+    return TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store())
+
+
+# Symboles recommandés dans les sélecteurs (complètent les symboles populaires)
+RECOMMENDED_SYMBOLS = [
+    {"symbol": "JPM", "name": "JPMorgan Chase & Co."},
+    {"symbol": "BAC", "name": "Bank of America Corp."},
+    {"symbol": "WMT", "name": "Walmart Inc."},
+    {"symbol": "JNJ", "name": "Johnson & Johnson"},
+    {"symbol": "PG", "name": "Procter & Gamble Co."},
+    {"symbol": "KO", "name": "Coca-Cola Co."},
+    {"symbol": "PFE", "name": "Pfizer Inc."},
+    {"symbol": "ABBV", "name": "AbbVie Inc."},
+    {"symbol": "V", "name": "Visa Inc."},
+    {"symbol": "MA", "name": "Mastercard Inc."},
+    {"symbol": "DIS", "name": "Walt Disney Co."}
+]
+
+
+@lazy
+def get_symbol_universe():
+    """Univers de symboles local (SYMBOL_INDEX_*), reconstruit chaque jour à partir de Tradier"""
+    tradier = get_tradier_api()
+    universe = create_symbol_universe_from_env(
+        lookup=tradier.lookup_symbols if is_tradier_configured() else None,
+        static_entries=tradier.get_popular_symbols() + RECOMMENDED_SYMBOLS,
+    )
+    current_app.extensions['symbol_universe'] = universe
+    return universe
+
+
+# Fonction pour surveiller l'utilisation mémoire
+def log_memory_usage():
+    """Log l'utilisation mémoire actuelle (niveau DEBUG du logger "memory")"""
+    if not memory_log.isEnabledFor(logging.DEBUG):
+        return
+    import psutil
+    memory_info = psutil.Process().memory_info()
+    memory_log.debug("📊 Utilisation mémoire: %.2f MB", memory_info.rss / 1024 / 1024,
+                     extra={"fields": {"rss_mb": round(memory_info.rss / 1024 / 1024, 2)}})
+
+
+# Fonction pour nettoyer la mémoire
+def cleanup_memory():
+    """Force le garbage collection pour libérer la mémoire"""
+    gc.collect()
+    log_memory_usage()
+
+
+def test_tradier_connectivity():
+    """
+    Connectivité avec l'API Tradier d'après la sonde de santé (aucun appel réseau)
+    
+    Returns:
+        bool: False si la dernière sonde a échoué (True si les sondes sont désactivées)
+    """
+    state = health_prober.status("tradier")
+    if state["status"] == "unknown" and health_prober.enabled:
+        # Aucune sonde encore faite dans ce worker (premier appel): sonder maintenant
+        state = health_prober.probe("tradier")
+    return state["status"] == "unknown" or state["consecutive_failures"] == 0
+
+
+def calculate_business_days_to_expiration(expiration_date_str):
+    """
+    Calcule le nombre de jours ouvrés jusqu'à l'expiration
+    
+    Args:
+        expiration_date_str (str): Date d'expiration au format "YYYY-MM-DD"
+        
+    Returns:
+        float: Nombre d'années (jours ouvrés / 252)
+    """
+    try:
+        from datetime import datetime, timedelta
+        
+        expiration_date = datetime.strptime(expiration_date_str, "%Y-%m-%d")
+        current_date = datetime.now()
+        
+        # Compter les jours ouvrés entre aujourd'hui et la date d'expiration
+        business_days = 0
+        current = current_date.date()
+        end = expiration_date.date()
+        
+        while current < end:
+            if current.weekday() < 5:  # lundi=0 .. vendredi=4
+                business_days += 1
+            current += timedelta(days=1)
+        
+        # Convertir en années (252 jours ouvrés par an)
+        years = max(0.001, business_days / 252.0)
+        return years
+        
+    except Exception as e:
+        print(f"❌ Erreur calcul jours ouvrés: {e}")
+        return 0.5  # Valeur par défaut
+
+
+def calculate_implied_volatility_black_scholes(spot_price: float, strike: float, time_to_exp: float, 
+                                             option_price: float, option_type: str, risk_free_rate: float = 0.05, 
+                                             dividend_yield: float = 0.0) -> float:
+    """
+    Calcule la volatilité implicite d'une option en utilisant la méthode de Newton-Raphson
+    avec le modèle de Black-Scholes
+    
+    Paramètres optimisés pour convergence avec les données d'images:
+    - Taux sans risque: 5% (optimisé pour options ATM)
+    - Rendement dividendes: 0% (simplifié pour convergence)
+    - Temps: Jours ouvrés / 252 (plus précis que jours calendaires)
+    
+    Args:
+        spot_price (float): Prix actuel de l'actif sous-jacent
+        strike (float): Prix d'exercice de l'option
+        time_to_exp (float): Temps jusqu'à l'expiration en années (jours ouvrés/252)
+        option_price (float): Prix observé de l'option
+        option_type (str): Type d'option ("call" ou "put")
+        risk_free_rate (float): Taux sans risque (par défaut: 5% - optimisé)
+        dividend_yield (float): Rendement des dividendes (par défaut: 0% - optimisé)
+        
+    Returns:
+        float: Volatilité implicite ou None si le calcul échoue
+    """
+    try:
+        # Fonction de distribution normale cumulative (approximation)
+        def norm_cdf(x):
+            return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+        
+        # Fonction de densité de probabilité normale
+        def norm_pdf(x):
+            return math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+        
+        # Fonction Black-Scholes avec dividendes
+        def black_scholes_price(S, K, T, r, sigma, option_type, q=0):
+            if T is None or T <= 0:
+                return max(S - K, 0) if option_type == "call" else max(K - S, 0)
+            
+            d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+            d2 = d1 - sigma * math.sqrt(T)
+            
+            if option_type == "call":
+                return S * math.exp(-q * T) * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d2)
+            else:  # put
+                return K * math.exp(-r * T) * norm_cdf(-d2) - S * math.exp(-q * T) * norm_cdf(-d1)
+        
+        # Fonction de vega (dérivée du prix par rapport à la volatilité) avec dividendes
+        def vega(S, K, T, r, sigma, q=0):
+            if T is None or T <= 0:
+                return 0
+            d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+            return S * math.exp(-q * T) * math.sqrt(T) * norm_pdf(d1)
+        
+        # Méthode de Newton-Raphson pour trouver la volatilité implicite
+        sigma = 0.2  # Estimation initiale
+        tolerance = 1e-6
+        max_iterations = 100
+        
+        result = "max_iterations"
+        for i in range(max_iterations):
+            try:
+                price = black_scholes_price(spot_price, strike, time_to_exp, risk_free_rate, sigma, option_type, dividend_yield)
+                vega_val = vega(spot_price, strike, time_to_exp, risk_free_rate, sigma, dividend_yield)
+                
+                if vega_val == 0:
+                    result = "no_vega"
+                    break
+                
+                diff = price - option_price
+                if abs(diff) < tolerance:
+                    observe_iv_solver(i + 1, "converged")
+                    return sigma
+                
+                sigma = sigma - diff / vega_val
+                
+                # S'assurer que la volatilité reste dans des limites raisonnables
+                sigma = max(0.001, min(3.0, sigma))
+                
+            except (ValueError, ZeroDivisionError, OverflowError):
+                result = "numeric_error"
+                break
+        
+        observe_iv_solver(i + 1, result)
+        return None
+        
+    except Exception:
+        return None
+
+
+def get_risk_free_rate():
+    """
+    Récupère le taux sans risque actuel (optimisé pour convergence avec Tradier)
+    """
+    try:
+        # Optimisé pour converger vers l'IV de Tradier (testé avec 2025-09-19)
+        # Le taux de 5% donne le meilleur écart moyen (13.13%)
+        return 0.05  # 5% - taux optimisé pour convergence avec Tradier
+    except:
+        return 0.05  # Fallback à 5%
+
+
+def get_dividend_yield(symbol):
+    """
+    Récupère le rendement des dividendes pour un symbole donné
+    """
+    try:
+        # Ajusté pour converger vers l'IV de Tradier
+        # Utiliser 0% de dividendes pour simplifier et converger vers l'IV de Tradier
+        return 0.0  # 0% - ajusté pour convergence avec Tradier
+    except:
+        return 0.0
+
+
+# API: surface de volatilité implicite
+@bp.route('/api/vol-surface/<symbol>')
+@binary_capable
+@cached_json_view(shared_cache, 'surface')
+def api_vol_surface(symbol):
+    """API endpoint pour récupérer les données de volatilité surface via Finnhub"""
+    try:
+        max_exp = int(request.args.get('maxExp', 6))
+        span = float(request.args.get('span', 0.5))
+        provider = request.args.get('provider', 'tradier')  # 'tradier' par défaut
+        
+        # Validation des paramètres
+        if max_exp < 1 or max_exp > 12:
+            return jsonify({'error': 'maxExp doit être entre 1 et 12'}), 400
+            
+        if span <= 0 or span > 1:
+            return jsonify({'error': 'span doit être entre 0 et 1'}), 400
+            
+        if provider != 'tradier':
+            return jsonify({'error': 'Seul le provider Tradier est supporté'}), 400
+        
+        print(f"🔴 Utilisation de Tradier pour {symbol}")
+        # Utiliser l'API Tradier pour les vraies données d'options
+        tradier = TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store())
+        
+        # Récupérer les dates d'expiration disponibles via Tradier
+        print(f"🔍 Récupération des expirations pour {symbol}...")
+        expirations_data = tradier.get_option_expirations(symbol)
+        print(f"📅 Expirations reçues: {expirations_data}")
+        
+        if not expirations_data or 'expirations' not in expirations_data or 'date' not in expirations_data['expirations']:
+            print(f"❌ Aucune expiration trouvée pour {symbol}")
+            return jsonify({
+                'error': f'Aucune date d\'expiration disponible pour {symbol}'
+            }), 404
+        
+        # Extraire les dates d'expiration
+        expirations = expirations_data['expirations']['date']
+        
+        # Limiter le nombre d'expirations selon maxExp
+        expirations_to_use = expirations[:max_exp]
+        
+        # Récupérer le prix spot actuel via Tradier
+        try:
+            quote_data = tradier.get_stock_quote(symbol)
+            if quote_data and 'quotes' in quote_data and 'quote' in quote_data['quotes']:
+                spot_price = float(quote_data['quotes']['quote'].get('last', 0))
+            else:
+                spot_price = 0
+        except:
+            spot_price = 0
+        
+        # Collecter toutes les données d'options pour toutes les expirations
+        all_options_data = []
+        
+        print(f"Test de {len(expirations_to_use)} expirations pour {symbol}")
+        
+        for expiration_date in expirations_to_use:
+            try:
+                # expiration_date est déjà au format 'YYYY-MM-DD'
+                print(f"Récupération des options pour {expiration_date}...")
+                
+                # Récupérer les données d'options pour cette expiration via Tradier
+                options_data = tradier.get_historical_options_data(symbol, expiration_date)
+                
+                if options_data is not None and not options_data.empty:
+                    print(f"✅ {len(options_data)} options trouvées pour {expiration_date}")
+                    # Renommer les colonnes pour correspondre au format attendu
+                    options_data = options_data.rename(columns={
+                        'Strike': 'strike',
+                        'Type': 'type',
+                        'Last': 'lastPrice',
+                        'Implied_Volatility': 'impliedVolatility',
+                        'Expiration': 'expiration_date'
+                    })
+                    # Convertir le type en minuscules
+                    options_data['type'] = options_data['type'].str.lower()
+                    all_options_data.append(options_data)
+                else:
+                    print(f"❌ Aucune option pour {expiration_date}")
+                    
+            except Exception as e:
+                print(f"Erreur pour l'expiration {expiration_date if 'expiration_date' in locals() else 'inconnue'}: {e}")
+                continue
+        
+        print(f"Total d'expirations avec données: {len(all_options_data)}")
+        
+        if not all_options_data:
+            print(f"❌ Aucune donnée d'options collectée pour {symbol}")
+            return jsonify({
+                'error': f'Aucune option disponible pour {symbol}'
+            }), 404
+        
+        # Combiner toutes les données
+        combined_data = pd.concat(all_options_data, ignore_index=True)
+        
+        # Filtrer par bande autour du spot si le prix spot est disponible
+        if spot_price > 0:
+            min_strike = spot_price * (1 - span)
+            max_strike = spot_price * (1 + span)
+            filtered_data = combined_data[
+                (combined_data['strike'] >= min_strike) & 
+                (combined_data['strike'] <= max_strike)
+            ]
+            
+            # Si le filtrage supprime trop de données, utiliser toutes les données
+            if len(filtered_data) < 10:
+                print(f"Filtrage trop restrictif, utilisation de toutes les données ({len(combined_data)} options)")
+                combined_data = combined_data
+            else:
+                combined_data = filtered_data
+        else:
+            print(f"Prix spot non disponible, utilisation de toutes les données ({len(combined_data)} options)")
+        
+        if combined_data.empty:
+            return jsonify({
+                'error': f'Aucune option disponible pour {symbol}'
+            }), 404
+        
+        # Organiser les données pour la surface de volatilité
+        # Extraire les strikes et expirations uniques
+        unique_strikes = sorted(combined_data['strike'].unique(), reverse=True)
+        unique_expirations = sorted(combined_data['expiration_date'].unique())
+        
+        # Calculer les maturités en années
+        current_date = datetime.now()
+        maturities = []
+        for exp_date in unique_expirations:
+            exp_datetime = datetime.strptime(exp_date, '%Y-%m-%d')
+            maturity = (exp_datetime - current_date).days / 365.25
+            # S'assurer que la maturité est positive et raisonnable
+            if maturity < 0:
+                print(f"⚠️  Maturité négative pour {exp_date}: {maturity:.4f} ans")
+                maturity = 0.01  # Maturité minimale
+            elif maturity > 5:
+                print(f"⚠️  Maturité très élevée pour {exp_date}: {maturity:.4f} ans")
+                maturity = 5.0  # Maturité maximale
+            maturities.append(maturity)
+        
+        # Créer la matrice de volatilité implicite
+        iv_matrix = []
+        for i, expiration in enumerate(unique_expirations):
+            row = []
+            for strike in unique_strikes:
+                # Trouver l'option correspondante
+                option = combined_data[
+                    (combined_data['expiration_date'] == expiration) & 
+                    (combined_data['strike'] == strike)
+                ]
+                
+                if not option.empty:
+                    # Prendre la moyenne des IV pour les calls et puts
+                    iv_values = option['impliedVolatility'].values
+                    # Filtrer les valeurs aberrantes (IV > 200% ou < 1%) et exclure les None
+                    valid_iv_values = [iv for iv in iv_values if iv is not None and 0.01 <= iv <= 2.0]
+                    
+                    if valid_iv_values:
+                        avg_iv = float(sum(valid_iv_values) / len(valid_iv_values))
+                        row.append(avg_iv)
+                    else:
+                        row.append(None)
+                else:
+                    row.append(None)
+            iv_matrix.append(row)
+        
+        # Calculer les statistiques sur les données filtrées
+        # Filtrer les données IV valides (exclure les None)
+        valid_iv_data = combined_data[
+            (combined_data['impliedVolatility'].notna()) &
+            (combined_data['impliedVolatility'] >= 0.01) & 
+            (combined_data['impliedVolatility'] <= 2.0)
+        ]
+        
+        if valid_iv_data.empty:
+            return jsonify({
+                'error': f'Aucune donnée IV valide pour {symbol}'
+            }), 404
+        
+        # Convertir le DataFrame en format JSON
+        result = {
+            'symbol': symbol,
+            'spot_price': spot_price,
+            'data_source': 'Tradier API (Données Réelles)',
+            'strikes': unique_strikes,
+            'maturities': maturities,
+            'iv': iv_matrix,
+            'total_options': len(combined_data),
+            'calls_count': len(combined_data[combined_data['type'] == 'call']),
+            'puts_count': len(combined_data[combined_data['type'] == 'put']),
+            'valid_options': len(valid_iv_data),
+            'statistics': {
+                'min_iv': float(valid_iv_data['impliedVolatility'].min()),
+                'max_iv': float(valid_iv_data['impliedVolatility'].max()),
+                'avg_iv': float(valid_iv_data['impliedVolatility'].mean()),
+                'std_iv': float(valid_iv_data['impliedVolatility'].std())
+            },
+            'raw_options': combined_data  # Données brutes pour debug (DataFrame sérialisé par le fournisseur JSON)
+        }
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'error': f'Erreur serveur: {str(e)}'}), 500
+
+
+# API: surface de volatilité 3D optimisée avec fond transparent
+@bp.route('/api/vol-surface-3d/<symbol>')
+@binary_capable
+@cached_json_view(shared_cache, 'surface')
+def api_vol_surface_3d(symbol):
+    """API endpoint optimisé pour la surface de volatilité 3D avec fond transparent"""
+    try:
+        # Log de l'utilisation mémoire au début
+        log_memory_usage()
+        
+        span = float(request.args.get('span', 0.5))
+        provider = request.args.get('provider', 'tradier')
+        
+        # Validation des paramètres
+        if span <= 0 or span > 1:
+            return jsonify({'error': 'span doit être entre 0 et 1'}), 400
+            
+        if provider != 'tradier':
+            return jsonify({'error': 'Seul le provider Tradier est supporté'}), 400
+        
+        # Vérifier que la clé API est disponible pour Tradier
+        if not TRADIER_API_KEY:
+            return jsonify({
+                'error': 'Clé API Tradier non configurée',
+                'details': 'Veuillez configurer TRADIER_API_KEY dans les variables d\'environnement'
+            }), 500
+        
+        tradier = TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store())
+        
+        # Récupérer les expirations avec timeout via Tradier
+        expirations_data = tradier.get_option_expirations(symbol)
+        if not expirations_data or 'expirations' not in expirations_data or 'date' not in expirations_data['expirations']:
+            return jsonify({'error': f'Aucune date d\'expiration disponible pour {symbol}'}), 404
+        
+        # Extraire les dates d'expiration
+        expirations = expirations_data['expirations']['date']
+        
+        # Limiter le nombre d'expirations pour la performance (par défaut 6)
+        max_expirations = int(request.args.get('maxExp', 6))
+        expirations_to_use = expirations[:max_expirations]
+        
+        # Récupérer le prix spot via Tradier
+        try:
+            quote_data = tradier.get_stock_quote(symbol)
+            if quote_data and 'quotes' in quote_data and 'quote' in quote_data['quotes']:
+                spot_price = float(quote_data['quotes']['quote'].get('last', 0))
+            else:
+                spot_price = 0
+        except Exception as e:
+            print(f"⚠️  Erreur lors de la récupération du prix spot pour {symbol}: {e}")
+            spot_price = 0
+        
+        # Collecter les données d'options via Tradier
+        all_options_data = []
+        for expiration_date in expirations_to_use:
+            try:
+                options_data = tradier.get_historical_options_data(symbol, expiration_date)
+                
+                if options_data is not None and not options_data.empty:
+                    # Renommer les colonnes pour correspondre au format attendu
+                    options_data = options_data.rename(columns={
+                        'Strike': 'strike',
+                        'Type': 'type',
+                        'Last': 'lastPrice',
+                        'Implied_Volatility': 'impliedVolatility',
+                        'Expiration': 'expiration_date'
+                    })
+                    # Convertir le type en minuscules
+                    options_data['type'] = options_data['type'].str.lower()
+                    all_options_data.append(options_data)
+                    
+            except Exception as e:
+                print(f"Erreur pour l'expiration {expiration_date if 'expiration_date' in locals() else 'inconnue'}: {e}")
+                continue
+        
+        if not all_options_data:
+            return jsonify({'error': f'Aucune donnée d\'options collectée pour {symbol}'}), 404
+        
+        # Traiter les données pour créer la surface
+        # Combiner toutes les données
+        combined_data = pd.concat(all_options_data, ignore_index=True)
+        
+        # Filtrer par bande autour du spot si le prix spot est disponible
+        if spot_price > 0:
+            min_strike = spot_price * (1 - span)
+            max_strike = spot_price * (1 + span)
+            filtered_data = combined_data[
+                (combined_data['strike'] >= min_strike) & 
+                (combined_data['strike'] <= max_strike)
+            ]
+            
+            # Si le filtrage supprime trop de données, utiliser toutes les données
+            if len(filtered_data) < 10:
+                print(f'Filtrage trop restrictif, utilisation de toutes les données ({len(combined_data)} options)')
+                combined_data = combined_data
+            else:
+                combined_data = filtered_data
+        else:
+            print(f'Prix spot non disponible, utilisation de toutes les données ({len(combined_data)} options)')
+        
+        if combined_data.empty:
+            return jsonify({
+                'error': f'Aucune option disponible pour {symbol}'
+            }), 404
+        
+        # Organiser les données pour la surface de volatilité
+        # Extraire les strikes et expirations uniques
+        unique_strikes = sorted(combined_data['strike'].unique(), reverse=True)
+        unique_expirations = sorted(combined_data['expiration_date'].unique())
+        
+        # Calculer les maturités en années
+        current_date = datetime.now()
+        maturities = []
+        for exp_date in unique_expirations:
+            exp_datetime = datetime.strptime(exp_date, '%Y-%m-%d')
+            maturity = (exp_datetime - current_date).days / 365.25
+            # S'assurer que la maturité est positive et raisonnable
+            if maturity < 0:
+                print(f'⚠️  Maturité négative pour {exp_date}: {maturity:.4f} ans')
+                maturity = 0.01  # Maturité minimale
+            elif maturity > 5:
+                print(f'⚠️  Maturité très élevée pour {exp_date}: {maturity:.4f} ans')
+                maturity = 5.0  # Maturité maximale
+            maturities.append(maturity)
+        
+        # Créer la matrice de volatilité implicite
+        iv_matrix = []
+        for i, expiration in enumerate(unique_expirations):
+            row = []
+            for strike in unique_strikes:
+                # Trouver l'option correspondante
+                option = combined_data[
+                    (combined_data['expiration_date'] == expiration) & 
+                    (combined_data['strike'] == strike)
+                ]
+                
+                if not option.empty:
+                    # Prendre la moyenne des IV pour les calls et puts
+                    iv_values = option['impliedVolatility'].values
+                    # Filtrer les valeurs aberrantes (IV > 200% ou < 1%) et exclure les None
+                    valid_iv_values = [iv for iv in iv_values if iv is not None and 0.01 <= iv <= 2.0]
+                    if valid_iv_values:
+                        avg_iv = sum(valid_iv_values) / len(valid_iv_values)
+                        row.append(avg_iv)
+                    else:
+                        row.append(None)
+                else:
+                    row.append(None)
+            iv_matrix.append(row)
+        
+        # Filtrer les données valides pour les statistiques
+        valid_iv_data = combined_data[
+            (combined_data['impliedVolatility'].notna()) & 
+            (combined_data['impliedVolatility'] > 0.01) & 
+            (combined_data['impliedVolatility'] < 2.0)
+        ]
+        
+        if valid_iv_data.empty:
+            return jsonify({
+                'error': f'Aucune donnée IV valide pour {symbol}'
+            }), 404
+        
+        # Convertir le DataFrame en format JSON
+        result = {
+            'symbol': symbol,
+            'spot_price': spot_price,
+            'data_source': 'Tradier API (Données Réelles)',
+            'strikes': unique_strikes,
+            'maturities': maturities,
+            'iv': iv_matrix,
+            'total_options': len(combined_data),
+            'calls_count': len(combined_data[combined_data['type'] == 'call']),
+            'puts_count': len(combined_data[combined_data['type'] == 'put']),
+            'valid_options': len(valid_iv_data),
+            'statistics': {
+                'min_iv': float(valid_iv_data['impliedVolatility'].min()),
+                'max_iv': float(valid_iv_data['impliedVolatility'].max()),
+                'avg_iv': float(valid_iv_data['impliedVolatility'].mean()),
+                'std_iv': float(valid_iv_data['impliedVolatility'].std())
+            },
+            'raw_options': combined_data  # Données brutes pour debug (DataFrame sérialisé par le fournisseur JSON)
+        }
+        
+        if 'error' in result:
+            error_msg = result['error']
+            if 'limite de taux' in error_msg.lower() or '429' in error_msg:
+                return jsonify({
+                    'error': 'API temporairement indisponible (limite de taux). Veuillez réessayer dans quelques secondes.',
+                    'details': error_msg
+                }), 429
+            elif 'aucune donnée' in error_msg.lower():
+                return jsonify({
+                    'error': f'Aucune donnée disponible pour {symbol} via {provider}',
+                    'details': error_msg
+                }), 404
+            else:
+                return jsonify({
+                    'error': f'Erreur lors de la récupération des données: {error_msg}',
+                    'details': error_msg
+                }), 500
+        
+        # Nettoyer la mémoire avant de retourner la réponse
+        # cleanup_memory()  # Fonction non disponible
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        print(f"❌ Erreur générale dans api_vol_surface_3d: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# API: Export des données de surface de volatilité 3D
+EXPORT_FETCH_WORKERS = int(os.getenv("EXPORT_FETCH_WORKERS", "4"))
+
+
+def _iter_export_chains(tradier, symbol, expirations, progress=None, request_budget=True):
+    """
+    Chaînes d'options par expiration pour les exports, rendues dans l'ordre des expirations
+    
+    Au plus EXPORT_FETCH_WORKERS requêtes en vol: les appels se recouvrent (le limiteur Tradier
+    reste l'arbitre du débit) et seules quelques chaînes sont en mémoire à la fois.
+    progress(reçues, total) est appelée avant chaque chaîne rendue.
+    
+    Les threads reçoivent le contexte de l'appelant (budget REQUEST_DEADLINE, priorité Tradier).
+    request_budget=False lève le budget: export en flux, lu après le retour de la vue.
+    """
+    def fetch(expiration):
+        try:
+            if request_budget:
+                return tradier.get_historical_options_data(symbol, expiration)
+            with without_deadline():
+                return tradier.get_historical_options_data(symbol, expiration)
+        except Exception as e:
+            print(f"Erreur pour l'expiration {expiration}: {e}")
+            return None
+    
+    # Contexte capturé au premier élément demandé, pas à la création du générateur
+    fetch_in_context = propagate(fetch)
+    received, total = 0, len(expirations)
+    with ThreadPoolExecutor(max_workers=EXPORT_FETCH_WORKERS) as executor:
+        pending = deque()
+        for expiration in expirations:
+            pending.append((expiration, executor.submit(fetch_in_context, expiration)))
+            if len(pending) >= EXPORT_FETCH_WORKERS:
+                done_expiration, future = pending.popleft()
+                result = future.result()
+                received += 1
+                if progress:
+                    progress(received, total)
+                yield done_expiration, result
+        while pending:
+            done_expiration, future = pending.popleft()
+            result = future.result()
+            received += 1
+            if progress:
+                progress(received, total)
+            yield done_expiration, result
+
+
+def _export_params(args):
+    """
+    Valide les paramètres d'export (query string ou paramètres d'une tâche de fond)
+    
+    Returns:
+        Dict | str: Paramètres normalisés, ou message d'erreur
+    """
+    try:
+        span = float(args.get('span', 0.5))
+    except (TypeError, ValueError):
+        return 'span doit être un nombre'
+    provider = args.get('provider', 'tradier')
+    format_type = args.get('format', 'json')  # json, csv, excel, parquet, arrow
+    layout = args.get('layout', 'surface')  # surface (matrice) ou chain (une ligne par option)
+    
+    # Validation des paramètres
+    if span <= 0 or span > 1:
+        return 'span doit être entre 0 et 1'
+        
+    if provider != 'tradier':
+        return 'Seul le provider Tradier est supporté'
+        
+    if format_type not in ['json', 'csv', 'excel', 'parquet', 'arrow']:
+        return 'format doit être "json", "csv", "excel", "parquet" ou "arrow"'
+    
+    if layout not in ['surface', 'chain']:
+        return 'layout doit être "surface" ou "chain"'
+    
+    # Parquet et Arrow: toujours une ligne par option (format colonnaire pour les scripts)
+    if format_type in ['parquet', 'arrow']:
+        layout = 'chain'
+    if layout == 'chain' and format_type not in ['csv', 'parquet', 'arrow']:
+        return 'layout=chain disponible en csv, parquet et arrow'
+    
+    return {'span': span, 'provider': provider, 'format': format_type, 'layout': layout}
+
+
+def build_surface_export(symbol, params, tradier, progress=None):
+    """
+    Construit un export de surface ou de chaîne (partagé par la route et les tâches de fond)
+    
+    Args:
+        symbol (str): Symbole du sous-jacent
+        params (Dict): Paramètres validés par _export_params
+        tradier (TradierAPI): Client utilisé pour les chaînes
+        progress (Callable, optional): Appelée avec (expirations reçues, total)
+    
+    Returns:
+        Dict: {'format', 'filename', 'chunks'} ('payload' pour le json), ou {'error', 'status'}
+    """
+    span, provider, format_type, layout = params['span'], params['provider'], params['format'], params['layout']
+    
+    # Récupérer les expirations
+    expirations_data = tradier.get_option_expirations(symbol)
+    if not expirations_data or 'expirations' not in expirations_data or 'date' not in expirations_data['expirations']:
+        return {'error': f'Aucune date d\'expiration disponible pour {symbol}', 'status': 404}
+    
+    # Extraire les dates d'expiration
+    expirations = expirations_data['expirations']['date']
+    
+    # Utiliser toutes les expirations disponibles
+    expirations_to_use = expirations
+    
+    # Récupérer le prix spot via Tradier
+    try:
+        quote_data = tradier.get_stock_quote(symbol)
+        if quote_data and 'quotes' in quote_data and 'quote' in quote_data['quotes']:
+            spot_price = float(quote_data['quotes']['quote'].get('last', 0))
+        else:
+            spot_price = 0
+    except:
+        spot_price = 0
+    
+    filename = f'volatility_surface_{symbol}_{datetime.now().strftime("%Y%m%d")}'
+    
+    # Chaîne complète: chaque expiration est écrite dès sa réception (mémoire bornée). Le flux est
+    # lu après le retour de la vue: il n'est pas soumis au budget de la requête (REQUEST_DEADLINE)
+    if layout == 'chain':
+        chains = _iter_export_chains(tradier, symbol, expirations_to_use, progress, request_budget=False)
+        strike_range = (spot_price * (1 - span), spot_price * (1 + span)) if spot_price > 0 else None
+        frames = chain_frames(chains, symbol, strike_range)
+        writers = {'csv': iter_chain_csv, 'parquet': iter_parquet, 'arrow': iter_arrow}
+        return {'format': format_type, 'filename': f'option_chain_{symbol}_{datetime.now().strftime("%Y%m%d")}',
+                'chunks': writers[format_type](frames)}
+    
+    # Collecter les données d'options via Tradier (dans la vue: sous le budget de la requête)
+    chains = _iter_export_chains(tradier, symbol, expirations_to_use, progress)
+    all_options_data = []
+    for expiration_date, options_data in chains:
+        if options_data is not None and not options_data.empty:
+            # Renommer les colonnes pour correspondre au format attendu
+            options_data = options_data.rename(columns={
+                'Strike': 'strike',
+                'Type': 'type',
+                'Last': 'lastPrice',
+                'Implied_Volatility': 'impliedVolatility',
+                'Expiration': 'expiration_date'
+            })
+            # Convertir le type en minuscules
+            options_data['type'] = options_data['type'].str.lower()
+            options_data['expiration_date'] = expiration_date
+            all_options_data.append(options_data)
+    
+    if not all_options_data:
+        return {'error': f'Aucune donnée d\'options collectée pour {symbol}', 'status': 404}
+    
+    # Traiter les données pour créer la surface
+    # Combiner toutes les données
+    combined_data = pd.concat(all_options_data, ignore_index=True)
+    
+    # Filtrer par bande autour du spot si le prix spot est disponible
+    if spot_price > 0:
+        min_strike = spot_price * (1 - span)
+        max_strike = spot_price * (1 + span)
+        filtered_data = combined_data[
+            (combined_data['strike'] >= min_strike) & 
+            (combined_data['strike'] <= max_strike)
+        ]
+        
+        # Si le filtrage supprime trop de données, utiliser toutes les données
+        if len(filtered_data) < 10:
+            print(f'Filtrage trop restrictif, utilisation de toutes les données ({len(combined_data)} options)')
+            combined_data = combined_data
+        else:
+            combined_data = filtered_data
+    else:
+        print(f'Prix spot non disponible, utilisation de toutes les données ({len(combined_data)} options)')
+    
+    if combined_data.empty:
+        return {'error': f'Aucune option disponible pour {symbol}', 'status': 404}
+    
+    # Organiser les données pour la surface de volatilité
+    # Extraire les strikes et expirations uniques
+    unique_strikes = sorted(combined_data['strike'].unique(), reverse=True)
+    unique_expirations = sorted(combined_data['expiration_date'].unique())
+    
+    # Calculer les maturités en années
+    current_date = datetime.now()
+    maturities = []
+    for exp_date in unique_expirations:
+        exp_datetime = datetime.strptime(exp_date, '%Y-%m-%d')
+        maturity = (exp_datetime - current_date).days / 365.25
+        # S'assurer que la maturité est positive et raisonnable
+        if maturity < 0:
+            print(f'⚠️  Maturité négative pour {exp_date}: {maturity:.4f} ans')
+            maturity = 0.01  # Maturité minimale
+        elif maturity > 5:
+            print(f'⚠️  Maturité très élevée pour {exp_date}: {maturity:.4f} ans')
+            maturity = 5.0  # Maturité maximale
+        maturities.append(maturity)
+    
+    # Créer la matrice de volatilité implicite
+    iv_matrix = []
+    for i, expiration in enumerate(unique_expirations):
+        row = []
+        for strike in unique_strikes:
+            # Trouver l'option correspondante
+            option = combined_data[
+                (combined_data['expiration_date'] == expiration) & 
+                (combined_data['strike'] == strike)
+            ]
+            
+            if not option.empty:
+                # Prendre la moyenne des IV pour les calls et puts
+                iv_values = option['impliedVolatility'].values
+                # Filtrer les valeurs aberrantes (IV > 200% ou < 1%) et exclure les None
+                valid_iv_values = [iv for iv in iv_values if iv is not None and 0.01 <= iv <= 2.0]
+                if valid_iv_values:
+                    avg_iv = sum(valid_iv_values) / len(valid_iv_values)
+                    row.append(avg_iv)
+                else:
+                    row.append(None)
+            else:
+                row.append(None)
+        iv_matrix.append(row)
+    
+    # Filtrer les données valides pour les statistiques
+    valid_iv_data = combined_data[
+        (combined_data['impliedVolatility'].notna()) & 
+        (combined_data['impliedVolatility'] > 0.01) & 
+        (combined_data['impliedVolatility'] < 2.0)
+    ]
+    
+    if valid_iv_data.empty:
+        return {'error': f'Aucune donnée IV valide pour {symbol}', 'status': 404}
+    
+    # Convertir le DataFrame en format JSON
+    result = {
+        'symbol': symbol,
+        'spot_price': spot_price,
+        'data_source': 'Tradier API (Données Réelles)',
+        'strikes': unique_strikes,
+        'maturities': maturities,
+        'iv': iv_matrix,
+        'total_options': len(combined_data),
+        'calls_count': len(combined_data[combined_data['type'] == 'call']),
+        'puts_count': len(combined_data[combined_data['type'] == 'put']),
+        'valid_options': len(valid_iv_data),
+        'statistics': {
+            'min_iv': float(valid_iv_data['impliedVolatility'].min()),
+            'max_iv': float(valid_iv_data['impliedVolatility'].max()),
+            'avg_iv': float(valid_iv_data['impliedVolatility'].mean()),
+            'std_iv': float(valid_iv_data['impliedVolatility'].std())
+        }
+    }
+    
+    if 'error' in result:
+        return {'error': result['error'], 'status': 404}
+    
+    # Préparer les données d'export
+    export_data = {
+        'metadata': {
+            'symbol': symbol,
+            'provider': provider,
+            'span': span,
+            'export_date': datetime.now().isoformat(),
+            'spot_price': result.get('spot_price', 0),
+            'maturities_count': len(result.get('maturities', [])),
+            'strikes_count': len(result.get('strikes', [])),
+            'data_points': sum(len(row) for row in result.get('iv', []) if row)
+        },
+        'data': {
+            'strikes': result.get('strikes', []),
+            'maturities': result.get('maturities', []),
+            'iv_matrix': result.get('iv', [])
+        }
+    }
+    
+    # Ajouter les statistiques si disponibles
+    try:
+        from models.volatility_surface_3d import VolatilitySurface3D
+        vs3d = VolatilitySurface3D(symbol)
+        vs3d.set_data({
+            'strikes': result['strikes'],
+            'maturities': result['maturities'],
+            'iv': result['iv'],
+            'spot_price': result.get('spot_price', 0)
+        })
+        export_data['statistics'] = vs3d.get_statistics()
+    except ImportError:
+        pass
+    
+    # Retourner selon le format demandé
+    if format_type == 'json':
+        return {'format': 'json', 'filename': filename, 'payload': export_data}
+    elif format_type == 'csv':
+        return {'format': 'csv', 'filename': filename,
+                'chunks': iter_surface_csv(result['strikes'], result['maturities'], result['iv'])}
+    elif format_type == 'excel':
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return {'error': 'openpyxl non installé pour l\'export Excel', 'status': 400}
+        return {'format': 'excel', 'filename': filename,
+                'chunks': iter_surface_xlsx(symbol, provider, result.get('spot_price', 0), result['strikes'],
+                                            result['maturities'], result['iv'])}
+
+
+@bp.route('/api/vol-surface-3d-export/<symbol>')
+def api_vol_surface_3d_export(symbol):
+    """API endpoint pour exporter les données de surface de volatilité 3D (?async=1: tâche de fond)"""
+    try:
+        params = _export_params(request.args)
+        if isinstance(params, str):
+            return jsonify({'error': params}), 400
+        
+        # Export long (toutes les expirations): tâche de fond, suivie via /api/jobs/<id>
+        if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+            if not job_manager.authorized(request):
+                return jsonify({'error': 'Tâches de fond non activées ou jeton invalide'}), 403
+            job = job_manager.submit('surface_export', {'symbol': symbol.upper(), **params})
+            return jsonify(job_response(job)), 202
+        
+        tradier = TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store())
+        export = build_surface_export(symbol, params, tradier)
+        if 'error' in export:
+            return jsonify({'error': export['error']}), export['status']
+        if export['format'] == 'json':
+            return jsonify(export['payload'])
+        return streaming_response(export['chunks'], export['format'], export['filename'])
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _job_symbol(raw):
+    """Symbole d'une tâche soumise par POST /api/jobs (None si absent)"""
+    symbol = str(raw.get('symbol', '')).strip().upper()
+    return symbol or None
+
+
+def _surface_export_job_params(raw):
+    """Paramètres d'une tâche surface_export (mêmes règles que la route d'export)"""
+    symbol = _job_symbol(raw)
+    if symbol is None:
+        return 'params.symbol requis'
+    params = _export_params(raw)
+    return params if isinstance(params, str) else {'symbol': symbol, **params}
+
+
+def _iv_history_job_params(raw):
+    """Paramètres d'une tâche iv_history (profondeur et maturité cible en jours)"""
+    symbol = _job_symbol(raw)
+    if symbol is None:
+        return 'params.symbol requis'
+    try:
+        days, target = int(raw.get('days', 365)), int(raw.get('target', 30))
+    except (TypeError, ValueError):
+        return 'days et target doivent être des entiers'
+    if not 1 <= days <= 1825 or not 1 <= target <= 365:
+        return 'days doit être entre 1 et 1825, target entre 1 et 365'
+    return {'symbol': symbol, 'days': days, 'target': target}
+
+
+# Tâches de fond: exports complets et backfills hors du cycle des requêtes (voir utils/jobs.py)
+@job_manager.task('surface_export', validate=_surface_export_job_params)
+def _surface_export_job(job, symbol, span, provider, format, layout):
+    """Export de surface ou de chaîne écrit dans un fichier téléchargeable"""
+    # Priorité basse: un export ne retarde jamais les requêtes interactives
+    tradier = TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store(), priority=PRIORITY_BACKGROUND)
+    params = {'span': span, 'provider': provider, 'format': format, 'layout': layout}
+    job.progress(0, 'Récupération des expirations')
+    export = build_surface_export(
+        symbol, params, tradier,
+        progress=lambda done, total: job.progress(90 * done / total, f'Expiration {done}/{total}'))
+    if 'error' in export:
+        raise RuntimeError(export['error'])
+    
+    if export['format'] == 'json':
+        mimetype, extension, chunks = 'application/json', 'json', [current_app.json.dumps_bytes(export['payload'])]
+    else:
+        (mimetype, extension), chunks = EXPORT_FORMATS[export['format']], export['chunks']
+    job.progress(90, 'Écriture du fichier')
+    return job.write_artifact(f"{export['filename']}.{extension}", chunks, mimetype)
+
+
+@job_manager.task('iv_history', validate=_iv_history_job_params)
+def _iv_history_job(job, symbol, days, target):
+    """Backfill de l'historique IV à maturité constante, résultat en CSV"""
+    builder = create_iv_history_builder(target_days=target)
+    history = builder.build(symbol, days, progress=lambda done, total: job.progress(
+        95 * done / total, f'Date {done}/{total}'))
+    if history is None:
+        raise RuntimeError(f'Aucun point d\'historique IV pour {symbol}')
+    return job.write_artifact(f'iv{target}_history_{symbol}.csv', [history.to_csv(index=False).encode('utf-8')],
+                              'text/csv')
+
+
+# API: Smile de volatilité avec une seule maturité (Tradier uniquement)
+@bp.route('/api/volatility-smile/<symbol>')
+@cached_json_view(shared_cache, 'smile')
+def api_volatility_smile(symbol):
+    """API endpoint pour le smile de volatilité avec une seule maturité (Tradier uniquement)"""
+    try:
+        maturity_days = int(request.args.get('maturity', 30))  # Maturité en jours
+        span = float(request.args.get('span', 0.3))  # Bande autour du spot
+        
+        # Validation des paramètres
+        if maturity_days < 1 or maturity_days > 365:
+            return jsonify({'error': 'maturity doit être entre 1 et 365 jours'}), 400
+            
+        if span <= 0 or span > 1:
+            return jsonify({'error': 'span doit être entre 0 et 1'}), 400
+        
+        # Utiliser Tradier pour le smile
+        tradier = TradierAPI(TRADIER_API_KEY, chain_store=get_chain_store())
+        result = {'error': 'Erreur inconnue'}
+        
+        # Récupérer les expirations
+        expirations_data = tradier.get_option_expirations(symbol)
+        if not expirations_data or 'expirations' not in expirations_data or 'date' not in expirations_data['expirations']:
+            return jsonify({'error': f'Aucune expiration disponible pour {symbol}'}), 404
+        
+        # Extraire les dates d'expiration
+        expirations = expirations_data['expirations']['date']
+        
+        # Trouver l'expiration la plus proche de la maturité demandée
+        from datetime import datetime, timedelta
+        current_date = datetime.now()
+        target_date = current_date + timedelta(days=maturity_days)
+        
+        best_expiration = None
+        min_diff = float('inf')
+        
+        for exp_date in expirations:
+            exp_datetime = datetime.strptime(exp_date, '%Y-%m-%d')
+            diff = abs((exp_datetime - current_date).days - maturity_days)
+            if diff < min_diff:
+                min_diff = diff
+                best_expiration = exp_date
+        
+        if not best_expiration:
+            return jsonify({'error': f'Aucune expiration trouvée pour {symbol}'}), 404
+        
+        # Récupérer les données d'options pour cette expiration
+        options_data = tradier.get_historical_options_data(symbol, best_expiration)
+        if options_data is None or options_data.empty:
+            return jsonify({'error': f'Aucune option disponible pour {symbol} à l\'expiration {best_expiration}'}), 404
+        
+        # Récupérer le prix spot
+        quote_data = tradier.get_stock_quote(symbol)
+        if quote_data and 'quotes' in quote_data and 'quote' in quote_data['quotes']:
+            spot_price = float(quote_data['quotes']['quote'].get('last', 0))
+        else:
+            spot_price = 0
+        
+        # Filtrer par bande autour du spot
+        if spot_price > 0:
+            min_strike = spot_price * (1 - span)
+            max_strike = spot_price * (1 + span)
+            filtered_data = options_data[
+                (options_data['Strike'] >= min_strike) & 
+                (options_data['Strike'] <= max_strike)
+            ]
+            if len(filtered_data) < 5:
+                filtered_data = options_data
+        else:
+            filtered_data = options_data
+        
+        # Séparer les calls et puts
+        calls_df = filtered_data[filtered_data['Type'].str.lower() == 'call']
+        puts_df = filtered_data[filtered_data['Type'].str.lower() == 'put']
+        
+        # Créer le résultat
+        result = {
+                'symbol': symbol,
+                'spot_price': spot_price,
+                'data_source': 'Tradier API (Données Réelles)',
+                'maturity_days': maturity_days,
+                'maturity_years': maturity_days / 365.25,
+                'strikes': filtered_data['Strike'].tolist(),
+                'calls_iv': calls_df['Implied_Volatility'].tolist() if len(calls_df) > 0 else [],
+                'puts_iv': puts_df['Implied_Volatility'].tolist() if len(puts_df) > 0 else [],
+                'calls_strikes': calls_df['Strike'].tolist() if len(calls_df) > 0 else [],
+                'puts_strikes': puts_df['Strike'].tolist() if len(puts_df) > 0 else [],
+                'statistics': {
+                    'total_options': len(filtered_data),
+                    'calls_count': len(calls_df),
+                    'puts_count': len(puts_df),
+                    'min_strike': float(filtered_data['Strike'].min()),
+                    'max_strike': float(filtered_data['Strike'].max()),
+                    'min_iv': float(filtered_data['Implied_Volatility'].min()),
+                    'max_iv': float(filtered_data['Implied_Volatility'].max()),
+                    'avg_iv': float(filtered_data['Implied_Volatility'].mean()),
+                    'std_iv': float(filtered_data['Implied_Volatility'].std())
+                },
+                'raw_options': filtered_data
+            }
+        
+        if 'error' in result:
+            error_msg = result['error']
+            if 'aucune option' in error_msg.lower():
+                return jsonify({
+                    'error': f'Aucune option disponible pour {symbol} avec maturité ~{maturity_days} jours',
+                    'details': error_msg
+                }), 404
+            else:
+                return jsonify({
+                    'error': f'Erreur lors de la récupération du smile: {error_msg}',
+                    'details': error_msg
+                }), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# API: Récupération des symboles Tradier
+@bp.route('/api/tradier/symbols')
+def get_tradier_symbols():
+    """API endpoint pour récupérer les symboles disponibles via Tradier"""
+    try:
+        query = request.args.get('q', '')  # Terme de recherche optionnel
+        
+        if query:
+            # Recherche dans l'index local (aucun appel amont)
+            symbols = [
+                {
+                    "symbol": entry["symbol"],
+                    "name": entry["description"],
+                    "type": entry["type"],
+                    "exchange": entry["exchange"]
+                }
+                for entry in get_symbol_universe().search(query, 50)
+                if entry["type"] in ("stock", "")  # Filtrer seulement les actions
+            ]
+            if not symbols:
+                return jsonify({
+                    'success': False,
+                    'error': 'Aucun symbole trouvé',
+                    'symbols': []
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'symbols': symbols,
+                'total': len(symbols),
+                'query': query
+            })
+        else:
+            # Retourner les symboles populaires si pas de recherche
+            popular_symbols = get_tradier_api().get_popular_symbols()
+            return jsonify({
+                'success': True,
+                'symbols': popular_symbols,
+                'total': len(popular_symbols),
+                'query': 'popular'
+            })
+            
+    except Exception as e:
+        print(f"❌ Erreur récupération symboles Tradier: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'symbols': []
+        }), 500
+
+
+# API: Smile de volatilité avec Tradier
+@bp.route('/api/volatility-smile-tradier/<symbol>')
+@cached_json_view(shared_cache, 'smile')
+def api_volatility_smile_tradier(symbol):
+    """API endpoint pour le smile de volatilité avec Tradier"""
+    debug = debug_enabled(smile_log)
+    try:
+        maturity_days = int(request.args.get('maturity', 30))  # Maturité en jours
+        span = float(request.args.get('span', 0.3))  # Bande autour du spot
+        specific_expiration = request.args.get('expiration', None)  # Date d'expiration spécifique
+        custom_risk_free = request.args.get('risk_free', None)  # Taux sans risque personnalisé
+        custom_dividend = request.args.get('dividend', None)  # Rendement dividendes personnalisé
+        custom_time_to_exp = request.args.get('time_to_exp', None)  # Time to expiration personnalisé
+        
+        # Validation des paramètres
+        if maturity_days < 1 or maturity_days > 365:
+            return jsonify({'error': 'maturity doit être entre 1 et 365 jours'}), 400
+            
+        if span <= 0 or span > 1:
+            return jsonify({'error': 'span doit être entre 0 et 1'}), 400
+        
+        smile_log.info("🚀 Smile %s via Tradier (maturité: %d jours)", symbol, maturity_days)
+        
+        # Récupérer les expirations disponibles
+        expirations = get_tradier_api().get_option_expirations(symbol)
+        if not expirations or "expirations" not in expirations:
+            return jsonify({'error': f'Aucune expiration disponible pour {symbol}'}), 404
+        
+        exp_list = expirations["expirations"]["date"]
+        if not exp_list:
+            return jsonify({'error': f'Aucune expiration trouvée pour {symbol}'}), 404
+        
+        # Utiliser la date d'expiration spécifique si fournie, sinon trouver la plus proche
+        if specific_expiration:
+            # Vérifier que la date spécifique est disponible
+            if specific_expiration in exp_list:
+                best_expiration = specific_expiration
+            else:
+                return jsonify({'error': f'Date d\'expiration {specific_expiration} non disponible. Dates disponibles: {exp_list}'}), 404
+        else:
+            # Trouver l'expiration la plus proche de la maturité demandée
+            from datetime import timedelta
+            today = datetime.now()
+            target_date = today + timedelta(days=maturity_days)
+            
+            best_expiration = None
+            min_diff = float('inf')
+            
+            for exp_date_str in exp_list:
+                try:
+                    exp_date = datetime.strptime(exp_date_str, "%Y-%m-%d")
+                    diff = abs((exp_date - today).days - maturity_days)
+                    if diff < min_diff:
+                        min_diff = diff
+                        best_expiration = exp_date_str
+                except ValueError:
+                    continue
+        
+        if not best_expiration:
+            return jsonify({'error': f'Aucune expiration proche de {maturity_days} jours trouvée'}), 404
+        
+        if debug:
+            smile_log.debug("📅 Expiration sélectionnée: %s (%s)", best_expiration,
+                            "date spécifique" if specific_expiration else f"écart: {min_diff} jours")
+        
+        # Récupérer le prix spot
+        stock_quote = get_tradier_api().get_stock_quote(symbol)
+        if not stock_quote or "quotes" not in stock_quote:
+            return jsonify({'error': f'Impossible de récupérer le prix spot pour {symbol}'}), 404
+        
+        quote_data = stock_quote["quotes"]["quote"]
+        if isinstance(quote_data, list):
+            quote_data = quote_data[0]
+        
+        spot_price = float(quote_data.get("last", 0))
+        if spot_price <= 0:
+            return jsonify({'error': f'Prix spot invalide pour {symbol}'}), 404
+        
+        if debug:
+            smile_log.debug("💰 Prix spot %s: $%.2f", symbol, spot_price)
+        
+        # Récupérer le taux sans risque et le rendement des dividendes
+        if custom_risk_free is not None:
+            risk_free_rate = float(custom_risk_free)
+        else:
+            risk_free_rate = get_risk_free_rate()
+            
+        if custom_dividend is not None:
+            dividend_yield = float(custom_dividend)
+        else:
+            dividend_yield = get_dividend_yield(symbol)
+        
+        if debug:
+            smile_log.debug("📊 Paramètres Black-Scholes: taux sans risque %.2f%%%s, dividendes %.2f%%%s",
+                            risk_free_rate * 100, " (personnalisé)" if custom_risk_free is not None else "",
+                            dividend_yield * 100, " (personnalisé)" if custom_dividend is not None else "")
+        
+        # Récupérer la chaîne d'options
+        chain_data = get_tradier_api().get_option_chain(symbol, best_expiration)
+        if not chain_data or "options" not in chain_data:
+            return jsonify({'error': f'Aucune option disponible pour {symbol} à l\'expiration {best_expiration}'}), 404
+        
+        options = chain_data["options"]["option"]
+        if not options:
+            return jsonify({'error': f'Aucune option trouvée pour {symbol} à l\'expiration {best_expiration}'}), 404
+        
+        # Convertir en liste si ce n'est pas déjà le cas
+        if not isinstance(options, list):
+            options = [options]
+        
+        # Données brutes Tradier (10 premières options), uniquement en DEBUG
+        if debug:
+            smile_log.debug(f"🔍 Données brutes Tradier {symbol} {best_expiration}: {len(options)} options")
+            for i, option in enumerate(options[:10]):
+                smile_log.debug(
+                    f"Option {i+1}: strike=${option.get('strike', 'N/A')} type={option.get('option_type', 'N/A')} "
+                    f"bid=${option.get('bid', 'N/A')} ask=${option.get('ask', 'N/A')} last=${option.get('last', 'N/A')} "
+                    f"volume={option.get('volume', 'N/A')} oi={option.get('open_interest', 'N/A')} "
+                    f"iv={option.get('implied_volatility', 'N/A')} delta={option.get('delta', 'N/A')} "
+                    f"gamma={option.get('gamma', 'N/A')} theta={option.get('theta', 'N/A')} vega={option.get('vega', 'N/A')}"
+                )
+        
+        # Filtrer les options selon le span
+        min_strike = spot_price * (1 - span)
+        max_strike = spot_price * (1 + span)
+        if debug:
+            smile_log.debug("🎯 Filtrage: spot $%.2f, span %.0f%% (plage $%.2f - $%.2f)",
+                            spot_price, span * 100, min_strike, max_strike)
+        
+        filtered_options = []
+        for option in options:
+            try:
+                strike = float(option.get("strike", 0))
+                if min_strike <= strike <= max_strike:
+                    # Récupérer les données importantes
+                    option_data = {
+                        "strike": strike,
+                        "type": option.get("option_type", "Unknown").lower(),
+                        "bid": option.get("bid", None),
+                        "ask": option.get("ask", None),
+                        "last": option.get("last", None),
+                        "volume": option.get("volume", None),
+                        "open_interest": option.get("open_interest", None),
+                        "implied_volatility": option.get("implied_volatility", None),
+                        "delta": option.get("delta", None),
+                        "gamma": option.get("gamma", None),
+                        "theta": option.get("theta", None),
+                        "vega": option.get("vega", None)
+                    }
+                    filtered_options.append(option_data)
+            except (ValueError, TypeError):
+                continue
+        
+        if not filtered_options:
+            return jsonify({'error': f'Aucune option dans la plage de strikes demandée pour {symbol}'}), 404
+        
+        # Temps jusqu'à l'expiration (identique pour toutes les options de l'échéance)
+        if custom_time_to_exp is not None:
+            time_to_exp = float(custom_time_to_exp)
+        else:
+            time_to_exp = calculate_business_days_to_expiration(best_expiration)
+        
+        if debug:
+            smile_log.debug(f"💰 {len(filtered_options)} options filtrées, TTE {time_to_exp:.3f} années")
+            for i, opt in enumerate(filtered_options[:15]):
+                smile_log.debug(
+                    f"Option {i+1}: strike ${opt['strike']:.2f} {opt['type'].upper()} "
+                    f"last=${opt['last'] or 'N/A'} bid/ask=${opt['bid'] or 'N/A'}/${opt['ask'] or 'N/A'} "
+                    f"iv={opt['implied_volatility'] or 'N/A'} volume={opt['volume'] or 'N/A'} "
+                    f"moneyness={opt['strike'] / spot_price:.3f}"
+                )
+        
+        # Construire le smile de volatilité
+        smile_data = []
+        strikes = sorted(set(opt["strike"] for opt in filtered_options))
+        if debug:
+            smile_log.debug("📈 Construction du smile: %d strikes uniques", len(strikes))
+        
+        for strike in strikes:
+            strike_options = [opt for opt in filtered_options if opt["strike"] == strike]
+            
+            # Calculer la volatilité implicite moyenne pour ce strike
+            ivs = []
+            for opt in strike_options:
+                # Essayer d'abord la volatilité implicite fournie par Tradier
+                if opt["implied_volatility"] is not None:
+                    try:
+                        iv = float(opt["implied_volatility"])
+                        if 0 < iv < 5:  # Filtrer les valeurs aberrantes
+                            ivs.append(iv)
+                    except (ValueError, TypeError):
+                        continue
+                
+                # Si pas de volatilité implicite, essayer de la calculer à partir du prix
+                elif opt["last"] is not None and opt["last"] > 0:
+                    try:
+                        if time_to_exp > 0:
+                            # Utiliser le prix last ou le prix moyen bid-ask
+                            option_price = opt["last"]
+                            if opt["bid"] is not None and opt["ask"] is not None and opt["bid"] > 0 and opt["ask"] > 0:
+                                # Utiliser le prix moyen bid-ask si disponible
+                                option_price = (opt["bid"] + opt["ask"]) / 2
+                            
+                            # Calculer la volatilité implicite avec Black-Scholes
+                            calculated_iv = calculate_implied_volatility_black_scholes(
+                                spot_price=spot_price,
+                                strike=opt["strike"],
+                                time_to_exp=time_to_exp,
+                                option_price=option_price,
+                                option_type=opt["type"],
+                                risk_free_rate=risk_free_rate,
+                                dividend_yield=dividend_yield
+                            )
+                            
+                            if calculated_iv and 0.01 < calculated_iv < 2.0:  # Plage plus large pour les IV
+                                ivs.append(calculated_iv)
+                                if debug:
+                                    smile_log.debug(f"✅ IV calculée strike ${opt['strike']:.2f} {opt['type'].upper()}: {calculated_iv:.4f} - prix ${option_price:.2f}")
+                            elif debug:
+                                smile_log.debug(f"⚠️  IV calculée hors plage pour strike ${opt['strike']:.2f}: {calculated_iv}")
+                    except Exception as e:
+                        smile_log.warning("❌ Erreur calcul IV pour strike $%.2f: %s", opt['strike'], e)
+                        continue
+            
+            if ivs:
+                avg_iv = sum(ivs) / len(ivs)
+                moneyness = strike / spot_price
+                calls_count = len([opt for opt in strike_options if opt["type"] == "call"])
+                puts_count = len([opt for opt in strike_options if opt["type"] == "put"])
+                
+                # Récupérer les données brutes pour ce strike
+                call_options = [opt for opt in strike_options if opt["type"] == "call"]
+                put_options = [opt for opt in strike_options if opt["type"] == "put"]
+                
+                raw_data = {
+                    "call_last": call_options[0]["last"] if call_options else None,
+                    "call_bid": call_options[0]["bid"] if call_options else None,
+                    "call_ask": call_options[0]["ask"] if call_options else None,
+                    "put_last": put_options[0]["last"] if put_options else None,
+                    "put_bid": put_options[0]["bid"] if put_options else None,
+                    "put_ask": put_options[0]["ask"] if put_options else None
+                }
+                
+                smile_data.append({
+                    "strike": strike,
+                    "moneyness": moneyness,
+                    "implied_volatility": avg_iv,
+                    "calls_count": calls_count,
+                    "puts_count": puts_count,
+                    "raw_data": raw_data
+                })
+                
+                if debug:
+                    smile_log.debug(f"Strike ${strike:.2f}: IV={avg_iv:.4f} ({avg_iv*100:.2f}%) - {len(ivs)} données - Moneyness={moneyness:.3f} - Calls:{calls_count} Puts:{puts_count}")
+        
+        if not smile_data:
+            # Si aucun smile n'a pu être construit, essayer avec les prix des options
+            smile_log.warning("⚠️  Aucune volatilité implicite trouvée pour %s, tentative avec les prix des options", symbol)
+            
+            # Créer un smile basé sur les prix des options (sans IV)
+            smile_data = []
+            for strike in strikes:
+                strike_options = [opt for opt in filtered_options if opt["strike"] == strike]
+                
+                # Calculer le prix moyen des options pour ce strike
+                prices = []
+                for opt in strike_options:
+                    if opt["last"] is not None and opt["last"] > 0:
+                        prices.append(opt["last"])
+                
+                if prices:
+                    avg_price = sum(prices) / len(prices)
+                    moneyness = strike / spot_price
+                    calls_count = len([opt for opt in strike_options if opt["type"] == "call"])
+                    puts_count = len([opt for opt in strike_options if opt["type"] == "put"])
+                    
+                    # Récupérer les données brutes pour ce strike
+                    call_options = [opt for opt in strike_options if opt["type"] == "call"]
+                    put_options = [opt for opt in strike_options if opt["type"] == "put"]
+                    
+                    raw_data = {
+                        "call_last": call_options[0]["last"] if call_options else None,
+                        "call_bid": call_options[0]["bid"] if call_options else None,
+                        "call_ask": call_options[0]["ask"] if call_options else None,
+                        "put_last": put_options[0]["last"] if put_options else None,
+                        "put_bid": put_options[0]["bid"] if put_options else None,
+                        "put_ask": put_options[0]["ask"] if put_options else None
+                    }
+                    
+                    smile_data.append({
+                        "strike": strike,
+                        "moneyness": moneyness,
+                        "implied_volatility": None,  # Pas d'IV disponible
+                        "option_price": avg_price,  # Prix moyen des options
+                        "calls_count": calls_count,
+                        "puts_count": puts_count,
+                        "raw_data": raw_data
+                    })
+                    
+                    if debug:
+                        smile_log.debug(f"Strike ${strike:.2f}: Prix moyen=${avg_price:.2f} - Moneyness={moneyness:.3f} - Calls:{calls_count} Puts:{puts_count}")
+            
+            if not smile_data:
+                return jsonify({'error': f'Aucune donnée d\'option valide trouvée pour {symbol}'}), 404
+        
+        # Trier par strike (ordre décroissant pour avoir les strikes les plus grands à gauche)
+        smile_data.sort(key=lambda x: x["strike"], reverse=True)
+        
+        # Construire la réponse
+        result = {
+            "symbol": symbol,
+            "spot_price": spot_price,
+            "expiration": best_expiration,
+            "maturity_days": (datetime.strptime(best_expiration, "%Y-%m-%d") - datetime.now()).days,
+            "span": span,
+            "data_source": "Tradier API",
+            "black_scholes_params": {
+                "risk_free_rate": risk_free_rate,
+                "dividend_yield": dividend_yield,
+                "time_to_expiration": float(custom_time_to_exp) if custom_time_to_exp is not None else calculate_business_days_to_expiration(best_expiration),
+                "time_calculation_method": "business_days_252",
+                "optimization_note": "Paramètres optimisés pour convergence avec données d'images (5% taux, 0% div, jours ouvrés/252)"
+            },
+            "smile_data": smile_data,
+            "total_options": len(filtered_options),
+            "valid_strikes": len(smile_data)
+        }
+        
+        smile_log.info("✅ Smile %s %s: %d points", symbol, best_expiration, len(smile_data),
+                       extra={"fields": {"symbol": symbol, "expiration": best_expiration,
+                                         "points": len(smile_data), "options": len(filtered_options)}})
+        return jsonify(result)
+        
+    except Exception as e:
+        smile_log.exception("❌ Erreur smile Tradier %s: %s", symbol, e)
+        return jsonify({'error': str(e)}), 500
+
+
+# API: Test simple Tradier
+@bp.route('/api/tradier-test/<symbol>')
+def test_tradier_simple(symbol):
+    """Test simple pour Tradier"""
+    try:
+        # Test basique
+        stock_quote = get_tradier_api().get_stock_quote(symbol)
+        if not stock_quote:
+            return jsonify({'error': 'Impossible de récupérer le prix spot'}), 404
+        
+        quote_data = stock_quote["quotes"]["quote"]
+        if isinstance(quote_data, list):
+            quote_data = quote_data[0]
+        
+        spot_price = float(quote_data.get("last", 0))
+        
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'spot_price': spot_price,
+            'message': 'Test Tradier réussi'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Erreur test: {str(e)}'}), 500
+
+
+# API: Surface de volatilité 3D avec Tradier (VERSION SIMPLIFIÉE QUI FONCTIONNE)
+@bp.route('/api/vol-surface-3d-tradier-simple/<symbol>')
+@binary_capable
+@cached_json_view(shared_cache, 'surface')
+def get_volatility_surface_3d_tradier_simple(symbol):
+    """API endpoint simplifié pour la surface de volatilité 3D avec Tradier"""
+    debug = debug_enabled(surface_log)
+    try:
+        surface_log.info("🚀 Surface 3D %s via Tradier", symbol)
+        
+        # Utiliser exactement le même code que notre fichier de test qui fonctionne
+        from datetime import datetime
+        import pandas as pd
+        import numpy as np
+        
+        # ÉTAPE 1: Récupérer le prix spot
+        stock_quote = get_tradier_api().get_stock_quote(symbol)
+        if not stock_quote or "quotes" not in stock_quote:
+            return jsonify({'error': f'Impossible de récupérer le prix spot pour {symbol}'}), 404
+        
+        quote_data = stock_quote["quotes"]["quote"]
+        if isinstance(quote_data, list):
+            quote_data = quote_data[0]
+        
+        spot_price = float(quote_data.get("last", 0))
+        if spot_price <= 0:
+            return jsonify({'error': f'Prix spot invalide pour {symbol}'}), 404
+        
+        if debug:
+            surface_log.debug("💰 Prix spot %s: $%.2f", symbol, spot_price)
+        
+        # ÉTAPE 2: Récupérer les expirations disponibles
+        expirations = get_tradier_api().get_option_expirations(symbol)
+        if not expirations or "expirations" not in expirations:
+            return jsonify({'error': f'Aucune expiration disponible pour {symbol}'}), 404
+        
+        exp_list = expirations["expirations"]["date"]
+        if not exp_list:
+            return jsonify({'error': f'Aucune expiration trouvée pour {symbol}'}), 404
+        
+        # Limiter le nombre de maturités pour le test
+        max_maturities = 3
+        selected_maturities = exp_list[:max_maturities]
+        if debug:
+            surface_log.debug("📅 %d maturités sélectionnées: %s", len(selected_maturities), selected_maturities)
+        
+        # ÉTAPE 3: Construire la matrice de volatilité
+        
+        all_data = []
+        
+        for maturity_date in selected_maturities:
+            # Calculer le temps jusqu'à l'expiration
+            time_to_exp = calculate_business_days_to_expiration(maturity_date)
+            if time_to_exp is None or time_to_exp <= 0:
+                surface_log.warning("⚠️  Temps d'expiration invalide pour %s %s: %s", symbol, maturity_date, time_to_exp)
+                continue
+            
+            # Récupérer la chaîne d'options pour cette maturité
+            chain_data = get_tradier_api().get_option_chain(symbol, maturity_date)
+            if not chain_data or "options" not in chain_data:
+                surface_log.warning("⚠️  Aucune option pour %s %s", symbol, maturity_date)
+                continue
+            
+            options = chain_data["options"]["option"]
+            if not options:
+                surface_log.warning("⚠️  Aucune option trouvée pour %s %s", symbol, maturity_date)
+                continue
+            
+            # Convertir en liste si nécessaire
+            if not isinstance(options, list):
+                options = [options]
+            
+            # Traiter chaque option
+            maturity_data = []
+            for option in options:
+                try:
+                    # Récupérer le strike
+                    strike = option.get("strike")
+                    if strike is None:
+                        continue
+                    
+                    try:
+                        strike_float = float(strike)
+                        if strike_float <= 0:
+                            continue
+                    except (ValueError, TypeError):
+                        continue
+                    
+                    # Récupérer le prix de l'option
+                    option_price = None
+                    if option.get("last") and option.get("last") is not None:
+                        try:
+                            last_price = float(option.get("last", 0))
+                            if last_price > 0:
+                                option_price = last_price
+                        except (ValueError, TypeError):
+                            pass
+                    
+                    if option_price is None and option.get("bid") and option.get("ask"):
+                        try:
+                            bid = float(option.get("bid", 0))
+                            ask = float(option.get("ask", 0))
+                            if bid > 0 and ask > 0:
+                                option_price = (bid + ask) / 2
+                        except (ValueError, TypeError):
+                            pass
+                    
+                    if option_price is None or option_price <= 0:
+                        continue
+                    
+                    # Calculer la volatilité implicite
+                    option_type = option.get("option_type", "call").lower()
+                    implied_vol = calculate_implied_volatility_black_scholes(
+                        spot_price=spot_price,
+                        strike=strike_float,
+                        time_to_exp=time_to_exp,
+                        option_price=option_price,
+                        option_type=option_type,
+                        risk_free_rate=0.05,
+                        dividend_yield=0.0
+                    )
+                    
+                    if implied_vol is not None and 0.01 <= implied_vol <= 2.0:  # Filtrer les valeurs aberrantes
+                        option_data = {
+                            'maturity_date': maturity_date,
+                            'time_to_exp': time_to_exp,
+                            'strike': strike_float,
+                            'option_type': option_type,
+                            'option_price': option_price,
+                            'implied_volatility': implied_vol,
+                            'contractSymbol': f"{symbol}{maturity_date.replace('-', '')}{option.get('option_type', 'C').upper()}{strike_float:08.0f}",
+                            'type': option_type,
+                            'lastPrice': option_price,
+                            'expiration_date': maturity_date
+                        }
+                        maturity_data.append(option_data)
+                        all_data.append(option_data)
+                
+                except Exception as e:
+                    if debug:
+                        surface_log.debug("⚠️  Erreur traitement option: %s", e)
+                    continue
+            
+            # Volatilités implicites calculées (10 premières), uniquement en DEBUG
+            if debug:
+                surface_log.debug(f"📊 {maturity_date} (TTE {time_to_exp:.4f}): {len(maturity_data)}/{len(options)} options avec IV")
+                for option in maturity_data[:10]:
+                    surface_log.debug(f"${option['strike']:<9.2f} {option['option_type']:<6} ${option['option_price']:<7.2f} "
+                                      f"IV {option['implied_volatility']:.4f}")
+        
+        if not all_data:
+            return jsonify({'error': f'Aucune donnée d\'options collectée pour {symbol}'}), 404
+        
+        # ÉTAPE 4: Créer le DataFrame et analyser
+        df = pd.DataFrame(all_data)
+        
+        # Statistiques de volatilité implicite (sans describe(): seules 4 valeurs sont utilisées)
+        iv_values = df['implied_volatility']
+        iv_stats = {'min': iv_values.min(), 'max': iv_values.max(), 'mean': iv_values.mean(), 'std': iv_values.std()}
+        if debug:
+            surface_log.debug(f"📈 {len(df)} options, {df['maturity_date'].nunique()} maturités, "
+                              f"{df['strike'].nunique()} strikes, types {df['option_type'].value_counts().to_dict()}, "
+                              f"IV moyenne {iv_stats['mean']:.4f} médiane {iv_values.median():.4f} "
+                              f"min {iv_stats['min']:.4f} max {iv_stats['max']:.4f}")
+        
+        # Créer le résultat au format attendu par l'interface
+        strikes = sorted(df['strike'].unique())
+        maturities = sorted(df['time_to_exp'].unique())
+        
+        # Créer la matrice IV: moyenne des IV par (maturité, strike) en un seul regroupement
+        # (les IV hors [0.01, 2.0] sont déjà exclues à la collecte)
+        mean_iv = df.groupby(['time_to_exp', 'strike'])['implied_volatility'].mean().to_dict()
+        iv_matrix = [[float(mean_iv[(maturity, strike)]) if (maturity, strike) in mean_iv else None
+                      for strike in strikes]
+                     for maturity in maturities]
+        
+        # Créer le résultat final
+        result = {
+            'success': True,
+            'symbol': symbol,
+            'spot_price': spot_price,
+            'strikes': strikes,
+            'maturities': maturities,
+            'iv': iv_matrix,
+            'statistics': {
+                'min_iv': float(iv_stats['min']),
+                'max_iv': float(iv_stats['max']),
+                'mean_iv': float(iv_stats['mean']),
+                'std_iv': float(iv_stats['std'])
+            },
+            'total_options': len(df),
+            'calls_count': len(df[df['option_type'] == 'call']),
+            'puts_count': len(df[df['option_type'] == 'put']),
+            'data_source': 'Tradier API (Données Réelles)',
+            'provider': 'tradier',
+            'raw_options': df
+        }
+        
+        surface_log.info("✅ Surface 3D %s: %d options, %d maturités, %d strikes", symbol, result['total_options'],
+                         len(maturities), len(strikes),
+                         extra={"fields": {"symbol": symbol, "options": result['total_options'],
+                                           "maturities": len(maturities), "strikes": len(strikes)}})
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        surface_log.exception("❌ Erreur lors de la génération de la surface de volatilité pour %s: %s", symbol, e)
+        return jsonify({
+            'error': f'Erreur lors de la génération de la surface de volatilité pour {symbol}',
+            'details': str(e)
+        }), 500
+
+
+# API: Surface de volatilité 3D avec Tradier
+@bp.route('/api/vol-surface-3d-tradier/<symbol>')
+def get_volatility_surface_3d_tradier(symbol):
+    """API endpoint pour la surface de volatilité 3D avec Tradier - Redirection vers la version simplifiée"""
+    # Rediriger vers l'endpoint simplifié qui fonctionne
+    return redirect(f'/api/vol-surface-3d-tradier-simple/{symbol}')
+
+
+# API: Symboles disponibles via Tradier
+# API: Symboles disponibles via Tradier
+@bp.route('/api/available-symbols')
+@http_cache(max_age=3600, stale_while_revalidate=600)
+def api_available_symbols():
+    """API endpoint des symboles recommandés, servi depuis l'univers de symboles local (aucun appel amont)"""
+    universe = get_symbol_universe()
+    formatted_symbols = []
+    for symbol_data in universe.static_entries:
+        # Description de l'univers Tradier si connue, sinon libellé statique
+        entry = universe.get(symbol_data['symbol'])
+        name = entry['description'] if entry and entry['description'] else symbol_data['name']
+        formatted_symbols.append({
+            'symbol': symbol_data['symbol'],
+            'label': f"{symbol_data['symbol']} - {name}",
+            'name': name
+        })
+    
+    return jsonify({
+        'recommended_symbols': formatted_symbols,
+        'statistics': {
+            'total_symbols': len(formatted_symbols),
+            'universe_size': len(universe.index),
+            'source': 'Index local'
+        }
+    })
+
+
+def process_volatility_surface_data(all_options_data, symbol, spot_price, span, filter_by_span=True):
+    """Traite les données d'options pour créer une surface de volatilité"""
+    try:
+        # Log de l'utilisation mémoire avant traitement
+        log_memory_usage()
+        
+        # Combiner toutes les données
+        combined_data = pd.concat(all_options_data, ignore_index=True)
+        
+        # Calculer les maturités en années
+        current_date = datetime.now()
+        print(f"🔍 Debug: Calcul des maturités pour {len(combined_data)} options")
+        print(f"🔍 Debug: Dates d'expiration uniques: {combined_data['expiration_date'].unique()}")
+        
+        combined_data['maturity_years'] = combined_data['expiration_date'].apply(
+            lambda x: (datetime.strptime(x, '%Y-%m-%d') - current_date).days / 365.25 if x is not None else None
+        )
+        
+        # Filtrer les maturités futures (exclure les None)
+        combined_data = combined_data[combined_data['maturity_years'].notna()]
+        combined_data = combined_data[combined_data['maturity_years'] > 0]
+        
+        # Gérer les valeurs None dans les strikes
+        combined_data = combined_data[combined_data['strike'].notna()]
+        combined_data = combined_data[combined_data['strike'] > 0]
+        
+        if combined_data.empty:
+            return {'error': 'Aucune donnée de maturité future disponible'}
+        
+        # Filtrer par span autour du spot (optionnel)
+        if filter_by_span and spot_price is not None and spot_price > 0:
+            min_strike = spot_price * (1 - span)
+            max_strike = spot_price * (1 + span)
+            # S'assurer que les strikes ne sont pas None
+            combined_data = combined_data[combined_data['strike'].notna()]
+            combined_data = combined_data[
+                (combined_data['strike'] >= min_strike) & 
+                (combined_data['strike'] <= max_strike)
+            ]
+        else:
+            # Juste s'assurer que les strikes ne sont pas None
+            combined_data = combined_data[combined_data['strike'].notna()]
+        
+        if combined_data.empty:
+            return {'error': 'Aucune donnée dans la plage de strikes spécifiée'}
+        
+        # Grouper par maturité et strike pour créer la surface
+        unique_maturities = sorted(combined_data['maturity_years'].unique())
+        unique_strikes = sorted(combined_data['strike'].unique(), reverse=True)
+        
+        # Créer la matrice de volatilité implicite
+        iv_matrix = []
+        for maturity in unique_maturities:
+            maturity_data = combined_data[combined_data['maturity_years'] == maturity]
+            row = []
+            for strike in unique_strikes:
+                strike_data = maturity_data[maturity_data['strike'] == strike]
+                if not strike_data.empty:
+                    # Prendre la moyenne des IV pour ce strike/maturité
+                    # Vérifier les noms de colonnes possibles
+                    iv_column = None
+                    for col in ['implied_volatility', 'impliedVolatility', 'iv']:
+                        if col in strike_data.columns:
+                            iv_column = col
+                            break
+                    
+                    if iv_column:
+                        avg_iv = strike_data[iv_column].mean()
+                        row.append(avg_iv)
+                    else:
+                        row.append(None)
+                else:
+                    row.append(None)
+            iv_matrix.append(row)
+        
+        # Calculer les statistiques
+        all_iv_values = []
+        for row in iv_matrix:
+            all_iv_values.extend([v for v in row if v is not None and not pd.isna(v)])
+        
+        stats = {}
+        if all_iv_values:
+            stats = {
+                'min_iv': float(min(all_iv_values)),
+                'max_iv': float(max(all_iv_values)),
+                'mean_iv': float(sum(all_iv_values) / len(all_iv_values))
+                
+            }
+        
+        # Compter les options
+        total_options = len(combined_data)
+        calls_count = len(combined_data[combined_data['type'] == 'call'])
+        puts_count = len(combined_data[combined_data['type'] == 'put'])
+        
+        # Nettoyer la mémoire après traitement
+        cleanup_memory()
+        
+        return {
+            'symbol': symbol,
+            'strikes': unique_strikes,
+            'maturities': unique_maturities,
+            'iv': iv_matrix,
+            'spot_price': spot_price,
+            'data_source': 'Tradier API (Données Réelles)',
+            'total_options': total_options,
+            'calls_count': calls_count,
+            'puts_count': puts_count,
+            'statistics': stats,
+            'raw_options': combined_data.to_dict('records')
+        }
+        
+    except Exception as e:
+        return {'error': f'Erreur lors du traitement des données: {str(e)}'}
+
+
+# API: Symboles populaires Tradier
+@bp.route('/api/tradier/symbols')
+def api_tradier_symbols():
+    """API endpoint pour récupérer les symboles populaires avec options via Tradier"""
+    try:
+        symbols = get_tradier_api().get_popular_symbols()
+        return jsonify({
+            'success': True,
+            'symbols': symbols,
+            'count': len(symbols)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Recherche de symboles Tradier
+@bp.route('/api/tradier/search')
+def api_tradier_search():
+    """
+    API endpoint d'autocomplétion des symboles, servi depuis l'index local
+    
+    Préfixe du ticker puis mots de la description, puis symboles proches (faute de frappe).
+    Tradier n'est interrogé que si l'index ne connaît rien (et le résultat enrichit l'index).
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': 'Paramètre de recherche manquant'
+            }), 400
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        
+        universe = get_symbol_universe()
+        results = universe.search(query, limit)
+        source = 'index'
+        if not results and len(query) >= 2 and is_tradier_configured():
+            upstream = get_tradier_api().search_symbols(query)
+            securities = ((upstream or {}).get('securities') or {}).get('security') or []
+            if not isinstance(securities, list):
+                securities = [securities]
+            universe.learn(securities)
+            results = universe.index.search(query, limit, fuzzy=False)
+            source = 'tradier'
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'source': source
+        })
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Test de connectivité Tradier
+@bp.route('/api/tradier/status')
+def api_tradier_status():
+    """API endpoint de connectivité Tradier, servi depuis la sonde de santé (réponse instantanée)"""
+    try:
+        is_connected = test_tradier_connectivity()
+        probe = health_prober.status("tradier")
+        return jsonify({
+            'success': is_connected,
+            'status': 'connected' if is_connected else 'disconnected',
+            'message': 'Connexion Tradier OK' if is_connected else 'Impossible de se connecter à Tradier',
+            'probe': probe,
+            'rate_limit': tradier_rate_limiter.get_status()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'status': 'error',
+            'message': f'Erreur lors du test: {str(e)}'
+        }), 500
+
+
+# API: Maturités disponibles pour un symbole Tradier (Version Async)
+@bp.route('/api/tradier/expirations/<symbol>')
+@http_cache(max_age=900, stale_while_revalidate=300)
+@cached_json_view(shared_cache, 'tradier_expirations')
+def api_tradier_expirations(symbol):
+    """API endpoint pour récupérer les maturités disponibles pour un symbole via Tradier (Version Async)"""
+    try:
+        print(f"🔍 Récupération des expirations pour {symbol} (Async)...")
+        
+        # Utiliser la version asynchrone
+        result = run_async(get_expirations_async(symbol))
+        
+        if result['success']:
+            # Trier par date
+            result['expirations'].sort(key=lambda x: x['date'])
+            
+            print(f"✅ {result['count']} expirations trouvées pour {symbol}")
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'expirations': result['expirations'],
+                'count': result['count']
+            })
+        else:
+            print(f"⚠️  Aucune expiration trouvée pour {symbol}: {result['error']}")
+            return jsonify({
+                'success': False,
+                'error': f'Aucune expiration trouvée pour {symbol}',
+                'details': result['error']
+            }), 404
+            
+    except Exception as e:
+        error_msg = str(e)
+        print(f"❌ Erreur lors de la récupération des expirations pour {symbol}: {error_msg}")
+        
+        # Messages d'erreur plus informatifs
+        if "ConnectionError" in error_msg or "ConnectTimeout" in error_msg:
+            user_message = "Impossible de se connecter à l'API Tradier. Vérifiez votre connexion internet."
+        elif "Max retries exceeded" in error_msg:
+            user_message = "L'API Tradier ne répond pas. Veuillez réessayer plus tard."
+        else:
+            user_message = f"Erreur lors de la récupération des données: {error_msg}"
+            
+        return jsonify({
+            'success': False,
+            'error': user_message,
+            'details': error_msg
+        }), 500
+
+
+# API: Chaîne d'options pour un symbole et une maturité Tradier
+@bp.route('/api/tradier/options/<symbol>/<expiration>')
+def api_tradier_options(symbol, expiration):
+    """API endpoint pour récupérer la chaîne d'options pour un symbole et une maturité via Tradier"""
+    try:
+        option_chain = get_tradier_api().get_option_chain(symbol, expiration)
+        if option_chain and 'options' in option_chain and 'option' in option_chain['options']:
+            options = option_chain['options']['option']
+            if not isinstance(options, list):
+                options = [options]
+            
+            # Formater les options
+            formatted_options = []
+            for option in options:
+                try:
+                    formatted_options.append({
+                        'symbol': option.get('symbol', ''),
+                        'description': option.get('description', ''),
+                        'strike': float(option.get('strike', 0)),
+                        'type': option.get('option_type', '').capitalize(),
+                        'bid': float(option.get('bid', 0)) if option.get('bid') else None,
+                        'ask': float(option.get('ask', 0)) if option.get('ask') else None,
+                        'last': float(option.get('last', 0)) if option.get('last') else None,
+                        'volume': int(option.get('volume', 0)) if option.get('volume') else 0,
+                        'open_interest': int(option.get('open_interest', 0)) if option.get('open_interest') else 0,
+                        'implied_volatility': float(option.get('implied_volatility', 0)) if option.get('implied_volatility') else None,
+                        'delta': float(option.get('delta', 0)) if option.get('delta') else None,
+                        'gamma': float(option.get('gamma', 0)) if option.get('gamma') else None,
+                        'theta': float(option.get('theta', 0)) if option.get('theta') else None,
+                        'vega': float(option.get('vega', 0)) if option.get('vega') else None
+                    })
+                except (ValueError, TypeError):
+                    continue
+            
+            # Trier par strike (ordre décroissant) puis par type
+            formatted_options.sort(key=lambda x: (-x['strike'], x['type']))
+            
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'expiration': expiration,
+                'options': formatted_options,
+                'count': len(formatted_options)
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Aucune option trouvée pour {symbol} - {expiration}'
+            }), 404
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Strikes disponibles pour un symbole et une maturité Tradier
+@bp.route('/api/tradier/strikes/<symbol>/<expiration>')
+@http_cache(max_age=900, stale_while_revalidate=300)
+def api_tradier_strikes(symbol, expiration):
+    """API endpoint pour récupérer les strikes disponibles pour un symbole et une maturité via Tradier"""
+    try:
+        print(f"🎯 Récupération des strikes pour {symbol} - {expiration}...")
+        
+        # Récupérer les strikes et le prix spot en parallèle
+        strikes_data = get_tradier_api().get_option_strikes(symbol, expiration)
+        spot_data = get_tradier_api().get_stock_quote(symbol)
+        
+        if strikes_data and 'strikes' in strikes_data and 'strike' in strikes_data['strikes']:
+            strikes = strikes_data['strikes']['strike']
+            if not isinstance(strikes, list):
+                strikes = [strikes]
+            
+            # Récupérer le prix spot
+            spot_price = 100.0  # Prix par défaut
+            if spot_data and 'quotes' in spot_data and 'quote' in spot_data['quotes']:
+                quote = spot_data['quotes']['quote']
+                if isinstance(quote, list):
+                    quote = quote[0]
+                spot_price = float(quote.get('last', 100.0))
+            
+            # Convertir en float et formater avec pourcentage
+            formatted_strikes = []
+            for strike in strikes:
+                try:
+                    strike_value = float(strike)
+                    percentage = (strike_value / spot_price) * 100
+                    formatted_strikes.append({
+                        'strike': strike_value,
+                        'display': f"${strike_value:.2f}",
+                        'percentage': round(percentage, 1),
+                        'percentage_display': f"{percentage:.1f}% (${strike_value:.2f})"
+                    })
+                except (ValueError, TypeError):
+                    continue
+            
+            # Trier par strike (ordre décroissant)
+            formatted_strikes.sort(key=lambda x: -x['strike'])
+            
+            print(f"✅ {len(formatted_strikes)} strikes trouvés pour {symbol} - {expiration} (Spot: ${spot_price:.2f})")
+            
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'expiration': expiration,
+                'spot_price': spot_price,
+                'strikes': formatted_strikes,
+                'count': len(formatted_strikes)
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Aucun strike trouvé pour {symbol} - {expiration}'
+            }), 404
+            
+    except Exception as e:
+        print(f"❌ Erreur lors de la récupération des strikes pour {symbol} - {expiration}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Strikes disponibles pour un symbole sur plusieurs maturités spécifiques (union) - Version Async
+@bp.route('/api/tradier/strikes-union/<symbol>')
+@http_cache(max_age=900, stale_while_revalidate=300)
+def api_tradier_strikes_union(symbol):
+    """API endpoint pour récupérer l'union des strikes de plusieurs maturités spécifiques via Tradier (Version Async)"""
+    try:
+        print(f"🎯 Récupération de l'union des strikes pour {symbol} (Async)...")
+        
+        # Utiliser la version asynchrone
+        result = run_async(get_strikes_union_async(symbol))
+        
+        if result['success']:
+            # Formater les strikes pour la compatibilité avec l'interface existante
+            formatted_strikes = []
+            for strike_data in result['strikes']:
+                formatted_strikes.append({
+                    'strike': strike_data['strike'],
+                    'display': f"${strike_data['strike']:.2f}",
+                    'percentage': round(strike_data['percentage'], 1),
+                    'percentage_display': strike_data['percentage_display']
+                })
+            
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'spot_price': result['spot_price'],
+                'strikes': formatted_strikes,
+                'count': len(formatted_strikes),
+                'total_strikes': result['total_strikes'],
+                'filtered_strikes': result['filtered_strikes'],
+                'expirations_processed': result['expirations_processed'],
+                'selected_expirations': result['selected_expirations']
+            })
+        else:
+            print(f"❌ Erreur pour {symbol}: {result['error']}")
+            return jsonify({
+                'success': False,
+                'error': result['error']
+            }), 404
+        
+    except Exception as e:
+        print(f"❌ Erreur lors de la récupération de l'union des strikes pour {symbol}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Prix spot d'une action via Tradier (Version Async)
+@bp.route('/api/tradier/quote/<symbol>')
+def api_tradier_quote(symbol):
+    """API endpoint pour récupérer le prix spot d'une action via Tradier (Version Async)"""
+    try:
+        print(f"💰 Récupération du prix spot pour {symbol} (Async)...")
+        
+        # Utiliser la version asynchrone
+        result = run_async(get_quote_async(symbol))
+        
+        if result['success'] and result['spot_price'] > 0:
+            print(f"✅ Prix spot {symbol}: ${result['spot_price']:.2f}")
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'spot_price': result['spot_price'],
+                'last': result['spot_price']
+            })
+        else:
+            error_msg = result.get('error', 'Prix spot invalide')
+            print(f"⚠️  Erreur pour {symbol}: {error_msg}")
+            return jsonify({
+                'success': False,
+                'error': f'Prix spot invalide pour {symbol}: {error_msg}'
+            }), 404
+            
+    except Exception as e:
+        print(f"❌ Erreur lors de la récupération du prix spot pour {symbol}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# API: Term Structure pour un symbole et un strike spécifique
+@bp.route('/api/term-structure/<symbol>/<strike>')
+@cached_json_view(shared_cache, 'term_structure')
+def api_term_structure(symbol, strike):
+    """API endpoint pour récupérer la term structure d'un symbole pour un strike spécifique"""
+    debug = debug_enabled(term_log)
+    try:
+        # Convertir le strike en float
+        strike = float(strike)
+        term_log.info("📈 Term structure %s - strike $%.2f", symbol, strike)
+        
+        # Récupérer les expirations disponibles
+        expirations_data = get_tradier_api().get_option_expirations(symbol)
+        if not expirations_data or 'expirations' not in expirations_data:
+            return jsonify({
+                'success': False,
+                'error': f'Aucune expiration trouvée pour {symbol}'
+            }), 404
+        
+        expirations = expirations_data['expirations']['date']
+        if not expirations:
+            return jsonify({
+                'success': False,
+                'error': f'Aucune expiration trouvée pour {symbol}'
+            }), 404
+        
+        # Récupérer le prix spot
+        spot_data = get_tradier_api().get_stock_quote(symbol)
+        if not spot_data or 'quotes' not in spot_data:
+            return jsonify({
+                'success': False,
+                'error': f'Impossible de récupérer le prix spot pour {symbol}'
+            }), 404
+        
+        quote = spot_data['quotes']['quote']
+        if isinstance(quote, list):
+            quote = quote[0]
+        
+        spot_price = float(quote.get('last', 0))
+        if spot_price <= 0:
+            return jsonify({
+                'success': False,
+                'error': f'Prix spot invalide pour {symbol}'
+            }), 404
+        
+        if debug:
+            term_log.debug("💰 Prix spot %s: $%.2f", symbol, spot_price)
+        
+        # Récupérer le taux sans risque et le rendement des dividendes
+        risk_free_rate = get_risk_free_rate()
+        dividend_yield = get_dividend_yield(symbol)
+        
+        if debug:
+            term_log.debug("📊 Paramètres Black-Scholes: taux sans risque %.2f%%, dividendes %.2f%%",
+                           risk_free_rate * 100, dividend_yield * 100)
+        
+        # Traiter chaque expiration
+        term_structure_data = []
+        today = datetime.now()
+        
+        for expiration in expirations:
+            try:
+                if debug:
+                    term_log.debug(f"📅 Traitement de l'expiration {expiration}...")
+                
+                # Récupérer la chaîne d'options pour cette expiration
+                chain_data = get_tradier_api().get_option_chain(symbol, expiration)
+                if not chain_data or 'options' not in chain_data:
+                    if debug:
+                        term_log.debug(f"⚠️  Aucune option pour {expiration}")
+                    continue
+                
+                options = chain_data['options']['option']
+                if not options:
+                    if debug:
+                        term_log.debug(f"⚠️  Aucune option trouvée pour {expiration}")
+                    continue
+                
+                # Convertir en liste si ce n'est pas déjà le cas
+                if not isinstance(options, list):
+                    options = [options]
+                
+                # Filtrer les options pour le strike exact
+                strike_options = []
+                for option in options:
+                    try:
+                        option_strike = float(option.get('strike', 0))
+                        if abs(option_strike - strike) < 0.01:  # Tolérance pour les arrondis
+                            strike_options.append(option)
+                    except (ValueError, TypeError):
+                        continue
+                
+                if not strike_options:
+                    if debug:
+                        term_log.debug(f"⚠️  Aucune option trouvée pour le strike ${strike:.2f}")
+                    continue
+                
+                if debug:
+                    term_log.debug(f"✅ {len(strike_options)} options trouvées pour le strike ${strike:.2f}")
+                
+                # Calculer le temps jusqu'à l'expiration en jours ouvrés
+                time_to_exp = calculate_business_days_to_expiration(expiration)
+                business_days = int(time_to_exp * 252)
+                
+                if time_to_exp <= 0:
+                    if debug:
+                        term_log.debug(f"⚠️  Expiration dans le passé: {expiration}")
+                    continue
+                
+                if debug:
+                    term_log.debug(f"📅 Time to Exp: {time_to_exp:.3f} années ({business_days} jours ouvrés)")
+                
+                # Calculer la volatilité implicite pour ce strike et cette expiration
+                ivs = []
+                for option in strike_options:
+                    option_type = option.get('option_type', '').lower()
+                    
+                    # Essayer d'abord la volatilité implicite fournie par Tradier
+                    if option.get('implied_volatility') is not None:
+                        try:
+                            iv = float(option['implied_volatility'])
+                            if 0 < iv < 5:  # Filtrer les valeurs aberrantes
+                                ivs.append(iv)
+                                if debug:
+                                    term_log.debug(f"✅ IV Tradier pour {option_type.upper()}: {iv:.4f}")
+                        except (ValueError, TypeError):
+                            pass
+                    
+                    # Si pas de volatilité implicite, essayer de la calculer à partir du prix
+                    elif option.get('last') is not None and option['last'] > 0:
+                        try:
+                            # Utiliser le prix last ou le prix moyen bid-ask
+                            option_price = float(option['last'])
+                            if option.get('bid') is not None and option.get('ask') is not None and option['bid'] > 0 and option['ask'] > 0:
+                                # Utiliser le prix moyen bid-ask si disponible
+                                option_price = (float(option['bid']) + float(option['ask'])) / 2
+                            
+                            # Calculer la volatilité implicite avec Black-Scholes
+                            calculated_iv = calculate_implied_volatility_black_scholes(
+                                spot_price=spot_price,
+                                strike=strike,
+                                time_to_exp=time_to_exp,
+                                option_price=option_price,
+                                option_type=option_type,
+                                risk_free_rate=risk_free_rate,
+                                dividend_yield=dividend_yield
+                            )
+                            
+                            if calculated_iv and 0.01 < calculated_iv < 2.0:
+                                ivs.append(calculated_iv)
+                                if debug:
+                                    term_log.debug(f"✅ IV calculée pour {option_type.upper()}: {calculated_iv:.4f} - Prix: ${option_price:.2f}")
+                            elif debug:
+                                term_log.debug(f"⚠️  IV calculée hors plage pour {option_type.upper()}: {calculated_iv}")
+                        except Exception as e:
+                            term_log.warning(f"❌ Erreur calcul IV pour {option_type.upper()}: {e}")
+                            continue
+                
+                if ivs:
+                    avg_iv = sum(ivs) / len(ivs)
+                    
+                    term_structure_data.append({
+                        'expiration': expiration,
+                        'days_to_exp': business_days,  # Jours ouvrés
+                        'time_to_exp': time_to_exp,    # Années (jours ouvrés / 252)
+                        'implied_volatility': avg_iv,
+                        'strike': strike,
+                        'spot_price': spot_price,
+                        'options_count': len(strike_options)
+                    })
+                    
+                    if debug:
+                        term_log.debug(f"✅ IV moyenne pour {expiration}: {avg_iv:.4f} ({avg_iv*100:.2f}%)")
+                elif debug:
+                    term_log.debug(f"⚠️  Aucune IV valide pour {expiration}")
+                    
+            except Exception as e:
+                term_log.warning(f"❌ Erreur pour {expiration}: {e}")
+                continue
+        
+        if not term_structure_data:
+            return jsonify({
+                'success': False,
+                'error': f'Aucune donnée de term structure trouvée pour {symbol} - Strike ${strike:.2f}'
+            }), 404
+        
+        # Trier par maturité croissante (jours ouvrés)
+        term_structure_data.sort(key=lambda x: x['days_to_exp'])
+        
+        term_log.info("✅ Term structure %s - strike $%.2f: %d points", symbol, strike, len(term_structure_data),
+                      extra={"fields": {"symbol": symbol, "strike": strike, "points": len(term_structure_data)}})
+        
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'strike': strike,
+            'spot_price': spot_price,
+            'term_structure': term_structure_data,
+            'count': len(term_structure_data)
+        })
+        
+    except Exception as e:
+        term_log.exception("❌ Erreur lors de la récupération de la term structure pour %s - strike %s: %s", symbol, strike, e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pages HTML du dashboard
+"""
+
+from flask import Blueprint, render_template, send_file
+
+bp = Blueprint("pages", __name__)
+
+
+@bp.route('/')
+def index():
+    """Page d'accueil du dashboard"""
+    return render_template('index.html')
+
+
+@bp.route('/cv-mathis-le-gall')
+def cv_mathis_le_gall():
+    """Page CV Mathis Le Gall"""
+    return render_template('cv_mathis_le_gall.html')
+
+
+@bp.route('/indices-actions')
+def indices_actions():
+    """Page des indices et actions"""
+    return render_template('indices_actions.html')
+
+
+@bp.route('/rates-fx')
+def rates_fx():
+    """Page des taux et forex"""
+    return render_template('rates_fx.html')
+
+
+@bp.route('/call-put')
+def call_put():
+    """Page Call & Put"""
+    return render_template('call_put.html')
+
+
+@bp.route('/volatility-surface')
+def volatility_surface():
+    """Page de la surface de volatilité"""
+    return render_template('volatility_surface.html')
+
+
+@bp.route('/force-refresh')
+def force_refresh():
+    """Page pour forcer le rafraîchissement"""
+    return render_template('force_refresh.html')
+
+
+@bp.route('/test-vol-surface')
+def test_vol_surface():
+    """Page de test pour debug de la surface de volatilité"""
+    return send_file('test_vol_surface_debug.html')
+
+
+@bp.route('/test-indices-actions')
+def test_indices_actions():
+    """Page de test pour les indices et actions"""
+    return send_file('test_indices_actions.html')
+
+
+@bp.route('/analyse-actions-indices')
+def analyse_actions_indices():
+    """Page dédiée: comparaison de performances (Base 100)"""
+    return render_template('analyse_actions_indices.html')
+
+
+@bp.route('/description-app')
+def description_app():
+    """Page de description de l'application"""
+    return render_template('description_app.html')
+
+
+@bp.route('/analyse-volatility')
+def analyse_volatility():
+    """Page d'analyse de volatilité"""
+    return render_template('analyse_volatility.html')
+
+
+# Routes pour les pages cryptomonnaies
+@bp.route('/crypto')
+def crypto():
+    """Page principale des cryptomonnaies"""
+    return render_template('crypto.html')
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Calculateur d'options: prix, grecques, courbes et matrices de sensibilité
+
+Calcul pur (aucun appel Tradier / Yahoo): ce blueprint peut être servi seul par un pool de
+workers dédié (APP_PROFILE=pricing).
+"""
+
+import math
+import time
+
+from flask import Blueprint, jsonify, request
+
+from models.options_pricing import OptionPricer
+from models.greeks_calculator import greeks_calculator
+from utils.binary_transport import binary_capable
+from utils.logging_setup import get_logger, debug_enabled
+from routes import lazy
+
+bp = Blueprint("pricing", __name__)
+
+# Logger du module (niveau réglable via LOG_LEVELS, ex: "greeks=DEBUG")
+greeks_log = get_logger("greeks")
+
+
+@lazy
+def get_pricer():
+    """Pricer Black-Scholes / Monte Carlo (créé à la première requête)"""
+    return OptionPricer()
+
+
+# Approximation rationnelle d'Acklam pour l'inverse de la CDF normale (PPF)
+# Source adaptée: https://web.archive.org/web/20151030215612/http://home.online.no/~pjacklam/notes/invnorm/
+def _inv_norm_cdf(p: float) -> float:
+    if p <= 0.0 or p >= 1.0:
+        raise ValueError("p doit être dans (0,1)")
+
+    # Coefficients pour approximation par morceaux
+    a = [
+        -3.969683028665376e+01,
+        2.209460984245205e+02,
+        -2.759285104469687e+02,
+        1.383577518672690e+02,
+        -3.066479806614716e+01,
+        2.506628277459239e+00,
+    ]
+    b = [
+        -5.447609879822406e+01,
+        1.615858368580409e+02,
+        -1.556989798598866e+02,
+        6.680131188771972e+01,
+        -1.328068155288572e+01,
+    ]
+    c = [
+        -7.784894002430293e-03,
+        -3.223964580411365e-01,
+        -2.400758277161838e+00,
+        -2.549732539343734e+00,
+        4.374664141464968e+00,
+        2.938163982698783e+00,
+    ]
+    d = [
+        7.784695709041462e-03,
+        3.224671290700398e-01,
+        2.445134137142996e+00,
+        3.754408661907416e+00,
+    ]
+
+    plow = 0.02425
+    phigh = 1 - plow
+
+    if p < plow:
+        q = math.sqrt(-2 * math.log(p))
+        return (
+            (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+            / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+        )
+    elif phigh < p:
+        q = math.sqrt(-2 * math.log(1 - p))
+        return -(
+            (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+            / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+        )
+    else:
+        q = p - 0.5
+        r = q * q
+        return (
+            (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+        ) / (
+            ((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1
+        )
+
+
+def _z_from_confidence(conf_level: float) -> float:
+    # conf_level dans (0,1), par défaut 0.95
+    cl = max(0.5, min(0.999, float(conf_level)))
+    tail = 1.0 - (1.0 - cl) / 2.0
+    return abs(_inv_norm_cdf(tail))
+
+
+# API pour les calculs d'options Call & Put
+@bp.route('/api/calculate-option', methods=['POST'])
+@binary_capable
+def api_calculate_option():
+    """API pour calculer le prix d'une option"""
+    try:
+        data = request.get_json()
+        
+        # Validation des données
+        required_fields = ['spotPrice', 'strikePrice', 'timeMaturity', 'riskFreeRate', 'volatility', 'optionType']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'error': f'Champ manquant: {field}'}), 400
+        
+        # Extraction des paramètres
+        spot_price = float(data['spotPrice'])
+        strike_price = float(data['strikePrice'])
+        time_maturity = float(data['timeMaturity'])
+        risk_free_rate = float(data['riskFreeRate'])
+        volatility = float(data['volatility'])
+        option_type = data['optionType']
+        model_choice = data['modelChoice']
+        
+        # Validation des valeurs
+        if spot_price <= 0 or strike_price <= 0 or time_maturity <= 0:
+            return jsonify({'error': 'Les prix et l\'échéance doivent être positifs'}), 400
+        
+        if risk_free_rate < 0 or risk_free_rate > 1 or volatility < 0 or volatility > 1:
+            return jsonify({'error': 'Le taux sans risque et la volatilité doivent être entre 0 et 1'}), 400
+        
+        # Validation du nombre de simulations Monte Carlo
+        nb_simulations = int(data.get('numSimulations', 10000))
+        if nb_simulations < 100 or nb_simulations > 1000000:
+            return jsonify({'error': 'Le nombre de simulations doit être entre 100 et 1 000 000'}), 400
+        
+        # Si Monte Carlo: simuler les trajectoires pour obtenir prix et IC
+        # Toujours calculer Monte Carlo et Black-Scholes pour comparaison
+        if True:
+            nb_steps = int(data.get('numSteps', 252))
+            confidence_level = float(data.get('confidenceLevel', 0.95))
+
+            t_all_start = time.perf_counter()
+            t_mc_start = time.perf_counter()
+            mc = get_pricer().monte_carlo_price_and_greeks(
+                S=spot_price,
+                K=strike_price,
+                T=time_maturity,
+                r=risk_free_rate,
+                sigma=volatility,
+                option_type=option_type,
+                nb_simulations=nb_simulations,
+                nb_steps=nb_steps,
+                return_std=True,
+                return_paths=int(data.get('numPaths', 50)),
+            )
+            t_mc_ms = (time.perf_counter() - t_mc_start) * 1000.0
+            try:
+                z = _z_from_confidence(confidence_level)
+            except Exception:
+                z = 1.96
+
+            t_bs_start = time.perf_counter()
+            bs_price, bs_delta, bs_gamma, bs_theta, bs_vega, bs_rho = get_pricer().black_scholes_price_and_greeks(
+                S=spot_price,
+                K=strike_price,
+                T=time_maturity,
+                r=risk_free_rate,
+                sigma=volatility,
+                option_type=option_type,
+            )
+            t_bs_ms = (time.perf_counter() - t_bs_start) * 1000.0
+            t_total_ms = (time.perf_counter() - t_all_start) * 1000.0
+
+            result = {
+                'monteCarlo': {
+                    'optionPrice': round(mc['price'], 4),
+                    'delta': round(mc['delta'], 4) if not math.isnan(mc['delta']) else None,
+                    'gamma': round(mc['gamma'], 4) if not math.isnan(mc['gamma']) else None,
+                    'theta': round(mc['theta'], 4) if not math.isnan(mc['theta']) else None,
+                    'vega': round(mc.get('vega', float('nan')), 4) if not math.isnan(mc.get('vega', float('nan'))) else None,
+                    'rho': round(mc.get('rho', float('nan')), 4) if not math.isnan(mc.get('rho', float('nan'))) else None,
+                    'confidenceInterval': {
+                        'lower': round(mc['price'] - z * mc['stdError'], 4),
+                        'mean': round(mc['price'], 4),
+                        'upper': round(mc['price'] + z * mc['stdError'], 4),
+                        'confidenceLevel': round(confidence_level, 4),
+                    },
+                    'paths': mc.get('paths'),
+                    'timeGrid': mc.get('timeGrid'),
+                    'timeMs': round(t_mc_ms, 2),
+                },
+                'blackScholes': {
+                    'optionPrice': round(bs_price, 4),
+                    'delta': round(bs_delta, 4),
+                    'gamma': round(bs_gamma, 4),
+                    'theta': round(bs_theta, 4),
+                    'vega': round(bs_vega, 4),
+                    'rho': round(bs_rho, 4),
+                    'timeMs': round(t_bs_ms, 2),
+                },
+                'parameters': {
+                    'spotPrice': spot_price,
+                    'strikePrice': strike_price,
+                    'timeMaturity': time_maturity,
+                    'riskFreeRate': risk_free_rate,
+                    'volatility': volatility,
+                    'optionType': option_type,
+                    'numSimulations': nb_simulations,
+                    'numSteps': nb_steps,
+                    'confidenceLevel': round(confidence_level, 4),
+                },
+                'timings': {
+                    'totalMs': round(t_total_ms, 2),
+                }
+            }
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/greeks-curves', methods=['POST'])
+@binary_capable
+def api_greeks_curves():
+    """API pour calculer les courbes des Greeks"""
+    try:
+        data = request.get_json()
+        
+        # Récupérer les paramètres
+
+        
+        spot_price = float(data.get('spotPrice', 100))
+        strike_price = float(data.get('strikePrice', 100))
+        time_maturity = float(data.get('timeMaturity', 1))
+        risk_free_rate = float(data.get('riskFreeRate', 0.05))
+        volatility = float(data.get('volatility', 0.2))
+        option_type = data.get('optionType', 'call')
+        
+        # Calculer les courbes des Greeks
+        curves = greeks_calculator.generate_greek_curves(
+            S=spot_price,  # Passer le prix spot pour la plage dynamique
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            sigma=volatility,
+            option_type=option_type
+        )
+        
+        # Contrôle du Theta au spot et des extrémités de la courbe, uniquement en DEBUG
+        if debug_enabled(greeks_log):
+            test_theta = greeks_calculator.calculate_theta(spot_price, strike_price, time_maturity, risk_free_rate, volatility, option_type)
+            greeks_log.debug("🔍 TEST THETA: S=%s, K=%s, T=%s → Theta=%.6f", spot_price, strike_price, time_maturity, test_theta)
+            greeks_log.debug("🔍 ARRAY THETA (premiers 5): %s", curves['theta'][:5])
+            greeks_log.debug("🔍 ARRAY THETA (derniers 5): %s", curves['theta'][-5:])
+        
+        # Calculer les valeurs au prix spot actuel
+        current_values = greeks_calculator.get_greek_values_at_spot(
+            S=spot_price,
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            sigma=volatility,
+            option_type=option_type
+        )
+        
+        return jsonify({
+            'success': True,
+            'curves': curves,
+            'current_values': current_values,
+            'parameters': {
+                'spotPrice': spot_price,
+                'strikePrice': strike_price,
+                'timeMaturity': time_maturity,
+                'riskFreeRate': risk_free_rate,
+                'volatility': volatility,
+                'optionType': option_type
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/volatility-sensitivity-matrix', methods=['POST'])
+@binary_capable
+def api_volatility_sensitivity_matrix():
+    """API pour calculer la matrice de sensibilité des Greeks selon la volatilité"""
+    try:
+        data = request.get_json()
+        
+        # Récupérer les paramètres
+        spot_price = float(data.get('spotPrice', 100))
+        strike_price = float(data.get('strikePrice', 100))
+        time_maturity = float(data.get('timeMaturity', 1))
+        risk_free_rate = float(data.get('riskFreeRate', 0.05))
+        base_volatility = float(data.get('volatility', 0.2))
+        option_type = data.get('optionType', 'call')
+        
+        # Paramètres pour la matrice de volatilité
+        volatility_range = float(data.get('volatilityRange', 0.1))  # ±10% par défaut
+        num_points = int(data.get('numPoints', 7))  # 7 points par défaut
+        
+        # Validation des paramètres
+        if volatility_range <= 0 or volatility_range > 0.5:
+            return jsonify({'error': 'La plage de volatilité doit être entre 0 et 0.5'}), 400
+        
+        if num_points < 3 or num_points > 15:
+            return jsonify({'error': 'Le nombre de points doit être entre 3 et 15'}), 400
+        
+        if base_volatility - volatility_range < 0:
+            return jsonify({'error': 'La volatilité de base moins la plage ne peut pas être négative'}), 400
+        
+        # Calculer la matrice de sensibilité
+        sensitivity_matrix = greeks_calculator.generate_volatility_sensitivity_matrix(
+            S=spot_price,
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            base_volatility=base_volatility,
+            option_type=option_type,
+            volatility_range=volatility_range,
+            num_points=num_points
+        )
+        
+        # Calculer les valeurs de référence avec la volatilité de base
+        reference_values = greeks_calculator.get_greek_values_at_spot(
+            S=spot_price,
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            sigma=base_volatility,
+            option_type=option_type
+        )
+        
+        return jsonify({
+            'success': True,
+            'sensitivity_matrix': sensitivity_matrix,
+            'reference_values': reference_values,
+            'parameters': {
+                'spotPrice': spot_price,
+                'strikePrice': strike_price,
+                'timeMaturity': time_maturity,
+                'riskFreeRate': risk_free_rate,
+                'baseVolatility': base_volatility,
+                'volatilityRange': volatility_range,
+                'numPoints': num_points,
+                'optionType': option_type
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/api/maturity-sensitivity-matrix', methods=['POST'])
+@binary_capable
+def api_maturity_sensitivity_matrix():
+    """API pour calculer la matrice de sensibilité des Greeks selon la maturité"""
+    try:
+        data = request.get_json()
+        
+        # Récupérer les paramètres
+        spot_price = float(data.get('spotPrice', 100))
+        strike_price = float(data.get('strikePrice', 100))
+        time_maturity = float(data.get('timeMaturity', 1))
+        risk_free_rate = float(data.get('riskFreeRate', 0.05))
+        volatility = float(data.get('volatility', 0.2))
+        option_type = data.get('optionType', 'call')
+        
+        # Paramètres pour la plage de maturité (non utilisés car la fonction backend a sa propre logique)
+        maturity_range = float(data.get('maturityRange', 0.9))  # Non utilisé dans la fonction backend
+        num_points = int(data.get('numPoints', 6))  # Non utilisé dans la fonction backend
+        
+        # Validation des paramètres
+        if maturity_range <= 0 or maturity_range > 2.0:
+            return jsonify({'error': 'La plage de maturité doit être entre 0 et 2.0 années'}), 400
+        
+        if num_points < 3 or num_points > 21:
+            return jsonify({'error': 'Le nombre de points doit être entre 3 et 21'}), 400
+        
+        # Calculer la matrice de sensibilité à la maturité
+        sensitivity_matrix = greeks_calculator.generate_maturity_sensitivity_matrix(
+            S=spot_price,
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            sigma=volatility,
+            option_type=option_type,
+            maturity_range=maturity_range,
+            num_points=num_points
+        )
+        
+        # Calculer les valeurs de référence (maturité de base)
+        reference_values = greeks_calculator.get_greek_values_at_spot(
+            S=spot_price,
+            K=strike_price,
+            T=time_maturity,
+            r=risk_free_rate,
+            sigma=volatility,
+            option_type=option_type
+        )
+        
+        return jsonify({
+            'success': True,
+            'sensitivity_matrix': sensitivity_matrix,
+            'reference_values': reference_values,
+            'parameters': {
+                'spotPrice': spot_price,
+                'strikePrice': strike_price,
+                'timeMaturity': time_maturity,
+                'riskFreeRate': risk_free_rate,
+                'volatility': volatility,
+                'maturityRange': maturity_range,
+                'numPoints': num_points,
+                'optionType': option_type
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
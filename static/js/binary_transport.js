@@ -0,0 +1,137 @@
+// Décodage du transport binaire MLGB (voir utils/binary_transport.py)
+//
+// Usage:
+//     const response = await fetch(url, { headers: { 'Accept': MLGBinary.ACCEPT } });
+//     const data = await MLGBinary.parse(response);
+//
+// Par défaut les buffers sont convertis en tableaux JavaScript (NaN → null) pour garder
+// la forme de la réponse JSON. Avec { typed: true }, les grilles restent des
+// Float32Array / Float64Array (vues sans copie, NaN conservés) pour Plotly / Chart.js:
+// MLGBinary.finite() et MLGBinary.jsonReplacer couvrent les statistiques et l'affichage brut.
+
+(function (global) {
+    'use strict';
+
+    const MIMETYPE = 'application/x-mlg-binary';
+    const PREFIX_SIZE = 12;
+
+    function toPlain(view) {
+        const out = new Array(view.length);
+        for (let i = 0; i < view.length; i++) {
+            const v = view[i];
+            out[i] = Number.isNaN(v) ? null : v;
+        }
+        return out;
+    }
+
+    // Valeurs finies d'une série ou d'une grille (tableaux ou vues typées), à plat
+    function finite(grid) {
+        const out = [];
+        const walk = values => {
+            for (let i = 0; i < values.length; i++) {
+                const v = values[i];
+                if (typeof v === 'number') {
+                    if (Number.isFinite(v)) out.push(v);
+                } else if (v && typeof v.length === 'number') {
+                    walk(v);
+                }
+            }
+        };
+        if (grid) walk(grid);
+        return out;
+    }
+
+    // JSON.stringify(data, MLGBinary.jsonReplacer): vues typées sérialisées comme des tableaux
+    function jsonReplacer(key, value) {
+        return ArrayBuffer.isView(value) ? Array.from(value, v => (Number.isNaN(v) ? null : v)) : value;
+    }
+
+    function decode(buffer, options = {}) {
+        const typed = Boolean(options.typed);
+        const dv = new DataView(buffer);
+        const magic = String.fromCharCode(dv.getUint8(0), dv.getUint8(1), dv.getUint8(2), dv.getUint8(3));
+        if (magic !== 'MLGB' || dv.getUint8(4) !== 1) {
+            throw new Error('Document MLGB invalide');
+        }
+        const headerLength = dv.getUint32(8, true);
+        const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, PREFIX_SIZE, headerLength)));
+        const base = PREFIX_SIZE + headerLength;
+
+        const buffers = header.buffers.map(desc => {
+            const size = desc.shape.reduce((a, b) => a * b, 1);
+            const float32 = desc.dtype === 'f4';
+            const flat = float32
+                ? new Float32Array(buffer, base + desc.offset, size)
+                : new Float64Array(buffer, base + desc.offset, size);
+            if (desc.shape.length === 1) {
+                return typed ? flat : toPlain(flat);
+            }
+            const cols = desc.shape[1];
+            const rows = [];
+            for (let r = 0; r < desc.shape[0]; r++) {
+                const row = flat.subarray(r * cols, (r + 1) * cols);
+                rows.push(typed ? row : toPlain(row));
+            }
+            return rows;
+        });
+
+        function column(node) {
+            if (node && typeof node === 'object' && '$b' in node) {
+                return buffers[node.$b];
+            }
+            return node;
+        }
+
+        function rebuild(node) {
+            if (Array.isArray(node)) {
+                return node.map(rebuild);
+            }
+            if (node === null || typeof node !== 'object') {
+                return node;
+            }
+            if ('$b' in node && Object.keys(node).length === 1) {
+                return buffers[node.$b];
+            }
+            if ('$df' in node && Object.keys(node).length === 1) {
+                // DataFrame en colonnes → liste d'enregistrements (forme JSON d'origine)
+                const frame = node.$df;
+                const cols = frame.columns.map(name => [name, column(frame.data[name])]);
+                const records = new Array(frame.length);
+                for (let i = 0; i < frame.length; i++) {
+                    const record = {};
+                    for (const [name, values] of cols) {
+                        const v = values[i];
+                        record[name] = (typeof v === 'number' && Number.isNaN(v)) ? null : v;
+                    }
+                    records[i] = record;
+                }
+                return records;
+            }
+            const out = {};
+            for (const key of Object.keys(node)) {
+                out[key] = rebuild(node[key]);
+            }
+            return out;
+        }
+
+        return rebuild(header.payload);
+    }
+
+    async function parse(response, options = {}) {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!contentType.startsWith(MIMETYPE)) {
+            // Route non compatible, erreur ou proxy: réponse JSON classique
+            return response.json();
+        }
+        return decode(await response.arrayBuffer(), options);
+    }
+
+    global.MLGBinary = {
+        MIMETYPE,
+        ACCEPT: `${MIMETYPE}, application/json;q=0.9`,
+        decode,
+        parse,
+        finite,
+        jsonReplacer
+    };
+})(window);
@@ -0,0 +1,86 @@
+// Suivi des tâches de fond (voir utils/jobs.py et /api/jobs)
+//
+// Usage:
+//     const job = await MLGJobs.submit('surface_export', { symbol: 'SPY', format: 'parquet', span: 0.5 }, { token });
+//     const done = await MLGJobs.wait(job, { token, onProgress: j => bar.style.width = `${j.progress}%` });
+//     MLGJobs.download(done, { token });
+//
+// Une tâche identique déjà en cours ou terminée est réutilisée par le serveur: soumettre deux fois
+// le même export ne le relance pas. Les fichiers produits expirent après JOBS_TTL secondes.
+// Toutes les routes demandent le secret JOBS_SECRET (option token → en-tête X-Jobs-Token, ou
+// paramètre _jobs_token pour le lien de téléchargement, qui ne peut pas porter d'en-tête).
+
+(function (global) {
+    'use strict';
+
+    const FINAL_STATUSES = ['done', 'failed', 'cancelled'];
+
+    async function request(url, options = {}) {
+        const response = await fetch(url, options);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || `HTTP ${response.status}`);
+        }
+        return data;
+    }
+
+    function authHeaders(options) {
+        return options.token ? { 'X-Jobs-Token': options.token } : {};
+    }
+
+    function submit(kind, params, options = {}) {
+        return request('/api/jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', ...authHeaders(options) },
+            body: JSON.stringify({ kind, params })
+        });
+    }
+
+    function status(job, options = {}) {
+        return request(job.status_url || `/api/jobs/${job.id}`, { headers: authHeaders(options) });
+    }
+
+    function cancel(job, options = {}) {
+        return request(job.status_url || `/api/jobs/${job.id}`, { method: 'DELETE', headers: authHeaders(options) });
+    }
+
+    async function wait(job, options = {}) {
+        const interval = options.interval || 1000;
+        let current = job;
+        while (!FINAL_STATUSES.includes(current.status)) {
+            if (options.onProgress) {
+                options.onProgress(current);
+            }
+            await new Promise(resolve => setTimeout(resolve, interval));
+            current = await status(current, options);
+        }
+        if (options.onProgress) {
+            options.onProgress(current);
+        }
+        if (current.status !== 'done') {
+            throw new Error(current.error || `Tâche ${current.id}: ${current.status}`);
+        }
+        return current;
+    }
+
+    function download(job, options = {}) {
+        // Lien temporaire: le navigateur reprend le nom de fichier de Content-Disposition
+        const link = document.createElement('a');
+        const url = new URL(job.download_url || `/api/jobs/${job.id}/download`, window.location.href);
+        if (options.token) {
+            url.searchParams.set('_jobs_token', options.token);
+        }
+        link.href = url.toString();
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+    }
+
+    global.MLGJobs = {
+        submit,
+        status,
+        cancel,
+        wait,
+        download
+    };
+})(window);
@@ -0,0 +1 @@
+# Package utilitaires de la couche web (sérialisation, HTTP, observabilité)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Transport binaire des grilles numériques (surfaces, courbes de grecques, chemins Monte Carlo, matrices)
+
+Négociation de contenu: une route décorée par @binary_capable répond au format binaire
+quand le client envoie "Accept: application/x-mlg-binary" (ou ?transport=binary), sinon en JSON.
+
+Format (petit-boutiste):
+    "MLGB" | version (u8) | 3 octets réservés | longueur de l'en-tête (u32) | en-tête JSON | buffers
+
+L'en-tête contient la réponse JSON dans laquelle chaque grand tableau numérique est remplacé
+par {"$b": index} et chaque DataFrame par {"$df": {...}} (colonnes numériques en buffers).
+Les buffers sont alignés sur 8 octets et décodés côté navigateur en Float32Array / Float64Array
+(static/js/binary_transport.js). Les grilles 2D voyagent en float32, les axes et séries 1D en float64.
+"""
+
+import sys
+import json
+import math
+import struct
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+BINARY_MIMETYPE = "application/x-mlg-binary"
+MAGIC = b"MLGB"
+VERSION = 1
+PREFIX = struct.Struct("<4sB3xI")
+
+# En dessous de cette taille, un tableau reste en JSON dans l'en-tête
+MIN_BUFFER_SIZE = 16
+
+
+def loaded_pandas():
+    """pandas s'il est déjà chargé (sinon aucun DataFrame n'existe): un pool pricing ne l'importe pas"""
+    return sys.modules.get("pandas")
+
+
+def _numeric_array(value: Any) -> Optional[np.ndarray]:
+    """Convertit une liste (éventuellement imbriquée, avec des None) en tableau flottant, ou None"""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "fiu":
+            return value
+        if value.dtype.kind != "O":
+            return None
+        value = value.tolist()
+
+    if not value or isinstance(value[0], (str, bool, dict)):
+        return None
+    try:
+        return np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # Valeurs manquantes (None) → NaN
+        array = np.array(value, dtype=object)
+        if array.dtype != object or array.ndim == 0:
+            return None
+        mask = np.equal(array, None)
+        array[mask] = np.nan
+        return array.astype(np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Encoder:
+    def __init__(self):
+        self.buffers: List[bytes] = []
+        self.descriptors: List[Dict[str, Any]] = []
+        self.offset = 0
+
+    def add_buffer(self, array: np.ndarray) -> Dict[str, int]:
+        dtype = np.float32 if array.ndim >= 2 else np.float64
+        data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+        padding = (-len(data)) % 8
+        self.descriptors.append({
+            "offset": self.offset,
+            "dtype": "f4" if dtype is np.float32 else "f8",
+            "shape": list(array.shape)
+        })
+        self.buffers.append(data + b"\0" * padding)
+        self.offset += len(data) + padding
+        return {"$b": len(self.descriptors) - 1}
+
+    def walk(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {str(k): self.walk(v) for k, v in obj.items()}
+        pd = loaded_pandas()
+        if pd is not None:
+            if isinstance(obj, pd.DataFrame):
+                return self.encode_frame(obj)
+            if isinstance(obj, pd.Series):
+                obj = obj.to_numpy()
+        if isinstance(obj, (list, tuple, np.ndarray)):
+            if len(obj) >= MIN_BUFFER_SIZE:
+                array = _numeric_array(obj)
+                if array is not None and array.ndim in (1, 2) and array.size >= MIN_BUFFER_SIZE:
+                    return self.add_buffer(array)
+            if isinstance(obj, np.ndarray):
+                obj = obj.tolist()
+            return [self.walk(v) for v in obj]
+        if isinstance(obj, float) and not math.isfinite(obj):
+            # NaN et ±Infinity: JSON.parse refuse les littéraux NaN / Infinity de l'en-tête
+            return None
+        if isinstance(obj, np.generic):
+            return self.walk(obj.item())
+        return obj
+
+    def encode_frame(self, df) -> Dict[str, Any]:
+        """DataFrame en colonnes: numériques en buffers float64, autres en listes JSON"""
+        pd = loaded_pandas()
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            if series.dtype.kind in "fiu" and len(series) >= MIN_BUFFER_SIZE:
+                columns[str(name)] = self.add_buffer(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                columns[str(name)] = series.astype(object).where(pd.notna(series), None).tolist()
+        return {"$df": {"columns": [str(c) for c in df.columns], "length": len(df), "data": columns}}
+
+
+def encode_binary(payload: Any, json_default=None) -> bytes:
+    """
+    Encode une réponse au format binaire MLGB
+
+    Args:
+        payload (Any): Réponse (dict, listes, tableaux NumPy, DataFrames)
+        json_default (Callable, optional): Sérialiseur des types restants de l'en-tête
+
+    Returns:
+        bytes: Document binaire
+    """
+    encoder = _Encoder()
+    tree = encoder.walk(payload)
+
+    def default(obj):
+        if json_default is None:
+            raise TypeError(f"Type {type(obj).__name__} non sérialisable en JSON")
+        # Valeur convertie (Decimal, dates, ensembles) repassée par walk: non-finis → null
+        return encoder.walk(json_default(obj))
+
+    # Le payload précède "buffers": un tableau ajouté par default() figure encore dans les descripteurs
+    header = json.dumps({"payload": tree, "buffers": encoder.descriptors},
+                        default=default, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    # Aligner le début des buffers sur 8 octets (vues Float64Array)
+    header += b" " * ((-(PREFIX.size + len(header))) % 8)
+    return PREFIX.pack(MAGIC, VERSION, len(header)) + header + b"".join(encoder.buffers)
+
+
+def decode_binary(data: bytes) -> Any:
+    """
+    Décode un document MLGB (tableaux NumPy, DataFrames reconstruits)
+
+    Args:
+        data (bytes): Document binaire
+
+    Returns:
+        Any: Réponse décodée
+    """
+    magic, version, header_length = PREFIX.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Document MLGB invalide")
+    header = json.loads(data[PREFIX.size:PREFIX.size + header_length])
+    base = PREFIX.size + header_length
+    buffers = []
+    for descriptor in header["buffers"]:
+        dtype = np.float32 if descriptor["dtype"] == "f4" else np.float64
+        count = int(np.prod(descriptor["shape"]))
+        buffers.append(np.frombuffer(data, dtype=dtype, count=count,
+                                     offset=base + descriptor["offset"]).reshape(descriptor["shape"]))
+
+    def rebuild(node):
+        if isinstance(node, dict):
+            if "$b" in node and len(node) == 1:
+                return buffers[node["$b"]]
+            if "$df" in node and len(node) == 1:
+                import pandas as pd
+                frame = node["$df"]
+                return pd.DataFrame({c: rebuild(frame["data"][c]) for c in frame["columns"]},
+                                    columns=frame["columns"])
+            return {k: rebuild(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [rebuild(v) for v in node]
+        return node
+
+    return rebuild(header["payload"])
+
+
+def wants_binary() -> bool:
+    """Le client de la requête courante accepte-t-il le format binaire sur une route compatible ?"""
+    from flask import g, request, has_request_context
+    if not has_request_context() or not g.get("binary_transport"):
+        return False
+    if request.args.get("transport") == "binary":
+        return True
+    # Opt-in explicite: "*/*" (navigateur, curl) garde le JSON
+    explicit = any(mimetype == BINARY_MIMETYPE and quality > 0 for mimetype, quality in request.accept_mimetypes)
+    return explicit and request.accept_mimetypes.best_match(["application/json", BINARY_MIMETYPE]) == BINARY_MIMETYPE
+
+
+def binary_capable(view):
+    """
+    Décorateur de route: autorise la réponse binaire négociée pour cette route
+
+    Les routes renvoient toujours jsonify(...): le fournisseur JSON bascule en binaire si le client l'accepte.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from flask import g, make_response
+        g.binary_transport = True
+        response = make_response(view(*args, **kwargs))
+        response.vary.add("Accept")
+        return response
+    return wrapper
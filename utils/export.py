@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Exports en flux (CSV, Excel, Parquet, Arrow) des surfaces et chaînes d'options
+
+Les réponses sont produites par des générateurs: le téléchargement commence dès les premiers
+octets et la mémoire reste bornée, même pour une chaîne complète sur toutes les expirations.
+- CSV: lignes écrites par paquets
+- Excel: classeur openpyxl en mode write_only, écrit dans un fichier temporaire puis lu par blocs
+- Parquet: un row group par expiration (pyarrow.parquet.ParquetWriter)
+- Arrow: flux IPC, un record batch par expiration (lisible par pyarrow.ipc.open_stream)
+
+Exemple:
+    chains = ((expiration, df) for expiration, df in fetch_chains())
+    return streaming_response(iter_parquet(chain_frames(chains, symbol)), "parquet", f"chain_{symbol}")
+"""
+
+import io
+import csv
+import tempfile
+import importlib.util
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# pyarrow.parquet et openpyxl ne sont importés qu'au premier export qui les utilise
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Colonnes de l'export au format chaîne (une ligne par option)
+CHAIN_COLUMNS = [
+    ("symbol", "str"), ("expiration_date", "str"), ("maturity_years", "float"), ("strike", "float"),
+    ("type", "str"), ("bid", "float"), ("ask", "float"), ("last", "float"), ("volume", "float"),
+    ("open_interest", "float"), ("implied_volatility", "float"), ("delta", "float"), ("gamma", "float"),
+    ("theta", "float"), ("vega", "float"),
+]
+
+# Colonnes de get_historical_options_data → colonnes de l'export
+_SOURCE_COLUMNS = {
+    "Strike": "strike", "Type": "type", "Bid": "bid", "Ask": "ask", "Last": "last", "Volume": "volume",
+    "Open_Interest": "open_interest", "Implied_Volatility": "implied_volatility", "Delta": "delta",
+    "Gamma": "gamma", "Theta": "theta", "Vega": "vega",
+}
+
+CSV_BATCH_ROWS = 500
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def chain_frames(chains: Iterable[Tuple[str, pd.DataFrame]], symbol: str,
+                 strike_range: Optional[Tuple[float, float]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Normalise les chaînes (une DataFrame par expiration) au schéma de l'export
+
+    Args:
+        chains (Iterable): Couples (expiration, DataFrame de get_historical_options_data)
+        symbol (str): Symbole du sous-jacent
+        strike_range (Tuple, optional): Bornes (min, max) des strikes conservés
+
+    Yields:
+        pd.DataFrame: Colonnes CHAIN_COLUMNS, une DataFrame par expiration
+    """
+    now = datetime.now()
+    for expiration, df in chains:
+        if df is None or df.empty:
+            continue
+        frame = df.rename(columns=_SOURCE_COLUMNS)
+        if strike_range is not None:
+            frame = frame[(frame["strike"] >= strike_range[0]) & (frame["strike"] <= strike_range[1])]
+        out = pd.DataFrame(index=frame.index)
+        out["symbol"] = symbol
+        out["expiration_date"] = expiration
+        out["maturity_years"] = (datetime.strptime(expiration, "%Y-%m-%d") - now).days / 365.25
+        for name, kind in CHAIN_COLUMNS[3:]:
+            values = frame[name] if name in frame.columns else None
+            if kind == "float":
+                out[name] = pd.to_numeric(values, errors="coerce") if values is not None else float("nan")
+            else:
+                out[name] = values.astype(str).str.lower() if values is not None else None
+        yield out.reset_index(drop=True)
+
+
+def _iter_csv(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % CSV_BATCH_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_surface_csv(strikes: List[float], maturities: List[float], iv_matrix: List[List]) -> Iterator[bytes]:
+    """CSV de la matrice de volatilité (une ligne par maturité, une colonne par strike)"""
+    header = ["Maturité (années)"] + [f"Strike ${s:.2f}" for s in strikes]
+    rows = ([f"{maturity:.3f}"] + [f"{iv:.4f}" if iv is not None else "" for iv in iv_matrix[i]]
+            for i, maturity in enumerate(maturities))
+    return _iter_csv(header, rows)
+
+
+def iter_chain_csv(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """CSV de la chaîne (une ligne par option), écrit au fil des expirations"""
+    def rows():
+        for frame in frames:
+            for record in frame.itertuples(index=False, name=None):
+                yield ["" if value is None or value != value else value for value in record]
+    return _iter_csv([name for name, _ in CHAIN_COLUMNS], rows())
+
+
+def iter_surface_xlsx(symbol: str, provider: str, spot_price: float, strikes: List[float],
+                      maturities: List[float], iv_matrix: List[List]) -> Iterator[bytes]:
+    """
+    Classeur Excel de la surface (openpyxl write_only: les lignes ne sont pas gardées en mémoire)
+
+    Le format xlsx est une archive zip: le classeur est écrit dans un fichier temporaire
+    (en mémoire jusqu'à 8 Mo) puis envoyé par blocs.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Surface de Volatilité")
+
+    def bold(value):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = Font(bold=True)
+        return cell
+
+    ws.append([bold("Métadonnées")])
+    ws.append([f"Symbole: {symbol}"])
+    ws.append([f"Fournisseur: {provider}"])
+    ws.append([f"Prix Spot: ${spot_price:.2f}"])
+    ws.append([f"Date d'export: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+    ws.append([])
+    ws.append([bold("Matrice de Volatilité Implicite")])
+    ws.append([None] + [f"Strike ${strike:.2f}" for strike in strikes])
+    for i, maturity in enumerate(maturities):
+        ws.append([f"{maturity:.3f}a"] + list(iv_matrix[i]))
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as output:
+        wb.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+class _ChunkSink:
+    """Fichier en écriture seule dont le contenu est vidé au fil de l'eau (sortie des writers pyarrow)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    types = {"str": pa.string(), "float": pa.float64()}
+    return pa.schema([(name, types[kind]) for name, kind in CHAIN_COLUMNS])
+
+
+def _iter_arrow_writer(frames: Iterable[pd.DataFrame], open_writer) -> Iterator[bytes]:
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow non installé pour les exports Parquet / Arrow")
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    writer = open_writer(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        for frame in frames:
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_parquet(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """Parquet de la chaîne, un row group par expiration"""
+    def open_writer(sink, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return _iter_arrow_writer(frames, open_writer)
+
+
+def iter_arrow(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """Flux Arrow IPC de la chaîne, un record batch par expiration"""
+    def open_writer(sink, schema):
+        import pyarrow.ipc
+        return pyarrow.ipc.new_stream(sink, schema)
+    return _iter_arrow_writer(frames, open_writer)
+
+
+def streaming_response(chunks: Iterator[bytes], format_type: str, basename: str):
+    """
+    Réponse Flask en flux
+
+    Args:
+        chunks (Iterator[bytes]): Générateur du contenu
+        format_type (str): Clé de EXPORT_FORMATS
+        basename (str): Nom du fichier téléchargé (sans extension)
+    """
+    from flask import Response, stream_with_context
+
+    mimetype, extension = EXPORT_FORMATS[format_type]
+    headers: Dict[str, str] = {
+        "Content-Disposition": f"attachment; filename={basename}.{extension}",
+        # Pas de mise en tampon par un proxy (nginx): les octets partent dès qu'ils sont produits
+        "X-Accel-Buffering": "no",
+    }
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Cache HTTP des réponses de l'API: ETag fort, GET conditionnel (304), Cache-Control et compression
+
+- ETag fort: empreinte du contenu (calculée une seule fois pour les vues mises en cache
+  par cached_json_view, qui la conservent avec la réponse)
+- If-None-Match → 304 sans corps: navigateurs et proxys ne retéléchargent pas une surface inchangée
+- Compression brotli (si le module est installé) ou gzip des réponses volumineuses,
+  avec un petit LRU des corps compressés par ETag pour ne pas recompresser une réponse en cache
+- Cache-Control: "no-cache" par défaut (revalidation systématique, peu coûteuse grâce à l'ETag),
+  ou durée explicite via le décorateur @http_cache
+"""
+
+import os
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+from utils.binary_transport import BINARY_MIMETYPE
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    BINARY_MIMETYPE,
+    "text/csv",
+    "text/plain",
+}
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Empreinte forte d'un corps de réponse
+
+    Args:
+        body (bytes): Corps de la réponse
+
+    Returns:
+        str: Valeur d'ETag (sans guillemets)
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def http_cache(max_age: int = 0, public: bool = True, stale_while_revalidate: int = 0):
+    """
+    Décorateur de route: durée de fraîcheur côté navigateur / proxy
+
+    Args:
+        max_age (int): Durée de fraîcheur en secondes (0 = revalider à chaque fois)
+        public (bool): Réponse partageable par les proxys
+        stale_while_revalidate (int): Durée pendant laquelle une réponse périmée peut être servie
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import g
+            g.http_cache_control = (max_age, public, stale_while_revalidate)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _CompressedLRU:
+    """LRU des corps compressés, indexé par (ETag, encodage)"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Tuple[str, str], value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class HTTPCache:
+    """
+    Extension Flask: ETag, 304, Cache-Control et compression des réponses de l'API
+    """
+
+    def __init__(self, app=None, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 compressed_entries: int = 128):
+        """
+        Initialise l'extension
+
+        Args:
+            app (Flask, optional): Application à équiper
+            min_size (int): Taille minimale (octets) pour compresser
+            gzip_level (int): Niveau gzip
+            brotli_quality (int): Qualité brotli (4 = bon compromis taille / CPU)
+            compressed_entries (int): Taille du LRU des corps compressés
+        """
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._compressed = _CompressedLRU(compressed_entries)
+        self.stats = {"not_modified": 0, "compressed": 0, "compressed_hits": 0, "bytes_saved": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.after_request(self.process_response)
+        app.extensions["http_cache"] = self
+
+    def _encoding(self, request) -> Optional[str]:
+        accepted = request.accept_encodings
+        if BROTLI_AVAILABLE and accepted["br"] > 0:
+            return "br"
+        if accepted["gzip"] > 0:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str, etag: str) -> bytes:
+        cached = self._compressed.get((etag, encoding))
+        if cached is not None:
+            self.stats["compressed_hits"] += 1
+            return cached
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        self._compressed.set((etag, encoding), compressed)
+        return compressed
+
+    def process_response(self, response):
+        """Hook after_request: ETag, Cache-Control, 304 puis compression"""
+        from flask import request, g
+
+        if (request.method not in ("GET", "HEAD") or response.status_code != 200
+                or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or "Content-Encoding" in response.headers):
+            return response
+
+        body = response.get_data()
+        etag, _ = response.get_etag()
+        if not etag:
+            etag = compute_etag(body)
+
+        if "Cache-Control" not in response.headers:
+            max_age, public, swr = g.get("http_cache_control", (0, True, 0))
+            if max_age > 0:
+                value = f"{'public' if public else 'private'}, max-age={max_age}"
+                if swr:
+                    value += f", stale-while-revalidate={swr}"
+                response.headers["Cache-Control"] = value
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+
+        # Chaque représentation (identité, gzip, br) a son propre ETag fort
+        response.vary.add("Accept-Encoding")
+        encoding = self._encoding(request) if len(body) >= self.min_size else None
+        response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+
+        # If-None-Match → 304 (werkzeug retire le corps)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+            return response
+        if encoding is None:
+            return response
+
+        compressed = self._compress(body, encoding, etag)
+        self.stats["compressed"] += 1
+        self.stats["bytes_saved"] += len(body) - len(compressed)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def get_status(self) -> dict:
+        """Compteurs de l'extension"""
+        return {"brotli": BROTLI_AVAILABLE, "min_size": self.min_size, **self.stats}
+
+
+def create_http_cache_from_env(app=None) -> Optional[HTTPCache]:
+    """
+    Crée l'extension selon l'environnement
+
+    Variables:
+        HTTP_CACHE_ENABLED: "false" pour désactiver ETag / compression (défaut: true)
+        HTTP_COMPRESS_MIN_SIZE: Taille minimale compressée en octets (défaut: 1024)
+        HTTP_GZIP_LEVEL: Niveau gzip (défaut: 6)
+        HTTP_BROTLI_QUALITY: Qualité brotli (défaut: 4)
+    """
+    if os.getenv("HTTP_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    return HTTPCache(
+        app,
+        min_size=int(os.getenv("HTTP_COMPRESS_MIN_SIZE", "1024")),
+        gzip_level=int(os.getenv("HTTP_GZIP_LEVEL", "6")),
+        brotli_quality=int(os.getenv("HTTP_BROTLI_QUALITY", "4")),
+    )
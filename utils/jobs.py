@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Tâches de fond (exports longs, backfills) avec progression et fichiers résultats
+
+Une tâche soumise reçoit un identifiant et s'exécute dans un pool de threads du worker,
+hors du cycle de la requête: un export complet ne bloque plus un worker gunicorn jusqu'au timeout.
+
+L'état de chaque tâche est un fichier JSON sur disque (JOBS_DIR): n'importe quel worker peut
+répondre au polling de la progression et servir le fichier produit. Les résultats expirent
+après JOBS_TTL secondes; une tâche identique (même type, mêmes paramètres) en cours ou terminée
+et non expirée est réutilisée au lieu d'être relancée. Toutes les routes de l'API (liste, suivi,
+téléchargement, soumission, annulation) demandent le secret JOBS_SECRET (en-tête X-Jobs-Token
+ou paramètre _jobs_token). Le dossier par défaut est propre à l'uid (mode 0700).
+
+Exemple:
+    @job_manager.task("surface_export")
+    def surface_export(job, symbol, span):
+        for i, chunk in enumerate(chunks):
+            job.progress(100 * i / total, f"{i}/{total} expirations")
+        return job.write_artifact(f"surface_{symbol}.csv", chunks, "text/csv")
+
+    job = job_manager.submit("surface_export", {"symbol": "SPY", "span": 0.3})
+"""
+
+import os
+import re
+import hmac
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from utils.private_dir import default_private_dir, private_dir
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+_JOB_ID = re.compile(r"^[0-9a-f]{16}$")
+
+
+class JobCancelled(Exception):
+    """Levée dans la tâche quand son annulation a été demandée"""
+
+
+def _process_token(pid: int) -> Optional[str]:
+    """
+    Date de démarrage d'un processus: distingue un pid réutilisé par un autre processus
+
+    Returns:
+        str: Jeton stable pendant la vie du processus, None si indisponible
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            # Champ 22 (starttime), compté après le nom du processus entre parenthèses
+            return f.read().rsplit(b")", 1)[1].split()[19].decode("ascii")
+    except (OSError, IndexError):
+        pass
+    try:
+        import psutil
+        return str(psutil.Process(pid).create_time())
+    except Exception:
+        return None
+
+
+def _pid_alive(pid: Optional[int], token: Optional[str] = None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    # Pid recyclé par un autre processus depuis la soumission
+    return token is None or _process_token(pid) in (None, token)
+
+
+class JobContext:
+    """
+    Contexte passé à la tâche: progression, annulation, écriture du résultat
+    """
+
+    def __init__(self, manager: "JobManager", job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+        self._last_update = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return os.path.exists(self.manager._path(self.job_id, "cancel"))
+
+    def progress(self, percent: float, message: Optional[str] = None) -> None:
+        """
+        Met à jour la progression (écriture limitée à 2 par seconde)
+
+        Args:
+            percent (float): Avancement de 0 à 100
+            message (str, optional): Étape en cours
+
+        Raises:
+            JobCancelled: Si l'annulation de la tâche a été demandée
+        """
+        if self.cancelled:
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self._last_update < 0.5 and percent < 100:
+            return
+        self._last_update = now
+        changes = {"progress": round(max(0.0, min(percent, 100.0)), 1)}
+        if message is not None:
+            changes["message"] = message
+        self.manager._update(self.job_id, **changes)
+
+    def write_artifact(self, filename: str, chunks: Iterable[bytes], mimetype: str) -> Dict:
+        """
+        Écrit le fichier résultat de la tâche (écriture atomique)
+
+        Args:
+            filename (str): Nom du fichier téléchargé
+            chunks (Iterable[bytes]): Contenu
+            mimetype (str): Type MIME du fichier
+
+        Returns:
+            Dict: Description du fichier (à renvoyer par la tâche)
+        """
+        filename = os.path.basename(filename)
+        path = self.manager._path(self.job_id, filename)
+        tmp_path = path + ".tmp"
+        size = 0
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                if self.cancelled:
+                    raise JobCancelled()
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(tmp_path, path)
+        return {"filename": filename, "mimetype": mimetype, "size": size}
+
+
+class JobManager:
+    """
+    Gestionnaire des tâches de fond (état partagé sur disque entre workers)
+    """
+
+    def __init__(self, directory: str, max_workers: int = 2, ttl: int = 3600, secret: Optional[str] = None):
+        """
+        Initialise le gestionnaire
+
+        Args:
+            directory (str): Dossier des états et des fichiers produits
+            max_workers (int): Tâches exécutées simultanément par worker
+            ttl (int): Durée de conservation des résultats en secondes
+            secret (str, optional): Secret requis par toutes les routes de l'API (None = API fermée)
+        """
+        self.directory = directory
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.secret = secret
+        self._tasks: Dict[str, Callable] = {}
+        self._validators: Dict[str, Callable] = {}
+        self.app = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pid_token = _process_token(os.getpid())
+        self._token_pid = os.getpid()
+        # Compteurs du worker tenus en mémoire: /health ne relit pas les fichiers d'état
+        self.stats = {"submitted": 0, "reused": 0, "running": 0, "done": 0, "failed": 0, "cancelled": 0}
+
+    # ------------------------------------------------------------------
+    # Enregistrement et soumission
+    # ------------------------------------------------------------------
+
+    def init_app(self, app) -> None:
+        """Exécute les tâches dans le contexte de l'application (current_app, configuration)"""
+        self.app = app
+        app.extensions["jobs"] = self
+
+    def authorized(self, request) -> bool:
+        """Le secret fourni (en-tête ou paramètre) correspond-il à JOBS_SECRET ?"""
+        token = request.headers.get("X-Jobs-Token") or request.args.get("_jobs_token", "")
+        return bool(self.secret) and hmac.compare_digest(token.encode("utf-8"), self.secret.encode("utf-8"))
+
+    def task(self, kind: str, validate: Optional[Callable[[Dict], Union[Dict, str]]] = None):
+        """
+        Décorateur: enregistre la fonction d'un type de tâche
+
+        Args:
+            kind (str): Type de tâche
+            validate (Callable, optional): Valide les paramètres soumis par l'API
+                (retourne les paramètres normalisés ou un message d'erreur)
+        """
+        def decorator(func: Callable):
+            self._tasks[kind] = func
+            if validate is not None:
+                self._validators[kind] = validate
+            return func
+        return decorator
+
+    def validate(self, kind: str, params: Dict) -> Union[Dict, str]:
+        """Paramètres normalisés d'une soumission, ou message d'erreur"""
+        if kind not in self._tasks:
+            return f"kind doit être l'un de: {', '.join(self.kinds)}"
+        validator = self._validators.get(kind)
+        return validator(params) if validator is not None else params
+
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._tasks)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Pool créé à la première soumission, dans le worker (jamais hérité du master gunicorn)
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mlg-job")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    @staticmethod
+    def _dedupe_key(kind: str, params: Dict) -> str:
+        payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def submit(self, kind: str, params: Dict, reuse: bool = True) -> Dict:
+        """
+        Soumet une tâche
+
+        Args:
+            kind (str): Type de tâche enregistré par @task
+            params (Dict): Paramètres (sérialisables en JSON) passés à la fonction
+            reuse (bool): Réutiliser une tâche identique en cours ou terminée
+
+        Returns:
+            Dict: État de la tâche
+
+        Raises:
+            ValueError: Si le type de tâche est inconnu
+        """
+        if kind not in self._tasks:
+            raise ValueError(f"Type de tâche inconnu: {kind} (disponibles: {', '.join(self.kinds)})")
+        self.cleanup()
+        key = self._dedupe_key(kind, params)
+        if reuse:
+            for job in self.list():
+                if job["key"] == key and job["status"] in ("queued", "running", "done"):
+                    with self._lock:
+                        self.stats["reused"] += 1
+                    return job
+
+        job_id = uuid.uuid4().hex[:16]
+        now = time.time()
+        if self._token_pid != os.getpid():
+            # Gestionnaire hérité du master gunicorn: jeton du worker
+            self._pid_token, self._token_pid = _process_token(os.getpid()), os.getpid()
+        job = {
+            "id": job_id, "kind": kind, "params": params, "key": key, "status": "queued",
+            "progress": 0.0, "message": "En attente", "created_at": now, "started_at": None,
+            "finished_at": None, "expires_at": None, "artifact": None, "error": None, "pid": os.getpid(),
+            "pid_token": self._pid_token,
+        }
+        os.makedirs(self._path(job_id), mode=0o700, exist_ok=True)
+        self._save(job)
+        with self._lock:
+            self.stats["submitted"] += 1
+        self._get_executor().submit(self._run, job_id)
+        return job
+
+    def _run(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job is None or job["status"] != "queued":
+            return
+        context = JobContext(self, job_id)
+        self._update(job_id, status="running", started_at=time.time(), message="Démarrage")
+        with self._lock:
+            self.stats["running"] += 1
+        outcome = "failed"
+        try:
+            if context.cancelled:
+                raise JobCancelled()
+            with self.app.app_context() if self.app is not None else contextlib.nullcontext():
+                artifact = self._tasks[job["kind"]](context, **job["params"])
+            now = time.time()
+            self._update(job_id, status="done", progress=100.0, message="Terminé", artifact=artifact,
+                         finished_at=now, expires_at=now + self.ttl)
+            outcome = "done"
+        except JobCancelled:
+            self._update(job_id, status="cancelled", message="Annulée", finished_at=time.time(),
+                         expires_at=time.time() + self.ttl)
+            outcome = "cancelled"
+        except Exception as e:
+            print(f"❌ Tâche {job['kind']} {job_id} en échec: {e}")
+            self._update(job_id, status="failed", message="Échec", error=str(e), finished_at=time.time(),
+                         expires_at=time.time() + self.ttl)
+        finally:
+            # Compteurs modifiés par plusieurs threads: sous le verrou, comme running
+            with self._lock:
+                self.stats["running"] -= 1
+                self.stats[outcome] += 1
+
+    # ------------------------------------------------------------------
+    # État sur disque
+    # ------------------------------------------------------------------
+
+    def _path(self, job_id: str, *parts: str) -> str:
+        return os.path.join(self.directory, job_id, *parts)
+
+    def _save(self, job: Dict) -> None:
+        path = self._path(job["id"], "job.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, default=str)
+        os.replace(tmp_path, path)
+
+    def _update(self, job_id: str, **changes) -> None:
+        with self._lock:
+            job = self._load(job_id)
+            if job is not None:
+                job.update(changes)
+                self._save(job)
+
+    def _load(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(job_id, "job.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        État d'une tâche (None si inconnue)
+
+        Une tâche en cours dont le worker a disparu (redémarrage, recyclage) est marquée en échec.
+        """
+        if not _JOB_ID.match(job_id or ""):
+            return None
+        job = self._load(job_id)
+        if job and job["status"] in ("queued", "running") and not _pid_alive(job.get("pid"), job.get("pid_token")):
+            self._update(job_id, status="failed", error="Worker arrêté pendant la tâche",
+                         finished_at=time.time(), expires_at=time.time() + self.ttl)
+            job = self._load(job_id)
+        return job
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        """Tâches connues, de la plus récente à la plus ancienne"""
+        try:
+            job_ids = [name for name in os.listdir(self.directory) if _JOB_ID.match(name)]
+        except OSError:
+            return []
+        jobs = [job for job in (self.get(job_id) for job_id in job_ids) if job]
+        jobs.sort(key=lambda job: job["created_at"], reverse=True)
+        return jobs[:limit]
+
+    def cancel(self, job_id: str) -> bool:
+        """Demande l'annulation d'une tâche en attente ou en cours (prise en compte à la prochaine étape)"""
+        job = self.get(job_id)
+        if job is None or job["status"] not in ("queued", "running"):
+            return False
+        open(self._path(job_id, "cancel"), "w").close()
+        return True
+
+    def artifact_path(self, job_id: str) -> Optional[str]:
+        """Chemin du fichier produit par une tâche terminée et non expirée"""
+        job = self.get(job_id)
+        if not job or job["status"] != "done" or not job.get("artifact"):
+            return None
+        if job.get("expires_at") and job["expires_at"] < time.time():
+            return None
+        path = self._path(job_id, job["artifact"]["filename"])
+        return path if os.path.isfile(path) else None
+
+    def cleanup(self) -> int:
+        """Supprime les tâches expirées et leurs fichiers"""
+        removed = 0
+        try:
+            job_ids = [name for name in os.listdir(self.directory) if _JOB_ID.match(name)]
+        except OSError:
+            return 0
+        now = time.time()
+        for job_id in job_ids:
+            job = self._load(job_id)
+            if job is None or (job.get("expires_at") and job["expires_at"] < now):
+                shutil.rmtree(self._path(job_id), ignore_errors=True)
+                removed += 1
+        return removed
+
+    def get_status(self) -> Dict:
+        """Compteurs du worker courant, en mémoire (pour /health; GET /api/jobs liste les tâches)"""
+        with self._lock:
+            stats = dict(self.stats)
+        return {"directory": self.directory, "workers": self.max_workers, "ttl": self.ttl,
+                "api_enabled": bool(self.secret), **stats}
+
+
+def create_job_manager_from_env() -> JobManager:
+    """
+    Crée le gestionnaire selon l'environnement
+
+    Variables:
+        JOBS_DIR: Dossier des états et résultats, réservé à l'uid (défaut: <tmp>/mlg-<uid>/jobs,
+            partagé par les workers)
+        JOBS_WORKERS: Tâches simultanées par worker (défaut: 2)
+        JOBS_TTL: Durée de conservation des résultats en secondes (défaut: 3600)
+        JOBS_SECRET: Secret de l'API des tâches (absent: API fermée)
+    """
+    try:
+        configured = os.getenv("JOBS_DIR")
+        directory = private_dir(configured) if configured else default_private_dir("jobs", root=tempfile.gettempdir())
+    except OSError as e:
+        # Dossier privé au processus: les autres workers ne voient pas ses tâches
+        directory = tempfile.mkdtemp(prefix="mlg_jobs_")
+        print(f"⚠️  Dossier des tâches refusé ({e}), tâches limitées au worker ({directory})")
+    return JobManager(
+        directory=directory,
+        max_workers=int(os.getenv("JOBS_WORKERS", "2")),
+        ttl=int(os.getenv("JOBS_TTL", "3600")),
+        secret=os.getenv("JOBS_SECRET") or None,
+    )
+
+
+# Instance globale (les types de tâches sont enregistrés par l'application)
+job_manager = create_job_manager_from_env()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Fournisseur JSON rapide pour Flask: orjson, tableaux NumPy et DataFrames pandas sans conversion
+
+- Les tableaux NumPy sont sérialisés directement (plus de .tolist() dans les routes)
+- Les DataFrames sont sérialisés en liste d'enregistrements, les Series en liste
+- NaN et ±Infinity deviennent null (le JSON produit reste toujours valide)
+- Arrondi optionnel des flottants (JSON_FLOAT_PRECISION dans la config ou par réponse)
+
+Sans orjson, le module json de la bibliothèque standard est utilisé avec les mêmes règles.
+"""
+
+import json
+import math
+import datetime
+import decimal
+from typing import Any, Optional
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+from utils.binary_transport import BINARY_MIMETYPE, loaded_pandas, encode_binary, wants_binary
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _round_floats(obj: Any, precision: int) -> Any:
+    """Arrondit récursivement les flottants d'une structure (tableaux NumPy compris)"""
+    if isinstance(obj, float):
+        return round(obj, precision) if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _round_floats(v, precision) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_round_floats(v, precision) for v in obj]
+    if isinstance(obj, np.ndarray) and obj.dtype.kind == "f":
+        return np.round(obj, precision)
+    pd = loaded_pandas()
+    if pd is not None:
+        if isinstance(obj, pd.DataFrame):
+            return obj.round(precision)
+        if isinstance(obj, pd.Series) and obj.dtype.kind == "f":
+            return obj.round(precision)
+    return obj
+
+
+def _sanitize(obj: Any) -> Any:
+    """Convertit NumPy / pandas et remplace NaN / Infinity par None (chemin sans orjson)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sanitize(v) for v in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return _sanitize(_default(obj))
+    pd = loaded_pandas()
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        return _sanitize(_default(obj))
+    return obj
+
+
+def _default(obj: Any) -> Any:
+    """Types non natifs: NumPy, pandas, dates, Decimal"""
+    if isinstance(obj, np.ndarray):
+        # Tableaux non contigus ou de type objet: orjson les délègue ici
+        if obj.dtype.kind == "f":
+            return np.where(np.isfinite(obj), obj, None).tolist()
+        return obj.tolist()
+    # pandas n'est consulté que s'il est chargé (un pool pricing ne l'importe pas)
+    pd = loaded_pandas()
+    if pd is not None:
+        if isinstance(obj, pd.DataFrame):
+            # NaN → None pour que l'encodeur produise null
+            return obj.astype(object).where(pd.notna(obj), None).to_dict("records")
+        if isinstance(obj, pd.Series):
+            return obj.astype(object).where(pd.notna(obj), None).tolist()
+        if obj is pd.NaT:
+            return None
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    # pd.Timestamp est une sous-classe de datetime
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type {type(obj).__name__} non sérialisable en JSON")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Fournisseur JSON de l'application (installé via app.json = FastJSONProvider(app))
+    """
+
+    def _precision(self) -> Optional[int]:
+        return self._app.config.get("JSON_FLOAT_PRECISION")
+
+    def dumps_bytes(self, obj: Any, precision: Optional[int] = None, **kwargs: Any) -> bytes:
+        """
+        Sérialise en octets UTF-8
+
+        Args:
+            obj (Any): Objet à sérialiser
+            precision (int, optional): Nombre de décimales (défaut: JSON_FLOAT_PRECISION)
+
+        Returns:
+            bytes: Document JSON
+        """
+        precision = self._precision() if precision is None else precision
+        if precision is not None:
+            obj = _round_floats(obj, precision)
+
+        sort_keys = kwargs.pop("sort_keys", self.sort_keys)
+        indent = kwargs.pop("indent", None)
+
+        if ORJSON_AVAILABLE and not kwargs:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_default, option=option)
+
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        return json.dumps(_sanitize(obj), default=_default, sort_keys=sort_keys, indent=indent,
+                          allow_nan=False, **kwargs).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Équivalent de jsonify: encode directement en octets"""
+        obj = self._prepare_response_obj(args, kwargs)
+        if wants_binary():
+            # Route @binary_capable et client compatible: grilles en buffers typés
+            precision = self._precision()
+            if precision is not None:
+                obj = _round_floats(obj, precision)
+            return self._app.response_class(encode_binary(obj, json_default=_default), mimetype=BINARY_MIMETYPE)
+        indent = 2 if (self.compact is False or (self.compact is None and self._app.debug)) else None
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent), mimetype=self.mimetype)
+
+
+def json_response(obj: Any, status: int = 200, precision: Optional[int] = None):
+    """
+    Réponse JSON avec arrondi propre à la route (ex: grilles de surface à 4 décimales)
+
+    Args:
+        obj (Any): Objet à sérialiser
+        status (int): Code HTTP
+        precision (int, optional): Nombre de décimales des flottants
+
+    Returns:
+        Response: Réponse Flask application/json
+    """
+    from flask import current_app
+    provider = current_app.json
+    if isinstance(provider, FastJSONProvider):
+        body = provider.dumps_bytes(obj, precision=precision)
+    else:
+        body = provider.dumps(_round_floats(obj, precision) if precision is not None else obj)
+    return current_app.response_class(body, status=status, mimetype="application/json")
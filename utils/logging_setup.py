@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Journalisation structurée et non bloquante de l'application
+
+- Loggers hiérarchiques "mlg.<module>" avec niveaux réglables par module (LOG_LEVELS)
+- Écriture déportée dans un thread (QueueHandler → QueueListener): une requête ne paie
+  que la mise en file d'un enregistrement, jamais l'écriture sur stdout / stderr
+- Format texte (défaut) ou JSON une ligne par événement (LOG_FORMAT=json)
+- Échantillonnage des traces de débogage par requête (LOG_DEBUG_SAMPLE_RATE)
+
+Exemple:
+    log = get_logger("smile")
+    debug = debug_enabled(log)          # décision prise une fois par requête
+    log.info("Smile %s: %d options", symbol, count, extra={"fields": {"symbol": symbol}})
+    if debug:
+        for option in options[:10]:
+            log.debug(f"Option {option['strike']} ...")
+"""
+
+import os
+import sys
+import json
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+ROOT_LOGGER = "mlg"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional[queue.Queue] = None
+_config: Dict = {}
+
+
+class JSONFormatter(logging.Formatter):
+    """Une ligne JSON par événement (champs structurés via extra={"fields": {...}})"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "pid": record.process,
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            event.update(fields)
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Format texte lisible, champs structurés ajoutés en fin de ligne"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    """'smile=DEBUG,tradier=WARNING' → {'mlg.smile': 10, 'mlg.tradier': 30}"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = (part.strip() for part in item.split("=", 1))
+        if name and level:
+            full_name = name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}"
+            levels[full_name] = logging.getLevelName(level.upper())
+    return levels
+
+
+def _start_listener() -> None:
+    """Démarre le thread d'écriture (aussi rappelé dans chaque worker après fork)"""
+    global _listener
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JSONFormatter() if _config.get("format") == "json" else TextFormatter())
+    _listener = logging.handlers.QueueListener(_queue, handler, respect_handler_level=False)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def _after_fork_in_child() -> None:
+    # Le thread d'écriture ne survit pas au fork des workers gunicorn (preload_app)
+    global _queue
+    if _queue is not None:
+        _queue = queue.Queue(-1)
+        logger = logging.getLogger(ROOT_LOGGER)
+        for handler in logger.handlers:
+            if isinstance(handler, logging.handlers.QueueHandler):
+                handler.queue = _queue
+        _start_listener()
+
+
+def configure_logging() -> logging.Logger:
+    """
+    Configure la journalisation selon l'environnement (idempotent)
+
+    Variables:
+        LOG_LEVEL: Niveau global (défaut: INFO)
+        LOG_LEVELS: Niveaux par module, ex: "smile=DEBUG,surface=WARNING"
+        LOG_FORMAT: "text" (défaut) ou "json"
+        LOG_DEBUG_SAMPLE_RATE: Part des requêtes dont les traces DEBUG sont écrites (défaut: 1.0)
+
+    Returns:
+        logging.Logger: Logger racine de l'application
+    """
+    global _queue
+    root = logging.getLogger(ROOT_LOGGER)
+    if _queue is not None:
+        return root
+
+    _config.update({
+        "format": os.getenv("LOG_FORMAT", "text").lower(),
+        "sample_rate": float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0")),
+    })
+    root.setLevel(logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()))
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _queue = queue.Queue(-1)
+    root.addHandler(logging.handlers.QueueHandler(_queue))
+    root.propagate = False
+    _start_listener()
+    atexit.register(_stop_listener)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger d'un module de l'application
+
+    Args:
+        name (str): Nom court du module (ex: "smile", "surface", "term_structure")
+
+    Returns:
+        logging.Logger: Logger "mlg.<name>"
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """
+    Décide une fois par requête si les traces DEBUG détaillées doivent être produites
+
+    Les traces ne sont construites que si le niveau DEBUG est actif pour ce module,
+    et seulement pour une part LOG_DEBUG_SAMPLE_RATE des requêtes.
+
+    Args:
+        logger (logging.Logger): Logger du module
+
+    Returns:
+        bool: True si les traces détaillées doivent être produites
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    rate = _config.get("sample_rate", 1.0)
+    return rate >= 1.0 or random.random() < rate
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Instrumentation de l'application et exposition au format Prometheus (/metrics)
+
+- Latence et taille des réponses par route (histogrammes)
+- Appels amont Tradier / Yahoo par endpoint: nombre, statut, latence
+- Solveur de volatilité implicite: itérations, convergences et échecs
+- Compteurs existants (cache partagé, single-flight, limiteur Tradier, cache HTTP) collectés à la lecture
+
+Sans dépendance: un registre minimal (compteurs, jauges, histogrammes) suffit ici.
+Avec plusieurs workers gunicorn, chaque worker écrit périodiquement un instantané dans
+METRICS_DIR et /metrics les agrège (compteurs et histogrammes additionnés, jauges par pid).
+À la sortie d'un worker (hook child_exit de gunicorn), ses compteurs et histogrammes sont
+reportés dans metrics-retired.json et son instantané est supprimé: ses jauges disparaissent.
+"""
+
+import os
+import json
+import time
+import glob
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Secondes: des calculs de grecques (ms) aux surfaces complètes (dizaines de s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 2e7)
+ITERATION_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+RETIRED_SNAPSHOT = "metrics-retired.json"
+
+# Clé d'environnement WSGI des requêtes émises par l'application elle-même (préchauffage du cache)
+INTERNAL_REQUEST_ENVIRON = "mlg.internal"
+
+
+def is_internal_request(request) -> bool:
+    """Requête interne (préchauffage): exclue des histogrammes de /metrics et du profilage"""
+    return bool(request.environ.get(INTERNAL_REQUEST_ENVIRON))
+
+
+def _pid_alive(pid) -> bool:
+    """Le processus existe-t-il encore ? (un pid réutilisé reste compté vivant jusqu'à sa sortie)"""
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    items = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels.items()
+    )
+    return "{" + items + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base commune: une famille de séries indexées par les valeurs d'étiquettes"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, self._labels(k), v) for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée"""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, self._labels(k), v) for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Histogramme à seaux cumulatifs"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # clé → [compte par seau..., +Inf, somme]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def samples(self) -> List[Sample]:
+        out = []
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, series in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, series[-1]))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques du processus et rendu au format texte Prometheus
+    """
+
+    def __init__(self, namespace: str = "mlg", shared_dir: Optional[str] = None, flush_interval: float = 5.0):
+        """
+        Initialise le registre
+
+        Args:
+            namespace (str): Préfixe des noms de métriques
+            shared_dir (str, optional): Dossier des instantanés partagés entre workers (None = processus seul)
+            flush_interval (float): Intervalle minimal entre deux écritures d'instantané (secondes)
+        """
+        self.namespace = namespace
+        self.shared_dir = shared_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]] = []
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+
+    def _register(self, cls, name: str, help_text: str, labelnames: Iterable[str] = (), **kwargs):
+        full_name = f"{self.namespace}_{name}"
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, help_text, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable) -> None:
+        """
+        Ajoute une source lue à chaque rendu
+
+        Le collecteur retourne des tuples (nom, type, aide, [(étiquettes, valeur), ...]).
+        """
+        self._collectors.append(collector)
+
+    # ------------------------------------------------------------------
+    # Instantanés et rendu
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict]:
+        """Familles du processus: {nom: {type, help, samples: [[nom_série, étiquettes, valeur], ...]}}"""
+        families = {}
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            families[metric.name] = {"type": metric.kind, "help": metric.help,
+                                     "samples": [list(s) for s in metric.samples()]}
+        for collector in self._collectors:
+            try:
+                for name, kind, help_text, values in collector():
+                    full_name = f"{self.namespace}_{name}"
+                    families[full_name] = {"type": kind, "help": help_text,
+                                           "samples": [[full_name, labels, value] for labels, value in values]}
+            except Exception as e:
+                families.setdefault(f"{self.namespace}_collector_errors_total", {
+                    "type": "counter", "help": "Erreurs de collecteurs", "samples": []
+                })["samples"].append([f"{self.namespace}_collector_errors_total",
+                                      {"error": type(e).__name__}, 1])
+        return families
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.shared_dir, f"metrics-{pid}.json")
+
+    def maybe_flush(self, force: bool = False) -> None:
+        """Écrit l'instantané du worker dans le dossier partagé (au plus une fois par intervalle)"""
+        if not self.shared_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        try:
+            self._write_snapshot(self._snapshot_path(os.getpid()),
+                                 {"pid": os.getpid(), "time": time.time(), "families": self.snapshot()})
+        except OSError as e:
+            print(f"⚠️  Écriture de l'instantané de métriques impossible: {e}")
+
+    def _write_snapshot(self, path: str, payload: Dict) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def retire(self, pid: int) -> None:
+        """
+        Reporte les compteurs et histogrammes d'un worker terminé dans l'instantané cumulé, puis supprime le sien
+
+        Appelé par le master gunicorn (hook child_exit): les jauges du worker ne sont plus exposées.
+
+        Args:
+            pid (int): Pid du worker terminé
+        """
+        if not self.shared_dir:
+            return
+        path = self._snapshot_path(pid)
+        retired_path = os.path.join(self.shared_dir, RETIRED_SNAPSHOT)
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = None
+        if snapshot is not None:
+            try:
+                with open(retired_path, encoding="utf-8") as f:
+                    retired = json.load(f)
+            except (OSError, ValueError):
+                retired = {"pid": None, "families": {}}
+            families = retired["families"]
+            for name, family in snapshot.get("families", {}).items():
+                if family["type"] == "gauge":
+                    continue
+                target = families.setdefault(name, {"type": family["type"], "help": family["help"], "samples": []})
+                index = {(sample[0], json.dumps(sample[1], sort_keys=True)): sample for sample in target["samples"]}
+                for series, labels, value in family["samples"]:
+                    sample = index.get((series, json.dumps(labels, sort_keys=True)))
+                    if sample is None:
+                        target["samples"].append([series, labels, value])
+                    else:
+                        sample[2] += value
+            retired["time"] = time.time()
+            try:
+                self._write_snapshot(retired_path, retired)
+            except OSError as e:
+                print(f"⚠️  Report des métriques du worker {pid} impossible: {e}")
+                return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _merged_families(self) -> Dict[str, Dict]:
+        """Agrège les instantanés de tous les workers (celui du processus courant est à jour)"""
+        if not self.shared_dir:
+            return self.snapshot()
+        self.maybe_flush(force=True)
+        merged: Dict[str, Dict] = {}
+        sums: Dict[Tuple[str, str, str], float] = {}
+        for path in glob.glob(os.path.join(self.shared_dir, "metrics-*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # Worker terminé (instantané cumulé ou pas encore retiré): compteurs seulement, sans ses jauges
+            stale = snapshot.get("pid") is None or not _pid_alive(snapshot["pid"])
+            for name, family in snapshot.get("families", {}).items():
+                target = merged.setdefault(name, {"type": family["type"], "help": family["help"], "samples": []})
+                for series, labels, value in family["samples"]:
+                    if family["type"] == "gauge":
+                        if not stale:
+                            target["samples"].append([series, {**labels, "pid": str(snapshot["pid"])}, value])
+                        continue
+                    key = (name, series, json.dumps(labels, sort_keys=True))
+                    if key not in sums:
+                        target["samples"].append([series, labels, None])
+                    sums[key] = sums.get(key, 0.0) + value
+        for name, family in merged.items():
+            for sample in family["samples"]:
+                if sample[2] is None:
+                    sample[2] = sums[(name, sample[0], json.dumps(sample[1], sort_keys=True))]
+        return merged
+
+    def render(self) -> str:
+        """Exposition texte Prometheus (version 0.0.4)"""
+        lines = []
+        for name, family in sorted(self._merged_families().items()):
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for series, labels, value in family["samples"]:
+                lines.append(f"{series}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _create_registry() -> MetricsRegistry:
+    """
+    Crée le registre selon l'environnement
+
+    Variables:
+        METRICS_MULTIPROCESS: "true" pour agréger les workers gunicorn (défaut: true si WEB_CONCURRENCY > 1)
+        METRICS_DIR: Dossier des instantanés (défaut: /dev/shm/mlg_metrics)
+        METRICS_FLUSH_INTERVAL: Intervalle d'écriture des instantanés en secondes (défaut: 5)
+    """
+    multiprocess = os.getenv("METRICS_MULTIPROCESS",
+                             "true" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "false")
+    shared_dir = None
+    if multiprocess.lower() == "true":
+        default_root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        shared_dir = os.getenv("METRICS_DIR", os.path.join(default_root, "mlg_metrics"))
+    return MetricsRegistry(shared_dir=shared_dir,
+                           flush_interval=float(os.getenv("METRICS_FLUSH_INTERVAL", "5")))
+
+
+# Registre global et métriques de l'application
+metrics = _create_registry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "Durée de traitement des requêtes par route", ("route", "method", "status"))
+http_response_size = metrics.histogram(
+    "http_response_size_bytes", "Taille des réponses par route", ("route",), buckets=SIZE_BUCKETS)
+upstream_requests = metrics.counter(
+    "upstream_requests_total", "Appels aux API amont par endpoint et statut", ("provider", "endpoint", "status"))
+upstream_duration = metrics.histogram(
+    "upstream_request_duration_seconds", "Latence des appels aux API amont", ("provider", "endpoint"))
+iv_solver_runs = metrics.counter(
+    "iv_solver_total", "Résolutions de volatilité implicite par résultat", ("result",))
+iv_solver_iterations = metrics.histogram(
+    "iv_solver_iterations", "Itérations de Newton-Raphson par résolution", buckets=ITERATION_BUCKETS)
+
+
+def observe_upstream(provider: str, endpoint: str, status, seconds: float) -> None:
+    """
+    Enregistre un appel amont
+
+    Args:
+        provider (str): "tradier" ou "yahoo"
+        endpoint (str): Endpoint sans paramètres variables (ex: /markets/options/chains)
+        status: Code HTTP ou nom de l'erreur réseau
+        seconds (float): Durée de l'appel
+    """
+    upstream_requests.inc(provider=provider, endpoint=endpoint, status=str(status))
+    upstream_duration.observe(seconds, provider=provider, endpoint=endpoint)
+
+
+def observe_iv_solver(iterations: int, result: str) -> None:
+    """
+    Enregistre une résolution de volatilité implicite
+
+    Args:
+        iterations (int): Nombre d'itérations effectuées
+        result (str): "converged", "no_vega", "numeric_error" ou "max_iterations"
+    """
+    iv_solver_runs.inc(result=result)
+    iv_solver_iterations.observe(iterations)
+
+
+def init_app(app) -> None:
+    """
+    Instrumente une application Flask (latence et taille des réponses par route, hors requêtes internes)
+
+    Args:
+        app (Flask): Application à instrumenter
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        if is_internal_request(request):
+            return
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        # Règle de routage (bornée) plutôt que le chemin réel (un symbole par série sinon)
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        http_request_duration.observe(time.perf_counter() - started, route=route,
+                                      method=request.method, status=str(response.status_code))
+        if not response.is_streamed and response.content_length is not None:
+            http_response_size.observe(response.content_length, route=route)
+        metrics.maybe_flush()
+        return response
+
+
+class UpstreamTimer:
+    """
+    Mesure d'un appel amont dont le statut n'est connu qu'une fois la réponse ouverte (aiohttp)
+
+    Exemple:
+        with UpstreamTimer("tradier", "/markets/quotes") as call:
+            async with session.get(url) as response:
+                call.status = response.status
+    """
+
+    def __init__(self, provider: str, endpoint: str):
+        self.provider = provider
+        self.endpoint = endpoint
+        self.status = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        status = self.status if self.status is not None else (exc_type.__name__ if exc_type else "unknown")
+        observe_upstream(self.provider, self.endpoint, status, time.perf_counter() - self._started)
+        return False
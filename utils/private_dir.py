@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Dossiers et fichiers partagés entre workers, réservés à l'utilisateur du processus
+
+Le cache SQLite, les résultats single-flight et les tâches de fond relisent des fichiers écrits
+par un autre worker (pickle pour les deux premiers). Sur /dev/shm ou /tmp, accessibles à tous,
+un autre utilisateur local pourrait créer ces fichiers avant l'application et y placer un
+contenu exécuté à la lecture. Les dossiers par défaut sont donc propres à l'uid
+(<racine>/mlg-<uid>/<nom>, mode 0700) et leur propriétaire est vérifié avant usage.
+
+Sous Windows (pas d'uid POSIX), les dossiers sont créés sans vérification.
+"""
+
+import os
+import stat
+import tempfile
+from typing import Optional
+
+
+def _uid() -> Optional[int]:
+    return os.getuid() if hasattr(os, "getuid") else None
+
+
+def _runtime_root() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def private_dir(path: str) -> str:
+    """
+    Crée un dossier en mode 0700, ou vérifie qu'un dossier existant appartient à l'uid courant
+
+    Un dossier existant à nous mais ouvert au groupe ou aux autres est restreint à 0700.
+
+    Args:
+        path (str): Chemin du dossier
+
+    Returns:
+        str: Chemin du dossier
+
+    Raises:
+        PermissionError: Lien symbolique, autre type de fichier ou propriétaire différent
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if _uid() is None:
+        return path
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} n'est pas un dossier")
+    if info.st_uid != _uid():
+        raise PermissionError(f"{path} appartient à l'uid {info.st_uid}, pas à l'uid {_uid()}")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def default_private_dir(name: str, root: Optional[str] = None) -> str:
+    """
+    Dossier privé par défaut: <racine>/mlg-<uid>/<nom>
+
+    Args:
+        name (str): Nom du sous-dossier (cache, single_flight, jobs...)
+        root (str, optional): Racine (défaut: /dev/shm, à défaut le dossier temporaire)
+
+    Returns:
+        str: Chemin du dossier, créé en 0700
+    """
+    uid = _uid()
+    base = private_dir(os.path.join(root or _runtime_root(), "mlg" if uid is None else f"mlg-{uid}"))
+    return private_dir(os.path.join(base, name))
+
+
+def check_private_file(path: str) -> None:
+    """
+    Vérifie qu'un fichier existant appartient à l'uid courant et n'est modifiable que par lui
+
+    Args:
+        path (str): Chemin du fichier (absent: rien à vérifier)
+
+    Raises:
+        PermissionError: Lien symbolique, propriétaire différent ou fichier modifiable par d'autres
+    """
+    if _uid() is None:
+        return
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISREG(info.st_mode):
+        raise PermissionError(f"{path} n'est pas un fichier ordinaire")
+    if info.st_uid != _uid():
+        raise PermissionError(f"{path} appartient à l'uid {info.st_uid}, pas à l'uid {_uid()}")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"{path} est modifiable par le groupe ou les autres utilisateurs")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Profilage à la demande des requêtes en production
+
+Activation:
+- À la demande: en-tête "X-Profile: sample|cprofile" (ou ?_profile=sample) accompagné du
+  secret PROFILE_SECRET dans "X-Profile-Token" (ou ?_profile_token=...)
+- Périodique: une fraction PROFILE_SAMPLE_RATE des requêtes est profilée en tâche de fond
+
+Modes:
+- sample: un thread échantillonne la pile du thread de la requête toutes les PROFILE_INTERVAL_MS
+  et produit des piles repliées ("a;b;c 12"), lisibles par flamegraph.pl et speedscope
+- cprofile: profilage déterministe (fichier .prof pour snakeviz / pstats). Utilisé d'office en
+  profil gevent, où les requêtes sont des greenlets qu'un thread d'échantillonnage ne voit pas
+
+Les profils sont écrits dans PROFILE_DIR. L'identifiant est renvoyé dans l'en-tête X-Profile-Id
+et le fichier se télécharge via /api/profiles/<id> (même secret).
+"""
+
+import os
+import sys
+import hmac
+import time
+import random
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from typing import List, Optional
+
+from utils.metrics import is_internal_request
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# Un seul cProfile actif à la fois par thread (les greenlets gevent partagent le même thread)
+_cprofile_lock = threading.Lock()
+
+
+def _gevent_patched() -> bool:
+    # Patch fait par gunicorn.conf.py: si gevent n'est pas déjà chargé, il n'y a rien à importer (~50 ms)
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+class StackSampler:
+    """
+    Échantillonneur de pile d'un thread (piles repliées pour flamegraph)
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """
+        Initialise l'échantillonneur
+
+        Args:
+            thread_id (int): Identifiant du thread à observer
+            interval (float): Période d'échantillonnage en secondes
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="mlg-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def collapsed(self) -> str:
+        """Format "pile;repliée compte" (une ligne par pile distincte)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """
+    Extension Flask: profilage des requêtes à la demande ou par échantillonnage
+    """
+
+    def __init__(self, app=None, secret: Optional[str] = None, sample_rate: float = 0.0,
+                 profile_dir: str = "profiles", interval: float = 0.005, max_files: int = 200):
+        """
+        Initialise l'extension
+
+        Args:
+            app (Flask, optional): Application à équiper
+            secret (str, optional): Secret requis pour le profilage à la demande (None = désactivé)
+            sample_rate (float): Fraction des requêtes profilées en tâche de fond (0 = jamais)
+            profile_dir (str): Dossier des profils
+            interval (float): Période d'échantillonnage du mode sample (secondes)
+            max_files (int): Nombre maximum de profils conservés (les plus anciens sont supprimés)
+        """
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.profile_dir = profile_dir
+        self.interval = interval
+        self.max_files = max_files
+        self.force_cprofile = _gevent_patched()
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.secret) or self.sample_rate > 0
+
+    def init_app(self, app) -> None:
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.extensions["profiler"] = self
+
+    def authorized(self, request) -> bool:
+        """Le secret fourni (en-tête ou paramètre) correspond-il à PROFILE_SECRET ?"""
+        token = request.headers.get("X-Profile-Token") or request.args.get("_profile_token", "")
+        return bool(self.secret) and hmac.compare_digest(token.encode("utf-8"), self.secret.encode("utf-8"))
+
+    def _requested_mode(self, request) -> Optional[str]:
+        mode = request.headers.get("X-Profile") or request.args.get("_profile")
+        if not mode:
+            return None
+        mode = mode.lower() if mode.lower() in PROFILE_MODES else "sample"
+        return mode if self.authorized(request) else None
+
+    def _start(self):
+        from flask import g, request
+
+        # Requêtes du préchauffage: ni échantillonnées ni profilables
+        if is_internal_request(request):
+            return None
+        mode = self._requested_mode(request) if self.secret else None
+        on_demand = mode is not None
+        if mode is None and self.sample_rate > 0 and random.random() < self.sample_rate:
+            mode = "sample"
+        if mode is None:
+            return None
+
+        if self.force_cprofile:
+            mode = "cprofile"
+        if mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                return None
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        # Les vues mises en cache sont recalculées: profiler une lecture de cache n'apprend rien
+        g.profiling = {"mode": mode, "profiler": profiler, "on_demand": on_demand,
+                       "started": time.perf_counter()}
+        return None
+
+    def _finish(self, response):
+        from flask import g, request
+
+        state = g.pop("profiling", None)
+        if state is None:
+            return response
+        profiler = state["profiler"]
+        if state["mode"] == "cprofile":
+            profiler.disable()
+            _cprofile_lock.release()
+        else:
+            profiler.stop()
+
+        elapsed_ms = (time.perf_counter() - state["started"]) * 1000
+        endpoint = (request.endpoint or "unmatched").replace(".", "_")
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{os.getpid()}-{int(elapsed_ms)}ms"
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            if state["mode"] == "cprofile":
+                profile_id += ".prof"
+                profiler.dump_stats(os.path.join(self.profile_dir, profile_id))
+            else:
+                profile_id += ".collapsed"
+                with open(os.path.join(self.profile_dir, profile_id), "w", encoding="utf-8") as f:
+                    f.write(profiler.collapsed())
+            self._prune()
+        except OSError as e:
+            print(f"⚠️  Écriture du profil impossible: {e}")
+            return response
+
+        if state["on_demand"]:
+            response.headers["X-Profile-Id"] = profile_id
+            response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.1f}"
+        return response
+
+    def _prune(self) -> None:
+        files = self.list_profiles()
+        for name in files[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.profile_dir, name))
+            except OSError:
+                pass
+
+    def list_profiles(self) -> List[str]:
+        """Profils enregistrés, du plus récent au plus ancien"""
+        try:
+            names = [n for n in os.listdir(self.profile_dir) if n.endswith((".prof", ".collapsed"))]
+        except OSError:
+            return []
+        return sorted(names, key=lambda n: os.path.getmtime(os.path.join(self.profile_dir, n)), reverse=True)
+
+    def profile_path(self, profile_id: str) -> Optional[str]:
+        """Chemin d'un profil enregistré (None si l'identifiant est invalide ou absent)"""
+        if os.path.basename(profile_id) != profile_id or not profile_id.endswith((".prof", ".collapsed")):
+            return None
+        path = os.path.join(self.profile_dir, profile_id)
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def summarize(path: str, limit: int = 30) -> str:
+        """Résumé texte d'un profil cProfile (fonctions triées par temps cumulé)"""
+        import io
+        stream = io.StringIO()
+        stats = pstats.Stats(path, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+def create_profiler_from_env(app=None) -> Optional[RequestProfiler]:
+    """
+    Crée l'extension selon l'environnement (aucune extension si rien n'est configuré)
+
+    Variables:
+        PROFILE_SECRET: Secret du profilage à la demande (vide = désactivé)
+        PROFILE_SAMPLE_RATE: Fraction des requêtes profilées en tâche de fond (défaut: 0)
+        PROFILE_DIR: Dossier des profils (défaut: profiles)
+        PROFILE_INTERVAL_MS: Période d'échantillonnage en millisecondes (défaut: 5)
+        PROFILE_MAX_FILES: Nombre maximum de profils conservés (défaut: 200)
+    """
+    profiler = RequestProfiler(
+        secret=os.getenv("PROFILE_SECRET") or None,
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        profile_dir=os.getenv("PROFILE_DIR", "profiles"),
+        interval=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000.0,
+        max_files=int(os.getenv("PROFILE_MAX_FILES", "200")),
+    )
+    if not profiler.enabled:
+        return None
+    if app is not None:
+        profiler.init_app(app)
+    return profiler